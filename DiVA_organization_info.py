@@ -57,659 +57,13 @@ from collections import defaultdict
 
 from datetime import datetime
 
+# the tables of schools and departments (and the lookups in them)
+from diva_code_tables import acronym_from_org_id
+
 global baseUrl	# the base URL used for access to Canvas
 global header	# the header for all HTML requests
 global payload	# place to store additionally payload when needed for options to HTML requests
 
-# ----------------------------------------------------------------------
-schools_info={'ABE': {'swe': 'Skolan för Arkitektur och samhällsbyggnad',
-                      'eng': 'School of Architecture and the Built Environment'},
-              'ITM': {'swe': 'Skolan för Industriell teknik och management',
-                      'eng': 'School of Industrial Engineering and Management'},
-              'SCI': {'swe': 'Skolan för Teknikvetenskap',
-                      'eng': 'School of Engineering Sciences'},
-              'CBH': {'swe': 'Skolan för Kemi, bioteknologi och hälsa',
-                      'eng': 'School of Engineering Sciences in Chemistry, Biotechnology and Health'},
-              'EECS': {'swe': 'Skolan för Elektroteknik och datavetenskap',
-                      'eng': 'School of Electrical Engineering and Computer Science'}
-              }
-
-departments_info={
-    'ABE': {
-        'ARCH': {'L2': "5851",
-                 'swe': 'Arkitektur',
-                 'eng': 'Architecture',
-                 'divisions': {'Q1a': {'L3': '5852',
-                                       'swe': 'Arkitekturens historia och teori',
-                                       'eng': 'History and Theory of Architecture'
-                                       },
-                               'Q1b': {'L3': '5853',
-                                       'swe': 'Arkitektonisk gestaltning',
-                                       'eng': 'Architectural Design'
-                                       },
-                               'Q1c': {'L3': '5854',
-                                       'swe': 'Arkitekturteknik',
-                                       'eng': 'Architectural Technologies'
-                                       },
-                               'Q1d': {'L3': '5855',
-                                       'swe': 'Kritiska studier i arkitektur',
-                                       'eng': 'Critical Studies in Architecture'
-                                       },
-                               'Q1e': {'L3': '5856',
-                                       'swe': 'Stadsbyggnad',
-                                       'eng': 'Urban Design'
-                                       },
-                               'Q1f': {'L3': '876913',
-                                       'swe': 'Ljusdesign',
-                                       'eng': 'Lighting Design'
-                                       },
-                               },
-                 },
-        'BYV':  {'L2': "5857",
-                 'swe': 'Byggvetenskap',
-                 'eng': 'Civil and Architectural Engineering',
-                 'divisions': {'betong': {'L3': '5861',
-                                          'swe': 'Betongbyggnad',
-                                          'eng': 'Concrete Structures'
-                                          },
-                               'bro-och-stalbyggnad': {'L3': '10153',
-                                                       'swe': 'Bro- och stålbyggnad',
-                                                       'eng': 'Structural Engineering and Bridges'
-                                                       },
-                               'byggteknik-och-design': {'L3': '5867',
-                                                         'swe': 'Byggteknik och design',
-                                                         'eng': 'Building Technology and Design'
-                                                         },
-                               'byggtnadseknik-och-design': {'L3': '5859',
-                                                             'swe': 'Byggnadsteknik',
-                                                             'eng': 'Building Technology'
-                                                             },
-                               'byggnadsmaterial': {'L3': '5860',
-                                                    'swe': 'Byggnadsmaterial',
-                                                    'eng': 'Building Materials'
-                                                    },
-                               'hallbara-byggnader': {'L3': '881151',
-                                                      'swe': 'Hållbara byggnader',
-                                                      'eng': 'Sustainable Buildings'
-                                                      },
-                               'jord-o-bergmekanik': {'L3': '5864',
-                                                      'swe': 'Jord- och bergmekanik',
-                                                      'eng': 'Soil and Rock Mechanics'},
-
-                                   'transportvetenskap': {'L3': '881700',
-                                                          'swe': 'Transportplanering',
-                                                          'eng': 'Transport planning'},
-                               'Q1g': {'L3': '5862',
-                                       'swe': 'Miljö- och resursinformation',
-                                       'eng': 'Environmental and Natural Resources Information System'},
-                               'Q1h': {'L3': '5865',
-                                       'swe': 'Stålbyggnad',
-                                       'eng': 'Steel Structures'},
-                               },
-                 },
-        'PHILHIST': { 'phil': {'L2': '5874',
-                               'swe': 'Filosofi',
-                               'eng': 'Philosophy'
-                               },
-                      'historia': {'L2': '14702',
-                                   'swe': 'Historiska studier av teknik, vetenskap och miljö',
-                                   'eng': 'History of Science, Technology and Environment'},
-                     },
-        'FOB': {'L2': "5869",
-                'swe': 'Fastigheter och byggande',
-                'eng': 'Real Estate and Construction Management',
-                'divisions': {'fastighetsvetenskap': {'L3': '5871',
-                                                      'swe': 'Fastighetsvetenskap',
-                                                      'eng': 'Real Estate Planning and Land Law'},
-                              'geo': {'L3': '879656',
-                                      'swe': 'Geodesi och satellitpositionering',
-                                      'eng': 'Geodesy and Satellite Positioning'},
-                              'fastighetsekonomi-och-finans': {'L3': '882950',
-                                                               'swe': 'Fastighetsekonomi och finans',
-                                                               'eng': 'Real Estate Economics and Finance'},
-                              'fastighetsforetagande-och-finansiella-system': {'L3': '882951',
-                                                                               'swe': 'Fastighetsföretagande och finansiella system',
-                                                                               'eng': 'Real Estate Business and Financial Systems'},
-                              'ledning-och-organisering-i-byggande-och-forvaltning': {'L3': '882952',
-                                                                                      'swe': 'Ledning och organisering i byggande och förvaltning',
-                                                                                      'eng': 'Construction and Facilities Management'},
-                              }
-                },
-        'SEED': { 'L2': "13604",
-                  'swe': 'Hållbar utveckling, miljövetenskap och teknik',
-                  'eng': 'Sustainable development, Environmental science and Engineering',
-                  'divisions': {
-                      'Q1ö': {'L3': '878258',
-                              'swe': 'Hållbarhet och miljöteknik',
-                              'eng': 'Sustainability and Environmental Engineering'},
-                      'hallbarhet-utvardering-och-styrning': {'L3': '878259',
-                                                              'swe': 'Hållbarhet, utvärdering och styrning',
-                                                              'eng': 'Sustainability Assessment and Management'},
-                      'strategiska-hallbarhetsstudier': {'L3': '878260',
-                                                         'swe': 'Strategiska hållbarhetsstudier',
-                                                         'eng': 'Strategic Sustainability Studies'},
-                      'vatten-och-miljoteknik': {'L3': '878261',
-                                                 'swe': 'Vatten- och miljöteknik',
-                                                 'eng': 'Water and Environmental Engineering'},
-                      'resurser-energi-och-infrastruktur': {'L3': '878262',
-                                                            'swe': 'Resurser, energi och infrastruktur',
-                                                            'eng': 'Resources, Energy and Infrastructure'},
-                  }
-                 },
-        'SOM': {'L2': "5884",
-                'swe': 'Samhällsplanering och miljö',
-                'eng': 'Urban Planning and Environment',
-                'divisions': {'urbana-studier': {'L3': '5885',
-                                                 'swe': 'Urbana och regionala studier',
-                                                 'eng': 'Urban and Regional Studies'},
-                              'gis': {'L3': '872751',
-                                      'swe': 'Geoinformatik',
-                                      'eng': 'Geoinformatics'},
-                              'sek': {'L3': '885102',
-                                      'swe': 'Transport och systemanalys',
-                                      'eng': 'Transport and Systems Analysis'},
-                              }
-                }
-    },
-    'ITM': {
-        'EGI': {'L2': "6024",
-                'swe': 'Energiteknik',
-                'eng': 'Energy Technology',
-                'divisions': {'Energisystem': {'L3': '883952',
-                                               'swe': 'Energisystem',
-                                               'eng': 'Energy Systems'},
-                              'heat-and-power-technology': {'L3': '6026',
-                                                            'swe': 'Kraft- och värmeteknologi',
-                                                            'eng': 'Heat and Power Technology'},
-                              'applied-thermodynamics': {'L3': '6025',
-                                                         'swe': 'Tillämpad termodynamik och kylteknik',
-                                                         'eng': 'Applied Thermodynamics and Refrigeration'},
-                              }
-                },
-        'INDEK': {'L2': "6030",
-                  'swe': 'Industriell ekonomi och organisation (Inst.)',
-                  'eng': 'Industrial Economics and Management (Dept.)',
-                  'divisions': {
-                      'MT': {'L3': '883956',
-                             'swe': 'Management & Teknologi',
-                             'eng': 'Management & Technology'},
-                      'SIDE': {'L3': '883957',
-                               'swe': 'Hållbarhet, Industriell dynamik & entreprenörskap',
-                               'eng': 'Sustainability, Industrial Dynamics & Entrepreneurship'},
-                      'AFC': {'L3': '883958',
-                              'swe': 'Redovisning, Finansiering & Förändring',
-                              'eng': 'Accounting, Finance & Changes'},
-                  }
-                  },
-        'Learning': {'L2': "879306",
-                     'swe': 'Lärande',
-                     'eng': 'Learning',
-                     'divisions': {'DL': {'L3': '883959',
-                                          'swe': 'Digitalt lärande"',
-                                          'eng': 'Digital Learning'},
-                                   'STEM': {'L3': '883960',
-                                            'swe': 'Lärande i Stem',
-                                            'eng': 'Learning in Stem'},
-                                   'sprak': {'L3': '883961',
-                                             'swe': 'Språk och kommunikation',
-                                             'eng': 'Language and communication'},
-                                   'VH': {'L3': '883962', # # this is a center
-                                          'swe': 'Vetenskapens hus',
-                                          'eng': 'House of Science'},
-                                   }
-                     },
-        'MMK': {'L2': "6038",
-                'swe': 'Maskinkonstruktion (Inst.)',
-                'eng': 'Machine Design (Dept.)',
-                'divisions': {'Q1i': {'L3': '6039',
-                                      'swe': 'Integrerad produktutveckling',
-                                      'eng': 'Integrated Product Development'},
-                              'Förbränningsmotorteknik': {'L3': '6040',
-                                                          'swe': 'Förbränningsmotorteknik',
-                                                          'eng': 'Internal Combustion Engines'},
-                              'mechatronics': {'L3': '6041',
-                                               'swe': 'Mekatronik',
-                                               'eng': 'Mechatronics'},
-                              'SKD': {'L3': '-1', # does not have a LADOK code 
-                                      'swe': 'System- och komponentdesign',
-                                      'eng': 'Systems and Component Design'},
-                              'Tribologi': {'L3': '6047',
-                                            'swe': 'Tribologi',
-                                            'eng': 'Tribologi'},
-                              'machine-elements': {'L3': '6043',
-                                                   'swe': 'Maskinelement',
-                                                   'eng': 'Machine Elements'},
-                              'Q1j': {'L3': '6042',
-                                      'swe': 'Inbyggda styrsystem',
-                                      'eng': 'Embedded Control Systems'},
-
-                                   'Q1k': {'L3': '6044',
-                                           'swe': 'Maskinkonstruktion (Avd.)',
-                                           'eng': 'Machine Design (Div.)'},
-                              'Q1l': {'L3': '6045',
-                                      'swe': 'Produktinnovationsteknik',
-                                      'eng': 'Product Innovation Technology'},
-                              'Q1m': {'L3': '6046',
-                                      'swe': 'Produkt- och tjänstedesign',
-                                      'eng': 'Product and Service Design'},
-                              }
-                },
-        'MSE': {'L2': '6048',
-                'swe': 'Materialvetenskap',
-                'eng': 'Materials Science and Engineering',
-                'divisions': {'process': {'L3': '883963',
-                                          'swe': 'Processer',
-                                          'eng': 'Process'},
-                              'structures': {'L3': '883964',
-                                             'swe': 'Strukturer',
-                                             'eng': 'Structures'},
-                              'properties': {'L3': '883965',
-                                             'swe': 'Egenskaper',
-                                             'eng': 'Properties'},
-                              }
-                },
-        'IIP': {'L2': '6061',
-                'swe': 'Industriell produktion',
-                'eng': 'Production Engineering',
-                'divisions': {'Q1n': {'L3': '883600',
-                                      'swe': 'Tillverkning och mätsystem',
-                                      'eng': 'Manufacturing and Metrology Systems'},
-                              'Q1o': {'L3': '883601',
-                                      'swe': 'Hållbara produktionssystem',
-                                      'eng': 'Sustainable Production Systems'},
-                              'Q1p': {'L3': '883608',
-                                      'swe': 'Digital smart produktion',
-                                      'eng': 'Digital Smart Production'},
-                              }
-                },
-        'HPU': {'L2': '880900',
-                'swe': 'Hållbar produktionsutveckling (ML)',
-                'eng': 'Sustainable production development',
-                'divisions': {'Production Management': {'L3': '883953',
-                                                        'swe': 'Processledning och hållbar produktion',
-                                                        'eng': 'Process management and sustainable production'},
-                              'Production Logistics': {'L3': '883955',
-                                                       'swe': 'Avancerad underhållsteknik och produktionslogistik',
-                                                       'eng': 'Advanced maintenance technology and production logistics'},
-                              # Industrial Dependability
-                        }
-                }
-    },
-    'SCI': {
-        'Fysik': {'L2': '6128',
-                  'swe': 'Fysik',
-                  'eng': 'Physics',
-                  'divisions': {'Q1q': {'L3': '6129',
-                                        'swe': 'Atom- och molekylfysik',
-                                        'eng': 'Atomic and Molecular Physics'},
-                                'MI': {'L3': '6130',
-                                       'swe': 'Medicinsk bildfysik',
-                                       'eng': 'Physics of Medical Imaging'},
-                                'nuclear': {'L3': '6131',
-                                            'swe': 'Kärnfysik',
-                                            'eng': 'Nuclear Physics'},
-                                'NPS': {'L3': '6132',
-                                        'swe': 'Kärnkraftssäkerhet',
-                                        'eng': 'Nuclear Power Safety'},
-                                'particle': {'L3': '6133',
-                                             'swe': 'Partikel- och astropartikelfysik',
-                                             'eng': 'Particle and Astroparticle Physics'},
-                                'condensed': {'L3': '876906',
-                                              'swe': 'Kondenserade materiens teori',
-                                              'eng': 'Condensed Matter Theory'},
-                                'Q1r': {'L3': '876907',
-                                        'swe': 'Matematisk fysik',
-                                        'eng': 'Mathematical Physics'},
-                                'Q1s': {'L3': '876908',
-                                        'swe': 'Materialteori',
-                                        'eng': 'Theory of Materials'},
-                                'Q1t': {'L3': '876909',
-                                        'swe': 'Statistisk fysik',
-                                        'eng': 'Statistical Physics'},
-                                'Q1u': {'L3': '876910',
-                                        'swe': 'Teoretisk biologisk fysik',
-                                        'eng': 'Theoretical Biological Physics'},
-                                'Q1v': {'L3': '876911',
-                                        'swe': 'Teoretisk partikelfysik',
-                                        'eng': 'Theoretical Particle Physics'},
-                                'NE': {'L3': '880050',
-                                       'swe': 'Kärnenergiteknik',
-                                       'eng': 'Nuclear Engineering'},
-                                'Q1w': {'L3': '880100',
-                                        'swe': 'Reaktorfysik och teknologi',
-                                        'eng': 'Reactor physics and technology'},
-                                }
-                  },
-        'MATH': {'L2': "6115",
-                 'swe': 'Matematik (Inst.)',
-                 'eng': 'Mathematics (Dept.)',
-                 'divisions': {'math': {'L3': '6116',
-                                        'swe': 'Matematik (Avd.)',
-                                        'eng': 'Mathematics (Div.)'},
-                               'mathstat': {'L3': '6117',
-                                            'swe': 'Matematisk statistik',
-                                            'eng': 'Mathematical Statistics'},
-                               'optsys': {'L3': '6118',
-                                          'swe': 'Optimeringslära och systemteori',
-                                          'eng': 'Optimization and Systems Theory'},
-                               'NA': {'L3': '11800',
-                                      'swe': 'Numerisk analys',
-                                      'eng': 'Numerical Analysis'},
-                               }
-                 },
-        'Mekanik': {'L2': '6119',
-                    'swe': 'Mekanik',
-                    'eng': 'Mechanics'
-                    },
-        'TEKMEK': { 'L2': "882656",
-                    'swe': 'Teknisk mekanik',
-                    'eng': 'Engineering Mechanics',
-                    'divisions': {'Farkostteknik och Solidmekanik': {'L3': "882657",
-                                                                     'swe': 'Farkostteknik och Solidmekanik',
-                                                                     'eng': 'Vehicle Engineering and Solid Mechanics'},
-                                  'Strömningsmekanik och Teknisk Akustik': {'L3': '882658',
-                                                                            'swe': 'Strömningsmekanik och Teknisk Akustik',
-                                                                            'eng': 'Fluid Mechanics and Engineering Acoustics'},
-                                  }
-                   },
-        'APHYS': {'L2': '6108',
-                  'swe': 'Tillämpad fysik',
-                  'eng': 'Applied Physics',
-                  'divisions': {'biox': {'L3': '6109',
-                                         'swe': 'Biomedicinsk fysik och röntgenfysik',
-                                         'eng': 'Biomedical and X-ray Physics'},
-                                'laserphysics': {'L3': '6112',
-                                                 'swe': 'Laserfysik',
-                                                 'eng': 'Laser Physics'},
-                                'nanophysics': {'L3': '6113',
-                                                'swe': 'Nanostrukturfysik',
-                                                'eng': 'Nanostructure Physics'},
-                                'qeo': {'L3': '880051',
-                                        'swe': 'Kvant- och biofotonik',
-                                        'eng': 'Quantum and Biophotonics'},
-                                'mnp': {'L3': '880052',
-                                        'swe': 'Material- och nanofysik',
-                                        'eng': 'Materials and Nanophysics'},
-                                'photonics': {'L3': '880053',
-                                              'swe': 'Fotonik',
-                                              'eng': 'Photonics'},
-                                'biophysics': {'L3': '880054',
-                                               'swe': 'Biofysik',
-                                               'eng': 'Biophysics'},
-                                }
-                  }
-    },
-    'CBH': {
-        'MTH': {'L2': "879308",
-                'swe': 'Medicinteknik och hälsosystem',
-                'eng': 'Biomedical Engineering and Health Systems',
-                'divisions': {'biomedical-imaging': {'L3': '879320',
-                                                     'swe': 'Medicinsk avbildning',
-                                                     'eng': 'Medical Imaging'},
-                              'ergonomi': {'L3': '879322',
-                                           'swe': 'Ergonomi',
-                                           'eng': 'Ergonomics'},
-                              'grundlaggande-naturv': {'L3': '879323',
-                                                       'swe': 'Grundläggande naturvetenskap',
-                                                       'eng': 'Basic Science'},
-                              'health-informatics': {'L3': '880401',
-                                                     'swe': 'Hälsoinformatik och logistik',
-                                                     'eng': 'Health Informatics and Logistics'},
-                              'Q1x': {'L3': '880402',
-                                      'swe': 'Människa och Kommunikation',
-                                      'eng': 'Human Communication Science'},
-                              'teknisk-vardvetenska': {'L3': '880403',
-                                                       'swe': 'Teknisk vårdvetenskap',
-                                                       'eng': 'Technology in Health Care'},
-                              'omgivningsfysiologi': {'L3': '879317',
-                                                      'swe': 'Omgivningsfysiologi',
-                                                      'eng': 'Environmental Physiology'},
-                              'neuronik': {'L3': '879318',
-                                           'swe': 'Neuronik',
-                                           'eng': 'Neuronic Engineering'},
-                              '': {'L3': '879319',
-                                   'swe': 'Strukturell bioteknik',
-                                   'eng': 'Structural Biotechnology'},
-                              }
-                },
-        'CHE': {'L2': "879316",
-                'swe': 'Kemi',
-                'eng': 'Chemistry',
-                'divisions': {'orgkem': {'L3': '879324',
-                                         'swe': 'Organisk kemi',
-                                         'eng': 'Organic chemistry'},
-                              'glykovetenskap': {'L3': '879326',
-                                                 'swe': 'Glykovetenskap',
-                                                 'eng': 'Glycoscience'},
-                              'tfk': {'L3': '879359',
-                                      'swe': 'Tillämpad fysikalisk kemi',
-                                      'eng': 'Applied Physical Chemistry'},
-                              '': {'L3': '879325',
-                                   'swe': 'Yt- och korrosionsvetenskap',
-                                   'eng': 'Surface and Corrosion Science'},
-                              }
-                },
-        'KET': {'L2': "879314",
-                'swe': 'Kemiteknik',
-                'eng': 'Chemical Engineering',
-                'divisions': {'energy-processes': {'L3': '879328',
-                                                   'swe': 'Energiprocesser',
-                                                   'eng': 'Energy Processes'},
-                              'resource-recovery': {'L3': '879331',
-                                                    'swe': 'Resursåtervinning',
-                                                    'eng': 'Resource recovery'},
-                              'electrochem': {'L3': '879332',
-                                              'swe': 'Tillämpad elektrokemi',
-                                              'eng': 'Applied Electrochemistry'},
-                              'nuclear': {'L3': '-2',
-                                          'swe': 'Kärnavfallsteknik',
-                                          'eng': 'Nuclear Waste Engineering'},
-                              'Q1y': {'L3': '879327',
-                                      'swe': 'Kemisk apparatteknik',
-                                      'eng': 'Chemical Engineering'},
-                              'Q1z': {'L3': '879333',
-                                      'swe': 'Teknisk strömningslära',
-                                      'eng': 'Transport Phenomena'},
-                              'Q1å': {'L3': '879334',
-                                      'swe': 'Processteknologi',
-                                      'eng': 'Process Technology'},
-                              'Q1ä': {'L3': '879650',
-                                      'swe': 'Kemisk teknologi',
-                                      'eng': 'Chemical Technology'},
-                              }
-                },
-        'FPT': {'L2': "879315",
-                'swe': 'Fiber- och polymerteknologi',
-                'eng': 'Fibre- and Polymer Technology',
-                'divisions': {
-                    '': {'L3': '879336',
-                         'swe': 'Polymerteknologi',
-                         'eng': 'Polymer Technology'},
-                    '': {'L3': '879337',
-                         'swe': 'Polymera material',
-                         'eng': 'Polymeric Materials'},
-                    '': {'L3': '879338',
-                         'swe': 'Ytbehandlingsteknik',
-                         'eng': 'Coating Technology'},
-                    '': {'L3': '879339',
-                         'swe': 'Träkemi och massateknologi',
-                         'eng': 'Wood Chemistry and Pulp Technology'},
-                    '': {'L3': '879340',
-                         'swe': 'Fiberteknologi',
-                         'eng': 'Fibre Technology'},
-                    '': {'L3': '879341',
-                         'swe': 'Biokompositer',
-                         'eng': 'Biocomposites'},
-                }
-                },
-        'GTE': {'L2': '879312',
-                'swe': 'Genteknologi',
-                'eng': 'Gene Technology',
-                },
-        'DIB': {'L2': '879311',
-                'swe': 'Industriell bioteknologi',
-                'eng': 'Industrial Biotechnology'
-                },
-        'IIP': {'L2': '879311',
-                'swe': 'Industriell bioteknologi',
-                'eng': 'Industrial Biotechnology'
-                },
-        'PRO': {'L2': "879309",
-                'swe': 'Proteinvetenskap',
-                'eng': 'Protein Science',
-                'divisions': {'nanobio': {'L3': '879342',
-                                          'swe': 'Nanobioteknologi',
-                                          'eng': 'Nano Biotechnology'},
-                              'sysbio': {'L3': '879343',
-                                         'swe': 'Systembiologi',
-                                         'eng': 'Systems Biology'},
-                              'cellular-proteomics': {'L3': '879344',
-                                                      'swe': 'Cellulär och klinisk proteomik',
-                                                      'eng': 'Cellular and Clinical Proteomics'},
-                              'affinity-proteomics': {'L3': '879345',
-                                                      'swe': 'Affinitets-proteomik',
-                                                      'eng': 'Affinity Proteomics'},
-                              'prot-tech': {'L3': '879346',
-                                            'swe': 'Proteinteknologi',
-                                            'eng': 'Protein Technology'},
-                              'proteineng': {'L3': '879347',
-                                             'swe': 'Proteinvetenskap',
-                                             'eng': 'Protein Engineering'},
-                              'drug-discovery': {'L3': '879348',
-                                                 'swe': 'Läkemedelsutveckling',
-                                                 'eng': 'Drug Discovery and Development'},
-                              }
-                },
-        'TCB': {'L2': '879310',
-                'swe': 'Teoretisk kemi och biologi',
-                'eng': 'Theoretical Chemistry and Biology',
-                'divisions': {
-
-                        }
-                }
-    },
-    'EECS': {
-        'CS': { 'L2': "882650",
-                'swe': 'Datavetenskap',
-                'eng': 'Computer Science',
-                'divisions': {'CoS': {'L3': '879305',
-                                      'swe': 'Kommunikationssystem',
-                                      'eng': 'Communication Systems'
-                                      },
-                              'CST': {'L3': '879225',
-                                      'swe': 'Beräkningsvetenskap och beräkningsteknik',
-                                      'eng': 'Computational Science and Technology'
-                                      },
-                              'NSE': {'L3': '879231',
-                                      'swe': 'Nätverk och systemteknik',
-                                      'eng': 'Network and Systems Engineering'
-                                      },
-                              'SCS': {'L3': '879232',
-                                      'swe': 'Programvaruteknik och datorsystem',
-                                      'eng': 'Software and Computer systems'
-                                      },
-                              'TCS': {'L3': '879237',
-                                      'swe': 'Teoretisk datalogi',
-                                      'eng': 'Theoretical Computer Science'
-                                      },
-                              }
-               },
-        'EE': {'L2': '882654',
-               'swe': 'Elektroteknik',
-               'eng': 'Electrical Engineering',
-               'divisions': {'EME': {'L3': '879226',
-                                     'swe': 'Elektroteknisk teori och konstruktion',
-                                     'eng': 'Electromagnetic Engineering'
-                                     },
-                             'EPE': {'L3': '879227',
-                                     'swe': 'Elkraftteknik',
-                                     'eng': 'Electric Power and Energy Systems'
-                                     },
-                             'EES': {'L3': '879249',
-                                     'swe': 'Elektronik och inbyggda system',
-                                     'eng': 'Electronics and Embedded systems'},
-                             'FPP': {'L3': '879228',
-                                     'swe': 'Fusionsplasmafysik',
-                                     'eng': 'Fusion Plasma Physics'
-                                     },
-                             'SPP': {'L3': '879235',
-                                     'swe': 'Rymd- och plasmafysik',
-                                     'eng': 'Space and Plasma Physics'
-                                     },
-
-                                 }
-               },
-        'IS':  {'L2': '882651',
-                'swe': 'Intelligenta system',
-                'eng': "Intelligent systems",
-                'divisions': {'MNS': {'L3': '879230',
-                                      'swe': 'Mikro- och nanosystemteknik',
-                                      'eng': 'Micro and Nanosystems'
-                                      },
-                              'AC': {'L3': '879233',
-                                     'swe': 'Reglerteknik',
-                                     'eng': 'Decision and Control Systems (Automatic Control)'
-                                     },
-                              'RPL': {'L3': '879234',
-                                      'swe': 'Robotik, perception och lärande',
-                                      'eng': 'Robotics, Perception and Learning'
-                                      },
-                              'ISE': {'L3': '879236',
-                                      'swe': 'Teknisk informationsvetenskap',
-                                      'eng': 'Information Science and Engineering'
-                                      },
-                              'TMH': {'L3': '879302',
-                                      'swe': 'Tal, musik och hörsel',
-                                      'eng': 'Speech, Music and Hearing'
-                                      },
-                              'CAS': {'L3': '882655',
-                                      'swe': 'Collaborative Autonomous Systems',
-                                      'eng': 'Collaborative Autonomous Systems'
-                                      },
-                              }
-                },
-        'HCT': {'L2': '882653',
-                'swe': 'Människocentrerad teknologi',
-                'eng': 'Human Centered Technology',
-                'divisions': {'MID': {'L3': '879229',
-                                      'swe': 'Medieteknik och interaktionsdesign',
-                                      'eng': 'Media Technology and Interaction Design'
-                                      }
-                              },
-                },
-
-        }
-}
-
-# the first argument is the acronym of the school, while the seconds is a string name of a department
-def departments_acronym(l1, s2):
-    for d in departments_info[l1]:
-        if s2 == departments_info[l1][d]['swe'] or s2 == departments_info[l1][d]['eng']:
-            return d
-    return None
-
-def acronym_from_org_id(key):
-    # convert numeric values ot strings for the later lookup
-    if isinstance(key, int):
-        key="{}".format(key)
-    #
-    # look for an L2 org_id
-    for school in departments_info:
-        for dept in departments_info[school]:
-            l2=departments_info[school][dept].get('L2')
-            if l2 == key:
-                return dept
-    #
-    for school in departments_info:
-        for dept in departments_info[school]:
-            if departments_info[school][dept].get('divisions'):
-                for division in departments_info[school][dept]['divisions']:
-                    l3=departments_info[school][dept]['divisions'][division].get('L3')
-                    if l3 == key:
-                        return division
-    return None
-
-
 #----------------------------------------------------------------------
 
 # The following are for dealing with the data from DiVA
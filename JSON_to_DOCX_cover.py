@@ -25,6 +25,11 @@
 #  --title TITLE         title of thesis
 #  --subtitle SUBTITLE   subtitle of thesis
 #  --year YEAR           year
+#  -b BATCH, --batch BATCH
+#                        directory of JSON files or a JSONL file (- for stdin) with one JSON object per cover
+#  --jobs JOBS           number of processes to use for making the covers in batch mode
+#  -o OUTPUT_DIR, --output_dir OUTPUT_DIR
+#                        directory for the covers made in batch mode
 #
 # Note that in the case of a combined Civing. and Master's,
 # the AREA is the field of technology, while AREA2 is the main subject
@@ -57,6 +62,14 @@
 # specify TRITA number
 #./JSON_to_DOCX_cover.py --file  Omslag_Exjobb_Eng_en-20220325.docx --exam kandidatexamen --json final.json --trita "TRITA-EECS-EX-2022:99999"
 #
+# make a cover for each of the JSON files in a directory (or each line of a JSONL file) using 8 processes
+# ./JSON_to_DOCX_cover.py --file  Omslag_Exjobb_Eng_en-20220325.docx --batch theses_directory --jobs 8 --output_dir covers
+#   produces covers/<name of JSON file>-<exam>-<language>.docx for each thesis
+#
+# The template is only read once and its word/document.xml is split into static chunks and the named slots
+# (see cover_slots) that are filled in for each cover. The other files in the DOCX file are written out as they are
+# in the template, i.e., without being decompressed and recompressed.
+#
 # Notes:
 #    Only limited testing - this is a program still under development
 #
@@ -87,6 +100,10 @@ from dateutil.tz import tzlocal
 
 # for dealing with the DOCX file - which is a ZIP file
 import zipfile
+import docx_rewriter            # to write out the unchanged files in the DOCX file without recompressing them
+
+# for making many covers in parallel
+from concurrent.futures import ProcessPoolExecutor
 
 try:
     import zlib
@@ -98,6 +115,8 @@ modes = { zipfile.ZIP_DEFLATED: 'deflated',
           zipfile.ZIP_STORED:   'stored',
           }
 
+word_document_file_name='word/document.xml'
+
 # If one uses fields, marking the first field as dirty will cause the document to prompt the user to update the fields
 def mark_first_field_as_dirty(content):
     # <w:fldChar w:fldCharType="begin" w:dirty="true"/>
@@ -117,36 +136,123 @@ def mark_first_field_as_dirty(content):
 # <w:placeholder><w:docPart w:val="3B317945923C481B9F5903B92E839E1E"/></w:placeholder><w:showingPlcHdr/>
 # <w:placeholder><w:docPart w:val="276F62D9284D4835BE181771EADBAE35"/></w:placeholder><w:showingPlcHdr/>
 # This placeholder text means that you cannot turn off Developer->Dsign mode if you turn it on
-def removed_unneded_placeholder_text(content):
-    start_marker_1='<w:placeholder><w:docPart w:val="5754E78FAA3547E690B6F86ACE31506E"/></w:placeholder><w:showingPlcHdr/>'
-    start_offset_1=content.find(start_marker_1)
-    if start_offset_1 > 0:
-        prefix=content[:start_offset_1]
-        postfix=content[(start_offset_1+len(start_marker_1)):]
-        content=prefix + postfix
-
-    start_marker_1='<w:placeholder><w:docPart w:val="C14E00FD463348788D1BB7328469EF1C"/></w:placeholder><w:showingPlcHdr/>'
-    start_offset_1=content.find(start_marker_1)
-    if start_offset_1 > 0:
-        prefix=content[:start_offset_1]
-        postfix=content[(start_offset_1+len(start_marker_1)):]
-        content=prefix + postfix
-
-    start_marker_1='<w:placeholder><w:docPart w:val="3B317945923C481B9F5903B92E839E1E"/></w:placeholder><w:showingPlcHdr/>'
-    start_offset_1=content.find(start_marker_1)
-    if start_offset_1 > 0:
-        prefix=content[:start_offset_1]
-        postfix=content[(start_offset_1+len(start_marker_1)):]
-        content=prefix + postfix
-
-    start_marker_1='<w:placeholder><w:docPart w:val="276F62D9284D4835BE181771EADBAE35"/></w:placeholder><w:showingPlcHdr/>'
-    start_offset_1=content.find(start_marker_1)
-    if start_offset_1 > 0:
-        prefix=content[:start_offset_1]
-        postfix=content[(start_offset_1+len(start_marker_1)):]
-        content=prefix + postfix
-
-    return content
+unneeded_placeholder_texts=['<w:placeholder><w:docPart w:val="5754E78FAA3547E690B6F86ACE31506E"/></w:placeholder><w:showingPlcHdr/>',
+                            '<w:placeholder><w:docPart w:val="C14E00FD463348788D1BB7328469EF1C"/></w:placeholder><w:showingPlcHdr/>',
+                            '<w:placeholder><w:docPart w:val="3B317945923C481B9F5903B92E839E1E"/></w:placeholder><w:showingPlcHdr/>',
+                            '<w:placeholder><w:docPart w:val="276F62D9284D4835BE181771EADBAE35"/></w:placeholder><w:showingPlcHdr/>'
+                            ]
+
+# The XML in the template's word/document.xml that is replaced (or removed) when making a cover
+unnecessary_bookmark='<w:bookmarkStart w:id="0" w:name="_GoBack"/><w:bookmarkEnd w:id="0"/>'
+
+# the optional picture is everything after the start marker up to and including the end marker
+picture_start_marker='<w:pStyle w:val="Frfattare"/><w:spacing w:before="680"/><w:ind w:left="-658"/><w:jc w:val="center"/></w:pPr>'
+picture_end_marker='</w:sdt>'
+
+sweden_xml='<w:lang w:val="en-US"/></w:rPr><w:t>Sweden</w:t>'
+sverige_xml='<w:lang w:val="sv-SE"/></w:rPr><w:t>Sverige</w:t>'
+
+english_KTH_logo='<w:r w:rsidRPr="00A15578"><w:rPr><w:noProof/><w:lang w:val="en-US"/></w:rPr><w:drawing><wp:anchor distT="0" distB="0" distL="114300" distR="114300" simplePos="0" relativeHeight="251667456" behindDoc="1" locked="0" layoutInCell="1" allowOverlap="1" wp14:anchorId="6EB69F10" wp14:editId="7BEE6404"><wp:simplePos x="0" y="0"/><wp:positionH relativeFrom="leftMargin"><wp:posOffset>5736178</wp:posOffset></wp:positionH><wp:positionV relativeFrom="topMargin"><wp:posOffset>417830</wp:posOffset></wp:positionV><wp:extent cx="1331595" cy="240665"/><wp:effectExtent l="0" t="0" r="1905" b="6985"/><wp:wrapNone/><wp:docPr id="3" name="Bildobjekt 3" descr="English logotype for KTH Royal Institute of Technology."/><wp:cNvGraphicFramePr><a:graphicFrameLocks xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" noChangeAspect="1"/></wp:cNvGraphicFramePr><a:graphic xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"><a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/picture"><pic:pic xmlns:pic="http://schemas.openxmlformats.org/drawingml/2006/picture"><pic:nvPicPr><pic:cNvPr id="3" name="Bildobjekt 3" descr="English logotype for KTH Royal Institute of Technology."/><pic:cNvPicPr/></pic:nvPicPr><pic:blipFill><a:blip r:embed="rId8" cstate="print"><a:extLst><a:ext uri="{28A0092B-C50C-407E-A947-70E740481C1C}"><a14:useLocalDpi xmlns:a14="http://schemas.microsoft.com/office/drawing/2010/main" val="0"/></a:ext></a:extLst></a:blip><a:stretch><a:fillRect/></a:stretch></pic:blipFill><pic:spPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="1331595" cy="240665"/></a:xfrm><a:prstGeom prst="rect"><a:avLst/></a:prstGeom></pic:spPr></pic:pic></a:graphicData></a:graphic><wp14:sizeRelH relativeFrom="page"><wp14:pctWidth>0</wp14:pctWidth></wp14:sizeRelH><wp14:sizeRelV relativeFrom="page"><wp14:pctHeight>0</wp14:pctHeight></wp14:sizeRelV></wp:anchor></w:drawing></w:r>'
+
+# The subject, cycle, and credits are set using Normal with a style of Arial 12pt
+subject_line_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter your subject area. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>Degree P</w:t></w:r><w:r w:rsidR="00A15578" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>roject in Information and Communication Technology</w:t></w:r><w:r w:rsidR="001D0C1B" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve"> </w:t>'
+leveL_points_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter first or second cycle and credits. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>First cycle 15 credits</w:t>'
+
+# Titel style is Arial 26pt
+title_xml='<w:pStyle w:val="Titel"/><w:spacing w:before="800"/></w:pPr><w:r w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t>Click here to enter your title</w:t></w:r></w:p>'
+
+# the whole subtitle (used when there is no subtitle) and the part of it that is replaced by the subtitle
+complete_subtitle_xml='<w:sdt><w:sdtPr><w:id w:val="-1971594218"/><w:placeholder><w:docPart w:val="4BAA847A82F14FE19642931C4B768D6D"/></w:placeholder><w:showingPlcHdr/></w:sdtPr><w:sdtEndPr/><w:sdtContent><w:p w:rsidR="00FF3FD9" w:rsidRPr="00A15578" w:rsidRDefault="00A15578" w:rsidP="00480A58"><w:pPr><w:pStyle w:val="Subtitle"/><w:spacing w:before="120"/></w:pPr><w:r w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter your </w:t></w:r><w:r><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t>sub</w:t></w:r><w:r w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t>title</w:t></w:r></w:p></w:sdtContent></w:sdt>'
+# Subtitle style is Arial 16pt
+subtitle_xml='w:val="Subtitle"/><w:spacing w:before="120"/></w:pPr><w:r w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter your </w:t></w:r><w:r><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t>sub</w:t></w:r><w:r w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t>title</w:t></w:r></w:p>'
+
+# Författare style is Arial 12pt
+author_xml='w:val="Frfattare"/><w:spacing w:before="560" w:after="120"/></w:pPr><w:r w:rsidRPr="00217644"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t>Click here to enter the name of the author (first and last name)</w:t></w:r></w:p>'
+
+year_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/><w:lang w:val="en-US"/></w:rPr><w:t>Click here to enter year</w:t></w:r>'
+
+# TRITA-nummer style is Arial 10pt
+trita_xml='<w:txbxContent><w:sdt><w:sdtPr><w:rPr><w:color w:val="1954A6" w:themeColor="accent1"/><w:sz w:val="16"/><w:lang w:val="pt-PT"/></w:rPr><w:id w:val="1624419607"/><w:lock w:val="contentLocked"/><w:placeholder><w:docPart w:val="19756925D2BC4334B77C3F3B8E579DA9"/></w:placeholder><w:group/></w:sdtPr><w:sdtEndPr><w:rPr><w:rStyle w:val="Hyperlink"/><w:lang w:val="en-GB"/></w:rPr></w:sdtEndPr><w:sdtContent><w:p w:rsidR="00C1097E" w:rsidRPr="00E014A5" w:rsidRDefault="00C1097E" w:rsidP="00C1097E"><w:pPr><w:pStyle w:val="TRITA-nummer"/><w:rPr><w:lang w:val="pt-PT"/></w:rPr></w:pPr><w:r w:rsidRPr="00E014A5"><w:rPr><w:lang w:val="pt-PT"/></w:rPr><w:t xml:space="preserve">TRITA – </w:t></w:r><w:sdt><w:sdtPr><w:id w:val="-246959913"/><w:showingPlcHdr/></w:sdtPr><w:sdtEndPr/><w:sdtContent><w:r w:rsidR="005C767E" w:rsidRPr="00637386"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t>XXX-XXX 20XX</w:t></w:r><w:r w:rsidR="00BF2CC2" w:rsidRPr="00637386"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t>:XX</w:t></w:r></w:sdtContent></w:sdt></w:p><w:p w:rsidR="00C1097E" w:rsidRPr="00637386" w:rsidRDefault="00937C6C" w:rsidP="00C1097E"><w:pPr><w:pStyle w:val="Webbadress"/><w:spacing w:before="360"/><w:rPr><w:lang w:val="pt-PT"/></w:rPr></w:pPr><w:hyperlink r:id="rId11" w:history="1"><w:r w:rsidR="00C1097E" w:rsidRPr="00BA595B"><w:rPr><w:rStyle w:val="Hyperlink"/></w:rPr><w:t>www.kth.se</w:t></w:r></w:hyperlink></w:p></w:sdtContent></w:sdt></w:txbxContent>'
+
+# The slots of a cover, i.e., the places in word/document.xml that are filled in for each cover.
+# For each slot: its name, the XML in the template, and whether only its first occurrence is a slot.
+# Note that 'complete_subtitle' contains the XML of 'subtitle', so the longer one has to come first.
+cover_slots=[('bookmark',          unnecessary_bookmark,  False),
+             ('sweden',            sweden_xml,            False),
+             ('english_KTH_logo',  english_KTH_logo,      False),
+             ('subject_line',      subject_line_xml,      True),
+             ('level_points',      leveL_points_xml,      True),
+             ('title',             title_xml,             False),
+             ('complete_subtitle', complete_subtitle_xml, False),
+             ('subtitle',          subtitle_xml,          False),
+             ('author',            author_xml,            False),
+             ('year',              year_xml,              False),
+             ('trita',             trita_xml,             False)
+             ] + [('unneeded_placeholder_{}'.format(i), t, True) for i, t in enumerate(unneeded_placeholder_texts)]
+
+cover_slot_pattern=re.compile('|'.join(['(?P<slot{0}>{1})'.format(i, re.escape(xml)) for i, (name, xml, first_only) in enumerate(cover_slots)]))
+
+# Split the template's word/document.xml into a list of chunks, each chunk is a tuple (slot_name, text),
+# where slot_name is None for the static text. The optional picture is the slot named 'picture'.
+def compile_document_xml(content):
+    chunks=[]
+    picture_start=-1
+    picture_end=-1
+    start_offset=content.find(picture_start_marker)
+    if start_offset > 0:
+        end_offset=content.find(picture_end_marker, start_offset+len(picture_start_marker))
+        if end_offset > 0:
+            picture_start=start_offset+len(picture_start_marker)
+            picture_end=end_offset+len(picture_end_marker)
+
+    seen=set()
+    position=0
+    m=cover_slot_pattern.search(content, position)
+    while True:
+        if picture_start >= position and (m is None or m.start() >= picture_start):
+            chunks.append((None, content[position:picture_start]))
+            chunks.append(('picture', content[picture_start:picture_end]))
+            position=picture_end
+            picture_start=-1
+            m=cover_slot_pattern.search(content, position)
+            continue
+        if m is None:
+            break
+        name, xml, first_only = cover_slots[int(m.lastgroup[len('slot'):])]
+        if first_only and name in seen:
+            m=cover_slot_pattern.search(content, m.end())
+            continue
+        seen.add(name)
+        chunks.append((None, content[position:m.start()]))
+        chunks.append((name, m.group(0)))
+        position=m.end()
+        m=cover_slot_pattern.search(content, position)
+    chunks.append((None, content[position:]))
+    return chunks
+
+# values is a dict of slot name to the new XML for the slot, slots without a value keep the XML of the template
+def render_document_xml(chunks, values):
+    return ''.join([text if name is None else values.get(name, text) for name, text in chunks])
+
+# A DOCX template that is read and compiled once and then used to make any number of covers.
+# The other files in the DOCX file are kept in their compressed form and written out as is.
+class CoverTemplate:
+    def __init__(self, template_filename):
+        self.template_filename=template_filename
+        self.members=docx_rewriter.read_members_raw(template_filename)
+        with zipfile.ZipFile(template_filename) as document:
+            self.chunks=compile_document_xml(document.read(word_document_file_name).decode('utf-8'))
+
+    def render(self, values):
+        return render_document_xml(self.chunks, values)
+
+    def write(self, output_filename, values):
+        with zipfile.ZipFile(output_filename, 'w') as zipOut:
+            for info, raw_data in self.members:
+                if info.filename == word_document_file_name:
+                    zipOut.writestr(info.filename, self.render(values), compress_type=compression)
+                else:
+                    docx_rewriter.write_member_raw(zipOut, info, raw_data)
 
 
 # the numeric value is the cycle
@@ -169,37 +275,27 @@ def format_credits(credits, language):
     return cred
 
 
-def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture):
+# Returns the values of the slots of the cover (see cover_slots) for a thesis
+def cover_values(dict_of_entries, exam, language, cycle, keep_picture):
     global Verbose_Flag
 
+    values=dict()
+
     # remove unnecessary bookmark
-    unnecessary_bookmark='<w:bookmarkStart w:id="0" w:name="_GoBack"/><w:bookmarkEnd w:id="0"/>'
-    content=content.replace(unnecessary_bookmark, '')
+    values['bookmark']=''
 
     # remove optional picture
     if not keep_picture:
-        start_marker_1='<w:pStyle w:val="Frfattare"/><w:spacing w:before="680"/><w:ind w:left="-658"/><w:jc w:val="center"/></w:pPr>'
-        end_marker_1='</w:sdt>'
-
-        start_offset_1=content.find(start_marker_1)
-        if start_offset_1 > 0:
-            prefix=content[:start_offset_1+len(start_marker_1)]
-            end_offset_1=content.find(end_marker_1, start_offset_1+len(start_marker_1))
-            if end_offset_1 > 0:
-                postfix=content[end_offset_1+len(end_marker_1):]
-                content=prefix + postfix
+        values['picture']=''
 
     # if te language is 'sv' then change the country from "Sweden" to "Sverige"
-    sweden_xml='<w:lang w:val="en-US"/></w:rPr><w:t>Sweden</w:t>'
-    sverige_xml='<w:lang w:val="sv-SE"/></w:rPr><w:t>Sverige</w:t>'
     if language == 'sv':
-        content=content.replace(sweden_xml, sverige_xml)
+        values['sweden']=sverige_xml
     
     # if this is a Swedish language cover, then remove the English KTH logo
-    english_KTH_logo='<w:r w:rsidRPr="00A15578"><w:rPr><w:noProof/><w:lang w:val="en-US"/></w:rPr><w:drawing><wp:anchor distT="0" distB="0" distL="114300" distR="114300" simplePos="0" relativeHeight="251667456" behindDoc="1" locked="0" layoutInCell="1" allowOverlap="1" wp14:anchorId="6EB69F10" wp14:editId="7BEE6404"><wp:simplePos x="0" y="0"/><wp:positionH relativeFrom="leftMargin"><wp:posOffset>5736178</wp:posOffset></wp:positionH><wp:positionV relativeFrom="topMargin"><wp:posOffset>417830</wp:posOffset></wp:positionV><wp:extent cx="1331595" cy="240665"/><wp:effectExtent l="0" t="0" r="1905" b="6985"/><wp:wrapNone/><wp:docPr id="3" name="Bildobjekt 3" descr="English logotype for KTH Royal Institute of Technology."/><wp:cNvGraphicFramePr><a:graphicFrameLocks xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" noChangeAspect="1"/></wp:cNvGraphicFramePr><a:graphic xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"><a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/picture"><pic:pic xmlns:pic="http://schemas.openxmlformats.org/drawingml/2006/picture"><pic:nvPicPr><pic:cNvPr id="3" name="Bildobjekt 3" descr="English logotype for KTH Royal Institute of Technology."/><pic:cNvPicPr/></pic:nvPicPr><pic:blipFill><a:blip r:embed="rId8" cstate="print"><a:extLst><a:ext uri="{28A0092B-C50C-407E-A947-70E740481C1C}"><a14:useLocalDpi xmlns:a14="http://schemas.microsoft.com/office/drawing/2010/main" val="0"/></a:ext></a:extLst></a:blip><a:stretch><a:fillRect/></a:stretch></pic:blipFill><pic:spPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="1331595" cy="240665"/></a:xfrm><a:prstGeom prst="rect"><a:avLst/></a:prstGeom></pic:spPr></pic:pic></a:graphicData></a:graphic><wp14:sizeRelH relativeFrom="page"><wp14:pctWidth>0</wp14:pctWidth></wp14:sizeRelH><wp14:sizeRelV relativeFrom="page"><wp14:pctHeight>0</wp14:pctHeight></wp14:sizeRelV></wp:anchor></w:drawing></w:r>'
 
     if language == 'sv':
-        content=content.replace(english_KTH_logo, '')
+        values['english_KTH_logo']=''
 
     # The subject, cycle, and credits are set using Normal with a style of Arial 12pt
     if exam == 'kandidatexamen':
@@ -209,7 +305,6 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
                         }
 
         # deal with the subject line
-        subject_line_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter your subject area. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>Degree P</w:t></w:r><w:r w:rsidR="00A15578" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>roject in Information and Communication Technology</w:t></w:r><w:r w:rsidR="001D0C1B" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve"> </w:t>'
         
         # "Degree1": {"Educational program": "Bachelor’s Programme in Information and Communication Technology", "programcode": "TCOMK", "Degree": "Bachelors degree", "subjectArea": "Technology"}
 
@@ -229,10 +324,9 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
             project_name='Degree project in {}'.format(subjectArea)
 
         new_subject_line_xml='<w:rPr><w:rStyle w:val="Normal"/></w:rPr><w:t xml:space="preserve">{}</w:t>'.format(project_name)
-        content=content.replace(subject_line_xml, new_subject_line_xml, 1)
+        values['subject_line']=new_subject_line_xml
 
         # do the replacement in the level and points line
-        leveL_points_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter first or second cycle and credits. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>First cycle 15 credits</w:t>'
 
         
         credits=args['credits']
@@ -246,7 +340,7 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
         level_credits_txt='{0}, {1} {2}'.format(all_levels[cycle][language], cred, all_units[language])
 
         new_leveL_points_xml='<w:rPr><w:rStyle w:val="Normal"/></w:rPr><w:t xml:space="preserve">{0}</w:t>'.format(level_credits_txt)
-        content=content.replace(leveL_points_xml, new_leveL_points_xml, 1)
+        values['level_points']=new_leveL_points_xml
 
     elif exam == 'högskoleexamen':
         cycle=1
@@ -255,7 +349,6 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
                         }
 
         # deal with the subject line
-        subject_line_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter your subject area. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>Degree P</w:t></w:r><w:r w:rsidR="00A15578" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>roject in Information and Communication Technology</w:t></w:r><w:r w:rsidR="001D0C1B" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve"> </w:t>'
         
         subjectArea=args['area']
         if not subjectArea:
@@ -273,10 +366,9 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
             project_name='Degree project in {}'.format(subjectArea)
 
         new_subject_line_xml='<w:rPr><w:rStyle w:val="Normal"/></w:rPr><w:t xml:space="preserve">{}</w:t>'.format(project_name)
-        content=content.replace(subject_line_xml, new_subject_line_xml, 1)
+        values['subject_line']=new_subject_line_xml
 
         # do the replacement in the level and points line
-        leveL_points_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter first or second cycle and credits. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>First cycle 15 credits</w:t>'
         
         credits=args['credits']
         if not credits:
@@ -289,7 +381,7 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
         level_credits_txt='{0}, {1} {2}'.format(all_levels[cycle][language], cred, all_units[language])
 
         new_leveL_points_xml='<w:rPr><w:rStyle w:val="Normal"/></w:rPr><w:t xml:space="preserve">{0}</w:t>'.format(level_credits_txt)
-        content=content.replace(leveL_points_xml, new_leveL_points_xml, 1)
+        values['level_points']=new_leveL_points_xml
 
 
     elif exam == 'arkitektexamen':
@@ -299,7 +391,6 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
                         }
 
         # deal with the subject line
-        subject_line_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter your subject area. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>Degree P</w:t></w:r><w:r w:rsidR="00A15578" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>roject in Information and Communication Technology</w:t></w:r><w:r w:rsidR="001D0C1B" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve"> </w:t>'
         
         subjectArea=args['area']
         if not subjectArea:
@@ -317,10 +408,9 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
             project_name='Degree project in {}'.format(subjectArea)
 
         new_subject_line_xml='<w:rPr><w:rStyle w:val="Normal"/></w:rPr><w:t xml:space="preserve">{}</w:t>'.format(project_name)
-        content=content.replace(subject_line_xml, new_subject_line_xml, 1)
+        values['subject_line']=new_subject_line_xml
 
         # do the replacement in the level and points line
-        leveL_points_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter first or second cycle and credits. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>First cycle 15 credits</w:t>'
 
         
         credits=args['credits']
@@ -334,7 +424,7 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
         level_credits_txt='{0}, {1} {2}'.format(all_levels[cycle][language], cred, all_units[language])
 
         new_leveL_points_xml='<w:rPr><w:rStyle w:val="Normal"/></w:rPr><w:t xml:space="preserve">{0}</w:t>'.format(level_credits_txt)
-        content=content.replace(leveL_points_xml, new_leveL_points_xml, 1)
+        values['level_points']=new_leveL_points_xml
 
     elif exam == 'högskoleingenjörsexamen':
         cycle = 1
@@ -364,7 +454,6 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
             }
 
         # deal with the subject line
-        subject_line_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter your subject area. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>Degree P</w:t></w:r><w:r w:rsidR="00A15578" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>roject in Information and Communication Technology</w:t></w:r><w:r w:rsidR="001D0C1B" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve"> </w:t>'
         
         subjectArea=args['area']
         if not subjectArea:
@@ -382,10 +471,9 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
             project_name='Degree project in {}'.format(subjectArea)
 
         new_subject_line_xml='<w:rPr><w:rStyle w:val="Normal"/></w:rPr><w:t xml:space="preserve">{}</w:t>'.format(project_name)
-        content=content.replace(subject_line_xml, new_subject_line_xml, 1)
+        values['subject_line']=new_subject_line_xml
 
         # do the replacement in the level and points line
-        leveL_points_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter first or second cycle and credits. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>First cycle 15 credits</w:t>'
 
         
         credits=args['credits']
@@ -399,7 +487,7 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
         level_credits_txt='{0}, {1} {2}'.format(all_levels[cycle][language], cred, all_units[language])
 
         new_leveL_points_xml='<w:rPr><w:rStyle w:val="Normal"/></w:rPr><w:t xml:space="preserve">{0}</w:t>'.format(level_credits_txt)
-        content=content.replace(leveL_points_xml, new_leveL_points_xml, 1)
+        values['level_points']=new_leveL_points_xml
 
     elif exam == 'civilingenjörsexamen':
         cycle = 2
@@ -451,7 +539,6 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
             }
 
         # deal with the subject line
-        subject_line_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter your subject area. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>Degree P</w:t></w:r><w:r w:rsidR="00A15578" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>roject in Information and Communication Technology</w:t></w:r><w:r w:rsidR="001D0C1B" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve"> </w:t>'
         
         subjectArea=args['area']
         if not subjectArea:
@@ -469,10 +556,9 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
             project_name='Degree project in {}'.format(subjectArea)
 
         new_subject_line_xml='<w:rPr><w:rStyle w:val="Normal"/></w:rPr><w:t xml:space="preserve">{}</w:t>'.format(project_name)
-        content=content.replace(subject_line_xml, new_subject_line_xml, 1)
+        values['subject_line']=new_subject_line_xml
 
         # do the replacement in the level and points line
-        leveL_points_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter first or second cycle and credits. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>First cycle 15 credits</w:t>'
 
         
         credits=args['credits']
@@ -486,7 +572,7 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
         level_credits_txt='{0}, {1} {2}'.format(all_levels[cycle][language], cred, all_units[language])
 
         new_leveL_points_xml='<w:rPr><w:rStyle w:val="Normal"/></w:rPr><w:t xml:space="preserve">{0}</w:t>'.format(level_credits_txt)
-        content=content.replace(leveL_points_xml, new_leveL_points_xml, 1)
+        values['level_points']=new_leveL_points_xml
 
 
     elif exam == 'masterexamen': #
@@ -535,7 +621,6 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
         }
 
         # deal with the subject line
-        subject_line_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter your subject area. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>Degree P</w:t></w:r><w:r w:rsidR="00A15578" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>roject in Information and Communication Technology</w:t></w:r><w:r w:rsidR="001D0C1B" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve"> </w:t>'
         
         subjectArea=args['area']
         if not subjectArea:
@@ -553,10 +638,9 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
             project_name='Degree project in {}'.format(subjectArea)
 
         new_subject_line_xml='<w:rPr><w:rStyle w:val="Normal"/></w:rPr><w:t xml:space="preserve">{}</w:t>'.format(project_name)
-        content=content.replace(subject_line_xml, new_subject_line_xml, 1)
+        values['subject_line']=new_subject_line_xml
 
         # do the replacement in the level and points line
-        leveL_points_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter first or second cycle and credits. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>First cycle 15 credits</w:t>'
 
         
         credits=args['credits']
@@ -570,7 +654,7 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
         level_credits_txt='{0}, {1} {2}'.format(all_levels[cycle][language], cred, all_units[language])
 
         new_leveL_points_xml='<w:rPr><w:rStyle w:val="Normal"/></w:rPr><w:t xml:space="preserve">{0}</w:t>'.format(level_credits_txt)
-        content=content.replace(leveL_points_xml, new_leveL_points_xml, 1)
+        values['level_points']=new_leveL_points_xml
 
     elif exam == 'magisterexamen': #
         cycle = 2
@@ -590,7 +674,6 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
         }
 
         # deal with the subject line
-        subject_line_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter your subject area. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>Degree P</w:t></w:r><w:r w:rsidR="00A15578" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>roject in Information and Communication Technology</w:t></w:r><w:r w:rsidR="001D0C1B" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve"> </w:t>'
         
         subjectArea=args['area']
         if not subjectArea:
@@ -608,10 +691,9 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
             project_name='Degree project in {}'.format(subjectArea)
 
         new_subject_line_xml='<w:rPr><w:rStyle w:val="Normal"/></w:rPr><w:t xml:space="preserve">{}</w:t>'.format(project_name)
-        content=content.replace(subject_line_xml, new_subject_line_xml, 1)
+        values['subject_line']=new_subject_line_xml
 
         # do the replacement in the level and points line
-        leveL_points_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter first or second cycle and credits. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>First cycle 15 credits</w:t>'
 
         credits=args['credits']
         if not credits:
@@ -624,7 +706,7 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
         level_credits_txt='{0}, {1} {2}'.format(all_levels[cycle][language], cred, all_units[language])
 
         new_leveL_points_xml='<w:rPr><w:rStyle w:val="Normal"/></w:rPr><w:t xml:space="preserve">{0}</w:t>'.format(level_credits_txt)
-        content=content.replace(leveL_points_xml, new_leveL_points_xml, 1)
+        values['level_points']=new_leveL_points_xml
 
     elif exam == 'clgym':
         cycle=2
@@ -644,7 +726,6 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
         }
 
         # deal with the subject line
-        subject_line_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter your subject area. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>Degree P</w:t></w:r><w:r w:rsidR="00A15578" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>roject in Information and Communication Technology</w:t></w:r><w:r w:rsidR="001D0C1B" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve"> </w:t>'
 
         subjectArea=args['area']
         if not subjectArea:
@@ -662,10 +743,9 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
             project_name='Degree project in {}'.format(subjectArea)
 
         new_subject_line_xml='<w:rPr><w:rStyle w:val="Normal"/></w:rPr><w:t xml:space="preserve">{}</w:t>'.format(project_name)
-        content=content.replace(subject_line_xml, new_subject_line_xml, 1)
+        values['subject_line']=new_subject_line_xml
 
         # do the replacement in the level and points line
-        leveL_points_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter first or second cycle and credits. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>First cycle 15 credits</w:t>'
 
         
         credits=args['credits']
@@ -679,7 +759,7 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
         level_credits_txt='{0}, {1} {2}'.format(all_levels[cycle][language], cred, all_units[language])
 
         new_leveL_points_xml='<w:rPr><w:rStyle w:val="Normal"/></w:rPr><w:t xml:space="preserve">{0}</w:t>'.format(level_credits_txt)
-        content=content.replace(leveL_points_xml, new_leveL_points_xml, 1)
+        values['level_points']=new_leveL_points_xml
 
     elif exam == 'ämneslärarexamen': # note that the students have to do two 15 credit exjobbs pne in the 3 and the other in the 4th year
         cycle=1
@@ -701,7 +781,6 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
         }
 
         # deal with the subject line
-        subject_line_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter your subject area. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>Degree P</w:t></w:r><w:r w:rsidR="00A15578" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>roject in Information and Communication Technology</w:t></w:r><w:r w:rsidR="001D0C1B" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve"> </w:t>'
 
         subjectArea=args['area']
         if not subjectArea:
@@ -719,10 +798,9 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
             project_name='Degree project in {}'.format(subjectArea)
 
         new_subject_line_xml='<w:rPr><w:rStyle w:val="Normal"/></w:rPr><w:t xml:space="preserve">{}</w:t>'.format(project_name)
-        content=content.replace(subject_line_xml, new_subject_line_xml, 1)
+        values['subject_line']=new_subject_line_xml
 
         # do the replacement in the level and points line
-        leveL_points_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter first or second cycle and credits. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>First cycle 15 credits</w:t>'
 
         
         credits=args['credits']
@@ -736,7 +814,7 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
         level_credits_txt='{0}, {1} {2}'.format(all_levels[cycle][language], cred, all_units[language])
 
         new_leveL_points_xml='<w:rPr><w:rStyle w:val="Normal"/></w:rPr><w:t xml:space="preserve">{0}</w:t>'.format(level_credits_txt)
-        content=content.replace(leveL_points_xml, new_leveL_points_xml, 1)
+        values['level_points']=new_leveL_points_xml
 
 
     elif exam in ['kpulu', 'kpufu']:
@@ -751,7 +829,6 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
         }
 
         # deal with the subject line
-        subject_line_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter your subject area. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>Degree P</w:t></w:r><w:r w:rsidR="00A15578" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>roject in Information and Communication Technology</w:t></w:r><w:r w:rsidR="001D0C1B" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve"> </w:t>'
 
         subjectArea=args['area']
         if not subjectArea:
@@ -769,10 +846,9 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
             project_name='Degree project in {}'.format(subjectArea)
 
         new_subject_line_xml='<w:rPr><w:rStyle w:val="Normal"/></w:rPr><w:t xml:space="preserve">{}</w:t>'.format(project_name)
-        content=content.replace(subject_line_xml, new_subject_line_xml, 1)
+        values['subject_line']=new_subject_line_xml
 
         # do the replacement in the level and points line
-        leveL_points_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter first or second cycle and credits. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>First cycle 15 credits</w:t>'
 
         
         credits=args['credits']
@@ -786,7 +862,7 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
         level_credits_txt='{0}, {1} {2}'.format(all_levels[cycle][language], cred, all_units[language])
 
         new_leveL_points_xml='<w:rPr><w:rStyle w:val="Normal"/></w:rPr><w:t xml:space="preserve">{0}</w:t>'.format(level_credits_txt)
-        content=content.replace(leveL_points_xml, new_leveL_points_xml, 1)
+        values['level_points']=new_leveL_points_xml
 
     elif exam == 'both':
         # Examensarbete inom teknikområdet <teknikområde> och huvudområdet <huvudområde>
@@ -884,7 +960,6 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
 
 
         # deal with the subject line
-        subject_line_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter your subject area. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>Degree P</w:t></w:r><w:r w:rsidR="00A15578" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>roject in Information and Communication Technology</w:t></w:r><w:r w:rsidR="001D0C1B" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve"> </w:t>'
 
         field=args['area']
         if not field:
@@ -913,10 +988,9 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
             project_name='Degree Project in the Field of Technology {0} and the Main Field of Study {1}'.format(field, subjectArea)
 
         new_subject_line_xml='<w:rPr><w:rStyle w:val="Normal"/></w:rPr><w:t xml:space="preserve">{}</w:t>'.format(project_name)
-        content=content.replace(subject_line_xml, new_subject_line_xml, 1)
+        values['subject_line']=new_subject_line_xml
 
         # do the replacement in the level and points line
-        leveL_points_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter first or second cycle and credits. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>First cycle 15 credits</w:t>'
 
         
         credits=args['credits']
@@ -930,7 +1004,7 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
         level_credits_txt='{0}, {1} {2}'.format(all_levels[cycle][language], cred, all_units[language])
 
         new_leveL_points_xml='<w:rPr><w:rStyle w:val="Normal"/></w:rPr><w:t xml:space="preserve">{0}</w:t>'.format(level_credits_txt)
-        content=content.replace(leveL_points_xml, new_leveL_points_xml, 1)
+        values['level_points']=new_leveL_points_xml
 
 
 
@@ -966,7 +1040,6 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
         }
 
         # deal with the subject line
-        subject_line_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter your subject area. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>Degree P</w:t></w:r><w:r w:rsidR="00A15578" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>roject in Information and Communication Technology</w:t></w:r><w:r w:rsidR="001D0C1B" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve"> </w:t>'
         
         subjectArea=args['area']
         if not subjectArea:
@@ -984,10 +1057,9 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
             project_name='Degree Project in the Field of Technology and the Main Field of Study {}'.format(subjectArea)
 
         new_subject_line_xml='<w:rPr><w:rStyle w:val="Normal"/></w:rPr><w:t xml:space="preserve">{}</w:t>'.format(project_name)
-        content=content.replace(subject_line_xml, new_subject_line_xml, 1)
+        values['subject_line']=new_subject_line_xml
 
         # do the replacement in the level and points line
-        leveL_points_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter first or second cycle and credits. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>First cycle 15 credits</w:t>'
 
         
         credits=args['credits']
@@ -1001,7 +1073,7 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
         level_credits_txt='{0}, {1} {2}'.format(all_levels[cycle][language], cred, all_units[language])
 
         new_leveL_points_xml='<w:rPr><w:rStyle w:val="Normal"/></w:rPr><w:t xml:space="preserve">{0}</w:t>'.format(level_credits_txt)
-        content=content.replace(leveL_points_xml, new_leveL_points_xml, 1)
+        values['level_points']=new_leveL_points_xml
 
     elif exam == 'högskoleexamen':
         cycle=1
@@ -1010,7 +1082,6 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
                         }
 
         # deal with the subject line
-        subject_line_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter your subject area. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>Degree P</w:t></w:r><w:r w:rsidR="00A15578" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>roject in Information and Communication Technology</w:t></w:r><w:r w:rsidR="001D0C1B" w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve"> </w:t>'
         
         subjectArea=args['area']
         if not subjectArea:
@@ -1028,10 +1099,9 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
             project_name='Degree project in {}'.format(subjectArea)
 
         new_subject_line_xml='<w:rPr><w:rStyle w:val="Normal"/></w:rPr><w:t xml:space="preserve">{}</w:t>'.format(project_name)
-        content=content.replace(subject_line_xml, new_subject_line_xml, 1)
+        values['subject_line']=new_subject_line_xml
 
         # do the replacement in the level and points line
-        leveL_points_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter first or second cycle and credits. For example. </w:t></w:r><w:r w:rsidR="005C4F74"><w:rPr><w:rStyle w:val="PlaceholderText"/><w:i/><w:iCs/></w:rPr><w:t>First cycle 15 credits</w:t>'
         
         credits=args['credits']
         if not credits:
@@ -1044,7 +1114,7 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
         level_credits_txt='{0}, {1} {2}'.format(all_levels[cycle][language], cred, all_units[language])
 
         new_leveL_points_xml='<w:rPr><w:rStyle w:val="Normal"/></w:rPr><w:t xml:space="preserve">{0}</w:t>'.format(level_credits_txt)
-        content=content.replace(leveL_points_xml, new_leveL_points_xml, 1)
+        values['level_points']=new_leveL_points_xml
 
 
     else:
@@ -1070,19 +1140,17 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
 
     if main_title:
         # Titel style is Arial 26pt
-        title_xml='<w:pStyle w:val="Titel"/><w:spacing w:before="800"/></w:pPr><w:r w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t>Click here to enter your title</w:t></w:r></w:p>'
         new_title_xml='<w:pStyle w:val="Titel"/><w:spacing w:before="800"/></w:pPr><w:r w:rsidRPr="00A15578"><w:t>{}</w:t></w:r></w:p>'.format(main_title)
-        content=content.replace(title_xml, new_title_xml)
+        values['title']=new_title_xml
 
     # If there is no subtitle or it is simply a space, then delete the whole vreical to prevent the loss of vertical space
     if not subtitle or subtitle == " ":
-        complete_subtitle_xml='<w:sdt><w:sdtPr><w:id w:val="-1971594218"/><w:placeholder><w:docPart w:val="4BAA847A82F14FE19642931C4B768D6D"/></w:placeholder><w:showingPlcHdr/></w:sdtPr><w:sdtEndPr/><w:sdtContent><w:p w:rsidR="00FF3FD9" w:rsidRPr="00A15578" w:rsidRDefault="00A15578" w:rsidP="00480A58"><w:pPr><w:pStyle w:val="Subtitle"/><w:spacing w:before="120"/></w:pPr><w:r w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter your </w:t></w:r><w:r><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t>sub</w:t></w:r><w:r w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t>title</w:t></w:r></w:p></w:sdtContent></w:sdt>'
-        content=content.replace(complete_subtitle_xml, '')
+        values['complete_subtitle']=''
     else:
         # Subtitle style is Arial 16pt
-        subtitle_xml='w:val="Subtitle"/><w:spacing w:before="120"/></w:pPr><w:r w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t xml:space="preserve">Click here to enter your </w:t></w:r><w:r><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t>sub</w:t></w:r><w:r w:rsidRPr="00A15578"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t>title</w:t></w:r></w:p>'
         new_subtitle_xml='w:val="Subtitle"/><w:spacing w:before="120"/></w:pPr><w:r w:rsidRPr="00A15578"><w:t>{}</w:t></w:r></w:p>'.format(subtitle)
-        content=content.replace(subtitle_xml, new_subtitle_xml)
+        values['subtitle']=new_subtitle_xml
+        values['complete_subtitle']=complete_subtitle_xml.replace(subtitle_xml, new_subtitle_xml)
 
     # {"Author1": {"Last name": "Student", "First name"
     author1=dict_of_entries.get('Author1', None)
@@ -1091,7 +1159,6 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
     author_name="{0} {1}".format(author1_first_name, author1_last_name)
 
     # Författare style is Arial 12pt
-    author_xml='w:val="Frfattare"/><w:spacing w:before="560" w:after="120"/></w:pPr><w:r w:rsidRPr="00217644"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t>Click here to enter the name of the author (first and last name)</w:t></w:r></w:p>'
     new_author_xml='w:val="Frfattare"/><w:spacing w:before="560" w:after="120"/></w:pPr><w:r w:rsidRPr="00217644"><w:t>{}</w:t></w:r></w:p>'.format(author_name)
 
     author2=dict_of_entries.get('Author2', None)
@@ -1101,7 +1168,7 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
         author_name2="{0} {1}".format(author2_first_name, author2_last_name)
         new_author_xml=new_author_xml+'<w:p w:rsidR="006A18DB" w:rsidRPr="00A15578" w:rsidRDefault="006A18DB" w:rsidP="00882929"><w:pPr><w:pStyle w:val="Frfattare"/><w:spacing w:before="120" w:after="120"/></w:pPr><w:r><w:t xml:space="preserve">{}</w:t></w:r></w:p>'.format(author_name2)
 
-    content=content.replace(author_xml, new_author_xml)
+    values['author']=new_author_xml
 
     # "Other information": {"Year": "2022"
     other_information=dict_of_entries.get('Other information', None)
@@ -1110,9 +1177,8 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
         if other_information:
             year=other_information.get('Year', None)
     if year:
-        year_xml='<w:rPr><w:rStyle w:val="PlaceholderText"/><w:lang w:val="en-US"/></w:rPr><w:t>Click here to enter year</w:t></w:r>'
         new_year_xml='<w:t>{}</w:t></w:r>'.format(year)
-        content=content.replace(year_xml, new_year_xml)
+        values['year']=new_year_xml
 
     trita=args['trita']
     if not trita:               # If trita string not specified on command line, then take from the JSON file
@@ -1129,12 +1195,18 @@ def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture
     # TRITA-nummer style is Arial 10pt
     # Hyperlink    style is Arial 8pt in blue
     # Webbadress   style is Arial 8pt in blue
-    trita_xml='<w:txbxContent><w:sdt><w:sdtPr><w:rPr><w:color w:val="1954A6" w:themeColor="accent1"/><w:sz w:val="16"/><w:lang w:val="pt-PT"/></w:rPr><w:id w:val="1624419607"/><w:lock w:val="contentLocked"/><w:placeholder><w:docPart w:val="19756925D2BC4334B77C3F3B8E579DA9"/></w:placeholder><w:group/></w:sdtPr><w:sdtEndPr><w:rPr><w:rStyle w:val="Hyperlink"/><w:lang w:val="en-GB"/></w:rPr></w:sdtEndPr><w:sdtContent><w:p w:rsidR="00C1097E" w:rsidRPr="00E014A5" w:rsidRDefault="00C1097E" w:rsidP="00C1097E"><w:pPr><w:pStyle w:val="TRITA-nummer"/><w:rPr><w:lang w:val="pt-PT"/></w:rPr></w:pPr><w:r w:rsidRPr="00E014A5"><w:rPr><w:lang w:val="pt-PT"/></w:rPr><w:t xml:space="preserve">TRITA – </w:t></w:r><w:sdt><w:sdtPr><w:id w:val="-246959913"/><w:showingPlcHdr/></w:sdtPr><w:sdtEndPr/><w:sdtContent><w:r w:rsidR="005C767E" w:rsidRPr="00637386"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t>XXX-XXX 20XX</w:t></w:r><w:r w:rsidR="00BF2CC2" w:rsidRPr="00637386"><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t>:XX</w:t></w:r></w:sdtContent></w:sdt></w:p><w:p w:rsidR="00C1097E" w:rsidRPr="00637386" w:rsidRDefault="00937C6C" w:rsidP="00C1097E"><w:pPr><w:pStyle w:val="Webbadress"/><w:spacing w:before="360"/><w:rPr><w:lang w:val="pt-PT"/></w:rPr></w:pPr><w:hyperlink r:id="rId11" w:history="1"><w:r w:rsidR="00C1097E" w:rsidRPr="00BA595B"><w:rPr><w:rStyle w:val="Hyperlink"/></w:rPr><w:t>www.kth.se</w:t></w:r></w:hyperlink></w:p></w:sdtContent></w:sdt></w:txbxContent>'
     new_trita_xml='<w:txbxContent><w:sdt><w:sdtPr><w:rPr><w:color w:val="1954A6" w:themeColor="accent1"/><w:sz w:val="16"/><w:lang w:val="en-US"/></w:rPr><w:id w:val="1624419607"/><w:group/></w:sdtPr><w:sdtEndPr><w:rPr><w:rStyle w:val="Hyperlink"/><w:lang w:val="en-US"/></w:rPr></w:sdtEndPr><w:sdtContent><w:p w:rsidR="00C1097E" w:rsidRPr="00E014A5" w:rsidRDefault="00C1097E" w:rsidP="00C1097E"><w:pPr><w:pStyle w:val="TRITA-nummer"/><w:rPr><w:lang w:val="en-US"/></w:rPr></w:pPr><w:r w:rsidRPr="00E014A5"><w:rPr><w:lang w:val="en-US"/></w:rPr><w:t xml:space="preserve">{0}</w:t></w:r></w:p><w:p w:rsidR="00C1097E" w:rsidRPr="00637386" w:rsidRDefault="00937C6C" w:rsidP="00C1097E"><w:pPr><w:pStyle w:val="Webbadress"/><w:spacing w:before="360"/><w:rPr><w:lang w:val="en-US"/></w:rPr></w:pPr><w:hyperlink r:id="rId11" w:history="1"><w:r w:rsidR="00C1097E" w:rsidRPr="00BA595B"><w:rPr><w:rStyle w:val="Hyperlink"/></w:rPr><w:t>www.kth.se</w:t></w:r></w:hyperlink></w:p></w:sdtContent></w:sdt></w:txbxContent>'.format(trita)
 
-    content=content.replace(trita_xml, new_trita_xml)
+    values['trita']=new_trita_xml
 
-    return content
+    # remove the unneeded placeholder texts
+    for i in range(0, len(unneeded_placeholder_texts)):
+        values['unneeded_placeholder_{}'.format(i)]=''
+
+    return values
+
+def transform_file(content, dict_of_entries, exam, language, cycle, keep_picture):
+    return render_document_xml(compile_document_xml(content), cover_values(dict_of_entries, exam, language, cycle, keep_picture))
 
 exams={'arkitektexamen': 'Degree of Master of Architecture',
        'civilingenjörsexamen': 'Degree of Master of Science in Engineering',
@@ -1153,10 +1225,130 @@ exams={'arkitektexamen': 'Degree of Master of Architecture',
        'same': 'same'   # Både civilingenjörsexamen och masterexamen om dessa områden har samma benämnin
 }
 
+# Returns the exam, language, and cycle for a cover, the command line options override the values from the JSON
+# (None is returned for the exam if it is not known, None for the language if it is not 'sv' or 'en')
+def cover_parameters(dict_of_entries):
+    exam=args["exam"]
+    if not exam:
+        degree1=dict_of_entries.get('Degree1', None)
+        if degree1:
+            exam=degree1.get('Degree', None)
+
+        if exam:
+            for e in exams:
+                exl=exam.lower()
+                el=e.lower()
+                if exl == el:
+                    exam=e
+                    break
+                if el.find(exl) > 0:
+                    exam=e
+                    break
+                if exl == exams[el].lower(): #  look at English name
+                    exam=e
+                    break
+    if exam not in exams:
+        print("Unknown exam {0}, choose one of {1}".format(exam, exams))        
+        exam=None
+
+    language=args["language"]
+    if not language:
+        title=dict_of_entries.get('Title', None)
+        if title:
+            language=title.get('Language', None)
+            if language == 'eng':
+                language = 'en'
+            elif language == 'swe':
+                language = 'sv'
+            else:
+                language = None
+
+    if language not in ['sv', 'en']:
+        print("Unknown language use 'sv' for Swedish or 'en' for English")
+        language=None
+
+    cycle=args['cycle']
+    if not cycle:
+        cycle=dict_of_entries.get('Cycle', None)
+        if not cycle:
+            cycle=1
+
+    return exam, language, cycle
+
+# Returns a list of (name, dict_of_entries) for the theses in a directory of JSON files or in a JSONL file (or stdin if the file is '-')
+def read_batch(batch):
+    theses=[]
+    if os.path.isdir(batch):
+        for fn in sorted(os.listdir(batch)):
+            if not fn.endswith('.json'):
+                continue
+            with open(os.path.join(batch, fn), 'r') as json_FH:
+                try:
+                    theses.append((fn[:-5], json.load(json_FH)))
+                except json.JSONDecodeError as e:
+                    print("Error in reading {0}: {1}".format(fn, e))
+        return theses
+
+    if batch == '-':
+        json_FH=sys.stdin
+    else:
+        json_FH=open(batch, 'r')
+    for line_number, line in enumerate(json_FH, start=1):
+        if not line.strip():
+            continue
+        try:
+            theses.append(("cover-{}".format(line_number), json.loads(line)))
+        except json.JSONDecodeError as e:
+            print("Error in reading line {0}: {1}".format(line_number, e))
+    if json_FH is not sys.stdin:
+        json_FH.close()
+    return theses
+
+# the template is compiled once in the main process and given to each of the worker processes
+def initialize_worker(template, options):
+    global cover_template
+    global args
+    global Verbose_Flag
+    cover_template=template
+    args=options
+    Verbose_Flag=options['verbose']
+
+# Makes the cover for one thesis, returns a tuple (name, output_filename or None, error message or None)
+def make_cover(thesis, output_directory):
+    name, dict_of_entries = thesis
+    try:
+        exam, language, cycle = cover_parameters(dict_of_entries)
+        if not exam or not language:
+            return (name, None, "unknown exam or language")
+        output_filename=os.path.join(output_directory, "{0}-{1}-{2}.docx".format(name, exam, language))
+        cover_template.write(output_filename, cover_values(dict_of_entries, exam, language, cycle, args['picture']))
+        return (name, output_filename, None)
+    except Exception as e:
+        return (name, None, "{}".format(e))
+
+def make_covers(theses, output_directory, jobs):
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=initialize_worker, initargs=(cover_template, args)) as executor:
+            # executor.map returns the results in the order of theses
+            results=list(executor.map(make_cover, theses, [output_directory]*len(theses), chunksize=8))
+    else:
+        results=[make_cover(thesis, output_directory) for thesis in theses]
+
+    number_made=0
+    for name, output_filename, error in results:
+        if error:
+            print("Error in making cover for {0}: {1}".format(name, error))
+        else:
+            number_made=number_made+1
+            if Verbose_Flag:
+                print("outputting cover for {0} to {1}".format(name, output_filename))
+    print("made {0} of {1} covers".format(number_made, len(theses)))
+
 def main(argv):
     global Verbose_Flag
     global testing
     global args
+    global cover_template
 
     argp = argparse.ArgumentParser(description="JSON_to_DOCX_cover.py: to make a thesis cover using the DOCX template")
 
@@ -1241,6 +1433,22 @@ def main(argv):
                       help="year"
                       )
 
+    argp.add_argument('-b', '--batch',
+                      type=str,
+                      help="directory of JSON files or a JSONL file (- for stdin) with one JSON object per cover"
+                      )
+
+    argp.add_argument('--jobs',
+                      type=int,
+                      default=1,
+                      help="number of processes to use for making the covers in batch mode"
+                      )
+
+    argp.add_argument('-o', '--output_dir',
+                      type=str,
+                      default='.',
+                      help="directory for the covers made in batch mode"
+                      )
 
     args = vars(argp.parse_args(argv))
 
@@ -1250,6 +1458,33 @@ def main(argv):
     if Verbose_Flag:
         print("testing={}".format(testing))
 
+    input_filename=args['file']
+    if not input_filename:
+        print("File name must be specified")
+        return
+
+    print("input_filename={}".format(input_filename))
+
+    # the template is only read and compiled once, regardless of the number of covers made
+    document = zipfile.ZipFile(input_filename)
+    file_names=document.namelist()
+    document.close()
+    if Verbose_Flag:
+        print("File names in ZIP zip file: {}".format(file_names))
+
+    if word_document_file_name not in file_names:
+        print("Missing file: {}".format(word_document_file_name))
+        return
+
+    cover_template=CoverTemplate(input_filename)
+
+    if args['batch']:
+        theses=read_batch(args['batch'])
+        if not os.path.isdir(args['output_dir']):
+            os.makedirs(args['output_dir'])
+        make_covers(theses, args['output_dir'], args['jobs'])
+        return
+
     json_filename=args["json"]
     if not json_filename:
         print("Unknown source for the JSON information: {}".format(json_filename))
@@ -1267,104 +1502,21 @@ def main(argv):
     if Verbose_Flag:
         print("read JSON: {}".format(dict_of_entries))
 
-
-    exam=args["exam"]
-    if not exam:
-        degree1=dict_of_entries.get('Degree1', None)
-        if not degree1:
-            exam=args["exam"]
-            exam=degree1.get('Degree', None)
-
-        if exam:
-            for e in exams:
-                exl=exam.lower()
-                el=e.lower()
-                if exl == el:
-                    exam=e
-                    break
-                if el.find(exl) > 0:
-                    exam=e
-                    break
-                if exl == exams[el].lower(): #  look at English name
-                    exam=e
-                    break
-    if exam not in exams:
-        print("Unknown exam {0}, choose one of {1}".format(exam, exams))        
+    exam, language, cycle = cover_parameters(dict_of_entries)
+    if not exam or not language:
         return
 
     print("exam={}".format(exam))
-
-    language=args["language"]
-    if not language:
-        title=dict_of_entries.get('Title', None)
-        if title:
-            language=title.get('Language', None)
-            if language == 'eng':
-                language = 'en'
-            elif language == 'swe':
-                language = 'sv'
-            else:
-                language = None
-
-    if language not in ['sv', 'en']:
-        print("Unknown language use 'sv' for Swedish or 'en' for English")
-        return
-
     print("language={}".format(language))
-
-    cycle=args['cycle']
-    if not cycle:
-        cycle=dict_of_entries.get('Cycle', None)
-        if not cycle:
-            cycle=1
     print("cycle={}".format(cycle))
     
-    input_filename=args['file']
-    if not input_filename:
-        print("File name must be specified")
-        return
-
-    print("input_filename={}".format(input_filename))
-
-    document = zipfile.ZipFile(input_filename)
-    file_names=document.namelist()
-    if Verbose_Flag:
-        print("File names in ZIP zip file: {}".format(file_names))
-
-    word_document_file_name='word/document.xml'
-    word_docprop_custom_file_name='docProps/custom.xml'
-    if word_document_file_name not in file_names:
-        print("Missing file: {}".format(word_document_file_name))
-        return
-    
     if Verbose_Flag:
         output_filename="{0}-{1}-{2}.docx".format(input_filename[:-5], exam, language)
     else:
         output_filename="{0}-{1}.docx".format(exam, language)
     print("outputting modified data to {}".format(output_filename))
 
-    zipOut = zipfile.ZipFile(output_filename, 'w')
-    for fn in file_names:
-        if Verbose_Flag:
-            print("processing file: {}".format(fn))
-        # copy existing file to archive
-        if fn not in [word_document_file_name]:
-            file_contents = document.read(fn)
-        else:
-            if Verbose_Flag:
-                print("processing {}".format(fn))
-            xml_content = document.read(fn).decode('utf-8')
-            if fn == word_document_file_name:
-                file_contents = transform_file(xml_content, dict_of_entries, exam, language, cycle, args['picture'])
-                file_contents = removed_unneded_placeholder_text(file_contents )
-            else:
-                print("Unknown file {}".format(fn))
-        # in any case write the file_contents out
-        zipOut.writestr(fn, file_contents,  compress_type=compression)
-
-    zipOut.close()
-
-    document.close()
+    cover_template.write(output_filename, cover_values(dict_of_entries, exam, language, cycle, args['picture']))
 
 
 if __name__ == '__main__':
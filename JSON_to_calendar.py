@@ -57,6 +57,9 @@ import isodate                  # for parsing ISO 8601 dates and times
 import pytz                     # for time zones
 from dateutil.tz import tzlocal
 
+# for transforming the LaTeX in the abstracts
+import latex_to_html
+
 def utc_to_local(utc_dt):
     return utc_dt.replace(tzinfo=datetime.timezone.utc).astimezone(tz=None)
 
@@ -974,94 +977,6 @@ def expand_school_name(school):
         return "Unknown"
     
 
-def mathincluded(html):
-    # look for LaTeX math in the html
-    if html.find('\\(') >= 0 and html.find('\\)') >= 0:
-        return True
-    if html.find('\\[') >= 0 and html.find('\\]') >= 0:
-        return True
-    if html.find('$$') >= 0:
-        return True
-    return False
-
-def transform_urls(html):
-    # look for \\url{xxxxx} in the html
-    start_of_url=html.find('\\url{')
-    # print("start_of_url={}".format(start_of_url))
-    while start_of_url >= 0:
-        end_of_url=html.find('}', start_of_url+6)
-        # print("end_of_url={}".format(end_of_url))
-        url=html[start_of_url+5:end_of_url]
-        # print("url={}".format(url))
-        # <a href="xxxx">xxx</a>
-        html_anchor="<a href='{0}'>{0}</a>".format(url)
-        # print("html_anchor={}".format(html_anchor))
-        html=url=html[0:start_of_url]+html_anchor+html[end_of_url+1:]
-        # print("html={}".format(html))
-        start_of_url=html.find('\\url{')
-        # print("start_of_url={}".format(start_of_url))
-    return html
-
-def transform_math_for_cortina(html):
-    # \( equation \)
-    start_of_eqn=html.find('\\(')
-    # print("start_of_eqn={}".format(start_of_eqn))
-    while start_of_eqn >= 0:
-        offset=start_of_eqn+3
-        end_of_eqn=html.find('\\)', offset)
-        # print("end_of_eqn={}".format(end_of_eqn))
-        eqn=html[start_of_eqn+2:end_of_eqn]
-        # print("eqn={}".format(eqn))
-        # <span class=\"math-tex\">\\(x =  {-b \\pm \\sqrt{b^2-4ac} \\over 2a}\\)</span>
-        eqn_string="<span class=\'math-tex\'>\\({0}\\)</span>".format(eqn)
-        # print("eqn_string={}".format(eqn_string))
-        html_part1=url=html[0:start_of_eqn]+eqn_string
-        offset=len(html_part1)
-        html=html_part1+html[end_of_eqn+2:]
-        # print("html={}".format(html))
-        start_of_eqn=html.find('\\(', offset)
-        # print("start_of_eqn={}".format(start_of_eqn))
-    # \[ equation \]
-    start_of_eqn=html.find('\\[')
-    print("start_of_eqn={}".format(start_of_eqn))
-    while start_of_eqn >= 0:
-        offset=start_of_eqn+3
-        end_of_eqn=html.find('\\]', offset)
-        # print("end_of_eqn={}".format(end_of_eqn))
-        eqn=html[start_of_eqn+2:end_of_eqn]
-        # print("eqn={}".format(eqn))
-        # <span class=\"math-tex\">\\(x =  {-b \\pm \\sqrt{b^2-4ac} \\over 2a}\\)</span>
-        eqn_string="<span class=\'math-tex\'>\\[{0}\\]</span>".format(eqn)
-        # print("eqn_string={}".format(eqn_string))
-        html_part1=url=html[0:start_of_eqn]+eqn_string
-        offset=len(html_part1)
-        html=html_part1+html[end_of_eqn+2:]
-        # print("html={}".format(html))
-        start_of_eqn=html.find('\\[', offset)
-        # print("start_of_eqn={}".format(start_of_eqn))
-    # $$ equation $$
-    start_of_eqn=html.find('$$')
-    # print("start_of_eqn={}".format(start_of_eqn))
-    while start_of_eqn >= 0:
-        offset=start_of_eqn+3
-        end_of_eqn=html.find('$$', offset)
-        # print("end_of_eqn={}".format(end_of_eqn))
-        eqn=html[start_of_eqn+2:end_of_eqn]
-        # print("eqn={}".format(eqn))
-        # <span class=\"math-tex\">\\(x =  {-b \\pm \\sqrt{b^2-4ac} \\over 2a}\\)</span>
-        eqn_string="<span class=\'math-tex\'>\\[{0}\\]</span>".format(eqn)
-        # print("eqn_string={}".format(eqn_string))
-        html_part1=url=html[0:start_of_eqn]+eqn_string
-        offset=len(html_part1)
-        html=html_part1+html[end_of_eqn+2:]
-        # print("html={}".format(html))
-        start_of_eqn=html.find('$$', offset)
-        # print("start_of_eqn={}".format(start_of_eqn))
-    #
-    return html
-
-
-
 def process_event_from_JSON_file(json_file):
     global Verbose_Flag
     global Use_local_time_for_output_flag
@@ -1406,24 +1321,16 @@ def process_event_from_JSON_file(json_file):
         if abstracts_eng:
             # add lang attribute to paragraphs
             abstracts_eng=abstracts_eng.replace('<p>', '<p lang="en-US">')
-            # take care of URLs
-            if abstracts_eng.find('\\url{') >= 0:
-                abstracts_eng=transform_urls(abstracts_eng)
-
-            # transform equations
-            if mathincluded(abstracts_eng):
-                abstracts_eng=transform_math_for_cortina(abstracts_eng)
+            # take care of URLs, escaped percent symbols, and equations
+            abstracts_eng=latex_to_html.transform_abstract(abstracts_eng, 'cortina')
 
             data['paragraphs_text']['en_GB']= abstracts_eng
         if abstracts_swe:
             # add lang attribute to paragraphs
             abstracts_swe=abstracts_swe.replace('<p>', '<p lang="sv-SE">')
 
-            if abstracts_swe.find('\\url{') >= 0:
-                abstracts_swe=transform_urls(abstracts_swe)
-
-            if mathincluded(abstracts_swe):
-                abstracts_swe=transform_math_for_cortina(abstracts_swe)
+            # take care of URLs, escaped percent symbols, and equations
+            abstracts_swe=latex_to_html.transform_abstract(abstracts_swe, 'cortina')
 
             data['paragraphs_text']['sv_SE']= abstracts_swe
              
@@ -1525,7 +1432,7 @@ def process_event_from_JSON_file(json_file):
 
     # if there are any URLs, replace them with an HTML anchor
     if body_html.find('\\url{') >= 0:
-        body_html=transform_urls(body_html)
+        body_html=latex_to_html.transform_urls(body_html)
     if body_html.find('\\%') >= 0: # replace escaped percent symbols
         body_html=body_html.replace('\\%', '%')
 
@@ -1535,7 +1442,7 @@ def process_event_from_JSON_file(json_file):
     # adding the following MATHML snippet causes MathJAX to get loaded by Canvas
     # based on https://chalmers.instructure.com/courses/2/pages/math-slash-latex-in-canvas-pages?module_item_id=22197
     # see also https://community.canvaslms.com/t5/Canvas-Releases/Canvas-Release-Notes-2021-02-20/ta-p/434781#toc-hId-698876024
-    if mathincluded(body_html):
+    if latex_to_html.mathincluded(body_html):
         body_html=body_html+'<div><math></math></div>'
         print("Math included in HTML")
 
@@ -63,6 +63,9 @@ import isodate                  # for parsing ISO 8601 dates and times
 import pytz                     # for time zones
 from dateutil.tz import tzlocal
 
+# the tables of schools and programs (and the lookups in them)
+from diva_code_tables import schools_info, programcode_from_degree
+
 def utc_to_local(utc_dt):
     return utc_dt.replace(tzinfo=datetime.timezone.utc).astimezone(tz=None)
 
@@ -80,388 +83,6 @@ def datetime_to_local_string(canvas_time):
     else:
         return t1.strftime("%Y-%m-%d %H:%M")
 
-schools_info={'ABE': {'swe': 'Skolan för Arkitektur och samhällsbyggnad',
-                      'eng': 'School of Architecture and the Built Environment'},
-              'ITM': {'swe': 'Skolan för Industriell teknik och management',
-                      'eng': 'School of Industrial Engineering and Management'},
-              'SCI': {'swe': 'Skolan för Teknikvetenskap',
-                      'eng': 'School of Engineering Sciences'},
-              'CBH': {'swe': 'Skolan för Kemi, bioteknologi och hälsa',
-                      'eng': 'School of Engineering Sciences in Chemistry, Biotechnology and Health'},
-              'EECS': {'swe': 'Skolan för Elektroteknik och datavetenskap',
-                      'eng': 'School of Electrical Engineering and Computer Science'}
-              }
-
-programcodes={
-    'ARKIT': {'cycle': 2,
-	      'swe': 'Arkitektutbildning',
-              'eng': 'Degree Programme in Architecture'},
-    
-    'CBIOT': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i bioteknik',
-              'eng': 'Degree Programme in Biotechnology'},
-    
-    'CDATE': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i datateknik',
-              'eng': 'Degree Programme in Computer Science and Engineering'},
-    
-    'CDEPR': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i design och produktframtagning',
-              'eng': 'Degree Programme in Design and Product Realisation'},
-    
-    'CELTE': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i elektroteknik',
-              'eng': 'Degree Programme in Electrical Engineering'},
-    
-    'CENMI': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i energi och miljö',
-              'eng': 'Degree Programme in Energy and Environment'},
-    
-    'CFATE': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i farkostteknik',
-              'eng': 'Degree Programme in Vehicle Engineering'},
-    
-    'CINEK': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i industriell ekonomi',
-              'eng': 'Degree Programme in Industrial Engineering and Management'},
-    
-    'CINTE': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i informationsteknik',
-              'eng': 'Degree Programme in Information and Communication Technology'},
-    
-    'CITEH': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i industriell teknik och hållbarhet',
-              'eng': 'Degree Programme in Industrial Technology and Sustainability'},
-    
-    'CLGYM': {'cycle': 2,
-	      'swe': 'Civilingenjör och lärare',
-              'eng': 'Master of Science in Engineering and in Education'},
-    'CMAST': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i maskinteknik',
-              'eng': 'Degree Programme in Mechanical Engineering'},
-    'CMATD': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i materialdesign',
-              'eng': 'Degree Programme in Materials Design and Engineering'},
-    'CMEDT': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i medicinsk teknik',
-              'eng': 'Degree Programme in Medical Engineering'},
-    'CMETE': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i medieteknik',
-              'eng': 'Degree Programme in Media Technology'},
-    'COPEN': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning öppen ingång',
-              'eng': 'Degree Programme Open Entrance'},
-    'CSAMH': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i samhällsbyggnad',
-              'eng': 'Degree Programme in Civil Engineering and Urban Management'},
-    'CTFYS': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i teknisk fysik',
-              'eng': 'Degree Programme in Engineering Physics'},
-    'CTKEM': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i teknisk kemi',
-              'eng': 'Degree Programme in Engineering Chemistry'},
-    'CTMAT': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i teknisk matematik',
-              'eng': 'Degree Programme in Engineering Mathematics'},
-    'KPUFU': {'cycle': 2,
-	      'swe': 'Kompletterande pedagogisk utbildning för ämneslärarexamen i matematik, naturvetenskap och teknik för forskarutbildade',
-              'eng': 'Bridging Teacher Education Programme in Mathematics, Science and Technology for Graduates with a Third Cycle Degree'},
-    'KPULU': {'cycle': 2,
-	      'swe': 'Kompletterande pedagogisk utbildning',
-              'eng': 'Bridging Teacher Education Programme'},
-    'KUAUT': {'cycle': 2,
-	      'swe': 'Kompletterande utbildning för arkitekter med avslutad utländsk utbildning',
-              'eng': 'Bridging programme for architects with foreign qualifications'},
-    'KUIUT': {'cycle': 2,
-	      'swe': 'Kompletterande utbildning för ingenjörer med avslutad utländsk utbildning',
-              'eng': 'Bridging programme for engineers with foreign qualifications'},
-    'LÄRGR': {'cycle': 2,
-	      'swe': 'Ämneslärarutbildning med inriktning mot teknik, årskurs 7-9',
-              'eng': 'Subject Teacher Education in Technology, Secondary Education'},
-    'TAEEM': {'cycle': 2,
-	      'swe': 'Masterprogram, flyg- och rymdteknik',
-              'eng': "Master's Programme, Aerospace Engineering, 120 credits"},
-    'TAETM': {'cycle': 2,
-	      'swe': 'Masterprogram, aeroelasticitet i turbomaskiner',
-              'eng': "Master's Programme, Turbomachinery Aeromechanic University Training, 120 credits"},
-    'TARKM': {'cycle': 2,
-	      'swe': 'Masterprogram, arkitektur',
-              'eng': "Master's Programme, Architecture, 120 credits"},
-    'TBASA': {'cycle': 0,
-	      'swe': 'Tekniskt basår, KTH Flemingsberg',
-              'eng': 'Technical Preparatory Year'},
-    'TBASD': {'cycle': 0,
-	      'swe': 'Tekniskt basår, KTH Campus',
-              'eng': 'Technical Preparatory Year'},
-    'TBASE': {'cycle': 0,
-	      'swe': 'Tekniskt basår, KTH Södertälje',
-              'eng': 'Technical Preparatory Year'},
-    'TBTMD': {'cycle': 0,
-	      'swe': 'Tekniskt basår, termin 2, KTH Campus',
-              'eng': 'Technical Preparatory Semester'},
-    'TBTMH': {'cycle': 0,
-	      'swe': 'Tekniskt basår, termin 2, KTH Flemingsberg',
-              'eng': 'Technical Preparatory Semester'},
-    'TBTMS': {'cycle': 0,
-	      'swe': 'Tekniskt basår, termin 2, KTH Södertälje',
-              'eng': 'Technical Preparatory Semester'},
-    'TBYPH': {'cycle': 1,
-	      'swe': 'Högskoleutbildning i byggproduktion',
-              'eng': 'Degree Progr. in Construction Management'},
-    'TCAEM': {'cycle': 2,
-	      'swe': 'Masterprogram, husbyggnads- och anläggningsteknik',
-              'eng': "Master's Programme, Civil and Architectural Engineering, 120 credits"},
-    'TCOMK': {'cycle': 1,
-	      'swe': 'Kandidatprogram, informations- och kommunikationsteknik',
-              'eng': "Bachelor's Programme in Information and Communication Technology"},
-    'TCOMM': {'cycle': 2,
-	      'swe': 'Masterprogram, kommunikationssystem',
-              'eng': "Master's Programme, Communication Systems, 120 credits"},
-    'TCSCM': {'cycle': 2,
-	      'swe': 'Masterprogram, datalogi',
-              'eng': "Master's Programme, Computer Science, 120 credits"},
-    'TDEBM': {'cycle': 2,
-	      'swe': 'Magisterprogram, design och byggande i staden',
-              'eng': "Master's Programme, Urban Development and Design, 60 credits"},
-    'TDSEM': {'cycle': 2,
-	      'swe': 'Masterprogram, decentraliserade smarta energisystem',
-              'eng': "Master's Programme, Decentralized Smart Energy Systems, 120 credits"},
-    'TDTNM': {'cycle': 2,
-	      'swe': 'Masterprogram, datorsimuleringar inom teknik och naturvetenskap',
-              'eng': "Master's Programme, Computer Simulations for Science and Engineering, 120 credits"},
-    'TEBSM': {'cycle': 2,
-	      'swe': 'Masterprogram, inbyggda system',
-              'eng': "Master's Programme, Embedded Systems, 120 credits"},
-    'TEEEM': {'cycle': 2,
-	      'swe': 'Masterprogram, teknik och ledning för energi- och miljösystem',
-              'eng': "Master's Programme, Management and Engineering of Environment and Energy, 120 credits"},
-    'TEEGM': {'cycle': 2,
-	      'swe': 'Masterprogram, miljöteknik',
-              'eng': "Master's Programme, Environmental Engineering, 120 credits"},
-    'TEFRM': {'cycle': 2,
-	      'swe': 'Masterprogram, elektromagnetism, fusion och rymdteknik',
-              'eng': "Master's Programme, Electromagnetics, Fusion and Space Engineering, 120 credits"},
-    'TEILM': {'cycle': 2,
-	      'swe': 'Magisterprogram, entreprenörskap och innovationsledning',
-              'eng': "Master's Programme, Entrepreneurship and Innovation Management, 60 credits"},
-    'TEINM': {'cycle': 2,
-	      'swe': 'Masterprogram, innovations- och tillväxtekonomi',
-              'eng': "Master's Programme, Economics of Innovation and Growth, 120 credits"},
-    'TELPM': {'cycle': 2,
-	      'swe': 'Masterprogram, elkraftteknik',
-              'eng': "Master's Programme, Electric Power Engineering, 120 credits"},
-    'TFAFK': {'cycle': 1,
-	      'swe': 'Kandidatprogram, Fastighetsutveckling med fastighetsförmedling',
-              'eng': "Bachelor's Programme in Property Development and Agency"},
-    'TFAHM': {'cycle': 2,
-	      'swe': 'Magisterprogram, fastigheter',
-              'eng': "Master's Programme, Real Estate"},
-    'TFOBM': {'cycle': 2,
-	      'swe': 'Masterprogram, fastigheter och byggande',
-              'eng': "Master's Programme, Real Estate and Construction Management, 120 credits"},
-    'TFOFK': {'cycle': 1,
-	      'swe': 'Kandidatprogram, fastighet och finans',
-              'eng': "Bachelor's Programme in Real Estate and Finance"},
-    'TFORM': {'cycle': 2,
-	      'swe': 'Masterprogram, fordonsteknik',
-              'eng': "Master's Programme, Vehicle Engineering, 120 credits"},
-    'THSSM': {'cycle': 2,
-	      'swe': 'Masterprogram, hållbar samhällsplanering och stadsutformning',
-              'eng': "Master's Programme, Sustainable Urban Planning and Design, 120 credits"},
-    'TIBYH': {'cycle': 1,
-	      'swe': 'Högskoleingenjörsutbildning i byggteknik och design',
-              'eng': "Degree Programme in Constructional Engineering and Design"},
-    'TIDAA': {'cycle': 1,
-	      'swe': 'Högskoleingenjörsutbildning i datateknik, Flemingsberg',
-              'eng': "Degree Programme in Computer Engineering"},
-    'TIDAB': {'cycle': 1,
-	      'swe': 'Högskoleingenjörsutbildning i datateknik, Kista',
-              'eng': "Degree Programme in Computer Engineering"},
-    'TIDTM': {'cycle': 2,
-	      'swe': 'Masterprogram, idrottsteknologi',
-              'eng': "Master's Programme, Sports Technology"},
-    'TIEDB': {'cycle': 2,
-	      'swe': 'Högskoleingenjörsutbildning i elektronik och datorteknik',
-              'eng': "Degree Programme in Electronics and Computer Engineering"},
-    'TIEEM': {'cycle': 2,
-	      'swe': 'Masterprogram, innovativ uthållig energiteknik',
-              'eng': "Master's Programme, Innovative Sustainable Energy Engineering, 120 credits"},
-    'TIELA': {'cycle': 1,
-	      'swe': 'Högskoleingenjörsutbildning i elektroteknik, Flemingsberg',
-              'eng': "Degree Programme in Electrical Engineering"},
-    'TIEMM': {'cycle': 2,
-	      'swe': 'Masterprogram, industriell ekonomi',
-              'eng': "Master's Programme, Industrial Engineering and Management, 120 credits"},
-    'TIETM': {'cycle': 2,
-	      'swe': 'Masterprogram, innovativ energiteknik',
-              'eng': "Master's Programme, Energy Innovation, 120 credits"},
-    'TIHLM': {'cycle': 2,
-	      'swe': 'Masterprogram, innovativ teknik för en hälsosam livsmiljö',
-              'eng': "Master's Programme, Innovative Technology for Healthy Living"},
-    'TIIPS': {'cycle': 1,
-	      'swe': 'Högskoleingenjörsutbildning i industriell teknik och produktionsunderhåll',
-              'eng': "Degree Programme in Industrial Technology and Production Maintenance"},
-    'TIKED': {'cycle': 1,
-	      'swe': 'Högskoleingenjörsutbildning i kemiteknik',
-              'eng': "Degree Programme in Chemical Engineering"},
-    'TIMAS': {'cycle': 1,
-	      'swe': 'Högskoleingenjörsutbildning i maskinteknik, Södertälje',
-              'eng': "Degree Programme in Mechanical Engineering"},
-    'TIMBM': {'cycle': 2,
-	      'swe': 'Masterprogram, Industriell och miljöinriktad bioteknologi',
-              'eng': "Master's Programme, Industrial and Environmental Biotechnology, 120 credits"},
-    'TIMEL': {'cycle': 1,
-	      'swe': 'Högskoleingenjörsutbildning i medicinsk teknik',
-              'eng': "Degree Programme in Medical Technology"},
-    'TIMTM': {'cycle': 2,
-	      'swe': 'Masterprogram, interaktiv medieteknik',
-              'eng': "Master's Programme, Interactive Media Technology, 120 credits"},
-    'TINEM': {'cycle': 2,
-	      'swe': 'Masterprogram, industriell ekonomi',
-              'eng': "Master's Programme, Industrial Management, 120 credits"},
-    'TINNM': {'cycle': 2,
-	      'swe': 'Masterprogram, information och nätverksteknologi',
-              'eng': "Master's Programme, Information and Network Engineering, 120 credits"},
-    'TIPDM': {'cycle': 2,
-	      'swe': 'Masterprogram, integrerad produktdesign',
-              'eng': "Master's Programme, Integrated Product Design, 120 credits"},
-    'TIPUM': {'cycle': 2,
-	      'swe': 'Masterprogram, industriell produktutveckling',
-              'eng': "Master's Programme, Engineering Design, 120 credits"},
-    'TITEH': {'cycle': 1,
-	      'swe': 'Högskoleingenjörsutbildning i teknik och ekonomi',
-              'eng': "Degree Programme in Engineering and Economics"},
-    'TITHM': {'cycle': 2,
-	      'swe': 'Masterprogram, hållbar produktionsutveckling',
-              'eng': "Master's Programme, Sustainable Production Development, 120 credits"},
-    'TIVNM': {'cycle': 2,
-	      'swe': 'Masterprogram, ICT Innovation',
-              'eng': "Master's Programme, ICT Innovation, 120 credits"},
-    'TJVTM': {'cycle': 2,
-	      'swe': 'Masterprogram, järnvägsteknik',
-              'eng': "Master's Programme, Railway Engineering, 120 credits"},
-    'TKEMM': {'cycle': 2,
-	      'swe': 'Masterprogram, kemiteknik för energi och miljö',
-              'eng': "Master's Programme, Chemical Engineering for Energy and Environment, 120 credits"},
-    'TLODM': {'cycle': 2,
-	      'swe': 'Magisterprogram, ljusdesign',
-              'eng': "Master's Programme,  Architectural Lighting Design, 60 credits"},
-    'TMAIM': {'cycle': 2,
-	      'swe': 'Masterprogram, maskininlärning',
-              'eng': "Master's Programme, Machine Learning, 120 credits"},
-    'TMAKM': {'cycle': 2,
-	      'swe': 'Masterprogram, matematik',
-              'eng': "Master's Programme, Mathematics, 120 credits"},
-    'TMBIM': {'cycle': 2,
-	      'swe': 'Masterprogram, medicinsk bioteknologi',
-              'eng': "Master's Programme, Medical Biotechnology, 120 credits"},
-    'TMEGM': {'cycle': 2,
-	      'swe': 'Masterprogram, marinteknik',
-              'eng': "Master's Programme, Maritime Engineering, 120 credits"},
-    'TMESM': {'cycle': 2,
-	      'swe': 'Masterprogram, miljövänliga energisystem',
-              'eng': "Master's Programme, Environomical Pathways for Sustainable Energy Systems, 120 credits"},
-    'TMHIM': {'cycle': 2,
-	      'swe': 'Masterprogram, miljöteknik och hållbar infrastruktur',
-              'eng': "Master's Programme, Environmental Engineering and Sustainable Infrastructure, 120 credits"},
-    'TMLEM': {'cycle': 2,
-	      'swe': 'Masterprogram, medicinsk teknik',
-              'eng': "Master's Programme, Medical Engineering, 120 credits"},
-    'TMMMM': {'cycle': 2,
-	      'swe': 'Masterprogram, makromolekylära material',
-              'eng': "Master's Programme, Macromolecular Materials, 120 credits"},
-    'TMMTM': {'cycle': 2,
-	      'swe': 'Masterprogram, media management',
-              'eng': "Master's Programme, Media Management, 120 credits"},
-    'TMRSM': {'cycle': 2,
-	      'swe': 'Masterprogram, marina system',
-              'eng': "Master's Programme, Naval Architecture, 120 credits"},
-    'TMTLM': {'cycle': 2,
-	      'swe': 'Masterprogram, molekylära tekniker inom livsvetenskaperna',
-              'eng': "Master's Programme, Molecular Techniques in Life Science, 120 credits"},
-    'TMVTM': {'cycle': 2,
-	      'swe': 'Masterprogram, molekylär vetenskap och teknik',
-              'eng': "Master's Programme, Molecular Science and Engineering, 120 credits"},
-    'TNEEM': {'cycle': 2,
-	      'swe': 'Masterprogram, kärnenergiteknik',
-              'eng': "Master's Programme, Nuclear Energy Engineering, 120 credits"},
-    'TNTEM': {'cycle': 2,
-	      'swe': 'Masterprogram, nanoteknik',
-              'eng': "Master's Programme, Nanotechnology, 120 credits"},
-    'TPRMM': {'cycle': 2,
-	      'swe': 'Masterprogram, industriell produktion',
-              'eng': "Master's Programme, Production Engineering and Management, 120 credits"},
-    'TSCRM': {'cycle': 2,
-	      'swe': 'Masterprogram, systemteknik och robotik',
-              'eng': "Master's Programme, Systems, Control and Robotics, 120 credits"},
-    'TSEDM': {'cycle': 2,
-	      'swe': 'Masterprogram, programvaruteknik för distribuerade system',
-              'eng': "Master's Programme, Software Engineering of Distributed Systems, 120 credits"},
-    'TSUEM': {'cycle': 2,
-	      'swe': 'Masterprogram, hållbar energiteknik',
-              'eng': "Master's Programme, Sustainable Energy Engineering, 120 credits"},
-    'TSUTM': {'cycle': 2,
-	      'swe': 'Masterprogram, teknik och hållbar utveckling',
-              'eng': "Master's Programme, Sustainable Technology, 120 credits"},
-    'TTAHM': {'cycle': 2,
-	      'swe': 'Masterprogram, teknik, arbete och hälsa',
-              'eng': "Master's Programme, Technology, Work and Health, 120 credits"},
-    'TTEMM': {'cycle': 2,
-	      'swe': 'Masterprogram, teknisk mekanik',
-              'eng': "Master's Programme, Engineering Mechanics, 120 credits"},
-    'TTFYM': {'cycle': 2,
-	      'swe': 'Masterprogram, teknisk fysik',
-              'eng': "Master's Programme, Engineering Physics, 120 credits"},
-    'TTGTM': {'cycle': 2,
-	      'swe': 'Masterprogram, transport och geoinformatik',
-              'eng': "Master's Programme, Transport and Geoinformation Technology, 120 credits"},
-    'TTMAM': {'cycle': 2,
-	      'swe': 'Masterprogram, tillämpad matematik och beräkningsmatematik',
-              'eng': "Master's Programme, Applied and Computational Mathematics, 120 credits"},
-    'TTMIM': {'cycle': 2,
-	      'swe': 'Masterprogram, transport, mobilitet och innovation',
-              'eng': "Master's Programme, Transport, Mobility and Innovation"},
-    'TTMVM': {'cycle': 2,
-	      'swe': 'Masterprogram, teknisk materialvetenskap',
-              'eng': "Master's Programme, Engineering Materials Science, 120 credits"},
-    'TURSM': {'cycle': 2,
-	      'swe': 'Magisterprogram, urbana studier',
-              'eng': "Master's Programme, Urbanism Studies, 60 credits"},
-    'TSKKM': {'cycle': 2,
-	      'swe': 'Masterprogram, systemkonstruktion på kisel',
-              'eng': 'Master’s Programme, System-on-Chip Design'}
-}
-
-def cycle_of_program(s):
-    # replace ’ #x2019 with ' #x27
-    s=s.replace(u"\u2019", "'")
-    for p in programcodes:
-        pname_eng=programcodes[p]['eng']
-        pname_swe=programcodes[p]['swe']
-        e_offset=s.find(pname_eng)
-        s_offset=s.find(pname_swe)
-        if (e_offset >= 0) or (s_offset >= 0):
-            return programcodes[p]['cycle']
-    # secondary check
-    if s.find("Magisterprogram") >= 0 or s.find("Masterprogram") >= 0 or s.find("Master's") >= 0 or s.find("Master of Science") >= 0 or s.find("Civilingenjör") >= 0:
-        return 2
-    if s.find("Kandidatprogram") >= 0 or s.find("Bachelor's") >= 0 or s.find("Högskoleingenjör") >= 0:
-        return 1
-    print("cycle_of_program: Error in program name - did not match anything")
-    return None
-
-def programcode_from_degree(s):
-    # replace ’ #x2019 with ' #x27
-    s=s.replace(u"\u2019", "'")
-    for p in programcodes:
-        pname_eng=programcodes[p]['eng']
-        pname_swe=programcodes[p]['swe']
-        e_offset=s.find(pname_eng)
-        s_offset=s.find(pname_swe)
-        if (e_offset >= 0) or (s_offset >= 0):
-            return p
-    return None
-
 #############################
 ###### EDIT THIS STUFF ######
 #############################
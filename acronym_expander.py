@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# -*- mode: python; python-indent-offset: 4 -*-
+#
+# acronym_expander.py
+#
+# Purpose: Spell out the acronyms (glossaries and glossaries-extra commands) in the abstracts and keywords of a thesis,
+#          for extract_pseudo_JSON-from_PDF.py and cleanup_pseudo_JSON-from_LaTeX.py.
+#
+# The expander is built once from the acronyms read from acronyms.tex (by get_acronyms() in these programs):
+#   acronym_dict[label]={'acronym': acronym, 'phrase': phrase, 'option': option}
+# where option is the optional argument of \newacronym, for example "plural=NFs, firstplural=Network Functions (NFs)".
+#
+# A single compiled regular expression finds all of the commands (\gls, \glspl, \Gls, \Glspl, \GLS, \acrfull, \acrlong,
+# \acrshort, \glsxtrfull, \glsxtrlong, \glsxtrshort, \glsentryfull, \glsentrylong, \glsentryshort, and their
+# capitalized and plural versions), so a text is expanded in one pass from left to right.
+#
+# As in LaTeX, the first use of an acronym (with \gls, \glspl, or one of the full forms) spells it out as "phrase (acronym)"
+# and later uses give only the acronym. Which acronyms have been used is tracked for each call of expand(), so that each
+# abstract (or set of keywords) introduces its acronyms again.
+#
+# Example of use in a program:
+#
+#   import acronym_expander
+#   expander=acronym_expander.AcronymExpander(acronym_dict)
+#   for a in abstracts:
+#       abstracts[a]=expander.expand(abstracts[a])
+#
+# 2026-10-18
+#
+
+import re
+
+# for each command: (which form, plural, capitalization)
+#   form: 'gls' - "phrase (acronym)" on first use and then "acronym", 'full' - "phrase (acronym)", 'long' - "phrase", 'short' - "acronym"
+#   capitalization: None, 'first' for the first letter, or 'all'
+acronym_commands={
+    'gls':           ('gls',   False, None),
+    'Gls':           ('gls',   False, 'first'),
+    'GLS':           ('gls',   False, 'all'),
+    'glspl':         ('gls',   True,  None),
+    'Glspl':         ('gls',   True,  'first'),
+    'GLSpl':         ('gls',   True,  'all'),
+}
+for prefix in ['acr', 'glsxtr']:
+    for form in ['full', 'long', 'short']:
+        acronym_commands[prefix+form]=(form, False, None)
+        acronym_commands[prefix.capitalize()+form]=(form, False, 'first')
+        acronym_commands[prefix+form+'pl']=(form, True, None)
+        acronym_commands[prefix.capitalize()+form+'pl']=(form, True, 'first')
+for form in ['full', 'long', 'short']:
+    acronym_commands['glsentry'+form]=(form, False, None)
+    acronym_commands['Glsentry'+form]=(form, False, 'first')
+
+acronym_command_re=re.compile(r'\\(?P<command>{})\{{(?P<label>[^}}]*)\}}'.format(
+    '|'.join(sorted(acronym_commands, key=len, reverse=True))))
+
+
+def check_for_acronyms(a):
+    return acronym_command_re.search(a) is not None
+
+def collect_acronyms(a):
+    # returns the set of labels of the acronyms that are used in a
+    return set(m.group('label') for m in acronym_command_re.finditer(a))
+
+
+def split_option(option):
+    # "plural=NFs, firstplural=Network Functions (NFs)" -> {'plural': 'NFs', 'firstplural': 'Network Functions (NFs)'}
+    options=dict()
+    if not option:
+        return options
+    parts=[]
+    part=''
+    level=0
+    for c in option:
+        if c in '{(':
+            level=level+1
+        elif c in '})':
+            level=level-1
+        if c == ',' and level == 0:
+            parts.append(part)
+            part=''
+            continue
+        part=part+c
+    parts.append(part)
+    for p in parts:
+        key, sep, value = p.partition('=')
+        if not sep:
+            continue
+        value=value.strip()
+        if value.startswith('{') and value.endswith('}'):
+            value=value[1:-1]
+        options[key.strip()]=value
+    return options
+
+def capitalize(s, capitalization):
+    if not s or not capitalization:
+        return s
+    if capitalization == 'all':
+        return s.upper()
+    return s[0].upper()+s[1:]
+
+
+class AcronymExpander:
+    def __init__(self, acronym_dict):
+        # the texts of the different forms are worked out once for each acronym
+        self.entries=dict()
+        for label, ad in acronym_dict.items():
+            acronym=ad.get('acronym', None)
+            phrase=ad.get('phrase', None)
+            options=split_option(ad.get('option', None))
+            entry={'short': acronym, 'long': phrase}
+            if acronym:
+                entry['shortplural']=options.get('shortplural', options.get('plural', acronym+'s'))
+            if phrase:
+                entry['longplural']=options.get('longplural', phrase+'s')
+            if acronym and phrase:
+                entry['full']=options.get('first', "{0} ({1})".format(phrase, acronym))
+                entry['fullplural']=options.get('firstplural', "{0} ({1})".format(entry['longplural'], entry['shortplural']))
+            self.entries[label]=entry
+
+    def text_for(self, label, form, plural, spelled_out):
+        entry=self.entries.get(label, None)
+        if entry is None:
+            print("Missing acronym for {}".format(label))
+            return None
+        if form == 'gls':
+            if label in spelled_out:
+                form='short'
+            else:
+                form='full'
+        key=form+'plural' if plural else form
+        text=entry.get(key, None)
+        if text is None:
+            print("phrase or acronym are missing for label={}".format(label))
+            return None
+        if form == 'full':
+            spelled_out.add(label)
+        return text
+
+    def expand(self, a, spelled_out=None):
+        # spelled_out is the set of labels of the acronyms that have already been introduced,
+        # by default each call starts afresh
+        if not a:
+            return a
+        if spelled_out is None:
+            spelled_out=set()
+        def replace(m):
+            form, plural, capitalization = acronym_commands[m.group('command')]
+            text=self.text_for(m.group('label'), form, plural, spelled_out)
+            if text is None:    # leave what cannot be expanded as it is
+                return m.group(0)
+            return capitalize(text, capitalization)
+        return acronym_command_re.sub(replace, a)
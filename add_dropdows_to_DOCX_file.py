@@ -45,16 +45,7 @@ from dateutil.tz import tzlocal
 
 # for dealing with the DOCX file - which is a ZIP file
 import zipfile
-
-try:
-    import zlib
-    compression = zipfile.ZIP_DEFLATED
-except:
-    compression = zipfile.ZIP_STORED
-
-modes = { zipfile.ZIP_DEFLATED: 'deflated',
-          zipfile.ZIP_STORED:   'stored',
-          }
+import docx_rewriter            # copies the unchanged files in the ZIP file without recompressing them
 
 def lookup_value_for_name(name, dict_of_entries):
     for e in dict_of_entries:
@@ -91,34 +82,6 @@ def mark_first_field_as_dirty(content):
         content=prefix + middle + postfix
     return content
 
-def  do_first_replacement(content, r):
-    start_marker_1='<w:rPr><w:rStyle w:val="PlaceholderText"/>'
-    end_marker_1='</w:sdtContent></w:sdt></w:p>'
-
-    start_offset_1=content.find(start_marker_1)
-    if start_offset_1 > 0:
-        prefix=content[:start_offset_1]
-        end_offset_1=content.find(end_marker_1)
-        if end_offset_1 > 0:
-            postfix=content[end_offset_1:]
-            content=prefix + r + postfix
-    return content
-
-def do_second_replacement(content, r):
-    start_marker_1='<w:rPr><w:rStyle w:val="PlaceholderText"/>'
-    end_marker_2='</w:sdtContent></w:sdt><w:r w:rsidR'
-
-    start_offset_2=content.find(start_marker_1)
-    print("start_offset_2={}".format(start_offset_2))
-    if start_offset_2 > 0:
-        prefix=content[:start_offset_2]
-        end_offset_2=content.find(end_marker_2)
-        if end_offset_2 > 0:
-            print("end_offset_2={}".format(end_offset_2))
-            postfix=content[end_offset_2:]
-            content=prefix + r + postfix
-    return content
-
 # From English template
 # <w:placeholder><w:docPart w:val="5754E78FAA3547E690B6F86ACE31506E"/></w:placeholder><w:showingPlcHdr/>
 # <w:placeholder><w:docPart w:val="C14E00FD463348788D1BB7328469EF1C"/></w:placeholder><w:showingPlcHdr/>
@@ -126,36 +89,55 @@ def do_second_replacement(content, r):
 # <w:placeholder><w:docPart w:val="3B317945923C481B9F5903B92E839E1E"/></w:placeholder><w:showingPlcHdr/>
 # <w:placeholder><w:docPart w:val="276F62D9284D4835BE181771EADBAE35"/></w:placeholder><w:showingPlcHdr/>
 # This placeholder text means that you cannot turn of Developer->Dsign mode if you turn it on
-def removed_unneded_placeholder_text(content):
-    start_marker_1='<w:placeholder><w:docPart w:val="5754E78FAA3547E690B6F86ACE31506E"/></w:placeholder><w:showingPlcHdr/>'
-    start_offset_1=content.find(start_marker_1)
-    if start_offset_1 > 0:
-        prefix=content[:start_offset_1]
-        postfix=content[(start_offset_1+len(start_marker_1)):]
-        content=prefix + postfix
-
-    start_marker_1='<w:placeholder><w:docPart w:val="C14E00FD463348788D1BB7328469EF1C"/></w:placeholder><w:showingPlcHdr/>'
-    start_offset_1=content.find(start_marker_1)
-    if start_offset_1 > 0:
-        prefix=content[:start_offset_1]
-        postfix=content[(start_offset_1+len(start_marker_1)):]
-        content=prefix + postfix
-
-    start_marker_1='<w:placeholder><w:docPart w:val="3B317945923C481B9F5903B92E839E1E"/></w:placeholder><w:showingPlcHdr/>'
-    start_offset_1=content.find(start_marker_1)
-    if start_offset_1 > 0:
-        prefix=content[:start_offset_1]
-        postfix=content[(start_offset_1+len(start_marker_1)):]
-        content=prefix + postfix
-
-    start_marker_1='<w:placeholder><w:docPart w:val="276F62D9284D4835BE181771EADBAE35"/></w:placeholder><w:showingPlcHdr/>'
-    start_offset_1=content.find(start_marker_1)
-    if start_offset_1 > 0:
-        prefix=content[:start_offset_1]
-        postfix=content[(start_offset_1+len(start_marker_1)):]
-        content=prefix + postfix
-
-    return content
+unneeded_placeholder_texts=['<w:placeholder><w:docPart w:val="5754E78FAA3547E690B6F86ACE31506E"/></w:placeholder><w:showingPlcHdr/>',
+                            '<w:placeholder><w:docPart w:val="C14E00FD463348788D1BB7328469EF1C"/></w:placeholder><w:showingPlcHdr/>',
+                            '<w:placeholder><w:docPart w:val="3B317945923C481B9F5903B92E839E1E"/></w:placeholder><w:showingPlcHdr/>',
+                            '<w:placeholder><w:docPart w:val="276F62D9284D4835BE181771EADBAE35"/></w:placeholder><w:showingPlcHdr/>'
+                            ]
+
+# Each of the placeholder regions that are replaced starts with the PlaceholderText style.
+# The first region (the subject line) ends with the paragraph, the second (the level and points line)
+# ends where the following run starts.
+placeholder_start_marker='<w:rPr><w:rStyle w:val="PlaceholderText"/>'
+placeholder_end_markers=['</w:sdtContent></w:sdt></w:p>',
+                         '</w:sdtContent></w:sdt><w:r w:rsidR'
+                         ]
+
+# all of the strings to look for, compiled into a single pattern
+rewrite_pattern=re.compile('|'.join([re.escape(placeholder_start_marker)]+[re.escape(s) for s in unneeded_placeholder_texts]))
+
+# Rewrite the document in a single pass, the result is assembled from a list of pieces
+# (rather than copying the whole document for each replacement):
+#   the i-th placeholder region is replaced by region_replacements[i]
+#   the first occurrence of each of the unneeded placeholder texts is removed
+def rewrite_document_xml(content, region_replacements):
+    global Verbose_Flag
+    pieces=[]
+    position=0
+    region=0
+    removed=set()
+    m=rewrite_pattern.search(content, position)
+    while m:
+        matched=m.group(0)
+        if matched == placeholder_start_marker:
+            if region < len(region_replacements) and m.start() > 0:
+                end_offset=content.find(placeholder_end_markers[region], m.end())
+                if end_offset > 0:
+                    if Verbose_Flag:
+                        print("replacing placeholder region {0} at {1}:{2}".format(region, m.start(), end_offset))
+                    pieces.append(content[position:m.start()])
+                    pieces.append(region_replacements[region])
+                    position=end_offset
+                    region=region+1
+                    m=rewrite_pattern.search(content, position)
+                    continue
+        elif matched not in removed and m.start() > 0:
+            pieces.append(content[position:m.start()])
+            position=m.end()
+            removed.add(matched)
+        m=rewrite_pattern.search(content, m.end())
+    pieces.append(content[position:])
+    return ''.join(pieces)
 
 
 # the numeric value is the cycle
@@ -169,6 +151,8 @@ number_of_credits =[15, 30]
 def transform_file(content, dict_of_entries, exam, language, cycle):
     global Verbose_Flag
 
+    region_replacements=[]
+
     # # <property fmtid="xxxx" pid="2" name="property_name"><vt:lpwstr>property_value</vt:lpwstr>
     # #
     # for k in dict_of_entries:
@@ -259,11 +243,8 @@ def transform_file(content, dict_of_entries, exam, language, cycle):
 
         replacement_2=replacement_2a + replacement_2b + replacement_2c
 
-        # do first replacement
-        content=do_first_replacement(content, replacement_1)
-
-        # do second replacement
-        content=do_second_replacement(content, replacement_2)
+        # the first replacement is for the subject line, the second for the level and points line
+        region_replacements=[replacement_1, replacement_2]
 
     elif exam == 'högskoleexamen':
         cycle=1
@@ -352,11 +333,8 @@ def transform_file(content, dict_of_entries, exam, language, cycle):
 
         replacement_2=replacement_2a + replacement_2b + replacement_2c
 
-        # do first replacement
-        content=do_first_replacement(content, replacement_1)
-
-        # do second replacement
-        content=do_second_replacement(content, replacement_2)
+        # the first replacement is for the subject line, the second for the level and points line
+        region_replacements=[replacement_1, replacement_2]
 
 
     elif exam == 'arkitektexamen':
@@ -443,11 +421,8 @@ def transform_file(content, dict_of_entries, exam, language, cycle):
 
         replacement_2=replacement_2a + replacement_2b + replacement_2c
 
-        # do first replacement
-        content=do_first_replacement(content, replacement_1)
-
-        # do second replacement
-        content=do_second_replacement(content, replacement_2)
+        # the first replacement is for the subject line, the second for the level and points line
+        region_replacements=[replacement_1, replacement_2]
 
     elif exam == 'högskoleingenjörsexamen':
         cycle = 1
@@ -554,11 +529,8 @@ def transform_file(content, dict_of_entries, exam, language, cycle):
 
         replacement_2=replacement_2a + replacement_2b + replacement_2c
 
-        # do first replacement
-        content=do_first_replacement(content, replacement_1)
-
-        # do second replacement
-        content=do_second_replacement(content, replacement_2)
+        # the first replacement is for the subject line, the second for the level and points line
+        region_replacements=[replacement_1, replacement_2]
 
     elif exam == 'civilingenjörsexamen':
         cycle = 2
@@ -687,11 +659,8 @@ def transform_file(content, dict_of_entries, exam, language, cycle):
 
         replacement_2=replacement_2a + replacement_2b + replacement_2c
 
-        # do first replacement
-        content=do_first_replacement(content, replacement_1)
-
-        # do second replacement
-        content=do_second_replacement(content, replacement_2)
+        # the first replacement is for the subject line, the second for the level and points line
+        region_replacements=[replacement_1, replacement_2]
 
     elif exam == 'masterexamen': #
         cycle = 2
@@ -816,11 +785,8 @@ def transform_file(content, dict_of_entries, exam, language, cycle):
 
         replacement_2=replacement_2a + replacement_2b + replacement_2c
 
-        # do first replacement
-        content=do_first_replacement(content, replacement_1)
-
-        # do second replacement
-        content=do_second_replacement(content, replacement_2)
+        # the first replacement is for the subject line, the second for the level and points line
+        region_replacements=[replacement_1, replacement_2]
         
     elif exam == 'magisterexamen': #
         cycle = 2
@@ -917,11 +883,8 @@ def transform_file(content, dict_of_entries, exam, language, cycle):
 
         replacement_2=replacement_2a + replacement_2b + replacement_2c
 
-        # do first replacement
-        content=do_first_replacement(content, replacement_1)
-
-        # do second replacement
-        content=do_second_replacement(content, replacement_2)
+        # the first replacement is for the subject line, the second for the level and points line
+        region_replacements=[replacement_1, replacement_2]
         
     elif exam == 'CLGYM':
         cycle=2
@@ -1018,11 +981,8 @@ def transform_file(content, dict_of_entries, exam, language, cycle):
 
         replacement_2=replacement_2a + replacement_2b + replacement_2c
 
-        # do first replacement
-        content=do_first_replacement(content, replacement_1)
-
-        # do second replacement
-        content=do_second_replacement(content, replacement_2)
+        # the first replacement is for the subject line, the second for the level and points line
+        region_replacements=[replacement_1, replacement_2]
 
     elif exam == 'ämneslärarexamen': # note that the students have to do two 15 credit exjobbs pne in the 3 and the other in the 4th year
         cycle=1
@@ -1121,11 +1081,8 @@ def transform_file(content, dict_of_entries, exam, language, cycle):
 
         replacement_2=replacement_2a + replacement_2b + replacement_2c
 
-        # do first replacement
-        content=do_first_replacement(content, replacement_1)
-
-        # do second replacement
-        content=do_second_replacement(content, replacement_2)
+        # the first replacement is for the subject line, the second for the level and points line
+        region_replacements=[replacement_1, replacement_2]
 
     elif exam in ['KPULU', 'KPUFU']:
         cycle=2
@@ -1216,11 +1173,8 @@ def transform_file(content, dict_of_entries, exam, language, cycle):
 
         replacement_2=replacement_2a + replacement_2b + replacement_2c
 
-        # do first replacement
-        content=do_first_replacement(content, replacement_1)
-
-        # do second replacement
-        content=do_second_replacement(content, replacement_2)
+        # the first replacement is for the subject line, the second for the level and points line
+        region_replacements=[replacement_1, replacement_2]
 
     elif exam == 'both':
         # Examensarbete inom teknikområdet <teknikområde> och huvudområdet <huvudområde>
@@ -1476,11 +1430,8 @@ def transform_file(content, dict_of_entries, exam, language, cycle):
 
         replacement_2=replacement_2a + replacement_2b + replacement_2c
 
-        # do first replacement
-        content=do_first_replacement(content, replacement_1)
-
-        # do second replacement
-        content=do_second_replacement(content, replacement_2)
+        # the first replacement is for the subject line, the second for the level and points line
+        region_replacements=[replacement_1, replacement_2]
 
     elif exam == 'same':
         # both degrees are in the same subject
@@ -1622,16 +1573,13 @@ def transform_file(content, dict_of_entries, exam, language, cycle):
 
         replacement_2=replacement_2a + replacement_2b + replacement_2c
 
-        # do first replacement
-        content=do_first_replacement(content, replacement_1)
-
-        # do second replacement
-        content=do_second_replacement(content, replacement_2)
+        # the first replacement is for the subject line, the second for the level and points line
+        region_replacements=[replacement_1, replacement_2]
 
 
     else:
         print("Do not know how to handle an exam of type {}".format(exam))
-    return content
+    return rewrite_document_xml(content, region_replacements)
 
 exams=['arkitektexamen',
        'civilingenjörsexamen',
@@ -1787,6 +1735,7 @@ def main(argv):
 
     document = zipfile.ZipFile(input_filename)
     file_names=document.namelist()
+    document.close()
     if Verbose_Flag:
         print("File names in ZIP zip file: {}".format(file_names))
 
@@ -1802,28 +1751,10 @@ def main(argv):
         output_filename="{0}-{1}.docx".format(exam, language)
     print("outputting modified data to {}".format(output_filename))
 
-    zipOut = zipfile.ZipFile(output_filename, 'w')
-    for fn in file_names:
-        if Verbose_Flag:
-            print("processing file: {}".format(fn))
-        # copy existing file to archive
-        if fn not in [word_document_file_name]:
-            file_contents = document.read(fn)
-        else:
-            if Verbose_Flag:
-                print("processing {}".format(fn))
-            xml_content = document.read(fn).decode('utf-8')
-            if fn == word_document_file_name:
-                file_contents = transform_file(xml_content, dict_of_entries, exam, language, cycle)
-                file_contents = removed_unneded_placeholder_text(file_contents )
-            else:
-                print("Unknown file {}".format(fn))
-        # in any case write the file_contents out
-        zipOut.writestr(fn, file_contents,  compress_type=compression)
-
-    zipOut.close()
-
-    document.close()
+    # only word/document.xml is changed, all of the other files are copied without being decompressed
+    docx_rewriter.rewrite_docx(input_filename, output_filename,
+                               {word_document_file_name: lambda xml_content: transform_file(xml_content, dict_of_entries, exam, language, cycle)},
+                               verbose=Verbose_Flag)
 
 
 if __name__ == '__main__':
@@ -13,6 +13,11 @@
 # ./augment_author_matches_with_canvas_info.py --file titles-all-EECS-df1-author-matches.xlsx
 #   by default it processes the titles-all-EECS-df1-author-matches.xlsx file
 #
+# The Canvas users are looked up in an index (keyed by integration_id, sis_user_id, and login_id) that is
+# built from the enrollments in the degree project course rooms (and optionally all the users of an account, --account)
+# and saved in canvas_user_index.json (--index FILE), so later runs do not have to build it again (unless --rebuild).
+# The users that are not in the index are looked up together, via the students in each of their courses.
+#
 # 2022-12-07 G. Q. Maguire Jr.
 # buids on augment-kth-dept-people-URL.py
 # removed testing data
@@ -37,14 +42,17 @@ import datetime
 
 import shlex
 
+import canvas_client
+
 global baseUrl	# the base URL used for access to Canvas
 global header	# the header for all HTML requests
 global payload	# place to store additionally payload when needed for options to HTML requests
+global canvas	# shared client (pooled session, concurrent pagination) for the Canvas API
 
 # Based upon the options to the program, initialize the variables used to access Canvas gia HTML requests
 # Based upon the options to the program, initialize the variables used to access Canvas gia HTML requests
 def initialize(options):
-    global baseUrl, header, payload
+    global baseUrl, header, payload, canvas
 
     # styled based upon https://martin-thoma.com/configuration-files-in-python/
     if options.config_filename:
@@ -67,6 +75,7 @@ def initialize(options):
 
             header = {'Authorization' : 'Bearer ' + access_token}
             payload = {}
+            canvas=canvas_client.CanvasClient(baseUrl, header, verbose=Verbose_Flag)
     except:
         print("Unable to open configuration file named {}".format(config_file))
         print("Please create a suitable configuration file, the default name is config.json")
@@ -77,103 +86,34 @@ def initialize(options):
 # Canvas related routines
 #//////////////////////////////////////////////////////////////////////
 def users_in_course(course_id):
-    users_found_thus_far=[]
     # Use the Canvas API to get the list of users enrolled in this course
     #GET /api/v1/courses/:course_id/enrollments
 
     url = "{0}/courses/{1}/enrollments".format(baseUrl,course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    extra_parameters={'per_page': '100',
-                      'type': ['StudentEnrollment'],
+    extra_parameters={'type': ['StudentEnrollment'],
                       #'state': ['active', 'completed']
                       #'state': ['active', 'invited', 'creation_pending', 'deleted', 'rejected', 'completed', 'inactive']
     }
-    r = requests.get(url, params=extra_parameters, headers = header)
-    if Verbose_Flag:
-        print("result of getting enrollments: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            users_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)
-            page_response = r.json()  
-            for p_response in page_response:  
-                users_found_thus_far.append(p_response)
-
-    return users_found_thus_far
+    return canvas.get_all(url, extra_parameters)
 
 def students_in_course(course_id):
-    users_found_thus_far=[]
     # Use the Canvas API to get the list of users enrolled in this course
     #GET /api/v1/courses/:course_id/enrollments
 
     url = "{0}/courses/{1}/enrollments".format(baseUrl,course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    extra_parameters={'per_page': '100',
-                      'type': ['StudentEnrollment']
-    }
-    r = requests.get(url, params=extra_parameters, headers = header)
-    if Verbose_Flag:
-        print("result of getting enrollments: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            users_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)
-            page_response = r.json()  
-            for p_response in page_response:  
-                users_found_thus_far.append(p_response)
-
-    return users_found_thus_far
+    extra_parameters={'type': ['StudentEnrollment']}
+    return canvas.get_all(url, extra_parameters)
 
 def teachers_in_course(course_id):
-    users_found_thus_far=[]
     # Use the Canvas API to get the list of users enrolled in this course
     #GET /api/v1/courses/:course_id/enrollments
 
     url = "{0}/courses/{1}/enrollments".format(baseUrl,course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    extra_parameters={'per_page': '100',
-                      'type': ['TeacherEnrollment']
-    }
-    r = requests.get(url, params=extra_parameters, headers = header)
-    if Verbose_Flag:
-        print("result of getting enrollments: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
+    extra_parameters={'type': ['TeacherEnrollment']}
+    return canvas.get_all(url, extra_parameters)
 
-        for p_response in page_response:  
-            users_found_thus_far.append(p_response)
 
-        # the following is needed when the reponse has been paginated
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)
-            page_response = r.json()  
-            for p_response in page_response:  
-                users_found_thus_far.append(p_response)
-
-    return users_found_thus_far
-
-
-def users_in_accounts(account_id, user_id):
-    users_found_thus_far=[]
+def users_in_accounts(account_id, user_id=None):
     # Use the Canvas API to get the list of users in this account
     #GET /api/v1/accounts/:account_id/users
 
@@ -181,27 +121,7 @@ def users_in_accounts(account_id, user_id):
     if Verbose_Flag:
         print("url: {}".format(url))
 
-    extra_parameters={'per_page': '100',
-                      #'type': ['StudentEnrollment']
-    }
-    r = requests.get(url, params=extra_parameters, headers = header)
-    if Verbose_Flag:
-        print("result of getting users in account: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            users_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        # while r.links.get('next', False):
-        #     r = requests.get(r.links['next']['url'], headers=header)
-        #     page_response = r.json()  
-        #     for p_response in page_response:  
-        #         users_found_thus_far.append(p_response)
-
-    return users_found_thus_far
+    return canvas.get_all(url)
 
 
 
@@ -239,33 +159,11 @@ def user_profile_info(user_id):
 
 
 def courses_for_a_user(user_id):
-    courses_found_thus_far=[]
     # Use the Canvas API to get the list of users enrolled in this course
     # GET /api/v1/users/:user_id/courses
 
     url = "{0}/users/{1}/courses".format(baseUrl,user_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    extra_parameters={'per_page': '100' }
-    r = requests.get(url, params=extra_parameters, headers = header)
-    if Verbose_Flag:
-        print("result of getting courses for a uuser: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            courses_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)
-            page_response = r.json()  
-            for p_response in page_response:  
-                courses_found_thus_far.append(p_response)
-
-    return courses_found_thus_far
+    return canvas.get_all(url)
 
 
 def lookup_user_in_canvas_with_ladok_id(ladok_id):
@@ -273,46 +171,94 @@ def lookup_user_in_canvas_with_ladok_id(ladok_id):
     ui=user_info(user_id)
     return ui
 
-def lookup_user_by_ladok_id(ladok_id, all_users):
-    print("doing the lookup by the courses for ladok_id: {}".format(ladok_id))
+#//////////////////////////////////////////////////////////////////////
+# Index of the Canvas users
+#//////////////////////////////////////////////////////////////////////
+# The index maps each of the user's integration_id (the Ladok ID), sis_user_id (the KTHID), and login_id
+# to the information about the user. It is saved in a JSON file, so it only has to be built once.
+default_user_index_filename='canvas_user_index.json'
+index_keys={'integration_id': 'integration_id',
+            'sis_user_id':    'kthid',
+            'login_id':       'login_id'}
+
+user_index=dict()
+user_index_records=dict()       # Canvas user id -> record, this is what is saved
+
+def add_user_to_index(u):
+    # u is a Canvas user object, as in the 'user' of an enrollment
+    if not u or 'id' not in u:
+        return
+    record={ 'id':             u['id'],
+             'kthid':          u.get('sis_user_id', None),
+             'login_id':       u.get('login_id', None),
+             'name':           u.get('sortable_name', None),
+             'integration_id': u.get('integration_id', None)
+            }
+    # do not lose information that was known from another source
+    old_record=user_index_records.get(record['id'], None)
+    if old_record:
+        for k in record:
+            if record[k] is None:
+                record[k]=old_record[k]
+    user_index_records[record['id']]=record
+    for kind, field in index_keys.items():
+        if record[field]:
+            user_index["{0}:{1}".format(kind, record[field])]=record
+
+def lookup_user_in_index(kind, value):
+    return user_index.get("{0}:{1}".format(kind, value), None)
+
+def read_user_index(filename):
+    if not filename or not os.path.isfile(filename):
+        return False
+    with open(filename, 'r') as json_FH:
+        records=json.load(json_FH)
+    for r in records:
+        add_user_to_index({'id': r['id'], 'sis_user_id': r['kthid'], 'login_id': r['login_id'],
+                           'sortable_name': r['name'], 'integration_id': r['integration_id']})
+    print("read {0} users from {1}".format(len(records), filename))
+    return True
+
+def write_user_index(filename):
+    if not filename:
+        return
+    with open(filename, 'w') as json_FH:
+        json.dump(list(user_index_records.values()), json_FH)
+
+def add_enrollments_to_index(enrollments):
+    for e in enrollments:
+        add_user_to_index(e.get('user', None))
+
+def lookup_user_by_ladok_id(ladok_id):
+    record=lookup_user_in_index('integration_id', ladok_id)
+    if record:
+        return { 'id':         record['id'],
+                 'kthid':      record['kthid'],
+                 'login_id':   record['login_id'],
+                 'name':       record['name']
+                }
+    return None
 
-    for u in all_users:
-        integration_id=u['user'].get('integration_id', None)
-        if integration_id and integration_id == ladok_id:
-            canvas_user_id= u['user']['id']
-            kthid=u['user'].get('sis_user_id', None)
-            login_id=u['user'].get('login_id', None)
-            canvas_sortable_name=u['user'].get('sortable_name', None)
-            return { 'id':         canvas_user_id,
-                     'kthid':      kthid,
-                     'login_id':   login_id,
-                     'name':       canvas_sortable_name
-                    }
+# For the Ladok IDs that are not in the index, go deep (in a batch): get each user's courses and add
+# the students in all of these courses to the index. Each course is only fetched once, even if several
+# of the users are in it, and the requests are done concurrently.
+def lookup_users_by_ladok_ids_the_hard_way(ladok_ids):
+    ladok_ids=[l for l in ladok_ids if not lookup_user_in_index('integration_id', l)]
+    if not ladok_ids:
+        return
+    print("doing the lookup by the courses for {} ladok_ids".format(len(ladok_ids)))
 
-    # if you cannot find the student via the above, then go deep
-    user_id="sis_integration_id:{}".format(ladok_id)
-    ui=user_info(user_id)
-    if ui:
-        canvas_user_id= ui['id']
-        canvas_sortable_name=ui.get('sortable_name', None)
-        users_courses=courses_for_a_user(canvas_user_id)
+    user_infos=canvas.map(lookup_user_in_canvas_with_ladok_id, ladok_ids)
+    canvas_user_ids=[ui['id'] for ui in user_infos if ui]
 
+    course_ids=set()
+    for users_courses in canvas.map(courses_for_a_user, canvas_user_ids):
         for c in users_courses:
-            students=students_in_course(c)
-            for u in students:
-                integration_id=u['user'].get('integration_id', None)
-                if integration_id and integration_id == ladok_id:
-                    canvas_user_id= u['user']['id']
-                    kthid=u['user'].get('sis_user_id', None)
-                    login_id=u['user'].get('login_id', None)
-                    canvas_sortable_name=u['user'].get('sortable_name', None)
-                    return { 'id':         canvas_user_id,
-                             'kthid':      kthid,
-                             'login_id':   login_id,
-                             'name':       canvas_sortable_name
-                            }
+            course_ids.add(c['id'])
+    print("looking at the students in {} courses".format(len(course_ids)))
 
-    return None
+    for students in canvas.map(students_in_course, sorted(course_ids)):
+        add_enrollments_to_index(students)
 
 def lookup_user_by_ladok_id_hardway(ladok_id, all_users):
     print("doing the lookup by the courses for ladok_id: {}".format(ladok_id))
@@ -328,7 +274,7 @@ def lookup_user_by_ladok_id_hardway(ladok_id, all_users):
         print("users_courses: {}".format(users_courses))
 
         for c in users_courses:
-            students=students_in_course(c)
+            students=students_in_course(c['id'])
             for u in students:
                 integration_id=u['user'].get('integration_id', None)
                 if integration_id and integration_id == ladok_id:
@@ -374,6 +320,26 @@ def main(argv):
                       metavar="FILE"
                       )
 
+    parser.add_option('--index',
+                      dest="index_filename",
+                      default=default_user_index_filename,
+                      help="JSON file with the index of the Canvas users",
+                      metavar="FILE"
+                      )
+
+    parser.add_option('--rebuild',
+                      dest="rebuild",
+                      default=False,
+                      action="store_true",
+                      help="rebuild the index of the Canvas users, rather than using the saved index"
+                      )
+
+    parser.add_option('--account',
+                      dest="account",
+                      default=None,
+                      help="also add all of the users of this Canvas account to the index (requires admin rights)"
+                      )
+
     options, remainder = parser.parse_args()
     
     Verbose_Flag=options.verbose
@@ -1223,23 +1189,33 @@ def main(argv):
 
         
     ]
-    all_users=[]
-
-    for course_id in sorted(degree_project_course_rooms):
-        print("working on course room {}".format(course_id))
+    # the index only has to be built if there is no saved index
+    if options.rebuild or not read_user_index(options.index_filename):
+        if options.account:
+            print("getting the users in account {}".format(options.account))
+            for u in users_in_accounts(options.account):
+                add_user_to_index(u)
+
+        print("getting the users in {} course rooms".format(len(degree_project_course_rooms)))
         # look for user - then check for integration_id
-        users=users_in_course(course_id)
-        if Verbose_Flag:
-            print("users={}".format(users))
-        all_users.extend(users)
-        
-    #pprint.pprint(all_users)
+        for users in canvas.map(users_in_course, sorted(degree_project_course_rooms)):
+            if Verbose_Flag:
+                print("users={}".format(users))
+            add_enrollments_to_index(users)
+        write_user_index(options.index_filename)
+
+    ladok_ids=[row['integration_id'] for idx, row in working_df.iterrows() if isinstance(row['integration_id'], str)]
+    # the users that are not in the index are looked up together
+    misses=[l for l in dict.fromkeys(ladok_ids) if not lookup_user_by_ladok_id(l)]
+    if misses:
+        lookup_users_by_ladok_ids_the_hard_way(misses)
+        write_user_index(options.index_filename)
 
     for idx, row in working_df.iterrows():
         integration_id=row['integration_id']
         if Verbose_Flag:
             print("integration_id={}".format(integration_id))
-        canvas_user_info=lookup_user_by_ladok_id(integration_id, all_users)
+        canvas_user_info=lookup_user_by_ladok_id(integration_id)
         
         if Verbose_Flag:
             print("canvas_user_info={}".format(canvas_user_info))
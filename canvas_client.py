@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# -*- mode: python; python-indent-offset: 4 -*-
+#
+# canvas_client.py
+#
+# Purpose: A shared client for the Canvas LMS REST API that the other programs can use
+#          instead of each walking r.links['next'] with a fresh requests.get() per page.
+#
+# The client:
+#   - keeps a single pooled requests.Session (so the TCP/TLS connection is reused),
+#   - asks for per_page=100,
+#   - when the first response carries a 'last' link with a numeric page number, fetches
+#     the remaining pages concurrently (results are still yielded in page order),
+#   - falls back to following the 'next' links serially when Canvas uses bookmark style pagination,
+#   - honours Canvas's X-Rate-Limit-Remaining header by slowing down as the quota runs low
+#     and retrying when Canvas answers 403 "Rate Limit Exceeded",
+#   - returns generators, so a caller can stream (for example) the enrollments of a large course,
+#   - writes the cells of custom gradebook columns in bulk (see bulk_update_custom_columns()), skipping the cells
+#     whose content is unchanged and waiting for the Progress objects of the bulk updates.
+#
+# Example of use in a program:
+#
+#   import canvas_client
+#   ...
+#   canvas=canvas_client.CanvasClient(baseUrl, header, verbose=Verbose_Flag)
+#   for e in canvas.paginated("{0}/courses/{1}/enrollments".format(baseUrl, course_id), {'type': ['StudentEnrollment']}):
+#       print(e['user']['sortable_name'])
+#
+# Note that the Canvas API documentation describes the pagination at
+#   https://canvas.instructure.com/doc/api/file.pagination.html
+# and the rate limiting (throttling) at
+#   https://canvas.instructure.com/doc/api/file.throttling.html
+#
+# 2026-10-18
+#
+
+import json
+import sys
+import threading
+import time
+import urllib.parse
+
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Canvas never returns more than 100 items per page
+Canvas_max_per_page=100
+
+# number of pages that are fetched at the same time
+default_max_workers=8
+
+# When the remaining quota (as reported in X-Rate-Limit-Remaining) falls below
+# this value the client starts to pause between requests.
+# Canvas starts each token with a bucket of 700 units.
+rate_limit_low_water_mark=150.0
+
+# maximum number of retries when Canvas says that the rate limit was exceeded
+max_rate_limit_retries=5
+
+# number of cells of custom gradebook columns sent in each bulk update
+custom_column_chunk_size=500
+
+# seconds between checks of a Progress object, and the maximum time to wait for it
+progress_poll_interval=1.0
+progress_timeout=600
+
+
+def client_from_config(config_file, containers=False, verbose=False):
+    """Read a config.json style file and return a CanvasClient for it."""
+    try:
+        with open(config_file) as json_data_file:
+            configuration = json.load(json_data_file)
+            access_token=configuration["canvas"]["access_token"]
+            if containers:
+                baseUrl="http://"+configuration["canvas"]["host"]+"/api/v1"
+            else:
+                baseUrl="https://"+configuration["canvas"]["host"]+"/api/v1"
+            header = {'Authorization' : 'Bearer ' + access_token}
+    except:
+        print("Unable to open configuration file named {}".format(config_file))
+        print("Please create a suitable configuration file, the default name is config.json")
+        sys.exit()
+
+    return CanvasClient(baseUrl, header, verbose=verbose)
+
+
+def page_number_from_url(url):
+    # returns the numeric value of the page parameter or None if it is missing or is a bookmark
+    query=urllib.parse.parse_qs(urllib.parse.urlsplit(url).query)
+    page=query.get('page', None)
+    if not page:
+        return None
+    try:
+        return int(page[0])
+    except ValueError:
+        return None
+
+def url_for_page(url, page_number):
+    # replace the value of the page parameter in url by page_number
+    parts=urllib.parse.urlsplit(url)
+    query=urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+    query=[(k, v) for k, v in query if k != 'page']
+    query.append(('page', str(page_number)))
+    return urllib.parse.urlunsplit(parts._replace(query=urllib.parse.urlencode(query)))
+
+
+class CanvasClient:
+    def __init__(self, baseUrl, header, max_workers=default_max_workers, verbose=False):
+        self.baseUrl=baseUrl
+        self.header=header
+        self.max_workers=max_workers
+        self.verbose=verbose
+
+        self.session=requests.Session()
+        self.session.headers.update(header)
+        # make the connection pool large enough for all of the worker threads
+        adapter=HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.rate_limit_lock=threading.Lock()
+        self.rate_limit_remaining=None
+
+    def note_rate_limit(self, r):
+        remaining=r.headers.get('X-Rate-Limit-Remaining', None)
+        if remaining is None:
+            return
+        try:
+            remaining=float(remaining)
+        except ValueError:
+            return
+        with self.rate_limit_lock:
+            self.rate_limit_remaining=remaining
+
+    def wait_for_rate_limit(self):
+        # slow down in proportion to how close we are to running out of quota
+        with self.rate_limit_lock:
+            remaining=self.rate_limit_remaining
+        if remaining is not None and remaining < rate_limit_low_water_mark:
+            delay=(rate_limit_low_water_mark - remaining)/rate_limit_low_water_mark
+            if self.verbose:
+                print("X-Rate-Limit-Remaining={0}, pausing {1:.2f} seconds".format(remaining, delay))
+            time.sleep(delay)
+
+    def request(self, method, url, **kwargs):
+        for attempt in range(0, max_rate_limit_retries+1):
+            self.wait_for_rate_limit()
+            r=self.session.request(method, url, **kwargs)
+            self.note_rate_limit(r)
+            if r.status_code == 403 and 'Rate Limit Exceeded' in r.text and attempt < max_rate_limit_retries:
+                if self.verbose:
+                    print("rate limit exceeded for {0}, retry {1}".format(url, attempt+1))
+                time.sleep(2**attempt)
+                continue
+            return r
+        return r
+
+    def get(self, url, params=None):
+        return self.request('GET', url, params=params)
+
+    def put(self, url, data=None, json=None):
+        return self.request('PUT', url, data=data, json=json)
+
+    def post(self, url, data=None, json=None):
+        return self.request('POST', url, data=data, json=json)
+
+    def delete(self, url, data=None):
+        return self.request('DELETE', url, data=data)
+
+    def get_page(self, url):
+        r=self.get(url)
+        if self.verbose:
+            print("result of getting {0}: {1}".format(url, r.text))
+        if r.status_code == requests.codes.ok:
+            return r.json()
+        # the list that paginated() returns will be missing this page, so say so
+        print("Unable to get {0}, status code={1}, the list is incomplete".format(url, r.status_code))
+        return []
+
+    def paginated(self, url, params=None):
+        """Generator that yields each element of a (possibly paginated) Canvas list response."""
+        if params is None:
+            params=dict()
+        else:
+            params=dict(params)
+        params.setdefault('per_page', Canvas_max_per_page)
+
+        if self.verbose:
+            print("url: {}".format(url))
+
+        r=self.get(url, params=params)
+        if self.verbose:
+            print("result of getting {0}: {1}".format(url, r.text))
+        if r.status_code != requests.codes.ok:
+            print("Unable to get {0}, status code={1}".format(url, r.status_code))
+            return
+
+        page_response=r.json()
+        # a few endpoints return a dict wrapping the list, simply hand it back
+        if isinstance(page_response, dict):
+            yield page_response
+            return
+        for p_response in page_response:
+            yield p_response
+
+        first_page=page_number_from_url(r.links.get('current', {}).get('url', '')) or 1
+        last_page=page_number_from_url(r.links.get('last', {}).get('url', ''))
+        if last_page is not None and r.links.get('next', False):
+            # the page count is known, so fetch the rest of the pages concurrently
+            last_url=r.links['last']['url']
+            urls=[url_for_page(last_url, p) for p in range(first_page+1, last_page+1)]
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # executor.map returns the results in the order of urls
+                for page_response in executor.map(self.get_page, urls):
+                    for p_response in page_response:
+                        yield p_response
+            return
+
+        # bookmark style pagination - the only option is to follow the 'next' links
+        while r.links.get('next', False):
+            r=self.get(r.links['next']['url'])
+            if self.verbose:
+                print("result of getting a paginated response: {}".format(r.text))
+            if r.status_code != requests.codes.ok:
+                print("Unable to get {0}, status code={1}, the list is incomplete".format(r.url, r.status_code))
+                return
+            for p_response in r.json():
+                yield p_response
+
+    def get_all(self, url, params=None):
+        return list(self.paginated(url, params))
+
+    def wait_for_progress(self, progress):
+        """Poll a Canvas Progress object until it is completed or has failed, returns the last Progress object seen."""
+        url=progress.get('url', None) or "{0}/progress/{1}".format(self.baseUrl, progress['id'])
+        deadline=time.time()+progress_timeout
+        while progress.get('workflow_state', None) not in ['completed', 'failed'] and time.time() < deadline:
+            time.sleep(progress_poll_interval)
+            r=self.get(url)
+            if self.verbose:
+                print("result of getting progress: {}".format(r.text))
+            if r.status_code != requests.codes.ok:
+                break
+            progress=r.json()
+        return progress
+
+    def custom_column_entries(self, course_id, column_id):
+        """Return a dict mapping user_id to the content of the given custom gradebook column."""
+        #GET /api/v1/courses/:course_id/custom_gradebook_columns/:id/data
+        url="{0}/courses/{1}/custom_gradebook_columns/{2}/data".format(self.baseUrl, course_id, column_id)
+        return {e['user_id']: e.get('content', None) for e in self.paginated(url)}
+
+    def bulk_update_custom_columns(self, course_id, cells, skip_unchanged=True, chunk_size=custom_column_chunk_size):
+        """Set the content of cells of custom gradebook columns, cells is an iterable of (column_id, user_id, content).
+
+        When skip_unchanged is True, the existing entries of the columns are read first and only the cells
+        whose content differs are sent. An empty string as content deletes the cell.
+        Returns the number of cells that were updated.
+        """
+        # if a cell is given more than once, the last content wins
+        wanted=dict()
+        for column_id, user_id, content in cells:
+            wanted[(column_id, user_id)]='' if content is None else str(content)
+
+        if skip_unchanged:
+            column_ids=sorted(set(column_id for column_id, user_id in wanted))
+            existing=dict(zip(column_ids, self.map(lambda column_id: self.custom_column_entries(course_id, column_id), column_ids)))
+            changed=[]
+            for (column_id, user_id), content in wanted.items():
+                current=existing[column_id].get(user_id, None)
+                if current == content or (current is None and content == ''):
+                    continue
+                changed.append((column_id, user_id, content))
+            if self.verbose:
+                print("{0} of {1} cells of custom columns are unchanged".format(len(wanted)-len(changed), len(wanted)))
+        else:
+            changed=[(column_id, user_id, content) for (column_id, user_id), content in wanted.items()]
+
+        #PUT /api/v1/courses/:course_id/custom_gradebook_column_data
+        url="{0}/courses/{1}/custom_gradebook_column_data".format(self.baseUrl, course_id)
+        progresses=[]
+        for i in range(0, len(changed), chunk_size):
+            chunk=changed[i:i+chunk_size]
+            column_data=[{'column_id': column_id, 'user_id': user_id, 'content': content} for column_id, user_id, content in chunk]
+            r=self.put(url, json={'column_data': column_data})
+            if self.verbose:
+                print("result of bulk update of custom columns: {}".format(r.text))
+            if r.status_code != requests.codes.ok:
+                print("Unable to update {0} cells of custom columns, status code={1}".format(len(chunk), r.status_code))
+                continue
+            progresses.append((len(chunk), r.json()))
+
+        number_updated=0
+        for number_of_cells, progress in progresses:
+            progress=self.wait_for_progress(progress)
+            if progress.get('workflow_state', None) == 'completed':
+                number_updated=number_updated+number_of_cells
+            else:
+                print("Bulk update of {0} cells of custom columns did not complete: {1}".format(number_of_cells, progress))
+        return number_updated
+
+    def map(self, function, iterable):
+        """Apply function to each element of iterable using the client's worker threads, the results are in order."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(function, iterable))
@@ -34,6 +34,9 @@ import json
 # Use Python Pandas to create XLSX files
 import pandas as pd
 
+import kopps_cache
+import examiner_classes
+
 from bs4 import BeautifulSoup
 
 ################################
@@ -41,6 +44,8 @@ from bs4 import BeautifulSoup
 ################################
 KOPPSbaseUrl = 'https://www.kth.se'
 
+global kopps	# cache for the responses from KOPPS (see kopps_cache.py)
+
 English_language_code='en'
 Swedish_language_code='sv'
 
@@ -61,7 +66,7 @@ def v1_get_programmes():
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting v1 programme: {}".format(r.text))
     #
@@ -127,7 +132,7 @@ def get_dept_codes(language_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting department codes: {}".format(r.text))
     #
@@ -155,7 +160,7 @@ def get_dept_courses(dept_code, language_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting courses for a department: {}".format(r.text))
     #
@@ -173,7 +178,7 @@ def get_course_info(course_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting course info: {}".format(r.text))
     #
@@ -208,7 +213,7 @@ def get_course_rounds_info(course_code, r_info):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting course round info: {}".format(r.text))
     #
@@ -227,7 +232,7 @@ def v1_get_course_info(course_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting v1 course info: {}".format(r.text))
     #
@@ -416,7 +421,7 @@ def programme_syllabi(program_code):
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting programme_syllabi: {}".format(r.text))
     #
@@ -440,7 +445,7 @@ def course_codes_from_url(syllabus_url):
     if Verbose_Flag:
         print("course_list_url: " + course_list_url)
     #
-    r = requests.get(course_list_url)
+    r = kopps.get(course_list_url)
     if Verbose_Flag:
         print("result of getting course list: {}".format(r.text))
     #
@@ -485,7 +490,7 @@ def target_group_for_course(course_code):
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting course information: {}".format(r.text))
     #
@@ -519,46 +524,8 @@ def target_group_for_course(course_code):
     return None
 
 def compute_equivalence_class_of_teachers_in_courses(ces):
-    courses_with_same_examiners=dict()
-    set_of_examiners=dict()
-    courses_with_no_examiner=list()
-    i=0
-    for c in ces:
-        examiners_for_class=ces[c]
-        examiner_set=set(examiners_for_class)
-        if Verbose_Flag:
-            print("examiners_for_class={0} are {1}".format(c, examiner_set))
-        if not examiner_set:
-            if Verbose_Flag:
-                print("course {0} has no examiners".format(c))
-            courses_with_no_examiner.append(c)
-            continue
-        teacher_set_found = -1
-        for j in range(0, len(set_of_examiners)):
-            if examiner_set == set_of_examiners[j]:
-                if Verbose_Flag:
-                    print("already in set of examiners for j={}".format(j))
-                teacher_set_found=j
-                break
-        #
-        if teacher_set_found >= 0:
-            course_codes=courses_with_same_examiners.get(teacher_set_found, [])
-            if not course_codes:
-                if Verbose_Flag:
-                    print("inserted course code {0} in courses_with_same_examiners[{1}]".format(c, courses_with_same_examiners[teacher_set_found]))
-                courses_with_same_examiners[teacher_set_found]=[c]
-            else:
-                courses_with_same_examiners[teacher_set_found].append(c)
-                if Verbose_Flag:
-                    print("added {0} to courses_with_same_examiners[{1}] is {2}".format(c, teacher_set_found, examiner_set))
-        else:
-            next_set=len(set_of_examiners)
-            if Verbose_Flag:
-                print("new courses_with_same_examiners[{0}] is {1}".format(next_set, examiner_set))
-            set_of_examiners[next_set]=examiner_set
-            courses_with_same_examiners[next_set]=[c]
-    #
-    return {'courses': courses_with_same_examiners, 'examiners': set_of_examiners, 'courses_with_no_examiner': courses_with_no_examiner}
+    # group the courses by their set of examiners (see examiner_classes.py)
+    return examiner_classes.equivalence_classes(ces, verbose=Verbose_Flag)
 
 
 def examiners_courses(name, courses):
@@ -621,7 +588,7 @@ def v1_get_academic_year_plan_for_program(program_code, year):
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting v1 programme academic-year-plan: {}".format(r.text))
     #
@@ -708,6 +675,7 @@ def highest_level(thesisLevels):
 
 def main():
     global Verbose_Flag
+    global kopps
 
     default_picture_size=128
 
@@ -729,11 +697,21 @@ def main():
                       help="execute test code"
     )
 
+    parser.add_option('--offline',
+                      dest="offline",
+                      default=False,
+                      action="store_true",
+                      help="only use the cached KOPPS responses, do not access the network"
+    )
 
+    parser.add_option("--kopps_cache", dest="kopps_cache",
+                      default=kopps_cache.default_cache_filename,
+                      help="read and write cached KOPPS responses in FILE", metavar="FILE")
 
     options, remainder = parser.parse_args()
 
     Verbose_Flag=options.verbose
+    kopps=kopps_cache.KOPPSCache(options.kopps_cache, offline=options.offline, verbose=Verbose_Flag)
     if Verbose_Flag:
         print("ARGV      : {}".format(sys.argv[1:]))
         print("VERBOSE   : {}".format(options.verbose))
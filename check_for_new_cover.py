@@ -12,6 +12,8 @@
 # To get the correct pdfminer package od:
 # pip install pdfminer.six
 #
+# The page layouts are cached in a file shared by the checkers, see pdf_layout_cache.py.
+#
 # 2021-08-09 G. Q. Maguire Jr.
 #
 import re
@@ -43,7 +45,8 @@ import faulthandler
 # from pdfminer.pdfpage import PDFPage
 # from pdfminer.pdfparser import PDFParser
 
-from pdfminer.high_level import extract_pages
+# pdfminer's extract_pages, but with the layouts cached in a file shared by the checkers (see pdf_layout_cache.py)
+from pdf_layout_cache import extract_pages
 from pdfminer.layout import LTTextContainer, LTChar, LTLine, LAParams, LTFigure, LTImage, LTTextLineHorizontal, LTTextBoxHorizontal, LTCurve
 from typing import Iterable, Any
 from pdfminer.layout import LAParams, LTTextBox, LTText, LTChar, LTAnno
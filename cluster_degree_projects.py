@@ -2,9 +2,12 @@
 # -*- coding: utf-8 -*-
 # -*- mode: python; python-indent-offset: 4 -*-
 #
-# ./cluster_degree_projects.py file_name.xlsx
+# ./cluster_degree_projects.py --file file_name.xlsx
 #
-# reads in data from a file
+# reads in data from a file (the 'All' sheet of an XLSX file, a CSV file, or a Parquet file)
+#
+# The main subjects are stacked into one column of (school, subject) pairs and turned into a school x subject
+# incidence matrix, the overlaps between schools (and between all combinations of schools) are computed from it.
 #
 # outputs an updated spreadsheet finale_name_augmented.xlsx
 #
@@ -22,11 +25,53 @@ import argparse
 import sys
 import re
 import datetime
+import itertools
+import os
 
 # Use Python Pandas to create XLSX files
 import pandas as pd
 
 
+school_column='school.code'
+subject_columns=['mainSubjects_0_name.en', 'mainSubjects_1_name.en', 'mainSubjects_2_name.en']
+
+# Technology is a subject of most schools, so it does not say anything about the overlap
+subjects_to_ignore=['Technology']
+
+# only the school and subject columns are read, as reading all of the columns of the full KOPPS export is slow
+def read_degree_project_courses(input_file):
+    columns=[school_column]+subject_columns
+    extension=os.path.splitext(input_file)[1].lower()
+    if extension == '.parquet':
+        return pd.read_parquet(input_file, columns=columns)
+    if extension == '.csv':
+        return pd.read_csv(input_file, usecols=lambda c: c in columns)
+    return pd.read_excel(open(input_file, 'rb'), sheet_name='All', usecols=lambda c: c in columns)
+
+# stack the main subject columns into one column, giving a dataframe with one row per (school, subject)
+def melt_subjects(degree_project_courses_df):
+    present_columns=[c for c in subject_columns if c in degree_project_courses_df.columns]
+    melted_df=degree_project_courses_df.melt(id_vars=[school_column], value_vars=present_columns, value_name='subject')
+    melted_df=melted_df.rename(columns={school_column: 'school'})[['school', 'subject']]
+    # only keep the string values, i.e., not the missing values
+    melted_df=melted_df[melted_df['subject'].map(lambda x: isinstance(x, str))]
+    return melted_df.drop_duplicates().reset_index(drop=True)
+
+# a school x subject matrix with a 1 when the school has the subject as a main subject
+def school_subject_incidence(school_subject_df, schools_list):
+    df=school_subject_df[~school_subject_df['subject'].isin(subjects_to_ignore)]
+    df=df[df['school'].map(lambda x: isinstance(x, str))]
+    incidence=pd.crosstab(df['school'], df['subject']).clip(upper=1)
+    return incidence.reindex(index=schools_list, fill_value=0).sort_index(axis=1)
+
+# returns a dict with the combination of schools (a tuple) as key and the sorted list of subjects that are in exactly these schools
+def subjects_shared_by_combinations_of_schools(incidence):
+    subject_df=incidence.T
+    subject_df=subject_df[subject_df.sum(axis=1) > 0]
+    combination_of_subject=subject_df.apply(lambda row: tuple(row.index[row > 0]), axis=1)
+    grouped=combination_of_subject.groupby(combination_of_subject).groups
+    return {combination: sorted(grouped[combination]) for combination in sorted(grouped, key=lambda c: (len(c), c))}
+
 def main(argv):
     global Verbose_Flag
     global testing
@@ -56,7 +101,7 @@ def main(argv):
     # read in the sheets
     input_file=args['file']
 
-    degree_project_courses_df = pd.read_excel(open(input_file, 'rb'), sheet_name='All')
+    degree_project_courses_df = read_degree_project_courses(input_file)
     if Verbose_Flag:
 
         print("{}".format(degree_project_courses_df.columns))
@@ -84,94 +129,60 @@ def main(argv):
     ITM_color={'color': 'orange', 'transparency': 50}
     SCI_color={'color': 'blue', 'transparency': 50}
 
-    ABE_set=set()
-    CBH_set=set()
-    EECS_set=set()
-    ITM_set=set()
-    SCI_set=set()
-
-    subjects=set()
-    schools=set()
-
-    output_file="{0}-augmented.xlsx".format(input_file[:-5])
+    output_file="{0}-augmented.xlsx".format(os.path.splitext(input_file)[0])
     writer = pd.ExcelWriter(output_file, engine='xlsxwriter')
 
+    # one row per (school, subject) pair
+    school_subject_df=melt_subjects(degree_project_courses_df)
 
     # determine all of the subjects
-    for index, row in  degree_project_courses_df.iterrows():
-        school=row['school.code']
-        s0=row['mainSubjects_0_name.en']
-        s1=row['mainSubjects_1_name.en']
-        s2=row['mainSubjects_2_name.en']
-        if isinstance(school, str):
-            schools.add(school)
-        if isinstance(s0, str):
-            subjects.add(s0)
-        if isinstance(s1, str):
-            subjects.add(s1)
-        if isinstance(s2, str):
-            subjects.add(s2)
+    subjects=set(school_subject_df['subject'].unique())
+    schools=set([s for s in degree_project_courses_df[school_column].unique() if isinstance(s, str)])
 
     if Verbose_Flag:
         print("subjects={}".format(subjects))
     print("schools={}".format(schools))
 
+    incidence=school_subject_incidence(school_subject_df, sorted(schools))
+
     subjects_by_school=dict()
     for s in schools:
-        subjects_by_school[s]=set()
-
-    for index, row in  degree_project_courses_df.iterrows():
-        school=row['school.code']
-        s0=row['mainSubjects_0_name.en']
-        s1=row['mainSubjects_1_name.en']
-        s2=row['mainSubjects_2_name.en']
-        
-        if isinstance(s0, str):
-            if s0 != 'Technology':
-                subjects_by_school[school].add(s0)
-        if isinstance(s1, str):
-            if s1 != 'Technology':
-                subjects_by_school[school].add(s1)
-        if isinstance(s2, str):
-            if s2 != 'Technology':
-                subjects_by_school[school].add(s2)
-
+        subjects_by_school[s]=set(incidence.columns[incidence.loc[s] > 0])
     print("subjects_by_school={}".format(subjects_by_school))
 
-    overlap_combinations=[]
     schools_list=list(schools)
     print("schools_list={}".format(schools_list))
     schools_list.sort()
     print("schools_list sorted={}".format(schools_list))
 
-    overlapping_subjects=set()
+    # overlap[s][os] is the number of subjects that schools s and os have in common
+    overlap=incidence.dot(incidence.T)
 
+    overlap_combinations=[]
     output_line=""
     for s in schools_list:
         output_line="{0}\t{1}".format(output_line, s)
     print(output_line)
     for s in schools_list:
         output_line="{}".format(s)
-        for os in schools_list:
-            if s == os:
+        for other_school in schools_list:
+            if s == other_school:
                 output_line="{0}\t ".format(output_line)        
                 continue
-            overlap=subjects_by_school[s].intersection(subjects_by_school[os])
-            for o in overlap:
-                overlapping_subjects.add(o)
             if Verbose_Flag:
-                print("{0}|{1}: overlap={2}".format(s, os, overlap))
-            if overlap:
+                print("{0}|{1}: overlap={2}".format(s, other_school, subjects_by_school[s].intersection(subjects_by_school[other_school])))
+            if overlap.loc[s, other_school] > 0:
                 output_line="{0}\tX".format(output_line)
-                if Verbose_Flag:
-                    print("s={0}, os={1}, overlap={2}".format(s, os, overlap))
-                combo={s, os}
+                combo={s, other_school}
                 if combo not in overlap_combinations:
                     overlap_combinations.append(combo)
             else:
                 output_line="{0}\t ".format(output_line)        
         print(output_line)
 
+    # the subjects that are in more than one school
+    overlapping_subjects=set(incidence.columns[incidence.sum(axis=0) > 1])
+
     print("overlap_combinations={}".format(overlap_combinations))
 
     print("overlapping_subjects={}".format(overlapping_subjects))
@@ -194,6 +205,20 @@ def main(argv):
             else:
                 output_line="{0}\t ".format(output_line)
         print(output_line)
+
+    # all of the higher-order combinations: for each combination of schools, the subjects that are in exactly these schools
+    shared_subjects=subjects_shared_by_combinations_of_schools(incidence)
+    print("combinations of schools with subjects in common:")
+    for combination, subjects_in_common in shared_subjects.items():
+        if len(combination) > 1:
+            print("{0}: {1}".format(combination, subjects_in_common))
+
+    # the number of subjects that all the schools in a combination have in common, for combinations of two or more schools
+    for k in range(2, len(schools_list)+1):
+        for combination in itertools.combinations(schools_list, k):
+            number_in_common=int(incidence.loc[list(combination)].min(axis=0).sum())
+            if number_in_common > 0:
+                print("{0}: {1} subjects in common".format(combination, number_in_common))
     return
 
     # write out the exiting data for all of the pages
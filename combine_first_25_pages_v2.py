@@ -1,12 +1,16 @@
 #!/usr/bin/python3
 # -*- coding: utf-8 -*-
 #
-# ./combine_first_25_pages_v2.py input_directory output_file_name
+# ./combine_first_25_pages_v2.py [--jobs N] [--shard M] input_directory output_file_name
 #
 # Combine the first 25 pages of the PDF files in the input directory into a single PDF file
 #
+# The pages of each PDF file are selected by a pool of N worker processes (by default one per CPU),
+# then the selected pages are put into the output in the order of the file names.
+#
 # Output:
 #   outputs a single file with all of the extracted pages
+#   with --shard M, outputs files named output_file_name-001.pdf, output_file_name-002.pdf, ... each with the pages of M theses
 #
 #
 # G. Q. Maguire Jr.
@@ -19,6 +23,10 @@ import pprint
 import optparse
 import sys
 import os
+import io
+import contextlib
+
+from concurrent.futures import ProcessPoolExecutor
 
 import faulthandler
 
@@ -52,272 +60,343 @@ larger_offset_to_contents={
 }
 
 
-def combine_first_25_pages(input_dir, output_filename):
+def initialize_worker(verbose, anonymous):
+    global Verbose_Flag
+    global Anonymous_flag
+    Verbose_Flag=verbose
+    Anonymous_flag=anonymous
+
+def select_pages(input_dir, filename):
+    """Selects the pages of one PDF file to be combined.
+
+    Args:
+      input_dir: The directory containing the PDF file.
+      filename: The name of the PDF file.
+
+    Returns:
+      (filename, the (zero-based) indexes of the selected pages, the output printed while selecting them)
+    """
+    global Verbose_Flag
+    global Anonymous_flag
+
+    selected_pages=[]
+    filepath = os.path.join(input_dir, filename)
+    # the output is collected so that it can be printed in the order of the files
+    printed_output = io.StringIO()
+    with contextlib.redirect_stdout(printed_output):
+        if filename in larger_offset_to_contents:
+            max_pages_to_check=larger_offset_to_contents[filename]
+        else:
+            max_pages_to_check=25
+
+        if Verbose_Flag:
+            print(f"Working on {filename}")
+        try:
+            doc = pymupdf.open(filepath)
+            num_pages = len(doc)
+            references_found=False
+            contents_found=False
+            skip_last_page=False
+            for i in range(min(num_pages, max_pages_to_check)):
+                # get page
+                page=doc[i]
+                # always output the cover page (or first page)
+                if i == 0 and not Anonymous_flag:
+                    selected_pages.append(i)
+                    continue
+
+                # extract text
+
+                txt=page.get_text()
+                # skip the Printed by pages.
+                if i > 0 and "Printed by" in txt:
+                    continue
+                if i > 0 and "Universitetsservice US-AB" in txt:
+                    continue
+                if i > 0 and "public defense" in txt:
+                    continue
+                if i > 0 and "public defence" in txt:
+                    continue
+                # if i > 1 and ("Abstract" in txt or "ABSTRACT" in txt):
+                #     continue
+                # if i > 1 and ("Sammanfattning" in txt or "SAMMANFATTNING" in txt):
+                #     continue
+                if i > 1 and (txt.startswith("Contents") or txt.startswith("CONTENTS") or "Contents" in txt or "CONTENTS" in txt):
+                    contents_found=True
+                    print(f"{contents_found=} - found Contents")
+
+                if i > 1 and ("Table of contents" in txt or "Table of Contents" in txt):
+                    contents_found=True
+                    print(f"{contents_found=} -- found TOC")
+
+                if i > 1 and ("Innehållsförteckning" in txt or "INNEHÅLLSFÖRTECKNING" in txt):
+                    contents_found=True
+                    print(f"{contents_found=} -- found TOC (Swedish)")
+
+                if (filename.find('1430432') >= 0  or filename.find('1501686')  >= 0 or filename.find('1501686')  >= 0 or filename.find('1813632')  >= 0 or filename.find(' 1530592')  >= 0) and i > 1 and "Table of content" in txt:
+                    contents_found=True
+                    print(f"{contents_found=} -- special")
+
+                if (filename.find('1598473') >= 0 or filename.find('1598473')  >= 0 or filename.find(' 1611997')  >= 0) and i > 1 and "Table of c ontents" in txt:
+                    contents_found=True
+                    print(f"{contents_found=} -- special")
+
+                if filename.find('1427220') >= 0 and i == 10 and "Content" in txt:
+                    contents_found=True
+                    print(f"{contents_found=} -- special")
+                    
+                if filename.find('1704847') >= 0 and i == 2 and "Content" in txt:
+                    contents_found=True
+                    print(f"{contents_found=} -- special")
+                    
+                if filename.find('1626735') >= 0 and i == 7 and "Content" in txt:
+                    contents_found=True
+                    print(f"{contents_found=} -- special")
+                    
+                if filename.find('1656258') >= 0 and i == 13 and "Content" in txt:
+                    contents_found=True
+                    print(f"{contents_found=} -- special")
+                    
+                if filename.find('1733649') >= 0 and i == 11 and "Content" in txt:
+                    contents_found=True
+                    print(f"{contents_found=} -- special")
+                    
+                if filename.find('1563869') >= 0 and i == 13 and "CONTENT" in txt:
+                    contents_found=True
+                    print(f"{contents_found=} -- special")
+                    
+
+                if filename.find('1656355') >= 0 and i == 11 and txt.startswith("C O N T E N T S"):
+                    contents_found=True
+                    print(f"{contents_found=} -- special")
+
+                if filename.find('1656355') >= 0 and i == 13 and txt.startswith("C O N T E N T S"):
+                    contents_found=True
+                    print(f"{contents_found=} -- special")
+
+
+                # in 1754147-FULLTEXT01.pdf the Contents page is just hex codes - not recognizable as normal character, but starts with "􀀋􀀞􀀝􀀢􀀕􀀝􀀢􀀡􀀁"
+                if filename.find('1754147') >= 0 and i == 14:
+                    contents_found=True
+                    print(f"{contents_found=} -- special")
+                    
+                if (filename.find('1389270') >= 0 or filename.find('1557578') >= 0) and i > 1 and (txt.startswith("Index") or txt.startswith("Index") or "Index" in txt or "Index" in txt):
+                    contents_found=True
+                    print(f"{contents_found=} - found Index")
+
+                # special processing for a thesis that uses the singular rather than the plural
+                if (filename.find('1648564') >= 0 or filename.find('1528058') >= 0) and i > 1 and ("Reference" in txt or "REFERENCE" in txt):
+                    references_found=True
+                    print(f"{references_found=} - found reference")
+
+                # Reference literature
+                if (filename.find('1733649') >= 0 or filename.find('1464302') >= 0) and i == 13 and "Reference":
+                    references_found=True
+                    print(f"{references_found=} - found reference")
+
+                # 1650507-FULLTEXT03.pdf uses REFERENCE LIST
+                if i > 1 and ("References" in txt or "REFERENCES" in txt or "REFERENCE LIST" in txt):
+                    references_found=True
+                    print(f"{references_found=} . References")
+
+                if i > 2 and ("Bibliography" in txt or "BIBLIOGRAPHY" in txt):
+                    references_found=True
+                    print(f"{references_found=} -- found Bibliography")
+
+                if i > 2 and ("Tryckta källor" in txt or "Elektroniska källor" in txt or "Referenser" in txt):
+                    references_found=True
+                    print(f"{references_found=} -- found Tryckta/Elektroniska källor")
+
+                # If we reach "Chapter 1" without encountering the references, then assue that we should stop copying
+                if i > 0 and (txt.startswith("Chapter 1") or txt.startswith("CHAPTER 1")):
+                    references_found=True
+                    print(f"{references_found=} -- found Chapter 1")
+                    skip_last_page=True
+
+                # special case - the table of contents refers to "Sources" and following the TOC is "CHAPTER 1"
+                if filename.find('1400295') >= 0 and i == 14:
+                    references_found=True
+                    print(f"{references_found=} ** special")
+
+                # special case - 1654893
+                if filename.find('1654893') >= 0 and i == 13 and "1 \n Chapter 1" in txt:
+                    references_found=True
+                    print(f"{references_found=} ** special")
+                    skip_last_page=True
+                    
+                # special case
+                if filename.find('1735246') >= 0 and i == 17 and "1\nChap\nter 1" in txt:
+                    references_found=True
+                    print(f"{references_found=} ** special")
+                    skip_last_page=True
+                    
+                # special case
+                if filename.find('1501920') >= 0 and i == 17 and "1 Introduction" in txt:
+                    references_found=True
+                    print(f"{references_found=} ** special")
+                    skip_last_page=True
+
+                # special case - TOC has "REFEREN CES"
+                if filename.find('1643849') >= 0 and i == 13 and "INTRODUCTION" in txt:
+                    references_found=True
+                    print(f"{references_found=} ** special")
+                    skip_last_page=True
+
+                # special case
+                if filename.find('1646381') >= 0 and i == 15 and "1 Introduction" in txt:
+                    references_found=True
+                    print(f"{references_found=} ** special")
+                    skip_last_page=True
+                    
+                # special case as the string appears as "Reference s"
+                if filename.find('1756272') >= 0 and i > 0 and "This first chapter" in txt:
+                    references_found=True
+                    print(f"{references_found=} ** special")
+                    skip_last_page=True
+                    
+                # special case as the string appears as "Reference s"
+                if filename.find('1703858') >= 0 and i > 0 and "I give a general overview of drug delivery to the lung" in txt:
+                    references_found=True
+                    print(f"{references_found=} ** special")
+                    skip_last_page=True
+
+                if filename.find('1501689') >= 0 and i == 11 and "Under  mitten av 1990 -talet arbetade jag som skiftgående me kanisk reparatör" in txt:
+                    references_found=True
+                    print(f"{references_found=} ** special")
+                    skip_last_page=True
+
+                # special case as the string appears as "Referenc es"
+                if filename.find('1530592') >= 0 and i == 12 and "Referenc es" in txt:
+                    references_found=True
+                    print(f"{references_found=} ** special")
+
+                # special case as the string appears as "Refe r\nences"
+                if filename.find('1596193') >= 0 and i == 13 and "Refe r\nences" in txt:
+                    references_found=True
+                    print(f"{references_found=} ** special")
+
+                # special case as the string appears as "REFERENCE S"
+                if filename.find('1528058') >= 0 and i == 9 and "REFERENCE S" in txt:
+                    references_found=True
+                    print(f"{references_found=} ** special")
+
+                # special case
+                if filename.find('1751042') >= 0 and i == 10 and "Refe r\nences" in txt:
+                    references_found=True
+                    print(f"{references_found=} ** special")
+
+                # special case
+                if filename.find('1660342') >= 0 and i == 12 and "R\neferences" in txt:
+                    references_found=True
+                    print(f"{references_found=} ** special")
+
+
+                # special case
+                if filename.find('1704847') >= 0 and i == 4 and "Preface" in txt:
+                    references_found=True
+                    print(f"{references_found=} ** special")
+
+
+                # The TOC shows "BIBLIOGRAPHY" but the text is actually "bibliography"
+                if filename.find('1557397') >= 0 and i == 7 and "bibliography" in txt:
+                    references_found=True
+                    print(f"{references_found=} ** special")
+
+
+                # special processing - a TOC has been seen .- now we see a LIST OFIGURES, ...
+                if contents_found and "LIST OF" in txt:
+                    references_found=True
+                    print(f"{references_found=} - found LIST OF")
+                    skip_last_page=True
+
+                if contents_found:
+                    if len(txt) > 0: # no need to write empty pages, i.e., those without (extractable) text
+                        if not skip_last_page:
+                            selected_pages.append(i)
+
+                # stop copying pages when you have processed a page with "References" on it.
+                if references_found:
+                    print(f"[stopping at page {i}; {contents_found=} ")
+                    break
+
+                if i >= max_pages_to_check - 1:
+                    print(f"[stopping at page {i}; {contents_found=}; {references_found=}")
+                    break
+
+        except Exception as err:
+            print(f"Unexpected {err=}, {type(err)=}")
+
+    return (filename, selected_pages, printed_output.getvalue())
+
+
+def page_ranges(page_indexes):
+    """Groups the page indexes into runs of consecutive pages, so that each run is inserted with one call."""
+    ranges=[]
+    for i in page_indexes:
+        if ranges and ranges[-1][1] == i - 1:
+            ranges[-1][1]=i
+        else:
+            ranges.append([i, i])
+    return ranges
+
+def shard_filename(output_filename, shard_number):
+    root, ext = os.path.splitext(output_filename)
+    return f"{root}-{shard_number:03d}{ext or '.pdf'}"
+
+def combine_first_25_pages(input_dir, output_filename, jobs=1, theses_per_shard=0):
     """Combines the first 25 pages of all PDFs in a directory into a single PDF.
 
+    The pages of each PDF are selected in parallel (by jobs worker processes), then the selected
+    pages are assembled in the order of the file names.
+
     Args:
       input_dir: The directory containing the PDF files.
       output_filename: The filename for the combined PDF.
+      jobs: The number of worker processes that select the pages.
+      theses_per_shard: If non-zero, the number of theses in each output file, named <output_filename>-NNN.pdf
     """
     global Verbose_Flag
     global Filter_flag
     global Anonymous_flag
 
+    # skip files with know problems
+    filenames=[filename for filename in sorted(os.listdir(input_dir))
+               if filename.endswith(".pdf") and filename not in pdf_files_to_ignore]
+
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=initialize_worker, initargs=(Verbose_Flag, Anonymous_flag)) as executor:
+            selections=list(executor.map(select_pages, [input_dir]*len(filenames), filenames, chunksize=4))
+    else:
+        selections=[select_pages(input_dir, filename) for filename in filenames]
+
     # create new empty document
     output_document = pymupdf.open(None)
-
-    for filename in os.listdir(input_dir):
-        if filename.endswith(".pdf"):
-            filepath = os.path.join(input_dir, filename)
-
-            # skip files with know problems
-            if filename in pdf_files_to_ignore:
-                continue
-
-            if filename in larger_offset_to_contents:
-                max_pages_to_check=larger_offset_to_contents[filename]
-            else:
-                max_pages_to_check=25
-
-            if Verbose_Flag:
-                print(f"Working on {filename}")
-            try:
-                doc = pymupdf.open(filepath)
-                num_pages = len(doc)
-                references_found=False
-                contents_found=False
-                skip_last_page=False
-                for i in range(min(num_pages, max_pages_to_check)):
-                    # get page
-                    page=doc[i]
-                    # always output the cover page (or first page)
-                    if i == 0 and not Anonymous_flag:
-                        output_document.insert_pdf(doc, from_page=i, to_page=i)
-                        continue
-
-                    # extract text
-
-                    txt=page.get_text()
-                    # skip the Printed by pages.
-                    if i > 0 and "Printed by" in txt:
-                        continue
-                    if i > 0 and "Universitetsservice US-AB" in txt:
-                        continue
-                    if i > 0 and "public defense" in txt:
-                        continue
-                    if i > 0 and "public defence" in txt:
-                        continue
-                    # if i > 1 and ("Abstract" in txt or "ABSTRACT" in txt):
-                    #     continue
-                    # if i > 1 and ("Sammanfattning" in txt or "SAMMANFATTNING" in txt):
-                    #     continue
-                    if i > 1 and (txt.startswith("Contents") or txt.startswith("CONTENTS") or "Contents" in txt or "CONTENTS" in txt):
-                        contents_found=True
-                        print(f"{contents_found=} - found Contents")
-
-                    if i > 1 and ("Table of contents" in txt or "Table of Contents" in txt):
-                        contents_found=True
-                        print(f"{contents_found=} -- found TOC")
-
-                    if i > 1 and ("Innehållsförteckning" in txt or "INNEHÅLLSFÖRTECKNING" in txt):
-                        contents_found=True
-                        print(f"{contents_found=} -- found TOC (Swedish)")
-
-                    if (filename.find('1430432') >= 0  or filename.find('1501686')  >= 0 or filename.find('1501686')  >= 0 or filename.find('1813632')  >= 0 or filename.find(' 1530592')  >= 0) and i > 1 and "Table of content" in txt:
-                        contents_found=True
-                        print(f"{contents_found=} -- special")
-
-                    if (filename.find('1598473') >= 0 or filename.find('1598473')  >= 0 or filename.find(' 1611997')  >= 0) and i > 1 and "Table of c ontents" in txt:
-                        contents_found=True
-                        print(f"{contents_found=} -- special")
-
-                    if filename.find('1427220') >= 0 and i == 10 and "Content" in txt:
-                        contents_found=True
-                        print(f"{contents_found=} -- special")
-                        
-                    if filename.find('1704847') >= 0 and i == 2 and "Content" in txt:
-                        contents_found=True
-                        print(f"{contents_found=} -- special")
-                        
-                    if filename.find('1626735') >= 0 and i == 7 and "Content" in txt:
-                        contents_found=True
-                        print(f"{contents_found=} -- special")
-                        
-                    if filename.find('1656258') >= 0 and i == 13 and "Content" in txt:
-                        contents_found=True
-                        print(f"{contents_found=} -- special")
-                        
-                    if filename.find('1733649') >= 0 and i == 11 and "Content" in txt:
-                        contents_found=True
-                        print(f"{contents_found=} -- special")
-                        
-                    if filename.find('1563869') >= 0 and i == 13 and "CONTENT" in txt:
-                        contents_found=True
-                        print(f"{contents_found=} -- special")
-                        
-
-                    if filename.find('1656355') >= 0 and i == 11 and txt.startswith("C O N T E N T S"):
-                        contents_found=True
-                        print(f"{contents_found=} -- special")
-
-                    if filename.find('1656355') >= 0 and i == 13 and txt.startswith("C O N T E N T S"):
-                        contents_found=True
-                        print(f"{contents_found=} -- special")
-
-
-                    # in 1754147-FULLTEXT01.pdf the Contents page is just hex codes - not recognizable as normal character, but starts with "􀀋􀀞􀀝􀀢􀀕􀀝􀀢􀀡􀀁"
-                    if filename.find('1754147') >= 0 and i == 14:
-                        contents_found=True
-                        print(f"{contents_found=} -- special")
-                        
-                    if (filename.find('1389270') >= 0 or filename.find('1557578') >= 0) and i > 1 and (txt.startswith("Index") or txt.startswith("Index") or "Index" in txt or "Index" in txt):
-                        contents_found=True
-                        print(f"{contents_found=} - found Index")
-
-                    # special processing for a thesis that uses the singular rather than the plural
-                    if (filename.find('1648564') >= 0 or filename.find('1528058') >= 0) and i > 1 and ("Reference" in txt or "REFERENCE" in txt):
-                        references_found=True
-                        print(f"{references_found=} - found reference")
-
-                    # Reference literature
-                    if (filename.find('1733649') >= 0 or filename.find('1464302') >= 0) and i == 13 and "Reference":
-                        references_found=True
-                        print(f"{references_found=} - found reference")
-
-                    # 1650507-FULLTEXT03.pdf uses REFERENCE LIST
-                    if i > 1 and ("References" in txt or "REFERENCES" in txt or "REFERENCE LIST" in txt):
-                        references_found=True
-                        print(f"{references_found=} . References")
-
-                    if i > 2 and ("Bibliography" in txt or "BIBLIOGRAPHY" in txt):
-                        references_found=True
-                        print(f"{references_found=} -- found Bibliography")
-
-                    if i > 2 and ("Tryckta källor" in txt or "Elektroniska källor" in txt or "Referenser" in txt):
-                        references_found=True
-                        print(f"{references_found=} -- found Tryckta/Elektroniska källor")
-
-                    # If we reach "Chapter 1" without encountering the references, then assue that we should stop copying
-                    if i > 0 and (txt.startswith("Chapter 1") or txt.startswith("CHAPTER 1")):
-                        references_found=True
-                        print(f"{references_found=} -- found Chapter 1")
-                        skip_last_page=True
-
-                    # special case - the table of contents refers to "Sources" and following the TOC is "CHAPTER 1"
-                    if filename.find('1400295') >= 0 and i == 14:
-                        references_found=True
-                        print(f"{references_found=} ** special")
-
-                    # special case - 1654893
-                    if filename.find('1654893') >= 0 and i == 13 and "1 \n Chapter 1" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
-                        skip_last_page=True
-                        
-                    # special case
-                    if filename.find('1735246') >= 0 and i == 17 and "1\nChap\nter 1" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
-                        skip_last_page=True
-                        
-                    # special case
-                    if filename.find('1501920') >= 0 and i == 17 and "1 Introduction" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
-                        skip_last_page=True
-
-                    # special case - TOC has "REFEREN CES"
-                    if filename.find('1643849') >= 0 and i == 13 and "INTRODUCTION" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
-                        skip_last_page=True
-
-                    # special case
-                    if filename.find('1646381') >= 0 and i == 15 and "1 Introduction" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
-                        skip_last_page=True
-                        
-                    # special case as the string appears as "Reference s"
-                    if filename.find('1756272') >= 0 and i > 0 and "This first chapter" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
-                        skip_last_page=True
-                        
-                    # special case as the string appears as "Reference s"
-                    if filename.find('1703858') >= 0 and i > 0 and "I give a general overview of drug delivery to the lung" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
-                        skip_last_page=True
-
-                    if filename.find('1501689') >= 0 and i == 11 and "Under  mitten av 1990 -talet arbetade jag som skiftgående me kanisk reparatör" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
-                        skip_last_page=True
-
-                    # special case as the string appears as "Referenc es"
-                    if filename.find('1530592') >= 0 and i == 12 and "Referenc es" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
-
-                    # special case as the string appears as "Refe r\nences"
-                    if filename.find('1596193') >= 0 and i == 13 and "Refe r\nences" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
-
-                    # special case as the string appears as "REFERENCE S"
-                    if filename.find('1528058') >= 0 and i == 9 and "REFERENCE S" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
-
-                    # special case
-                    if filename.find('1751042') >= 0 and i == 10 and "Refe r\nences" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
-
-                    # special case
-                    if filename.find('1660342') >= 0 and i == 12 and "R\neferences" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
-
-
-                    # special case
-                    if filename.find('1704847') >= 0 and i == 4 and "Preface" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
-
-
-                    # The TOC shows "BIBLIOGRAPHY" but the text is actually "bibliography"
-                    if filename.find('1557397') >= 0 and i == 7 and "bibliography" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
-
-
-                    # special processing - a TOC has been seen .- now we see a LIST OFIGURES, ...
-                    if contents_found and "LIST OF" in txt:
-                        references_found=True
-                        print(f"{references_found=} - found LIST OF")
-                        skip_last_page=True
-
-                    if contents_found:
-                        if len(txt) > 0: # no need to write empty pages, i.e., those without (extractable) text
-                            if not skip_last_page:
-                                output_document.insert_pdf(doc, from_page=i, to_page=i)
-
-                    # stop copying pages when you have processed a page with "References" on it.
-                    if references_found:
-                        print(f"[stopping at page {i}; {contents_found=} ")
-                        break
-
-                    if i >= max_pages_to_check - 1:
-                        print(f"[stopping at page {i}; {contents_found=}; {references_found=}")
-                        break
-
-            except Exception as err:
-                print(f"Unexpected {err=}, {type(err)=}")
-                continue
-            
-    output_document.save(output_filename)
+    theses_in_output=0
+    shard_number=0
+    for filename, selected_pages, printed_output in selections:
+        print(printed_output, end='')
+        if not selected_pages:
+            continue
+        try:
+            with pymupdf.open(os.path.join(input_dir, filename)) as doc:
+                for from_page, to_page in page_ranges(selected_pages):
+                    output_document.insert_pdf(doc, from_page=from_page, to_page=to_page)
+        except Exception as err:
+            print(f"Unexpected {err=}, {type(err)=}")
+            continue
+
+        theses_in_output=theses_in_output+1
+        if theses_per_shard and theses_in_output >= theses_per_shard:
+            shard_number=shard_number+1
+            output_document.save(shard_filename(output_filename, shard_number))
+            output_document = pymupdf.open(None)
+            theses_in_output=0
+
+    if not theses_per_shard:
+        output_document.save(output_filename)
+    elif theses_in_output > 0:
+        shard_number=shard_number+1
+        output_document.save(shard_filename(output_filename, shard_number))
 
 
 def main():
@@ -348,6 +427,20 @@ def main():
                       help="filter out some pages"
     )
 
+    parser.add_option('-j', '--jobs',
+                      dest="jobs",
+                      default=os.cpu_count() or 1,
+                      type="int",
+                      help="number of PDF files to select pages from in parallel"
+    )
+
+    parser.add_option('-s', '--shard',
+                      dest="shard",
+                      default=0,
+                      type="int",
+                      help="put the pages of this many theses in each output file"
+    )
+
     options, remainder = parser.parse_args()
 
     Verbose_Flag=options.verbose
@@ -365,7 +458,7 @@ def main():
         input_directory=remainder[0]
         output_file_name=remainder[1]
 
-        combine_first_25_pages(input_directory, output_file_name)
+        combine_first_25_pages(input_directory, output_file_name, jobs=options.jobs, theses_per_shard=options.shard)
 
 
 if __name__ == "__main__": main()
@@ -33,11 +33,15 @@ import json
 # Use Python Pandas to create XLSX files
 import pandas as pd
 
+import kopps_cache
+
 ################################
 ######    KOPPS related   ######
 ################################
 KOPPSbaseUrl = 'https://www.kth.se'
 
+global kopps	# cache for the responses from KOPPS (see kopps_cache.py)
+
 English_language_code='en'
 Swedish_language_code='sv'
 
@@ -58,7 +62,7 @@ def v1_get_programmes():
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting v1 programme: {}".format(r.text))
     #
@@ -93,7 +97,7 @@ def get_dept_codes(language_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting department codes: {}".format(r.text))
     #
@@ -121,7 +125,7 @@ def get_dept_courses(dept_code, language_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting courses for a department: {}".format(r.text))
     #
@@ -139,7 +143,7 @@ def get_course_info(course_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting course info: {}".format(r.text))
     #
@@ -161,7 +165,7 @@ def v1_get_course_info(course_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting v1 course info: {}".format(r.text))
     #
@@ -257,6 +261,7 @@ def degree_project_course_codes_in(set_of_course_codes):
 
 def main():
     global Verbose_Flag
+    global kopps
 
     default_picture_size=128
 
@@ -278,11 +283,21 @@ def main():
                       help="execute test code"
     )
 
+    parser.add_option('--offline',
+                      dest="offline",
+                      default=False,
+                      action="store_true",
+                      help="only use the cached KOPPS responses, do not access the network"
+    )
 
+    parser.add_option("--kopps_cache", dest="kopps_cache",
+                      default=kopps_cache.default_cache_filename,
+                      help="read and write cached KOPPS responses in FILE", metavar="FILE")
 
     options, remainder = parser.parse_args()
 
     Verbose_Flag=options.verbose
+    kopps=kopps_cache.KOPPSCache(options.kopps_cache, offline=options.offline, verbose=Verbose_Flag)
     if Verbose_Flag:
         print("ARGV      : {}".format(sys.argv[1:]))
         print("VERBOSE   : {}".format(options.verbose))
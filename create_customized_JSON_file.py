@@ -20,6 +20,8 @@
 #                                      [--Supervisor2 SUPERVISOR2]
 #                                      [--Supervisor3 SUPERVISOR3]
 #                                      [--Examiner EXAMINER]
+#                                      [--all | --section SECTION]
+#                                      [-o OUTPUT_DIR]
 #
 #
 #
@@ -43,11 +45,21 @@
 #
 # Output: a JSON file with customized content: by default: customize.json
 #
+# With --all (or --section SECTION, where SECTION is the id or name of a section) a JSON file is made for
+# every student in the course (or section) in a single run. The files are named customize-<login ID>.json
+# and are placed in OUTPUT_DIR (by default the current directory). In this case the students, sections, teachers,
+# groups, and assignments of the course are only fetched once and the grades of the Examiner and Supervisor
+# assignments are fetched for all of the students in one (paginated) request. A second author who is in a group
+# with a first author is included in the first author's file, rather than getting a file of their own.
+#
 #
 # Example:
 # ./create_customized_JSON_file.py -c canvas_course_id --author xxxxx
 #
 #
+# To make JSON files for all of the students in a course, put them in the directory customize:
+# ./create_customized_JSON_file.py -c canvas_course_id --exam kandidat --language eng --all -o customize
+#
 # Case for a student with 3 supervisors (one of whom happens to be a teacher in the course) and with a TRITA number
 # The program will generate placeholders for supervisors 2 and 3.
 # ./create_customized_JSON_file.py --canvas_course_id 22156 --author xxxxx --language eng --programCode TCOMK  --numberOfSupervisors 3 --trita 'TRITA-EECS-EX-2021:00'
@@ -134,16 +146,24 @@ import pprint
 
 from collections import defaultdict
 
+import canvas_client
+import kth_profile_client
+
 
 import datetime
 import isodate                  # for parsing ISO 8601 dates and times
 import pytz                     # for time zones
 from dateutil.tz import tzlocal
 
+# the tables of schools and programs (and the lookups in them)
+from diva_code_tables import schools_info, programcodes
+
 global baseUrl	# the base URL used for access to Canvas
 global header	# the header for all HTML requests
 global payload	# place to store additionally payload when needed for options to HTML requests
+global canvas	# shared client (pooled session, concurrent pagination) for the Canvas API
 global kth_host, kth_header, kth_payload
+global kth_profiles	# shared client (with a cache) for the KTH profile API
 
 global cortina_baseUrl
 global cortina_seminarlist_base_Url
@@ -157,9 +177,9 @@ KOPPS_Swedish_language_code='sv'
 
 # Based upon the options to the program, initialize the variables used to access Canvas gia HTML requests
 def initialize(args):
-    global baseUrl, header, payload
+    global baseUrl, header, payload, canvas
     global Verbose_Flag
-    global kth_host, kth_header, kth_payload
+    global kth_host, kth_header, kth_payload, kth_profiles
     
     # styled based upon https://martin-thoma.com/configuration-files-in-python/
     config_file=args["config"]
@@ -180,6 +200,7 @@ def initialize(args):
 
             header = {'Authorization' : 'Bearer ' + access_token}
             payload = {}
+            canvas=canvas_client.CanvasClient(baseUrl, header, verbose=Verbose_Flag)
 
             # The following are only used in when using get_user_by_kthid(kthid)
             kth_api=configuration.get("KTH_API", None)
@@ -188,8 +209,10 @@ def initialize(args):
                 kth_host=kth_api["host"]
                 kth_header = {'api_key': kth_key, 'Content-Type': 'application/json', 'Accept': 'application/json' }
                 kth_payload = {}
+                kth_profiles=kth_profile_client.KTHProfileClient(kth_host, kth_header, verbose=Verbose_Flag)
             else:
                 kth_host=None
+                kth_profiles=None
 
     except:
         print("Unable to open configuration file named {}".format(config_file))
@@ -220,22 +243,13 @@ def get_course_info_KOPPS(course_code):
 
 # KTH API related functions
 def get_user_by_kthid(kthid):
-    global kth_host, kth_header, kth_payload
+    global kth_profiles
     # Use the KTH API to get the user information give an orcid
     #"#{$kth_api_host}/profile/v1/kthId/#{kthid}"
-
-    url = "{0}/profile/v1/kthId/{1}".format(kth_host, kthid)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    r = requests.get(url, headers = kth_header)
-    if Verbose_Flag:
-        print("result of getting profile: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-        return page_response
-    return []
+    # the profiles are cached, see kth_profile_client.py
+    if not kth_profiles:
+        return []
+    return kth_profiles.get(kthid)
 
 # Given a list of items containing affiliation information as a dict
 # use the 'path' element of the dict to figure out the school, department, and division HR keys.
@@ -594,66 +608,18 @@ def address_from_kth_profile(profile, language, default_school_acronym):
 # Canvas related functions
 
 def list_my_courses():
-    courses_found_thus_far=[]
     # Use the Canvas API to get the list of courses for the user making the query
     #GET /api/v1/courses
 
     url = "{0}/courses".format(baseUrl)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    r = requests.get(url, headers = header)
-    if Verbose_Flag:
-        print("result of getting courses: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            courses_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        # i.e., when the response is split into pieces - each returning only some of the list of courses
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)
-            if Verbose_Flag:
-                print("result of getting courses for a paginated response: {}".format(r.text))
-            page_response = r.json()  
-            for p_response in page_response:  
-                courses_found_thus_far.append(p_response)
-
-    return courses_found_thus_far
+    return canvas.get_all(url)
 
 def list_users_courses(user_id):
-    courses_found_thus_far=[]
     # Use the Canvas API to get the list of courses for the user making the query
     # GET /api/v1/users/:user_id/courses
 
     url = "{0}/users/{1}/courses".format(baseUrl,user_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    r = requests.get(url, headers = header)
-    if Verbose_Flag:
-        print("result of getting courses: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            courses_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        # i.e., when the response is split into pieces - each returning only some of the list of courses
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)
-            if Verbose_Flag:
-                print("result of getting courses for a paginated response: {}".format(r.text))
-            page_response = r.json()  
-            for p_response in page_response:  
-                courses_found_thus_far.append(p_response)
-
-    return courses_found_thus_far
+    return canvas.get_all(url)
 
 
 
@@ -677,76 +643,28 @@ def canvas_course_info(course_id):
 def students_in_course(course_id):
     global Verbose_Flag
     global testing
-    users_found_thus_far=[]
     # Use the Canvas API to get the list of users enrolled in this course
     #GET /api/v1/courses/:course_id/enrollments
 
     url = "{0}/courses/{1}/enrollments".format(baseUrl,course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
 
     if testing: # for testing purposes include the teachers in the list of students, so a teacher can try the "self" code paths
-        extra_parameters={'per_page': '100',
-                          'type': ['StudentEnrollment', 'TeacherEnrollment']
-                          }
+        extra_parameters={'type': ['StudentEnrollment', 'TeacherEnrollment']}
     else:
-        extra_parameters={'per_page': '100',
-                          'type': ['StudentEnrollment']
-                          }
-    r = requests.get(url, params=extra_parameters, headers = header)
-    if Verbose_Flag:
-        print("result of getting enrollments: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            users_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        # i.e., when the response is split into pieces - each returning only some of the list of modules
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)
-            page_response = r.json()  
-            for p_response in page_response:  
-                users_found_thus_far.append(p_response)
-
-    return users_found_thus_far
+        extra_parameters={'type': ['StudentEnrollment']}
+    return canvas.get_all(url, extra_parameters)
 
 
 def teachers_in_course(course_id):
     global Verbose_Flag
     global testing
-    users_found_thus_far=[]
     # Use the Canvas API to get the list of users enrolled in this course
     #GET /api/v1/courses/:course_id/enrollments
 
     url = "{0}/courses/{1}/enrollments".format(baseUrl,course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    extra_parameters={'per_page': '100',
-                      'type': ['TeacherEnrollment']
-                      }
-    r = requests.get(url, params=extra_parameters, headers = header)
-    if Verbose_Flag:
-        print("result of getting enrollments: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            users_found_thus_far.append(p_response)
 
-        # the following is needed when the reponse has been paginated
-        # i.e., when the response is split into pieces - each returning only some of the list of modules
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)
-            page_response = r.json()  
-            for p_response in page_response:  
-                users_found_thus_far.append(p_response)
-
-    return users_found_thus_far
+    extra_parameters={'type': ['TeacherEnrollment']}
+    return canvas.get_all(url, extra_parameters)
 
 def examiners_in_course(teachers):
     examiners=[]
@@ -830,93 +748,27 @@ def user_profile(user_id):
 
 
 def members_of_groups(group_id):
-    members_found_thus_far=[]
-
     # Use the Canvas API to get the list of members of group
     # GET /api/v1/groups/:group_id/users
 
     url = "{0}/groups/{1}/users".format(baseUrl, group_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    r = requests.get(url, headers = header)
-    if Verbose_Flag:
-        print("result of getting group info: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            members_found_thus_far.append(p_response['id'])
-
-        # the following is needed when the reponse has been paginated
-        # i.e., when the response is split into pieces - each returning only some of the list of modules
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)  
-            page_response = r.json()  
-            for p_response in page_response:  
-                members_found_thus_far.append(p_response['id'])
-    return members_found_thus_far
+    return [m['id'] for m in canvas.paginated(url)]
 
 
 
 def list_groups_in_course(course_id):
-    groups_found_thus_far=[]
-
     # Use the Canvas API to get the list of groups in this course
     # GET /api/v1/courses/:course_id/groups
 
     url = "{0}/courses/{1}/groups".format(baseUrl, course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    r = requests.get(url, headers = header)
-    if Verbose_Flag:
-        print("result of getting groups: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            groups_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        # i.e., when the response is split into pieces - each returning only some of the list of modules
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)  
-            page_response = r.json()  
-            for p_response in page_response:  
-                groups_found_thus_far.append(p_response)
-    return groups_found_thus_far
+    return canvas.get_all(url)
 
 def sections_in_course(course_id):
-    sections_found_thus_far=[]
     # Use the Canvas API to get the list of sections for this course
     #GET /api/v1/courses/:course_id/sections
 
     url = "{0}/courses/{1}/sections".format(baseUrl,course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    r = requests.get(url, headers = header)
-    if Verbose_Flag:
-        print("result of getting sections: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            sections_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        # i.e., when the response is split into pieces - each returning only some of the list of modules
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)  
-            page_response = r.json()  
-            for p_response in page_response:  
-                sections_found_thus_far.append(p_response)
-
-    return sections_found_thus_far
+    return canvas.get_all(url)
 
 def assignment_id_from_assignment_name(assignments_info, assignment_name): 
     for i in assignments_info:
@@ -925,35 +777,11 @@ def assignment_id_from_assignment_name(assignments_info, assignment_name):
     return False
 
 def list_assignments(course_id):
-    assignments_found_thus_far=[]
     # Use the Canvas API to get the list of assignments for the course
     #GET /api/v1/courses/:course_id/assignments
 
     url = "{0}/courses/{1}/assignments".format(baseUrl, course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    r = requests.get(url, headers = header)
-    if Verbose_Flag:
-        print("result of getting assignments: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            assignments_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        # i.e., when the response is split into pieces - each returning only some of the list of assignments
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)  
-            if Verbose_Flag:
-                print("result of getting assignments for a paginated response: {}".format(r.text))
-            page_response = r.json()  
-            for p_response in page_response:  
-                assignments_found_thus_far.append(p_response)
-
-    return assignments_found_thus_far
+    return canvas.get_all(url)
 
 def get_grade_for_assignment(course_id, assignment_id, user_id):
     global Verbose_Flag
@@ -980,6 +808,65 @@ def get_grade_for_assignment(course_id, assignment_id, user_id):
     return None
 
 
+def submissions_in_course(course_id, assignment_ids):
+    # Use the Canvas API to get the submissions of all of the students for the given assignments, in one paginated sweep
+    #GET /api/v1/courses/:course_id/students/submissions
+
+    # Request Parameters:
+    # student_ids[] string	List of student ids to return submissions for. The special id "all" will return submissions for all students in the course.
+    # assignment_ids[] string	List of assignments to return submissions for. If none are given, submissions for all assignments are returned.
+    # include[] string	Associations to include with the group.
+
+    url = "{0}/courses/{1}/students/submissions".format(baseUrl, course_id)
+    extra_parameters={'student_ids[]': 'all',
+                      'assignment_ids[]': assignment_ids,
+                      'include[]': 'submission_comments'}
+
+    # index the submissions by (user_id, assignment_id)
+    submissions=dict()
+    for s in canvas.paginated(url, extra_parameters):
+        submissions[(s['user_id'], s['assignment_id'])]=s
+    return submissions
+
+# Course wide information keyed by (kind of information, course_id), so that it is only fetched once
+# even when JSON files are made for all of the students in a course
+course_cache=dict()
+
+def cached_for_course(kind, course_id, fetch):
+    key=(kind, course_id)
+    if key not in course_cache:
+        course_cache[key]=fetch(course_id)
+    return course_cache[key]
+
+def group_members_in_course(course_id):
+    # returns a list of (group, list of the user ids of its members), the members of the groups are fetched concurrently
+    groups=list_groups_in_course(course_id)
+    members=canvas.map(members_of_groups, [g['id'] for g in groups])
+    return list(zip(groups, members))
+
+def prefetch_submissions(course_id):
+    # get the submissions for the Examiner and Supervisor assignments of all of the students at once
+    assignments=cached_for_course('assignments', course_id, list_assignments)
+    assignment_ids=[]
+    for name in ['Examiner', 'Supervisor']:
+        assignment_id=assignment_id_from_assignment_name(assignments, name)
+        if assignment_id:
+            assignment_ids.append(assignment_id)
+    if assignment_ids:
+        course_cache[('submissions', course_id)]=submissions_in_course(course_id, assignment_ids)
+    else:
+        course_cache[('submissions', course_id)]=dict()
+
+def grade_for_assignment(course_id, assignment_id, user_id):
+    # use the course's submissions (if they have been prefetched), otherwise ask for this one submission
+    if not assignment_id:
+        return None
+    submissions=course_cache.get(('submissions', course_id), None)
+    if submissions is not None:
+        return submissions.get((user_id, assignment_id), None)
+    return get_grade_for_assignment(course_id, assignment_id, user_id)
+
+
 def get_course_info(course_id):
     global Verbose_Flag
     # Use the Canvas API to get a grading standard
@@ -996,18 +883,6 @@ def get_course_info(course_id):
     return None
 
 # ----------------------------------------------------------------------
-schools_info={'ABE': {'swe': 'Skolan för Arkitektur och samhällsbyggnad',
-                      'eng': 'School of Architecture and the Built Environment'},
-              'ITM': {'swe': 'Skolan för Industriell teknik och management',
-                      'eng': 'School of Industrial Engineering and Management'},
-              'SCI': {'swe': 'Skolan för Teknikvetenskap',
-                      'eng': 'School of Engineering Sciences'},
-              'CBH': {'swe': 'Skolan för Kemi, bioteknologi och hälsa',
-                      'eng': 'School of Engineering Sciences in Chemistry, Biotechnology and Health'},
-              'EECS': {'swe': 'Skolan för Elektroteknik och datavetenskap',
-                      'eng': 'School of Electrical Engineering and Computer Science'}
-              }
-
 #EECS degree project course codes
 #[DA231X, DA232X, DA233X, DA234X, DA235X, DA236X, DA239X, DA240X, DA246X, DA248X, DA250X, DA256X, DA258X, DM250X, EA236X, EA238X, EA246X, EA248X, EA249X, EA250X, EA256X, EA258X, EA260X, EA270X, EA275X, EA280X, IA249X, IA250X]
 
@@ -1036,376 +911,6 @@ def cycle_from_course_code(course_code):
         print("In cycle_from_course_code could not figure out cycle from course code: {}".format(course_code ))
     return None
 
-programcodes={
-    'ARKIT': {'cycle': 2,
-	      'swe': 'Arkitektutbildning',
-              'eng': 'Degree Programme in Architecture'},
-    
-    'CBIOT': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i bioteknik',
-              'eng': 'Degree Programme in Biotechnology'},
-    
-    'CDATE': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i datateknik',
-              'eng': 'Degree Programme in Computer Science and Engineering'},
-    
-    'CDEPR': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i design och produktframtagning',
-              'eng': 'Degree Programme in Design and Product Realisation'},
-    
-    'CELTE': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i elektroteknik',
-              'eng': 'Degree Programme in Electrical Engineering'},
-    
-    'CENMI': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i energi och miljö',
-              'eng': 'Degree Programme in Energy and Environment'},
-    
-    'CFATE': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i farkostteknik',
-              'eng': 'Degree Programme in Vehicle Engineering'},
-    
-    'CINEK': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i industriell ekonomi',
-              'eng': 'Degree Programme in Industrial Engineering and Management'},
-    
-    'CINTE': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i informationsteknik',
-              'eng': 'Degree Programme in Information and Communication Technology'},
-    
-    'CITEH': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i industriell teknik och hållbarhet',
-              'eng': 'Degree Programme in Industrial Technology and Sustainability'},
-    
-    'CLGYM': {'cycle': 2,
-	      'swe': 'Civilingenjör och lärare',
-              'eng': 'Master of Science in Engineering and in Education'},
-    'CMAST': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i maskinteknik',
-              'eng': 'Degree Programme in Mechanical Engineering'},
-    'CMATD': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i materialdesign',
-              'eng': 'Degree Programme in Materials Design and Engineering'},
-    'CMEDT': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i medicinsk teknik',
-              'eng': 'Degree Programme in Medical Engineering'},
-    'CMETE': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i medieteknik',
-              'eng': 'Degree Programme in Media Technology'},
-    'COPEN': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning öppen ingång',
-              'eng': 'Degree Programme Open Entrance'},
-    'CSAMH': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i samhällsbyggnad',
-              'eng': 'Degree Programme in Civil Engineering and Urban Management'},
-    'CTFYS': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i teknisk fysik',
-              'eng': 'Degree Programme in Engineering Physics'},
-    'CTKEM': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i teknisk kemi',
-              'eng': 'Degree Programme in Engineering Chemistry'},
-    'CTMAT': {'cycle': 2,
-	      'swe': 'Civilingenjörsutbildning i teknisk matematik',
-              'eng': 'Degree Programme in Engineering Mathematics'},
-    'KPUFU': {'cycle': 2,
-	      'swe': 'Kompletterande pedagogisk utbildning för ämneslärarexamen i matematik, naturvetenskap och teknik för forskarutbildade',
-              'eng': 'Bridging Teacher Education Programme in Mathematics, Science and Technology for Graduates with a Third Cycle Degree'},
-    'KPULU': {'cycle': 2,
-	      'swe': 'Kompletterande pedagogisk utbildning',
-              'eng': 'Bridging Teacher Education Programme'},
-    'KUAUT': {'cycle': 2,
-	      'swe': 'Kompletterande utbildning för arkitekter med avslutad utländsk utbildning',
-              'eng': 'Bridging programme for architects with foreign qualifications'},
-    'KUIUT': {'cycle': 2,
-	      'swe': 'Kompletterande utbildning för ingenjörer med avslutad utländsk utbildning',
-              'eng': 'Bridging programme for engineers with foreign qualifications'},
-    'LÄRGR': {'cycle': 2,
-	      'swe': 'Ämneslärarutbildning med inriktning mot teknik, årskurs 7-9',
-              'eng': 'Subject Teacher Education in Technology, Secondary Education'},
-    'TAEEM': {'cycle': 2,
-	      'swe': 'Masterprogram, flyg- och rymdteknik',
-              'eng': "Master's Programme, Aerospace Engineering, 120 credits"},
-    'TAETM': {'cycle': 2,
-	      'swe': 'Masterprogram, aeroelasticitet i turbomaskiner',
-              'eng': "Master's Programme, Turbomachinery Aeromechanic University Training, 120 credits"},
-    'TARKM': {'cycle': 2,
-	      'swe': 'Masterprogram, arkitektur',
-              'eng': "Master's Programme, Architecture, 120 credits"},
-    'TBASA': {'cycle': 0,
-	      'swe': 'Tekniskt basår, KTH Flemingsberg',
-              'eng': 'Technical Preparatory Year'},
-    'TBASD': {'cycle': 0,
-	      'swe': 'Tekniskt basår, KTH Campus',
-              'eng': 'Technical Preparatory Year'},
-    'TBASE': {'cycle': 0,
-	      'swe': 'Tekniskt basår, KTH Södertälje',
-              'eng': 'Technical Preparatory Year'},
-    'TBTMD': {'cycle': 0,
-	      'swe': 'Tekniskt basår, termin 2, KTH Campus',
-              'eng': 'Technical Preparatory Semester'},
-    'TBTMH': {'cycle': 0,
-	      'swe': 'Tekniskt basår, termin 2, KTH Flemingsberg',
-              'eng': 'Technical Preparatory Semester'},
-    'TBTMS': {'cycle': 0,
-	      'swe': 'Tekniskt basår, termin 2, KTH Södertälje',
-              'eng': 'Technical Preparatory Semester'},
-    'TBYPH': {'cycle': 1,
-	      'swe': 'Högskoleutbildning i byggproduktion',
-              'eng': 'Degree Progr. in Construction Management'},
-    'TCAEM': {'cycle': 2,
-	      'swe': 'Masterprogram, husbyggnads- och anläggningsteknik',
-              'eng': "Master's Programme, Civil and Architectural Engineering, 120 credits"},
-    'TCOMK': {'cycle': 1,
-	      'swe': 'Kandidatprogram, informations- och kommunikationsteknik',
-              'eng': "Bachelor's Programme in Information and Communication Technology"},
-    'TCOMM': {'cycle': 2,
-	      'swe': 'Masterprogram, kommunikationssystem',
-              'eng': "Master's Programme, Communication Systems, 120 credits"},
-    'TCSCM': {'cycle': 2,
-	      'swe': 'Masterprogram, datalogi',
-              'eng': "Master's Programme, Computer Science, 120 credits"},
-    'TDEBM': {'cycle': 2,
-	      'swe': 'Magisterprogram, design och byggande i staden',
-              'eng': "Master's Programme, Urban Development and Design, 60 credits"},
-    'TDSEM': {'cycle': 2,
-	      'swe': 'Masterprogram, decentraliserade smarta energisystem',
-              'eng': "Master's Programme, Decentralized Smart Energy Systems, 120 credits"},
-    'TDTNM': {'cycle': 2,
-	      'swe': 'Masterprogram, datorsimuleringar inom teknik och naturvetenskap',
-              'eng': "Master's Programme, Computer Simulations for Science and Engineering, 120 credits"},
-    'TEBSM': {'cycle': 2,
-	      'swe': 'Masterprogram, inbyggda system',
-              'eng': "Master's Programme, Embedded Systems, 120 credits"},
-    'TEEEM': {'cycle': 2,
-	      'swe': 'Masterprogram, teknik och ledning för energi- och miljösystem',
-              'eng': "Master's Programme, Management and Engineering of Environment and Energy, 120 credits"},
-    'TEEGM': {'cycle': 2,
-	      'swe': 'Masterprogram, miljöteknik',
-              'eng': "Master's Programme, Environmental Engineering, 120 credits"},
-    'TEFRM': {'cycle': 2,
-	      'swe': 'Masterprogram, elektromagnetism, fusion och rymdteknik',
-              'eng': "Master's Programme, Electromagnetics, Fusion and Space Engineering, 120 credits"},
-    'TEILM': {'cycle': 2,
-	      'swe': 'Magisterprogram, entreprenörskap och innovationsledning',
-              'eng': "Master's Programme, Entrepreneurship and Innovation Management, 60 credits"},
-    'TEINM': {'cycle': 2,
-	      'swe': 'Masterprogram, innovations- och tillväxtekonomi',
-              'eng': "Master's Programme, Economics of Innovation and Growth, 120 credits"},
-    'TELPM': {'cycle': 2,
-	      'swe': 'Masterprogram, elkraftteknik',
-              'eng': "Master's Programme, Electric Power Engineering, 120 credits"},
-    'TFAFK': {'cycle': 1,
-	      'swe': 'Kandidatprogram, Fastighetsutveckling med fastighetsförmedling',
-              'eng': "Bachelor's Programme in Property Development and Agency"},
-    'TFAHM': {'cycle': 2,
-	      'swe': 'Magisterprogram, fastigheter',
-              'eng': "Master's Programme, Real Estate"},
-    'TFOBM': {'cycle': 2,
-	      'swe': 'Masterprogram, fastigheter och byggande',
-              'eng': "Master's Programme, Real Estate and Construction Management, 120 credits"},
-    'TFOFK': {'cycle': 1,
-	      'swe': 'Kandidatprogram, fastighet och finans',
-              'eng': "Bachelor's Programme in Real Estate and Finance"},
-    'TFORM': {'cycle': 2,
-	      'swe': 'Masterprogram, fordonsteknik',
-              'eng': "Master's Programme, Vehicle Engineering, 120 credits"},
-    'THSSM': {'cycle': 2,
-	      'swe': 'Masterprogram, hållbar samhällsplanering och stadsutformning',
-              'eng': "Master's Programme, Sustainable Urban Planning and Design, 120 credits"},
-    'TIBYH': {'cycle': 1,
-	      'swe': 'Högskoleingenjörsutbildning i byggteknik och design',
-              'eng': "Degree Programme in Constructional Engineering and Design"},
-    'TIDAA': {'cycle': 1,
-	      'swe': 'Högskoleingenjörsutbildning i datateknik, Flemingsberg',
-              'eng': "Degree Programme in Computer Engineering"},
-    'TIDAB': {'cycle': 1,
-	      'swe': 'Högskoleingenjörsutbildning i datateknik, Kista',
-              'eng': "Degree Programme in Computer Engineering"},
-    'TIDTM': {'cycle': 2,
-	      'swe': 'Masterprogram, idrottsteknologi',
-              'eng': "Master's Programme, Sports Technology"},
-    'TIEDB': {'cycle': 2,
-	      'swe': 'Högskoleingenjörsutbildning i elektronik och datorteknik',
-              'eng': "Degree Programme in Electronics and Computer Engineering"},
-    'TIEEM': {'cycle': 2,
-	      'swe': 'Masterprogram, innovativ uthållig energiteknik',
-              'eng': "Master's Programme, Innovative Sustainable Energy Engineering, 120 credits"},
-    'TIELA': {'cycle': 1,
-	      'swe': 'Högskoleingenjörsutbildning i elektroteknik, Flemingsberg',
-              'eng': "Degree Programme in Electrical Engineering"},
-    'TIEMM': {'cycle': 2,
-	      'swe': 'Masterprogram, industriell ekonomi',
-              'eng': "Master's Programme, Industrial Engineering and Management, 120 credits"},
-    'TIETM': {'cycle': 2,
-	      'swe': 'Masterprogram, innovativ energiteknik',
-              'eng': "Master's Programme, Energy Innovation, 120 credits"},
-    'TIHLM': {'cycle': 2,
-	      'swe': 'Masterprogram, innovativ teknik för en hälsosam livsmiljö',
-              'eng': "Master's Programme, Innovative Technology for Healthy Living"},
-    'TIIPS': {'cycle': 1,
-	      'swe': 'Högskoleingenjörsutbildning i industriell teknik och produktionsunderhåll',
-              'eng': "Degree Programme in Industrial Technology and Production Maintenance"},
-    'TIKED': {'cycle': 1,
-	      'swe': 'Högskoleingenjörsutbildning i kemiteknik',
-              'eng': "Degree Programme in Chemical Engineering"},
-    'TIMAS': {'cycle': 1,
-	      'swe': 'Högskoleingenjörsutbildning i maskinteknik, Södertälje',
-              'eng': "Degree Programme in Mechanical Engineering"},
-    'TIMBM': {'cycle': 2,
-	      'swe': 'Masterprogram, Industriell och miljöinriktad bioteknologi',
-              'eng': "Master's Programme, Industrial and Environmental Biotechnology, 120 credits"},
-    'TIMEL': {'cycle': 1,
-	      'swe': 'Högskoleingenjörsutbildning i medicinsk teknik',
-              'eng': "Degree Programme in Medical Technology"},
-    'TIMTM': {'cycle': 2,
-	      'swe': 'Masterprogram, interaktiv medieteknik',
-              'eng': "Master's Programme, Interactive Media Technology, 120 credits"},
-    'TINEM': {'cycle': 2,
-	      'swe': 'Masterprogram, industriell ekonomi',
-              'eng': "Master's Programme, Industrial Management, 120 credits"},
-    'TINNM': {'cycle': 2,
-	      'swe': 'Masterprogram, information och nätverksteknologi',
-              'eng': "Master's Programme, Information and Network Engineering, 120 credits"},
-    'TIPDM': {'cycle': 2,
-	      'swe': 'Masterprogram, integrerad produktdesign',
-              'eng': "Master's Programme, Integrated Product Design, 120 credits"},
-    'TIPUM': {'cycle': 2,
-	      'swe': 'Masterprogram, industriell produktutveckling',
-              'eng': "Master's Programme, Engineering Design, 120 credits"},
-    'TITEH': {'cycle': 1,
-	      'swe': 'Högskoleingenjörsutbildning i teknik och ekonomi',
-              'eng': "Degree Programme in Engineering and Economics"},
-    'TITHM': {'cycle': 2,
-	      'swe': 'Masterprogram, hållbar produktionsutveckling',
-              'eng': "Master's Programme, Sustainable Production Development, 120 credits"},
-    'TIVNM': {'cycle': 2,
-	      'swe': 'Masterprogram, ICT Innovation',
-              'eng': "Master's Programme, ICT Innovation, 120 credits"},
-    'TJVTM': {'cycle': 2,
-	      'swe': 'Masterprogram, järnvägsteknik',
-              'eng': "Master's Programme, Railway Engineering, 120 credits"},
-    'TKEMM': {'cycle': 2,
-	      'swe': 'Masterprogram, kemiteknik för energi och miljö',
-              'eng': "Master's Programme, Chemical Engineering for Energy and Environment, 120 credits"},
-    'TLODM': {'cycle': 2,
-	      'swe': 'Magisterprogram, ljusdesign',
-              'eng': "Master's Programme,  Architectural Lighting Design, 60 credits"},
-    'TMAIM': {'cycle': 2,
-	      'swe': 'Masterprogram, maskininlärning',
-              'eng': "Master's Programme, Machine Learning, 120 credits"},
-    'TMAKM': {'cycle': 2,
-	      'swe': 'Masterprogram, matematik',
-              'eng': "Master's Programme, Mathematics, 120 credits"},
-    'TMBIM': {'cycle': 2,
-	      'swe': 'Masterprogram, medicinsk bioteknologi',
-              'eng': "Master's Programme, Medical Biotechnology, 120 credits"},
-    'TMEGM': {'cycle': 2,
-	      'swe': 'Masterprogram, marinteknik',
-              'eng': "Master's Programme, Maritime Engineering, 120 credits"},
-    'TMESM': {'cycle': 2,
-	      'swe': 'Masterprogram, miljövänliga energisystem',
-              'eng': "Master's Programme, Environomical Pathways for Sustainable Energy Systems, 120 credits"},
-    'TMHIM': {'cycle': 2,
-	      'swe': 'Masterprogram, miljöteknik och hållbar infrastruktur',
-              'eng': "Master's Programme, Environmental Engineering and Sustainable Infrastructure, 120 credits"},
-    'TMLEM': {'cycle': 2,
-	      'swe': 'Masterprogram, medicinsk teknik',
-              'eng': "Master's Programme, Medical Engineering, 120 credits"},
-    'TMMMM': {'cycle': 2,
-	      'swe': 'Masterprogram, makromolekylära material',
-              'eng': "Master's Programme, Macromolecular Materials, 120 credits"},
-    'TMMTM': {'cycle': 2,
-	      'swe': 'Masterprogram, media management',
-              'eng': "Master's Programme, Media Management, 120 credits"},
-    'TMRSM': {'cycle': 2,
-	      'swe': 'Masterprogram, marina system',
-              'eng': "Master's Programme, Naval Architecture, 120 credits"},
-    'TMTLM': {'cycle': 2,
-	      'swe': 'Masterprogram, molekylära tekniker inom livsvetenskaperna',
-              'eng': "Master's Programme, Molecular Techniques in Life Science, 120 credits"},
-    'TMVTM': {'cycle': 2,
-	      'swe': 'Masterprogram, molekylär vetenskap och teknik',
-              'eng': "Master's Programme, Molecular Science and Engineering, 120 credits"},
-    'TNEEM': {'cycle': 2,
-	      'swe': 'Masterprogram, kärnenergiteknik',
-              'eng': "Master's Programme, Nuclear Energy Engineering, 120 credits"},
-    'TNTEM': {'cycle': 2,
-	      'swe': 'Masterprogram, nanoteknik',
-              'eng': "Master's Programme, Nanotechnology, 120 credits"},
-    'TPRMM': {'cycle': 2,
-	      'swe': 'Masterprogram, industriell produktion',
-              'eng': "Master's Programme, Production Engineering and Management, 120 credits"},
-    'TSCRM': {'cycle': 2,
-	      'swe': 'Masterprogram, systemteknik och robotik',
-              'eng': "Master's Programme, Systems, Control and Robotics, 120 credits"},
-    'TSEDM': {'cycle': 2,
-	      'swe': 'Masterprogram, programvaruteknik för distribuerade system',
-              'eng': "Master's Programme, Software Engineering of Distributed Systems, 120 credits"},
-    'TSUEM': {'cycle': 2,
-	      'swe': 'Masterprogram, hållbar energiteknik',
-              'eng': "Master's Programme, Sustainable Energy Engineering, 120 credits"},
-    'TSUTM': {'cycle': 2,
-	      'swe': 'Masterprogram, teknik och hållbar utveckling',
-              'eng': "Master's Programme, Sustainable Technology, 120 credits"},
-    'TTAHM': {'cycle': 2,
-	      'swe': 'Masterprogram, teknik, arbete och hälsa',
-              'eng': "Master's Programme, Technology, Work and Health, 120 credits"},
-    'TTEMM': {'cycle': 2,
-	      'swe': 'Masterprogram, teknisk mekanik',
-              'eng': "Master's Programme, Engineering Mechanics, 120 credits"},
-    'TTFYM': {'cycle': 2,
-	      'swe': 'Masterprogram, teknisk fysik',
-              'eng': "Master's Programme, Engineering Physics, 120 credits"},
-    'TTGTM': {'cycle': 2,
-	      'swe': 'Masterprogram, transport och geoinformatik',
-              'eng': "Master's Programme, Transport and Geoinformation Technology, 120 credits"},
-    'TTMAM': {'cycle': 2,
-	      'swe': 'Masterprogram, tillämpad matematik och beräkningsmatematik',
-              'eng': "Master's Programme, Applied and Computational Mathematics, 120 credits"},
-    'TTMIM': {'cycle': 2,
-	      'swe': 'Masterprogram, transport, mobilitet och innovation',
-              'eng': "Master's Programme, Transport, Mobility and Innovation"},
-    'TTMVM': {'cycle': 2,
-	      'swe': 'Masterprogram, teknisk materialvetenskap',
-              'eng': "Master's Programme, Engineering Materials Science, 120 credits"},
-    'TURSM': {'cycle': 2,
-	      'swe': 'Magisterprogram, urbana studier',
-              'eng': "Master's Programme, Urbanism Studies, 60 credits"},
-    'TSKKM': {'cycle': 2,
-	      'swe': 'Masterprogram, systemkonstruktion på kisel',
-              'eng': 'Master’s Programme, System-on-Chip Design'}
-}
-
-def cycle_of_program(s):
-    # replace ’ #x2019 with ' #x27
-    s=s.replace(u"\u2019", "'")
-    for p in programcodes:
-        pname_eng=programcodes[p]['eng']
-        pname_swe=programcodes[p]['swe']
-        e_offset=s.find(pname_eng)
-        s_offset=s.find(pname_swe)
-        if (e_offset >= 0) or (s_offset >= 0):
-            return programcodes[p]['cycle']
-    # secondary check
-    if s.find("Magisterprogram") >= 0 or s.find("Masterprogram") >= 0 or s.find("Master's") >= 0 or s.find("Master of Science") >= 0 or s.find("Civilingenjör") >= 0:
-        return 2
-    if s.find("Kandidatprogram") >= 0 or s.find("Bachelor's") >= 0 or s.find("Högskoleingenjör") >= 0:
-        return 1
-    print("cycle_of_program: Error in program name - did not match anything")
-    return None
-
-def programcode_from_degree(s):
-    # replace ’ #x2019 with ' #x27
-    s=s.replace(u"\u2019", "'")
-    for p in programcodes:
-        pname_eng=programcodes[p]['eng']
-        pname_swe=programcodes[p]['swe']
-        e_offset=s.find(pname_eng)
-        s_offset=s.find(pname_swe)
-        if (e_offset >= 0) or (s_offset >= 0):
-            return p
-    return None
-
 # helper functions
 def add_word_to_dictionary(d, language, word):
     global Verbose_Flag
@@ -2353,141 +1858,17 @@ EXAMS={
         }
     }
 
-def main(argv):
+# Create the customization data for the author (and, for a first cycle degree project, the second author)
+# in the course canvas_course_id. Returns None if there is not enough information to do so.
+# The course wide information (students, sections, teachers, groups, assignments, and the submissions
+# for the Examiner and Supervisor assignments) is fetched once per course, see course_cache.
+def customize_for_author(args, canvas_course_id, author):
     global Verbose_Flag
     global testing
-    global Keep_picture_flag
     global national_subject_category
     global national_subject_category_augmented
     global kopps_course_info
 
-    argp = argparse.ArgumentParser(description="create_customized_JSON_file.py: to make a customized JSON file")
-
-    argp.add_argument('-v', '--verbose', required=False,
-                      default=False,
-                      action="store_true",
-                      help="Print lots of output to stdout")
-
-    argp.add_argument('-t', '--testing',
-                      default=False,
-                      action="store_true",
-                      help="execute test code"
-                      )
-
-    argp.add_argument("--config", type=str, default='config.json',
-                      help="read configuration from file")
-
-    argp.add_argument('-c', '--canvas_course_id',
-                      default=0,
-                      type=int,
-                      help="Canvas course id"
-                      )
-
-    argp.add_argument('-a', '--alternative_canvas_course_id',
-                      default=0,
-                      type=int,
-                      help="Canvas course id"
-                      )
-
-    argp.add_argument('-j', '--json',
-                      type=str,
-                      default="customize.json",
-                      help="output JSON file"
-                      )
-
-    argp.add_argument('--language',
-                      type=str,
-                      help="code for planned language of the thesis (eng or swe)"
-                      )
-
-    argp.add_argument('--exam',
-                      type=str,
-                      default=None,
-                      help="the deegree that the author(s) will apply for, as this affects the thesi covere"
-                      )
-
-    argp.add_argument('--author',
-                      type=str,
-                      help="login ID without the @kth.se"
-                      )
-
-    argp.add_argument('--author2',
-                      type=str,
-                      help="login ID of second without the @kth.se"
-                      )
-
-    argp.add_argument('--school',
-                      type=str,
-                      help="acronyms for school"
-                      )
-
-    argp.add_argument('--courseCode',
-                      type=str,
-                      help="course code"
-                      )
-
-    argp.add_argument('--programCode',
-                      type=str,
-                      help="program code"
-                      )
-
-    argp.add_argument('--cycle',
-                      type=int,
-                      help="cycle of thesis"
-                      )
-
-    argp.add_argument('--credits',
-                      type=float,
-                      help="number_of_credits of thesis"
-                      )
-
-    argp.add_argument('--area',
-                      type=str,
-                      help="area of thesis"
-                      )
-
-    argp.add_argument('--area2',
-                      type=str,
-                      help="area of thesis for combined Cinving. and Master's"
-                      )
-
-    argp.add_argument('--numberOfSupervisors',
-                      default=1,
-                      type=int,
-                      help="number of supervisors"
-                      )
-
-    argp.add_argument('--Supervisor',
-                      type=str,
-                      help="login ID of supervisor without the @kth.se"
-                      )
-
-    argp.add_argument('--Supervisor2',
-                      type=str,
-                      help="login ID of second supervisor without the @kth.se"
-                      )
-
-    argp.add_argument('--Supervisor3',
-                      type=str,
-                      help="login ID of third supervisor without the @kth.se"
-                      )
-
-    argp.add_argument('--Examiner',
-                      type=str,
-                      help="login ID of examiner without the @kth.se"
-                      )
-
-    args = vars(argp.parse_args(argv))
-
-    Verbose_Flag=args["verbose"]
-
-    initialize(args)
-    
-    testing=args["testing"]
-    if Verbose_Flag:
-        print("testing={}".format(testing))
-
-    canvas_course_id=args['canvas_course_id']
     canvas_course_name=None
     kopps_course_info=None
     area=None
@@ -2526,22 +1907,9 @@ def main(argv):
     supervisor2=None
     supervisor2_canvas_user_id=None
 
-    exam=args['exam']
-    if exam and exam in EXAMS:
-        print("found a valid type of exam: {}".format(exam))
-    else:
-        list_of_exams=[e for e in EXAMS]
-        print("Do not understand what the exam is. specify --exam with one of {}".format(list_of_exams))
-        return
-
-    author=args['author']
-    if not author:
-        print("You have to provude at least one of the auhtor's names")
-        return
-
     if author and canvas_course_id > 0:   # author and canvas_course_id specified on command line, so use them
         # at this point we know a canvas_course_id
-        students=students_in_course(canvas_course_id)
+        students=cached_for_course('students', canvas_course_id, students_in_course)
         if not students:
             print("Unable to find students in the Canvas course {}".format(canvas_course_id))
             return
@@ -2605,7 +1973,7 @@ def main(argv):
         print("current_canvas_user_id={0}, canvas_course_id={1}".format(current_canvas_user_id, canvas_course_id))
 
     if not students:
-        students=students_in_course(canvas_course_id)
+        students=cached_for_course('students', canvas_course_id, students_in_course)
         if not students:
             print("Error in getting enrollments for course: ".format(canvas_course_id))
             return
@@ -2620,7 +1988,11 @@ def main(argv):
     language=args['language']
     if not language:
         # if no language specified look at the uer's profile - where it is encoded as per RFC 5646
-        locale=current_profile['locale']
+        if not current_profile:
+            current_profile=user_profile(current_canvas_user_id)
+        locale=None
+        if current_profile:
+            locale=current_profile.get('locale', None)
         if locale:
             if locale[0:2] == 'en':
                 language='eng'
@@ -2711,7 +2083,7 @@ def main(argv):
 
     customize_data['Credits']=course_credits
 
-    course_info=canvas_course_info(canvas_course_id)
+    course_info=cached_for_course('course_info', canvas_course_id, canvas_course_info)
     if course_info:
         canvas_course_name=course_info['name']
 
@@ -2742,22 +2114,21 @@ def main(argv):
                 return
         else:
             # Look for the second author being in a group with the first author; for example, in a group set 'Exjobb grupp'
-            groups=list_groups_in_course(canvas_course_id)
-            if groups:
+            group_members=cached_for_course('group_members', canvas_course_id, group_members_in_course)
+            if group_members:
                 if Verbose_Flag:
-                    print("groups={}".format(groups))
+                    print("groups={}".format([g for g, g_members in group_members]))
                 groups_names=dict()
-                for g in groups:
+                for g, g_members in group_members:
                     g_id=g['id']
-                    g_members=members_of_groups(g_id)
                     #groups_names[g_id]={'name': g['name'], 'members': g_members}
                     if Verbose_Flag:
                         print("g_id={0}, g_members={1}".format(g_id, g_members))
                     if current_canvas_user_id in g_members:
-                        g_members.remove(current_canvas_user_id) # remove first author from list
+                        g_members=[m for m in g_members if m != current_canvas_user_id] # remove first author from list
                         if len(g_members) > 1:
                             print("too many users in group {}".format(g['name']))
-                        else:
+                        elif g_members:
                             second_canvas_user_id=g_members[0]
                             student2=student_from_students_by_id(second_canvas_user_id, students)
 
@@ -2831,7 +2202,7 @@ def main(argv):
     if x:
         area=x
     if not area:                # try to guess based upon course section
-        sections=sections_in_course(canvas_course_id)
+        sections=cached_for_course('sections', canvas_course_id, sections_in_course)
         if Verbose_Flag:
             print("sections={}".format(sections))
 
@@ -2916,7 +2287,7 @@ def main(argv):
 
     customize_data['Degree1']=degree1_data
 
-    teachers=teachers_in_course(canvas_course_id)
+    teachers=cached_for_course('teachers', canvas_course_id, teachers_in_course)
     if not teachers:
         print("Error in getting teachers for course: ".format(canvas_course_id))
         return
@@ -2932,7 +2303,7 @@ def main(argv):
         print("examiners={}".format(examiners))
 
     if not sections:
-        sections=sections_in_course(canvas_course_id)
+        sections=cached_for_course('sections', canvas_course_id, sections_in_course)
 
     #"Examiner1": {"Last name": "Maguire Jr.", "First name": "Gerald Q.", "Local User Id": "u1d13i2c", "E-mail": "maguire@kth.se", "organisation": {"L1": "School of Electrical Engineering and Computer Science" ,"L2": "Computer Science" }}, 
 
@@ -2956,13 +2327,16 @@ def main(argv):
             examiner_canvas_user_id=examiner['user']['id']
             examiner_section_id=teacher_section_id_by_name(examiner['user']['sortable_name'], sections)
         else:
-            assignments=list_assignments(canvas_course_id)
+            assignments=cached_for_course('assignments', canvas_course_id, list_assignments)
             examiner_assignment_id=assignment_id_from_assignment_name(assignments, 'Examiner')
-            examiner_grade=get_grade_for_assignment(canvas_course_id, examiner_assignment_id, current_canvas_user_id)
-            examiner_name=examiner_grade.get('entered_grade', None)
+            examiner_grade=grade_for_assignment(canvas_course_id, examiner_assignment_id, current_canvas_user_id)
+            examiner_name=None
+            if examiner_grade:
+                examiner_name=examiner_grade.get('entered_grade', None)
             if examiner_name:
                 print("examiner_name={}".format(examiner_name))
                 examiner=examiner_by_name(examiner_name, examiners)
+            if examiner:
                 examiner_canvas_user_id=examiner['user']['id']
                 examiner_section_id=teacher_section_id_by_name(examiner['user']['sortable_name'], sections)
                 if Verbose_Flag:
@@ -3029,13 +2403,16 @@ def main(argv):
         if supervisor:
             supervisor_canvas_user_id=supervisor['user']['id']
         else:
-            assignments=list_assignments(canvas_course_id)
+            assignments=cached_for_course('assignments', canvas_course_id, list_assignments)
             supervisor_assignment_id=assignment_id_from_assignment_name(assignments, 'Supervisor')
-            supervisor_grade=get_grade_for_assignment(canvas_course_id, supervisor_assignment_id, current_canvas_user_id)
-            supervisor_name=supervisor_grade.get('entered_grade', None)
+            supervisor_grade=grade_for_assignment(canvas_course_id, supervisor_assignment_id, current_canvas_user_id)
+            supervisor_name=None
+            if supervisor_grade:
+                supervisor_name=supervisor_grade.get('entered_grade', None)
             if supervisor_name:
                 print("supervisor_name={}".format(supervisor_name))
                 supervisor=supervisor_by_name(supervisor_name, teachers)
+            if supervisor:
                 supervisor_canvas_user_id=supervisor['user']['id']
                 if Verbose_Flag:
                     print("supervisor_id={0} is {1}".format(supervisor_canvas_user_id, supervisor))
@@ -3090,7 +2467,6 @@ def main(argv):
         if supervisor2:
             supervisor2_canvas_user_id=supervisor2['user']['id']
     else:
-        supervisor2_section_id=teacher_section_id_by_name(supervisor2['user']['sortable_name'], sections)
         # Try to identify the supervisor2 based upon the sections that the student is in - one could be that of their supervisor2
         author1_section_ids=section_ids_for_students_by_id(current_canvas_user_id, students)
         if examiner_section_id and (examiner_section_id in author1_section_ids):
@@ -3109,6 +2485,7 @@ def main(argv):
         #     author2_section_ids=section_ids_for_students_by_id(second_canvas_user_id, students)
 
     if supervisor2 and supervisor2_canvas_user_id:
+        supervisor2_section_id=teacher_section_id_by_name(supervisor2['user']['sortable_name'], sections)
         # calculate the school name, department, etc. for supervisor2
         supervisor2_kthid=supervisor2['sis_user_id']
         kth_profile=get_user_by_kthid(supervisor2_kthid)
@@ -3313,14 +2690,264 @@ def main(argv):
         customize_data['National Subject Categories Augmented']=national_subject_category_augmented
 
     print("customize_data={}".format(customize_data))
+    return customize_data
 
-    # save the results
-    output_filename=args["json"]
+def write_customize_data(customize_data, output_filename):
     if Verbose_Flag:
         print("output_filename={}".format(output_filename))
     with open(output_filename, 'w', encoding='utf-8') as output_FH:
         j_as_string = json.dumps(customize_data, ensure_ascii=False)
         print(j_as_string, file=output_FH)
+
+def section_by_id_or_name(section_id_or_name, sections):
+    for s in sections:
+        if str(s['id']) == section_id_or_name or s['name'] == section_id_or_name:
+            return s
+    return None
+
+# Create a JSON file for each student in the course (or in the section given with --section).
+# The course wide information is fetched once and the submissions for the Examiner and Supervisor
+# assignments are fetched for all of the students in a single paginated request.
+def customize_for_course(args, canvas_course_id):
+    if canvas_course_id <= 0:
+        print("To create JSON files for the students in a course, you have to specify the course with --canvas_course_id")
+        return
+
+    students=cached_for_course('students', canvas_course_id, students_in_course)
+    if not students:
+        print("Unable to find students in the Canvas course {}".format(canvas_course_id))
+        return
+
+    if args['section']:
+        sections=cached_for_course('sections', canvas_course_id, sections_in_course)
+        section=section_by_id_or_name(args['section'], sections)
+        if not section:
+            print("Unable to find section {0} in course {1}".format(args['section'], canvas_course_id))
+            return
+        user_ids=set([s['user_id'] for s in students if s['course_section_id'] == section['id']])
+    else:
+        user_ids=set([s['user_id'] for s in students])
+
+    prefetch_submissions(canvas_course_id)
+
+    # the examiners and supervisors are teachers in the course, so get all of their KTH profiles at once
+    if kth_profiles:
+        teachers=cached_for_course('teachers', canvas_course_id, teachers_in_course)
+        kth_profiles.prefetch([t['sis_user_id'] for t in teachers])
+
+    output_dir=args['output_dir']
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+
+    # the authors are taken from the course, so --author and --author2 are ignored
+    student_args=dict(args)
+    student_args['author2']=None
+
+    # a student can have several enrollments (one per section), so only use the first of them
+    done=set()
+    number_of_files=0
+    for student in students:
+        login_id=student['user'].get('login_id', None)
+        if student['user_id'] not in user_ids or not login_id or login_id in done:
+            continue
+        done.add(login_id)
+        print("creating customization for {}".format(login_id))
+        try:
+            customize_data=customize_for_author(student_args, canvas_course_id, login_id)
+        except Exception as e:
+            print("Error in creating customization for {0}: {1}".format(login_id, e))
+            continue
+        if not customize_data:
+            continue
+
+        # the second author of a first cycle degree project shares the JSON file of the first author
+        author2=customize_data.get('Author2', None)
+        if author2:
+            done.add(author2['E-mail'])
+
+        output_filename=os.path.join(output_dir, "customize-{}.json".format(login_id.split('@')[0]))
+        write_customize_data(customize_data, output_filename)
+        number_of_files=number_of_files+1
+
+    print("created {0} JSON files in {1}".format(number_of_files, output_dir))
+
+
+def main(argv):
+    global Verbose_Flag
+    global testing
+    global Keep_picture_flag
+    global national_subject_category
+    global national_subject_category_augmented
+    global kopps_course_info
+
+    argp = argparse.ArgumentParser(description="create_customized_JSON_file.py: to make a customized JSON file")
+
+    argp.add_argument('-v', '--verbose', required=False,
+                      default=False,
+                      action="store_true",
+                      help="Print lots of output to stdout")
+
+    argp.add_argument('-t', '--testing',
+                      default=False,
+                      action="store_true",
+                      help="execute test code"
+                      )
+
+    argp.add_argument("--config", type=str, default='config.json',
+                      help="read configuration from file")
+
+    argp.add_argument('-c', '--canvas_course_id',
+                      default=0,
+                      type=int,
+                      help="Canvas course id"
+                      )
+
+    argp.add_argument('-a', '--alternative_canvas_course_id',
+                      default=0,
+                      type=int,
+                      help="Canvas course id"
+                      )
+
+    argp.add_argument('-j', '--json',
+                      type=str,
+                      default="customize.json",
+                      help="output JSON file"
+                      )
+
+    argp.add_argument('--language',
+                      type=str,
+                      help="code for planned language of the thesis (eng or swe)"
+                      )
+
+    argp.add_argument('--exam',
+                      type=str,
+                      default=None,
+                      help="the deegree that the author(s) will apply for, as this affects the thesi covere"
+                      )
+
+    argp.add_argument('--author',
+                      type=str,
+                      help="login ID without the @kth.se"
+                      )
+
+    argp.add_argument('--author2',
+                      type=str,
+                      help="login ID of second without the @kth.se"
+                      )
+
+    argp.add_argument('--school',
+                      type=str,
+                      help="acronyms for school"
+                      )
+
+    argp.add_argument('--courseCode',
+                      type=str,
+                      help="course code"
+                      )
+
+    argp.add_argument('--programCode',
+                      type=str,
+                      help="program code"
+                      )
+
+    argp.add_argument('--cycle',
+                      type=int,
+                      help="cycle of thesis"
+                      )
+
+    argp.add_argument('--credits',
+                      type=float,
+                      help="number_of_credits of thesis"
+                      )
+
+    argp.add_argument('--area',
+                      type=str,
+                      help="area of thesis"
+                      )
+
+    argp.add_argument('--area2',
+                      type=str,
+                      help="area of thesis for combined Cinving. and Master's"
+                      )
+
+    argp.add_argument('--numberOfSupervisors',
+                      default=1,
+                      type=int,
+                      help="number of supervisors"
+                      )
+
+    argp.add_argument('--Supervisor',
+                      type=str,
+                      help="login ID of supervisor without the @kth.se"
+                      )
+
+    argp.add_argument('--Supervisor2',
+                      type=str,
+                      help="login ID of second supervisor without the @kth.se"
+                      )
+
+    argp.add_argument('--Supervisor3',
+                      type=str,
+                      help="login ID of third supervisor without the @kth.se"
+                      )
+
+    argp.add_argument('--Examiner',
+                      type=str,
+                      help="login ID of examiner without the @kth.se"
+                      )
+
+    argp.add_argument('--all',
+                      default=False,
+                      action="store_true",
+                      help="create a JSON file for every student in the course"
+                      )
+
+    argp.add_argument('--section',
+                      type=str,
+                      help="create a JSON file for every student in the section (given by its id or its name)"
+                      )
+
+    argp.add_argument('-o', '--output_dir',
+                      type=str,
+                      default='.',
+                      help="directory for the JSON files when using --all or --section"
+                      )
+
+    args = vars(argp.parse_args(argv))
+
+    Verbose_Flag=args["verbose"]
+
+    initialize(args)
+    
+    testing=args["testing"]
+    if Verbose_Flag:
+        print("testing={}".format(testing))
+
+    canvas_course_id=args['canvas_course_id']
+
+    exam=args['exam']
+    if exam and exam in EXAMS:
+        print("found a valid type of exam: {}".format(exam))
+    else:
+        list_of_exams=[e for e in EXAMS]
+        print("Do not understand what the exam is. specify --exam with one of {}".format(list_of_exams))
+        return
+
+    if args['all'] or args['section']:
+        customize_for_course(args, canvas_course_id)
+        return
+
+    author=args['author']
+    if not author:
+        print("You have to provude at least one of the auhtor's names")
+        return
+
+    customize_data=customize_for_author(args, canvas_course_id, author)
+    if not customize_data:
+        return
+
+    # save the results
+    write_customize_data(customize_data, args["json"])
     return
 
 if __name__ == '__main__':
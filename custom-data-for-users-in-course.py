@@ -33,6 +33,8 @@ import json
 
 from bs4 import BeautifulSoup
 
+import canvas_client
+
 #############################
 ###### EDIT THIS STUFF ######
 #############################
@@ -40,10 +42,11 @@ from bs4 import BeautifulSoup
 global baseUrl	# the base URL used for access to Canvas
 global header	# the header for all HTML requests
 global payload	# place to store additionally payload when needed for options to HTML requests
+global canvas	# shared client (pooled session, concurrent pagination) for the Canvas API
 
 # Based upon the options to the program, initialize the variables used to access Canvas gia HTML requests
 def initialize(options):
-    global baseUrl, header, payload
+    global baseUrl, header, payload, canvas
 
     # styled based upon https://martin-thoma.com/configuration-files-in-python/
     if options.config_filename:
@@ -63,6 +66,7 @@ def initialize(options):
 
             header = {'Authorization' : 'Bearer ' + access_token}
             payload = {}
+            canvas=canvas_client.CanvasClient(baseUrl, header, verbose=Verbose_Flag)
     except:
         print("Unable to open configuration file named {}".format(config_file))
         print("Please create a suitable configuration file, the default name is config.json")
@@ -73,34 +77,11 @@ selected_user_data={}
 
 
 def users_in_course(course_id):
-    user_found_thus_far=[]
     # Use the Canvas API to get the list of users enrolled in this course
     #GET /api/v1/courses/:course_id/enrollments
 
     url = "{0}/courses/{1}/enrollments".format(baseUrl,course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    extra_parameters={'per_page': '100'}
-    r = requests.get(url, params=extra_parameters, headers = header)
-    if Verbose_Flag:
-        print("result of getting enrollments: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-        
-        for p_response in page_response:  
-            user_found_thus_far.append(p_response)
-
-            # the following is needed when the reponse has been paginated
-            # i.e., when the response is split into pieces - each returning only some of the list of modules
-            # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-            while r.links['current']['url'] != r.links['last']['url']:  
-                r = requests.get(r.links['next']['url'], headers=header)  
-                page_response = r.json()  
-                for p_response in page_response:  
-                    user_found_thus_far.append(p_response)
-    return user_found_thus_far
+    return canvas.get_all(url)
 
 def user_profile_url(user_id):
     # Use the Canvas API to get the profile of a user
@@ -209,96 +190,25 @@ def section_name_from_section_id(sections_info, section_id):
             return i['name']
 
 def sections_in_course(course_id):
-    sections_found_thus_far=[]
     # Use the Canvas API to get the list of sections for this course
     #GET /api/v1/courses/:course_id/sections
 
     url = "{0}/courses/{1}/sections".format(baseUrl,course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    r = requests.get(url, headers = header)
-    if Verbose_Flag:
-        print("result of getting sections: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            sections_found_thus_far.append(p_response)
-
-            # the following is needed when the reponse has been paginated
-            # i.e., when the response is split into pieces - each returning only some of the list of modules
-            # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-            while r.links['current']['url'] != r.links['last']['url']:  
-                r = requests.get(r.links['next']['url'], headers=header)  
-                page_response = r.json()  
-                for p_response in page_response:  
-                    sections_found_thus_far.append(p_response)
-
-    return sections_found_thus_far
+    return canvas.get_all(url)
 
 def list_your_courses():
-    courses_found_thus_far=[]
     # Use the Canvas API to get the list of all of your courses
     # GET /api/v1/courses
 
-    url = baseUrl+'courses'
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    r = requests.get(url, headers = header)
-    if Verbose_Flag:
-        print("result of getting courses: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            courses_found_thus_far.append(p_response)
-
-            # the following is needed when the reponse has been paginated
-            # i.e., when the response is split into pieces - each returning only some of the list of modules
-            # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-            while r.links['current']['url'] != r.links['last']['url']:  
-                r = requests.get(r.links['next']['url'], headers=header)  
-                if Verbose_Flag:
-                    print("result of getting courses for a paginated response: {}".format(r.text))
-                page_response = r.json()  
-                for p_response in page_response:  
-                    courses_found_thus_far.append(p_response)
-
-    return courses_found_thus_far
+    url = "{0}/courses".format(baseUrl)
+    return canvas.get_all(url)
 
 def users_in_account(account_id):
-    user_found_thus_far=[]
     # Use the Canvas API to get the list of users known to the system
     # GET /api/v1/accounts/:account_id/users
 
     url = "{0}/accounts/{1}/users".format(baseUrl, account_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    extra_parameters={'per_page': '100'}
-    r = requests.get(url, params=extra_parameters, headers = header)
-    if Verbose_Flag:
-        print("result of getting users for account: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-        
-        for p_response in page_response:  
-            user_found_thus_far.append(p_response)
-
-            # the following is needed when the reponse has been paginated
-            # i.e., when the response is split into pieces - each returning only some of the list of modules
-            # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-            while r.links['current']['url'] != r.links['last']['url']:  
-                r = requests.get(r.links['next']['url'], headers=header)  
-                page_response = r.json()  
-                for p_response in page_response:  
-                    user_found_thus_far.append(p_response)
-    return user_found_thus_far
+    return canvas.get_all(url)
 
 def create_user(account_id, user_name, short_name, sortable_name, time_zone, locale, birthdate, unique_id, password, sis_user_id, email_address):
     # Create a user
@@ -418,35 +328,11 @@ def create_user(account_id, user_name, short_name, sortable_name, time_zone, loc
 
 def enrollments_in_course(course_id):
     global Verbose_Flag
-    users_found_thus_far=[]
-
     # Use the Canvas API to get the list of users enrolled in this course
     #GET /api/v1/courses/:course_id/enrollments
 
     url = "{0}/courses/{1}/enrollments".format(baseUrl,course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    extra_parameters={'per_page': '100'}
-    r = requests.get(url, params=extra_parameters, headers = header)
-    if Verbose_Flag:
-        print("result of getting enrollments: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-        
-        for p_response in page_response:  
-            user_found_thus_far.append(p_response)
-
-            # the following is needed when the reponse has been paginated
-            # i.e., when the response is split into pieces - each returning only some of the list of modules
-            # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-            while r.links['current']['url'] != r.links['last']['url']:  
-                r = requests.get(r.links['next']['url'], headers=header)  
-                page_response = r.json()  
-                for p_response in page_response:  
-                    user_found_thus_far.append(p_response)
-    return user_found_thus_far
+    return canvas.get_all(url)
 
 # Enroll a user 
 # return the user's Canvas user_id
@@ -25,6 +25,8 @@ import json
 # Use Python Pandas to create XLSX files
 import pandas as pd
 
+import kopps_cache
+
 from bs4 import BeautifulSoup
 
 ################################
@@ -32,6 +34,8 @@ from bs4 import BeautifulSoup
 ################################
 KOPPSbaseUrl = 'https://www.kth.se'
 
+global kopps	# cache for the responses from KOPPS (see kopps_cache.py)
+
 English_language_code='en'
 Swedish_language_code='sv'
 
@@ -53,7 +57,7 @@ def v1_get_programmes():
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting v1 programme: {}".format(r.text))
     #
@@ -116,7 +120,7 @@ def get_dept_codes(language_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting department codes: {}".format(r.text))
     #
@@ -144,7 +148,7 @@ def get_dept_courses(dept_code, language_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting courses for a department: {}".format(r.text))
     #
@@ -162,7 +166,7 @@ def get_course_info(course_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting course info: {}".format(r.text))
     #
@@ -197,7 +201,7 @@ def get_course_rounds_info(course_code, r_info):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting course round info: {}".format(r.text))
     #
@@ -216,7 +220,7 @@ def v1_get_course_info(course_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting v1 course info: {}".format(r.text))
     #
@@ -338,7 +342,7 @@ def programme_syllabi(program_code):
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting programme_syllabi: {}".format(r.text))
     #
@@ -362,7 +366,7 @@ def course_codes_from_url(syllabus_url):
     if Verbose_Flag:
         print("course_list_url: " + course_list_url)
     #
-    r = requests.get(course_list_url)
+    r = kopps.get(course_list_url)
     if Verbose_Flag:
         print("result of getting course list: {}".format(r.text))
     #
@@ -407,7 +411,7 @@ def target_group_for_course(course_code):
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting course information: {}".format(r.text))
     #
@@ -442,6 +446,7 @@ def target_group_for_course(course_code):
 
 def main():
     global Verbose_Flag
+    global kopps
 
     parser = optparse.OptionParser()
 
@@ -461,9 +466,21 @@ def main():
                       help="execute test code"
     )
 
+    parser.add_option('--offline',
+                      dest="offline",
+                      default=False,
+                      action="store_true",
+                      help="only use the cached KOPPS responses, do not access the network"
+    )
+
+    parser.add_option("--kopps_cache", dest="kopps_cache",
+                      default=kopps_cache.default_cache_filename,
+                      help="read and write cached KOPPS responses in FILE", metavar="FILE")
+
     options, remainder = parser.parse_args()
 
     Verbose_Flag=options.verbose
+    kopps=kopps_cache.KOPPSCache(options.kopps_cache, offline=options.offline, verbose=Verbose_Flag)
     if Verbose_Flag:
         print("ARGV      : {}".format(sys.argv[1:]))
         print("VERBOSE   : {}".format(options.verbose))
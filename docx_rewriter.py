@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# -*- mode: python; python-indent-offset: 4 -*-
+#
+# docx_rewriter.py
+#
+# Purpose: Rewrite a DOCX file (which is a ZIP file) where only a few of the members (typically
+#          'word/document.xml' and perhaps 'docProps/custom.xml') are changed.
+#
+# The members that are not changed are copied raw, i.e., their compressed bytes are copied from the
+# input ZIP file to the output ZIP file without being decompressed and recompressed. Only the members
+# that have a transform are read, transformed, and compressed again.
+#
+# Example of use in a program:
+#
+#   import docx_rewriter
+#   docx_rewriter.rewrite_docx(input_filename, output_filename,
+#                              {'word/document.xml': lambda xml_content: transform_file(xml_content, ...)})
+#
+# A transform gets the member's contents as a string (decoded as UTF-8) and returns the new contents.
+#
+# 2026-10-18
+#
+import copy
+import struct
+import zipfile
+
+try:
+    import zlib
+    compression = zipfile.ZIP_DEFLATED
+except:
+    compression = zipfile.ZIP_STORED
+
+
+def read_member_raw(zip_in, info):
+    # returns the still compressed bytes of the member described by info
+    zip_in.fp.seek(info.header_offset)
+    local_header=zip_in.fp.read(zipfile.sizeFileHeader)
+    fheader=struct.unpack(zipfile.structFileHeader, local_header)
+    if fheader[0] != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile("Bad magic number for file header of {}".format(info.filename))
+    # the local header's file name and extra field lengths can differ from those in the central directory
+    data_offset=info.header_offset+zipfile.sizeFileHeader+fheader[zipfile._FH_FILENAME_LENGTH]+fheader[zipfile._FH_EXTRA_FIELD_LENGTH]
+    zip_in.fp.seek(data_offset)
+    return zip_in.fp.read(info.compress_size)
+
+def write_member_raw(zip_out, info, raw_data):
+    # write a member whose data (raw_data) is already compressed as described by info
+    new_info=copy.copy(info)
+    # the sizes and CRC go in the local header, so there is no data descriptor after the data
+    new_info.flag_bits &= ~zipfile._MASK_USE_DATA_DESCRIPTOR
+    new_info.header_offset=zip_out.fp.tell()
+    zip_out.fp.write(new_info.FileHeader())
+    zip_out.fp.write(raw_data)
+    zip_out.filelist.append(new_info)
+    zip_out.NameToInfo[new_info.filename]=new_info
+    zip_out.start_dir=zip_out.fp.tell()
+    zip_out._didModify=True
+
+def copy_member_raw(zip_in, zip_out, info):
+    # copy the still compressed bytes of the member described by info from zip_in to zip_out
+    write_member_raw(zip_out, info, read_member_raw(zip_in, info))
+
+def read_members_raw(filename):
+    # returns a list of (info, raw_data) for all of the members of the ZIP file, in their order in the file,
+    # so that a template can be read once and then written out any number of times
+    members=[]
+    with zipfile.ZipFile(filename) as zip_in:
+        for info in zip_in.infolist():
+            if info.flag_bits & 0x1: # encrypted members are not supported
+                raise zipfile.BadZipFile("Encrypted file {0} in {1}".format(info.filename, filename))
+            members.append((info, read_member_raw(zip_in, info)))
+    return members
+
+def rewrite_docx(input_filename, output_filename, transforms, verbose=False):
+    # transforms is a dict mapping the name of a member to a function that transforms its contents
+    with zipfile.ZipFile(input_filename) as document, zipfile.ZipFile(output_filename, 'w') as zipOut:
+        for info in document.infolist():
+            fn=info.filename
+            transform=transforms.get(fn, None)
+            if transform is None:
+                if verbose:
+                    print("copying file: {}".format(fn))
+                if info.flag_bits & 0x1: # encrypted members cannot be copied raw
+                    zipOut.writestr(info, document.read(fn), compress_type=info.compress_type)
+                else:
+                    copy_member_raw(document, zipOut, info)
+                continue
+
+            if verbose:
+                print("processing file: {}".format(fn))
+            xml_content = document.read(fn).decode('utf-8')
+            file_contents = transform(xml_content)
+            zipOut.writestr(fn, file_contents,  compress_type=compression)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# -*- mode: python; python-indent-offset: 4 -*-
+#
+# examiner_classes.py
+#
+# Purpose: Group the degree project courses into equivalence classes of courses that have the same set of examiners,
+#          for setup-degree-project-course-from-JSON-file.py, check_degree_projects_from_DiVA.py, and
+#          get-all-degree-project-examiners.py.
+#
+# The input is a dict of course code -> list of examiners (as in all_course_examiners in the course-data files).
+# The classes are returned in the form used by course_examiner_alternatives_table() and course_examiner_alternatives_answers():
+#   {'courses': {i: [course codes]}, 'examiners': {i: set of examiners}, 'courses_with_no_examiner': [course codes]}
+# where the class numbers i are given in the order in which the examiner sets are first seen.
+#
+# equivalence_classes() looks up each course's examiner set (as a frozenset) in a dict, so grouping takes linear time
+# rather than comparing each course's examiners with every class found so far.
+#
+# update_equivalence_classes() is the incremental version: given the previous classes (for example, from the last term)
+# and the changes (course code -> new list of examiners, or None for a course that has been removed), only the affected
+# classes are changed. The other classes keep their numbers, hence the blanks ([e0], [e1], ...) of the survey's
+# examiner question stay the same. course_examiner_changes() works out these changes from a new set of course examiners.
+#
+# save_classes() and load_classes() store the classes as a JSON file.
+#
+# Example of use in a program:
+#
+#   import examiner_classes
+#   previous=examiner_classes.load_classes(filename)
+#   if previous is None:
+#       classes=examiner_classes.equivalence_classes(all_course_examiners)
+#   else:
+#       changes=examiner_classes.course_examiner_changes(previous, all_course_examiners)
+#       classes=examiner_classes.update_equivalence_classes(previous, changes)
+#   examiner_classes.save_classes(filename, classes)
+#
+# 2026-10-18
+#
+
+import json
+
+
+def class_index(classes):
+    # returns a dict of frozenset of examiners -> class number
+    return dict((frozenset(examiners), i) for i, examiners in classes['examiners'].items())
+
+def equivalence_classes(course_examiners, verbose=False):
+    classes={'courses': dict(), 'examiners': dict(), 'courses_with_no_examiner': list()}
+    return update_equivalence_classes(classes, course_examiners, verbose=verbose)
+
+def course_examiner_changes(classes, course_examiners):
+    # returns a dict of course code -> list of examiners (None if the course has been removed) for the courses whose
+    # examiners differ from those in classes
+    previous_examiners=dict()
+    for i, courses in classes['courses'].items():
+        for c in courses:
+            previous_examiners[c]=classes['examiners'][i]
+    for c in classes['courses_with_no_examiner']:
+        previous_examiners[c]=set()
+
+    changes=dict()
+    for c, examiners in course_examiners.items():
+        if c not in previous_examiners or set(examiners) != previous_examiners[c]:
+            changes[c]=examiners
+    for c in previous_examiners:
+        if c not in course_examiners:
+            changes[c]=None
+    return changes
+
+def update_equivalence_classes(classes, changes, verbose=False):
+    # returns new classes where each course in changes has been moved to the class for its new examiners
+    courses_with_same_examiners=dict((i, list(courses)) for i, courses in classes['courses'].items())
+    set_of_examiners=dict((i, set(examiners)) for i, examiners in classes['examiners'].items())
+    courses_with_no_examiner=list(classes['courses_with_no_examiner'])
+    index=class_index(classes)
+    class_of_course=dict()
+    for i, courses in courses_with_same_examiners.items():
+        for c in courses:
+            class_of_course[c]=i
+    next_set=max(set_of_examiners, default=-1)+1
+
+    for c, examiners_for_class in changes.items():
+        old_class=class_of_course.get(c, None)
+        if old_class is not None and examiners_for_class is not None and set(examiners_for_class) == set_of_examiners[old_class]:
+            continue            # the course stays in its class
+
+        # take the course out of its old class
+        class_of_course.pop(c, None)
+        if old_class is not None:
+            courses_with_same_examiners[old_class].remove(c)
+            if not courses_with_same_examiners[old_class]:
+                if verbose:
+                    print("class {0} with examiners {1} no longer has any courses".format(old_class, set_of_examiners[old_class]))
+                del courses_with_same_examiners[old_class]
+                del index[frozenset(set_of_examiners.pop(old_class))]
+        elif c in courses_with_no_examiner:
+            courses_with_no_examiner.remove(c)
+        if examiners_for_class is None: # the course has been removed
+            continue
+
+        examiner_set=frozenset(examiners_for_class)
+        if verbose:
+            print("examiners_for_class={0} are {1}".format(c, set(examiner_set)))
+        if not examiner_set:
+            if verbose:
+                print("course {0} has no examiners".format(c))
+            courses_with_no_examiner.append(c)
+            continue
+        i=index.get(examiner_set, None)
+        if i is None:
+            i=next_set
+            next_set=next_set+1
+            if verbose:
+                print("new courses_with_same_examiners[{0}] is {1}".format(i, set(examiner_set)))
+            index[examiner_set]=i
+            set_of_examiners[i]=set(examiner_set)
+            courses_with_same_examiners[i]=[]
+        elif verbose:
+            print("added {0} to courses_with_same_examiners[{1}] is {2}".format(c, i, set(examiner_set)))
+        courses_with_same_examiners[i].append(c)
+        class_of_course[c]=i
+    #
+    return {'courses': courses_with_same_examiners, 'examiners': set_of_examiners, 'courses_with_no_examiner': courses_with_no_examiner}
+
+
+def save_classes(filename, classes):
+    # JSON has neither sets nor integer keys, so the examiners are stored as sorted lists and the class numbers as strings
+    with open(filename, 'w') as outfile:
+        json.dump({'courses': classes['courses'],
+                   'examiners': dict((i, sorted(examiners)) for i, examiners in classes['examiners'].items()),
+                   'courses_with_no_examiner': classes['courses_with_no_examiner']},
+                  outfile, indent=4, ensure_ascii=False)
+
+def load_classes(filename):
+    # returns the classes saved in filename, or None if there is no such file
+    try:
+        with open(filename) as infile:
+            saved=json.load(infile)
+    except FileNotFoundError:
+        return None
+    return {'courses': dict((int(i), courses) for i, courses in saved['courses'].items()),
+            'examiners': dict((int(i), set(examiners)) for i, examiners in saved['examiners'].items()),
+            'courses_with_no_examiner': saved['courses_with_no_examiner']}
@@ -8,6 +8,14 @@
 #
 # Output: outputs files and information to the target_directory
 #
+# If a course_id is given, the media files (images, audio, ...) are also uploaded to the course's files in Canvas.
+# The Canvas file ID of each uploaded media file is remembered in a persistent store (by default the file
+# PPTX_media_uploads.sqlite3 in the current directory, see the --upload_store option), keyed by the course_id and the
+# MD5 hash of the file's contents. Hence a media file that appears in several slide decks (such as a logo) is only
+# uploaded once per course, later it is simply linked to. The Canvas file IDs and URLs of the media files of a PPTX file
+# are output to canvas_media_files.json in the target_directory.
+# The files are streamed to Canvas, rather than first being read into memory.
+#
 # Example:
 # ./extract_content_from_PPTX_file.py --file Lecture-4-4-tiled-matrix-multiplication-kernel.pptx --dir Lecture-4-4-tiled-matrix-multiplication-kernel-contents
 #
@@ -23,11 +31,20 @@ import subprocess
 import json
 import argparse
 import os			# to make OS calls, here to get time zone info
+import io
 
 import time
 
 import pprint
 
+import requests
+
+# for guessing the content type of the media files
+import mimetypes
+
+# for the persistent store of uploaded media files
+import sqlite3
+
 from collections import defaultdict
 
 
@@ -239,13 +256,12 @@ def create_folder(course_id, name, parent_folder_id):
         return True
     return False
 
+# returns the Canvas JSON representation of the new file, or None if the upload failed
 def create_file(course_id, filename, parent_folder_id, content_type):
     global Verbose_Flag
     global pp
 
-    with open(filename, 'rb') as file_handle:
-        file_contents = file_handle.read()
-    file_size=len(file_contents)
+    file_size=os.path.getsize(filename)
     if Verbose_Flag:
         print(f'{file_size=}')
     
@@ -267,7 +283,7 @@ def create_file(course_id, filename, parent_folder_id, content_type):
     if Verbose_Flag:
        print("url: " + url)
 
-    payload={'name': filename,
+    payload={'name': os.path.basename(filename),
              'size': file_size,
              'content_type': content_type,
              'parent_folder_id': parent_folder_id}
@@ -297,53 +313,137 @@ def create_file(course_id, filename, parent_folder_id, content_type):
         payload=page_response['upload_params']
 
         # Note that the access token is _not_ sent with this request
-        upload_header={}
-        r = requests.post(url, headers = upload_header, data=payload, files={"file": open(filename, 'rb')})
+        # The file is streamed as the body of the multipart/form-data request, rather than being read into memory
+        with open(filename, 'rb') as file_handle:
+            body=MultipartFileStream(payload, 'file', os.path.basename(filename), content_type, file_handle, file_size)
+            upload_header={'Content-Type': body.content_type}
+            r = requests.post(url, headers = upload_header, data=body, allow_redirects=False)
         if Verbose_Flag:
             print("result of file create step #2: {}".format(r.text))
             print(f'{r.status_code=}')
         if 300 <= r.status_code and r.status_code < 400:
-            page_response=r.json()
-
             # Step 3: Confirm the upload's success
             # If Step 2 is successful, the response will be either a 3XX redirect or 201 Created with a Location header set as normal.
             # In the case of a 3XX redirect, the application needs to perform a GET to this location in order to complete the upload, otherwise the new file may not be marked as available. (Note: While a POST would be truer to REST semantics, a GET is required for forwards compatibility with the 201 Created response described below.) This request is back against Canvas again, and needs to be authenticated using the normal API access token authentication.
-            file_id=page_response['id']
-            urL=page_response['location']
-            print("file_id={0}, url={1}".format(file_id, url))
-
+            url=r.headers['Location']
             if Verbose_Flag:
                 print("url: " + url)
 
-            payload={'Content-Length': 0}
-            r = requests.post(url, headers = header, data=payload)
+            r = requests.get(url, headers = header)
             if Verbose_Flag:
                 print("result of create file step #3: {}".format(r.text))
             if r.status_code == requests.codes.ok:
                 page_response=r.json()
-                return True
+                return page_response
         elif 200 <= r.status_code and r.status_code < 300:
             page_response=r.json()
 
             # In the case of a 201 Created, the upload has been complete and the Canvas JSON representation of the file can be retrieved with a GET from the provided Location.
             if Verbose_Flag:
                 pp.pprint(page_response)
-            file_id=page_response['id']
-            file_url=page_response['url']
-            if Verbose_Flag:
-                print("file_id={0}, file_url={1}".format(file_id, file_url))
-
-            r = requests.get(file_url, headers = header, data=payload)
+            if page_response.get('id', None) is None and r.headers.get('Location', None):
+                r = requests.get(r.headers['Location'], headers = header)
+                if Verbose_Flag:
+                    print("result of create file step #3: {}".format(r.text))
+                if r.status_code != requests.codes.ok:
+                    return None
+                page_response=r.json()
             if Verbose_Flag:
-                print("result of create file step #3: {}".format(r.text))
-            if r.status_code == requests.codes.ok:
-                return True
+                print("file_id={0}, file_url={1}".format(page_response.get('id', None), page_response.get('url', None)))
+            return page_response
         else:
-            return False
-    return False
+            return None
+    return None
 
 
 
+class MultipartFileStream:
+    # A file-like object that reads as a multipart/form-data body with the given fields followed by the contents of
+    # an open file, so that requests can stream the file (in blocks) rather than building the whole body in memory.
+    # As it has a length, requests sends a Content-Length header (rather than using a chunked transfer encoding).
+    def __init__(self, fields, file_field_name, filename, content_type, file_handle, file_size):
+        boundary=os.urandom(16).hex()
+        self.content_type='multipart/form-data; boundary={}'.format(boundary)
+        preamble=''
+        for name, value in fields.items():
+            preamble=preamble+'--{0}\r\nContent-Disposition: form-data; name="{1}"\r\n\r\n{2}\r\n'.format(boundary, name, value)
+        preamble=preamble+'--{0}\r\nContent-Disposition: form-data; name="{1}"; filename="{2}"\r\nContent-Type: {3}\r\n\r\n'.format(boundary, file_field_name, filename, content_type)
+        epilogue='\r\n--{0}--\r\n'.format(boundary)
+        self.parts=[io.BytesIO(preamble.encode('utf-8')), file_handle, io.BytesIO(epilogue.encode('utf-8'))]
+        self.len=len(self.parts[0].getvalue())+file_size+len(self.parts[2].getvalue())
+
+    def read(self, size=-1):
+        data=b''
+        while self.parts and (size < 0 or len(data) < size):
+            chunk=self.parts[0].read(-1 if size < 0 else size-len(data))
+            if not chunk:
+                self.parts.pop(0)
+                continue
+            data=data+chunk
+        return data
+
+# The persistent store of the media files that have been uploaded: (course_id, MD5 hash of the contents) -> Canvas file
+default_upload_store_filename='PPTX_media_uploads.sqlite3'
+
+def open_upload_store(store_filename):
+    db=sqlite3.connect(store_filename)
+    db.execute("""CREATE TABLE IF NOT EXISTS uploaded_media (
+                      course_id INTEGER NOT NULL,
+                      file_hash TEXT NOT NULL,
+                      file_id INTEGER NOT NULL,
+                      url TEXT,
+                      display_name TEXT,
+                      uploaded REAL NOT NULL,
+                      PRIMARY KEY (course_id, file_hash))""")
+    db.commit()
+    return db
+
+def lookup_uploaded_media(db, course_id, file_hash):
+    row=db.execute("SELECT file_id, url, display_name FROM uploaded_media WHERE course_id=? AND file_hash=?",
+                   (course_id, file_hash)).fetchone()
+    if row is None:
+        return None
+    return {'id': row[0], 'url': row[1], 'display_name': row[2]}
+
+def remember_uploaded_media(db, course_id, file_hash, canvas_file):
+    db.execute("INSERT OR REPLACE INTO uploaded_media VALUES (?, ?, ?, ?, ?, ?)",
+               (course_id, file_hash, canvas_file['id'], canvas_file.get('url', None), canvas_file.get('display_name', None), time.time()))
+    db.commit()
+
+def forget_uploaded_media(db, course_id, file_hash):
+    db.execute("DELETE FROM uploaded_media WHERE course_id=? AND file_hash=?", (course_id, file_hash))
+    db.commit()
+
+def file_exists_in_course(course_id, file_id):
+    # check that a previously uploaded file has not been deleted from the course
+    url = "{0}/courses/{1}/files/{2}".format(baseUrl, course_id, file_id)
+    if Verbose_Flag:
+        print("url: {}".format(url))
+    r = requests.get(url, headers = header)
+    return r.status_code == requests.codes.ok
+
+def upload_media_file(db, course_id, filename, file_hash, checked_file_ids):
+    # returns the Canvas file for the media file, uploading it only if it is not already in the course
+    canvas_file=lookup_uploaded_media(db, course_id, file_hash)
+    if canvas_file:
+        if canvas_file['id'] in checked_file_ids or file_exists_in_course(course_id, canvas_file['id']):
+            checked_file_ids.add(canvas_file['id'])
+            print("already uploaded {0} as file_id={1}".format(filename, canvas_file['id']))
+            return canvas_file
+        print("file_id={0} is no longer in the course, uploading {1} again".format(canvas_file['id'], filename))
+        forget_uploaded_media(db, course_id, file_hash)
+
+    content_type=mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    canvas_file=create_file(course_id, filename, None, content_type)
+    if not canvas_file or canvas_file.get('id', None) is None:
+        print("Unable to upload {}".format(filename))
+        return None
+    remember_uploaded_media(db, course_id, file_hash, canvas_file)
+    checked_file_ids.add(canvas_file['id'])
+    print("uploaded {0} as file_id={1}".format(filename, canvas_file['id']))
+    return canvas_file
+
+
 def create_page(course_id, title, body):
     # Create a new wiki page
     # POST /api/v1/courses/:course_id/pages 
@@ -660,7 +760,7 @@ def know_image_hash(file_hash, known_hashes):
         return "{0}.{1}".format(p['known_file_name'], p['type'])
     return None
 
-# <?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+# <?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 # <Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
 # <Relationship Id="rId3" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideLayout" Target="../slideLayouts/slideLayout2.xml"/>
 # <Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/audio" Target="../media/media10.m4a"/>
@@ -743,6 +843,12 @@ def main(argv):
                       help="read configuration from FILE"
                       )
 
+    argp.add_argument('--upload_store',
+                      type=str,
+                      default=default_upload_store_filename,
+                      help="file with the store of the media files that have been uploaded to Canvas"
+                      )
+
 
 
     args = vars(argp.parse_args(argv))
@@ -775,6 +881,9 @@ def main(argv):
     course_id=args["course_id"]
     if course_id:
         print(f'{course_id=}')
+        upload_store=open_upload_store(args["upload_store"])
+        checked_file_ids=set()
+        canvas_media_files=dict()
 
     document = zipfile.ZipFile(input_filename)
     file_names=document.namelist()
@@ -1006,21 +1115,29 @@ def main(argv):
 
         # Extract media files, such as ppt/media/image10.png
         if len(split_fn) == 3 and split_fn[0] == 'ppt' and split_fn[1] == 'media':
+            # copy the file out in blocks, computing its hash on the way, so that large (audio/video) files are not read into memory
+            output_filename=f'{target_directory}/{split_fn[2]}'
+            h=hashlib.md5()
             try:
-                file_contents = document.read(fn)
+                with document.open(fn) as media_file, open(output_filename,'wb') as f:
+                    for block in iter(lambda: media_file.read(1024*1024), b''):
+                        h.update(block)
+                        f.write(block)
             except Exception as e:
                 print("Error {0} encountered when processing: {1}".format(e.args, fn))
                 continue        # process the next package item
 
-            file_hash = hashlib.md5(file_contents).hexdigest()
+            file_hash = h.hexdigest()
             print("file: {0} with hash {1}".format(split_fn[2], file_hash))
             know_name=know_image_hash(file_hash, known_hashes)
             if know_name:
+                os.replace(output_filename, f'{target_directory}/{split_fn[2]}-{know_name}')
                 output_filename=f'{target_directory}/{split_fn[2]}-{know_name}'
-            else:
-                output_filename=f'{target_directory}/{split_fn[2]}'
-            with open(output_filename,'wb') as f:
-                f.write(file_contents)
+
+            if course_id:
+                canvas_file=upload_media_file(upload_store, course_id, output_filename, file_hash, checked_file_ids)
+                if canvas_file:
+                    canvas_media_files[split_fn[2]]={'hash': file_hash, 'id': canvas_file['id'], 'url': canvas_file.get('url', None)}
 
 
         # # copy existing file to archive
@@ -1041,6 +1158,11 @@ def main(argv):
 
     document.close()
 
+    if course_id:
+        upload_store.close()
+        with open(f'{target_directory}/canvas_media_files.json','w') as f:
+            json.dump(canvas_media_files, f, indent=4)
+
 
 if __name__ == '__main__':
     sys.exit(main(sys.argv[1:]))
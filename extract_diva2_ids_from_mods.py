@@ -24,7 +24,8 @@ import json
 # Use Python Pandas to create XLSX files
 import pandas as pd
 
-from bs4 import BeautifulSoup
+# for reading the MODS file one record at a time
+import mods_reader
 
 ################################
 ######    DiVA related   ######
@@ -32,19 +33,14 @@ from bs4 import BeautifulSoup
 DiVAUrlbase = 'http://kth.diva-portal.org/smash/record.jsf?pid=diva2%3A'
 
 
-def get_diva2ids(xml):
+def get_diva2ids(mods_filename):
     list_of_diva2_ids=list()
-    #
-    found=xml.findAll('recordIdentifier')
-    if found:
-        if Verbose_Flag:
-            print("length={0}, found={1}".format(len(found), found ))
-        for idx, singlerow in enumerate(found):
-            h1=singlerow.string
+    # read the MODS file one <mods> element at a time, rather than parsing the whole file into memory
+    for node_index, mods_element in mods_reader.iterate_mods(mods_filename):
+        for h1 in mods_reader.record_identifiers(mods_element):
             if Verbose_Flag:
-                print("h1 {0}={1}".format(idx, h1))
-            if h1:
-                list_of_diva2_ids.append(h1)
+                print("h1 {0}={1}".format(node_index, h1))
+            list_of_diva2_ids.append(h1)
     return list_of_diva2_ids
 
 
@@ -77,13 +73,10 @@ def main():
     else:
         mods_filename=remainder[0]
 
-    input_file=open(mods_filename, 'rb')
-    xml=BeautifulSoup(input_file, 'lxml-xml')
+    ids=get_diva2ids(mods_filename)
     if Verbose_Flag:
         print("Finished parsing the xml")
 
-    ids=get_diva2ids(xml)
-
     ids_df= pd.DataFrame(ids, columns=['diva2 ids'])
 
     writer = pd.ExcelWriter('diva2_ids.xlsx', engine='xlsxwriter')
@@ -23,6 +23,10 @@
 # To get the correct pdfminer package od:
 # pip install pdfminer.six
 #
+# As the For DIVA information is at the end of the PDF file, only the trailing pages (from the page where
+# the For DIVA information starts to the end of the document) are converted to text, walking backward from the last page.
+# If PyMuPDF (pip install pymupdf) is installed, it is used to quickly find the page where the For DIVA information starts.
+#
 # 2021-04-22 G. Q. Maguire Jr.
 #
 import re
@@ -46,48 +50,19 @@ from pdfminer.pdfparser import PDFParser
 
 from pdfminer.high_level import extract_pages
 
-def remove_comment_to_EOL(s):
-    global Verbose_Flag
-    offset=s.find('%')
-    if offset < 0:              # if no comments, then return right away
-        return s
-    while (offset) >= 0:
-        if (offset == 0) or (s[offset-1] != '\\'):
-            # remove to EOL
-            EOL_offset=s.find('\n', offset)
-            if EOL_offset > 0:
-                if (offset == 0):
-                    s=s[EOL_offset+1:]
-                else:
-                    s=s[0:offset] + '\n' +s[EOL_offset+1:]
-        offset=s.find('%', offset+1)
-    return s
+# PyMuPDF is optional, it is only used to quickly find where the For DIVA information starts
+try:
+    import pymupdf # import PyMuPDF
+except ImportError:
+    pymupdf=None
 
+# for transforming the LaTeX in the abstracts
+import latex_to_html
+from latex_to_html import replace_ligature
 
-
-def replace_latex_symbol(s, symbol, insert_symbol):
-    global Verbose_Flag
-    cmd_offset=s.find(symbol)
-    while (cmd_offset) > 0:
-        s1=s[:cmd_offset]
-        s2=s[cmd_offset+len(symbol):]
-        s=s1+insert_symbol+s2
-        cmd_offset=s.find(symbol, cmd_offset)
-    return s
-
-
-# usage: replace_latex_command(s1, '\\textit{', '<i>', '</i>')
-def replace_latex_command(s, command, insert_at_start, insert_at_end):
-    global Verbose_Flag
-    cmd_offset=s.find(command)
-    while (cmd_offset) > 0:
-        s1=s[:cmd_offset]
-        end_offset=s.find('}', cmd_offset+len(command))
-        s2=s[cmd_offset+len(command):end_offset]
-        s3=s[end_offset+1:]
-        s=s1+insert_at_start+s2+insert_at_end+s3
-        cmd_offset=s.find(command, cmd_offset)
-    return s
+# for spelling out the acronyms in the abstracts and keywords
+import acronym_expander
+from acronym_expander import check_for_acronyms, collect_acronyms
 
 # \textregistered
 # \textcopyright
@@ -98,7 +73,7 @@ def clean_up_abstract(s):
     #print("in clean_up_abstract abstract={}".format(s))
     if s[0] == '\n':
         s=s[1:]
-    s=remove_comment_to_EOL(s)
+    s=latex_to_html.remove_comment_to_EOL(s)
     s='<p>'+s+'</p>'
     #s=s.replace('<span style="font-family: TeXGyreHeros-Bold; font-size:5px">', '<span style="font-weight:bold">')
     #s=s.replace('<span style="font-family: TeXGyreHeros-Italic; font-size:5px">', '<span style="font-style:italic">')
@@ -107,18 +82,9 @@ def clean_up_abstract(s):
     s=s.replace('', '') 
     s=s.replace('\x0c', '')
     s=s.replace('\n\n', '</p><p>')
-    s=s.replace('\\&', '&amp;')
     s=s.replace('\\linebreak[4]', '')
-    s=replace_latex_command(s, '\\textit{', '<i>', '</i>')
-    s=replace_latex_command(s, '\\emph{', '<strong>', '</strong>')
-    s=replace_latex_command(s, '\\textbf{', '<bold>', '</bold>')
-    s=replace_latex_command(s, '\\texttt{', '<tt>', '</tt>')
-    s=replace_latex_command(s, '\\textsubscript{', '<sub>', '</sub>')
-    s=replace_latex_command(s, '\\textsuperscript{', '<sup>', '</sup>')
-    s=replace_latex_symbol(s, '\\ldots', ' ... ')
-    s=replace_latex_symbol(s, '\\textregistered', '&reg;')
-    s=replace_latex_symbol(s, '\\texttrademark', '&trade;')
-    s=replace_latex_symbol(s, '\\textcopyright', '&copy;')
+    # the commands (\textit{...}, ...), symbols (\&, \ldots, ...), defines.tex macros, and units in a single pass
+    s=latex_to_html.transform_latex(s, 'diva')
     s=s.replace('\\begin{itemize}</p><p>\\item', '</p><ul><li>')
     s=s.replace('\\item', '</li><li>')
     s=s.replace('</p><p>\\end{itemize}</p>', '</li></ul>')
@@ -132,30 +98,6 @@ def clean_up_abstract(s):
     s=s.replace(' </p>', '</p>') # remove space before </p>' from abstracts
     s=s.replace('<p>•</p><p>', '<p>• ') # join the bullet with the paragraph
 
-
-    # handle defines.tex macros
-    s=s.replace('\\eg', 'e.g.')
-    s=s.replace('\\Eg', 'E.g.')
-    s=s.replace('\\ie', 'i.e.')
-    s=s.replace('\\Ie', 'I.e.')
-    s=s.replace('\\etc', 'etc.')
-    s=s.replace('\\etal', 'et al.')
-    s=s.replace('\\first', '(i) ')
-    s=s.replace('\\Second', '(ii) ')
-    s=s.replace('\\third', '(iii) ')
-    s=s.replace('\\fourth', '(iv) ')
-    s=s.replace('\\fifth', '(v) ')
-    s=s.replace('\\sixth', '(vi) ')
-    s=s.replace('\\seventh', '(vii) ')
-    s=s.replace('\\eighth', '(viii) ')
-    # handle some units
-    s=s.replace('{\\meter\\squared}', '\u202Fm<sup>2</sup>')
-    s=s.replace('{\\meter\\per\\second}', '\u202Fm\u202Fs<sup>-1</sup>')
-    s=s.replace('{\\second}', '\u202Fs')
-    s=s.replace('{\\meter}', '\u202Fm')
-    s=s.replace('{\\percent}', '%')
-    s=replace_latex_command(s, '\\num{', '', '')
-    s=replace_latex_command(s, '\\SI{', '', '')
     #
     trailing_empty_paragraph='<p> </p>'
     if s.endswith(trailing_empty_paragraph):
@@ -166,36 +108,6 @@ def clean_up_abstract(s):
     return s
 
 
-def check_for_acronyms(a):
-    if (a.find('\\gls{') >= 0) or (a.find('\\glspl{') >= 0) or \
-       (a.find('\\Gls{') >= 0) or (a.find('\\Glspl{') >= 0) or \
-       (a.find('\\acrlong{') >= 0) or (a.find('\\acrshort{') >= 0) or \
-       (a.find('\\acrfull{') >= 0) or \
-       (a.find('\\glsxtrshort{') >= 0) or (a.find('\\glsxtrlong{') >= 0) \
-       or (a.find('\\glsxtrfull{') >= 0) :
-        return True
-    return False
-
-def collect_acronyms(a):
-    collected_acronyms=set()
-    possible_acronym_references=['\\gls{', '\\glspl{', '\\Gls{', '\\Glspl{', '\\acrlong{', '\\acrshort{', '\\acrfull{', '\\glsxtrshort{', '\\glsxtrlong{', '\\glsxtrfull{']
-    for pat in possible_acronym_references:
-        starting=0
-        while starting < len(a):
-            offset=a.find(pat, starting)
-            if offset >= 0:
-                end_of_command=a[offset+len(pat):].find('}')
-                if end_of_command >= 0:
-                    acronym=a[offset+len(pat):offset+len(pat)+end_of_command]
-                    collected_acronyms.add(acronym)
-                    starting=offset+len(pat)+end_of_command+1
-                else:           # error there is not an ending right brace found
-                    break
-            else:               # no instance found. so no need to look more
-                break
-    return collected_acronyms
-
-
 # Format of acronyms, some examples
 # \newacronym{NAS}{NAS}{Network Attached Storage}
 # split_acronym_definition(l1)
@@ -334,356 +246,70 @@ def get_acronyms(acronyms_filename):
         return acronym_dict, "No file"
     return acronym_dict, "Default"
 
-def replace_first_gls(a, offset, acronym_dict):
-    global spelled_out
-    a_prefix=a[:offset]
-    end_of_acronym=a.find('}', offset+5)
-    if end_of_acronym < 0:
-        print("could not find end of acronym label")
-        return a
-    label=a[offset+5:end_of_acronym]
-    a_postfix=a[end_of_acronym+1:]
-    ad=acronym_dict.get(label, None)
-    if ad:
-        phrase=ad.get('phrase', None)
-        acronym=ad.get('acronym', None)
-        already_spelled_out=spelled_out.get(label, None)
-        if already_spelled_out:
-            if acronym:
-                a=a_prefix+acronym+a_postfix
-            else:
-                print("acronym missing for label={}".format(label))
-        else:
-            if phrase and acronym:
-                full_phrase="{0} ({1})".format(phrase, acronym)
-                a=a_prefix+full_phrase+a_postfix
-                spelled_out[label]=True
-            else:
-                print("phrase or acronym are missing for label={}".format(label))
-    else:
-        print("Missing acronym for {}".format(label))
-        return None
-    #
-    return a
-
-def replace_first_glspl(a, offset, acronym_dict):
-    global spelled_out
-    a_prefix=a[:offset]
-    end_of_acronym=a.find('}', offset+7)
-    if end_of_acronym < 0:
-        print("could not find end of acronym label")
-        return a
-    label=a[offset+7:end_of_acronym]
-    a_postfix=a[end_of_acronym+1:]
-    ad=acronym_dict.get(label, None)
-    if ad:
-        phrase=ad.get('phrase', None)
-        acronym=ad.get('acronym', None)
-        already_spelled_out=spelled_out.get(label, None)
-        if already_spelled_out:
-            if acronym:
-                a=a_prefix+acronym+a_postfix
-            else:
-                print("acronym missing for label={}".format(label))
-        else:
-            firstplural=ad.get('firstplural', None)
-            longplural=ad.get('longplural', None)
-            if firstplural:
-                full_phrase="{0} ({1})".format(longplural, acronym)
-                a=a_prefix+firstplural+a_postfix
-                spelled_out[label]=True
-            elif longplural:
-                full_phrase="{0} ({1})".format(longplural, acronym)
-                a=a_prefix+longplural+a_postfix
-                spelled_out[label]=True
-            elif phrase and acronym:
-                full_phrase="{0} ({1})".format(phrase, acronym)
-                a=a_prefix+full_phrase+'s'+a_postfix
-                spelled_out[label]=True
-            else:
-                print("phrase or acronym are missing for label={}".format(label))
-    else:
-        print("Missing acronym for {}".format(label))
-        return None
-    #
-    return a
-
-def spellout_acronyms_in_abstract(acronym_dict, a):
-    # look for use of acronyms (i.e., a reference to an acronym's label) and spell out as needed
-    # keep list of labels of acronyms found and spellout out
-    global spelled_out
-    spelled_out=dict()
-    # Note that because we initialize it for each call of this routine, the acronyms will be spellout appropriately in each abstract
-    #
-    # first handle all cases where the full version is to be included
-    acrfull_template='\\acrfull{'
-    acrfull_offset=a.find(acrfull_template)
-    while acrfull_offset >= 0:
-        a_prefix=a[:acrfull_offset]
-        end_of_acronym=a.find('}', acrfull_offset+len(acrfull_template))
-        if end_of_acronym < 0:
-            print("could not find end of acronym label")
-            break
-        label=a[acrfull_offset+len(acrfull_template):end_of_acronym]
-        a_postfix=a[end_of_acronym+1:]
-        ad=acronym_dict.get(label, None)
-        if ad:
-            phrase=ad.get('phrase', None)
-            acronym=ad.get('acronym', None)
-            if phrase and acronym:
-                full_phrase="{0} ({1})".format(phrase, acronym)
-                a=a_prefix+full_phrase+a_postfix
-                spelled_out[label]=True
-            else:
-                print("phrase or acronym are missing for label={}".format(label))
-            #
-            acrfull_offset=a.find(acrfull_template, end_of_acronym)
-    #
-    # second handle all cases where the long version is to be included
-    acrlong_template='\\acrlong{'
-    acrlong_offset=a.find(acrlong_template)
-    while acrlong_offset >= 0:
-        a_prefix=a[:acrlong_offset]
-        end_of_acronym=a.find('}', acrlong_offset+len(acrlong_template))
-        if end_of_acronym < 0:
-            print("could not find end of acronym label")
-            break
-        label=a[acrlong_offset+len(acrlong_template):end_of_acronym]
-        a_postfix=a[end_of_acronym+1:]
-        ad=acronym_dict.get(label, None)
-        if ad:
-            phrase=ad.get('phrase', None)
-            if phrase:
-                a=a_prefix+phrase+a_postfix
-            else:
-                print("phrase or acronym are missing for label={}".format(label))
-            #
-            acrlong_offset=a.find(acrlong_template, end_of_acronym)
-    #
-    #
-    # third handle all cases where the short version is to be included
-    acrshort_template='\\acrshort{'
-    acrshort_offset=a.find(acrshort_template)
-    while acrshort_offset >= 0:
-        a_prefix=a[:acrshort_offset]
-        end_of_acronym=a.find('}', acrshort_offset+len(acrshort_template))
-        if end_of_acronym < 0:
-            print("could not find end of acronym label")
-            break
-        label=a[acrshort_offset+len(acrshort_template):end_of_acronym]
-        a_postfix=a[end_of_acronym+1:]
-        ad=acronym_dict.get(label, None)
-        if ad:
-            acronym=ad.get('acronym', None)
-            if acronym:
-                a=a_prefix+acronym+a_postfix
-            else:
-                print("phrase or acronym are missing for label={}".format(label))
-            #
-            acrshort_offset=a.find(acrshort_template, end_of_acronym)
-
-    # for the glossaries-extra versions
-    # first handle all cases where the full version is to be included
-    acrfull_template='\\glsxtrfull{'
-    acrfull_offset=a.find(acrfull_template)
-    while acrfull_offset >= 0:
-        a_prefix=a[:acrfull_offset]
-        end_of_acronym=a.find('}', acrfull_offset+len(acrfull_template))
-        if end_of_acronym < 0:
-            print("could not find end of acronym label")
-            break
-        label=a[acrfull_offset+len(acrfull_template):end_of_acronym]
-        a_postfix=a[end_of_acronym+1:]
-        ad=acronym_dict.get(label, None)
-        if ad:
-            phrase=ad.get('phrase', None)
-            acronym=ad.get('acronym', None)
-            if phrase and acronym:
-                full_phrase="{0} ({1})".format(phrase, acronym)
-                a=a_prefix+full_phrase+a_postfix
-                spelled_out[label]=True
-            else:
-                print("phrase or acronym are missing for label={}".format(label))
-            #
-            acrfull_offset=a.find(acrfull_template, end_of_acronym)
-    #
-    # second handle all cases where the long version is to be included
-    acrlong_template='\\glsxtrlong{'
-    acrlong_offset=a.find(acrlong_template)
-    while acrlong_offset >= 0:
-        a_prefix=a[:acrlong_offset]
-        end_of_acronym=a.find('}', acrlong_offset+len(acrlong_template))
-        if end_of_acronym < 0:
-            print("could not find end of acronym label")
-            break
-        label=a[acrlong_offset+len(acrlong_template):end_of_acronym]
-        a_postfix=a[end_of_acronym+1:]
-        ad=acronym_dict.get(label, None)
-        if ad:
-            phrase=ad.get('phrase', None)
-            if phrase:
-                a=a_prefix+phrase+a_postfix
-            else:
-                print("phrase or acronym are missing for label={}".format(label))
-            #
-            acrlong_offset=a.find(acrlong_template, end_of_acronym)
-    #
-    #
-    # third handle all cases where the short version is to be included
-    acrshort_template='\\glsxtrshort{'
-    acrshort_offset=a.find(acrshort_template)
-    while acrshort_offset >= 0:
-        a_prefix=a[:acrshort_offset]
-        end_of_acronym=a.find('}', acrshort_offset+len(acrshort_template))
-        if end_of_acronym < 0:
-            print("could not find end of acronym label")
-            break
-        label=a[acrshort_offset+len(acrshort_template):end_of_acronym]
-        a_postfix=a[end_of_acronym+1:]
-        ad=acronym_dict.get(label, None)
-        if ad:
-            acronym=ad.get('acronym', None)
-            if acronym:
-                a=a_prefix+acronym+a_postfix
-            else:
-                print("phrase or acronym are missing for label={}".format(label))
-            #
-            acrshort_offset=a.find(acrshort_template, end_of_acronym)
+# define the maker string
+quad__euro_marker='€€€€'
 
-    #
-    # handle cases where the acronym is conditionally spelled out and introduced or only the acronym is inserted
-    # gls_offset=a.find('\\gls{')
-    # lspl_offset=a.find('\\glspl{')
-    # ggls_offset=a.find('\\Gls{')
-    # gglspl_offset=a.find('\\Glspl{')
-    # 
-    s1=re.search('\\\\gls\{', a, re.IGNORECASE)
-    s2=re.search('\\\\glspl\{', a, re.IGNORECASE)
-    # find the earliest one
-    while s1 or s2:
-        if s1 and s2:
-            gls_offset=s1.span()[0]
-            glspl_offset=s2.span()[0]
-            if  gls_offset < glspl_offset:
-                # gls case occurs first
-                a1=replace_first_gls(a, gls_offset, acronym_dict)
-                if a1:
-                    a=a1
-                else:           # if the replacement failed, bail out
-                    return a
-            else:
-                a=replace_first_glspl(a, glspl_offset, acronym_dict)
-        elif s1 and not s2:
-            gls_offset=s1.span()[0]
-            a1=replace_first_gls(a, gls_offset, acronym_dict)
-            if a1:
-                a=a1
-            else:
-                return a
-        else: # case of no s1 and s2:
-            glspl_offset=s2.span()[0]
-            a1=replace_first_glspl(a, glspl_offset, acronym_dict)
-            if a1:
-                a=a1
-            else:
-                return a
-        s1=re.search('\\\\gls\{', a, re.IGNORECASE)
-        s2=re.search('\\\\glspl\{', a, re.IGNORECASE)
-    return a
-
-# ligature. LaTeX commonly does it for ff, fi, fl, ffi, ffl, ...
-ligrature_table= {'\ufb00': 'ff', # 'ﬀ'
-                  '\ufb03': 'f‌f‌i', # 'ﬃ'
-                  '\ufb04': 'ffl', # 'ﬄ'
-                  '\ufb01': 'fi', # 'ﬁ'
-                  '\ufb02': 'fl', # 'ﬂ'
-                  '\ua732': 'AA', # 'Ꜳ'
-                  '\ua733': 'aa', # 'ꜳ'
-                  '\ua733': 'aa', # 'ꜳ'
-                  '\u00c6': 'AE', # 'Æ'
-                  '\u00e6': 'ae', # 'æ'
-                  '\uab31': 'aə', # 'ꬱ'
-                  '\ua734': 'AO', # 'Ꜵ'
-                  '\ua735': 'ao', # 'ꜵ'
-                  '\ua736': 'AU', # 'Ꜷ'
-                  '\ua737': 'au', # 'ꜷ'
-                  '\ua738': 'AV', # 'Ꜹ'
-                  '\ua739': 'av', # 'ꜹ'
-                  '\ua73a': 'AV', # 'Ꜻ'  - note the bar
-                  '\ua73b': 'av', # 'ꜻ'  - note the bar
-                  '\ua73c': 'AY', # 'Ꜽ'
-                  '\ua76a': 'ET', # 'Ꝫ'
-                  '\ua76b': 'et', # 'ꝫ'
-                  '\uab41': 'əø', # 'ꭁ'
-                  '\u01F6': 'Hv', # 'Ƕ'
-                  '\u0195': 'hu', # 'ƕ'
-                  '\u2114': 'lb', # '℔'
-                  '\u1efa': 'IL', # 'Ỻ'
-                  '\u0152': 'OE', # 'Œ'
-                  '\u0153': 'oe', # 'œ'
-                  '\ua74e': 'OO', # 'Ꝏ'
-                  '\ua74f': 'oo', # 'ꝏ'
-                  '\uab62': 'ɔe', # 'ꭢ'
-                  '\u1e9e': 'fs', # 'ẞ'
-                  '\u00df': 'fz', # 'ß'
-                  '\ufb06': 'st', # 'ﬆ'
-                  '\ufb05': 'ſt', # 'ﬅ'  -- long ST
-                  '\ua728': 'Tz', # 'Ꜩ'
-                  '\ua729': 'tz', # 'ꜩ'
-                  '\u1d6b': 'ue', # 'ᵫ'
-                  '\uab63': 'uo', # 'ꭣ'
-                  #'\u0057': 'UU', # 'W'
-                  #'\u0077': 'uu', # 'w'
-                  '\ua760': 'VY', # 'Ꝡ'
-                  '\ua761': 'vy', # 'ꝡ'
-                  # 
-                  '\u0238': 'db', # 'ȸ'
-                  '\u02a3': 'dz', # 'ʣ'
-                  '\u1b66': 'dʐ', # 'ꭦ'
-                  '\u02a5': 'dʑ', # 'ʥ'
-                  '\u02a4': 'dʒ', # 'ʤ'
-                  '\u02a9': 'fŋ', # 'ʩ'
-                  '\u02aa': 'ls', # 'ʪ'
-                  '\u02ab': 'lz', # 'ʫ'
-                  '\u026e': 'lʒ', # 'ɮ'
-                  '\u0239': 'qp', # 'ȹ'
-                  '\u02a8': 'tɕ', # 'ʨ'
-                  '\u02a6': 'ts', # 'ʦ'
-                  '\uab67': 'tʂ', # 'ꭧ'
-                  '\u02a7': 'tʃ', # 'ʧ'
-                  '\uab50': 'ui', # 'ꭐ'
-                  '\uab51': 'ui', # 'ꭑ' -- turned ui
-                  '\u026f': 'uu', # 'ɯ'
-                  # digraphs with single code points
-                  '\u01f1': 'DZ', # 'Ǳ'
-                  '\u01f2': 'Dz', # 'ǲ'
-                  '\u01f3': 'dz', # 'ǳ'
-                  '\u01c4': 'DŽ', # 'Ǆ'
-                  '\u01c5': 'Dž', # 'ǅ'
-                  '\u01c6': 'dž', # 'ǆ'
-                  '\u0132': 'IJ', # 'Ĳ'
-                  '\u0133': 'ij', # 'ĳ'
-                  '\u01c7': 'LJ', # 'Ǉ'
-                  '\u01c8': 'Lj', # 'ǈ'
-                  '\u01c9': 'lj', # 'ǉ'
-                  '\u01ca': 'NJ', # 'Ǌ'
-                  '\u01cb': 'Nj', # 'ǋ'
-                  '\u01cc': 'nj', # 'ǌ'
-                  '\u1d7a': 'th', # 'ᵺ'
-                  }
-
-def replace_ligature(s):
-    # check for ligratures and replace them with separate characters
-    if not s:
-        return s
-    
-    for l in ligrature_table:
-        if s.find(l) >= 0:
-            print("found ligrature {0} replacing with {1}".format(l, ligrature_table[l]))  
-            s=s.replace(l, ligrature_table[l])
-    #
-    return s
+# the strings that start the For DIVA information, the last is the older For DIVA string
+For_DIVA_markers=["{0} For DIVA {0}".format(quad__euro_marker), "{0} FOR DIVA {0}".format(quad__euro_marker), "For DIVA"]
 
+def has_For_DIVA_marker(text):
+    for marker in For_DIVA_markers:
+        if text.find(marker) >= 0:
+            return True
+    return False
+
+def text_of_page(rsrcmgr, page):
+    output_string = BytesIO()
+    device = TextConverter(rsrcmgr, output_string, laparams=LAParams())
+    interpreter = PDFPageInterpreter(rsrcmgr, device)
+    interpreter.process_page(page)
+    return output_string.getvalue().decode('UTF-8')
+
+def last_page_mentioning_For_DIVA(filename):
+    # a quick look with PyMuPDF for the (zero-based) number of the page where the For DIVA information starts, or None
+    if pymupdf is None:
+        return None
+    try:
+        with pymupdf.open(filename) as document:
+            for page_number in range(document.page_count-1, -1, -1):
+                page_text=document[page_number].get_text()
+                if page_text.find('For DIVA') >= 0 or page_text.find('FOR DIVA') >= 0:
+                    return page_number
+    except Exception as e:
+        print("PyMuPDF could not read {0}: {1}".format(filename, e))
+    return None
+
+# The For DIVA information is at the end of the thesis, so rather than converting the whole document to text,
+# walk backward from the last page until the page with the start of the For DIVA information has been converted.
+# The text of the pages from that page to the end of the document is returned (in page order).
+# pdfminer is used for the text (as the rest of the program depends on its layout of the text), but when PyMuPDF
+# is available it is used to quickly find the page to start from.
+def text_of_trailing_pages(filename):
+    with open(filename, 'rb') as in_file:
+        parser = PDFParser(in_file)
+        doc = PDFDocument(parser)
+        rsrcmgr = PDFResourceManager()
+        pages=list(PDFPage.create_pages(doc))
+
+        first_page=len(pages)
+        page_texts=[]           # in reverse page order
+        hint=last_page_mentioning_For_DIVA(filename)
+        if hint is not None and hint < len(pages):
+            first_page=hint
+            for page in reversed(pages[first_page:]):
+                page_texts.append(text_of_page(rsrcmgr, page))
+            if has_For_DIVA_marker(''.join(reversed(page_texts))):
+                return ''.join(reversed(page_texts))
+
+        while first_page > 0:
+            first_page=first_page-1
+            page_text=text_of_page(rsrcmgr, pages[first_page])
+            page_texts.append(page_text)
+            if has_For_DIVA_marker(page_text):
+                break
+        if Verbose_Flag:
+            print("converted {0} of {1} pages to text".format(len(page_texts), len(pages)))
+        return ''.join(reversed(page_texts))
 
 def main(argv):
     global Verbose_Flag
@@ -737,25 +363,10 @@ def main(argv):
     if Verbose_Flag:
         print("filename={}".format(filename))
 
-    #output_string = StringIO()
-    output_string = BytesIO()
-    with open(filename, 'rb') as in_file:
-        parser = PDFParser(in_file)
-        doc = PDFDocument(parser)
-        rsrcmgr = PDFResourceManager()
-        device = TextConverter(rsrcmgr, output_string, laparams=LAParams())
-        #device = HTMLConverter(rsrcmgr, output_string, laparams=LAParams(), layoutmode='normal', codec='utf-8')
-
-        interpreter = PDFPageInterpreter(rsrcmgr, device)
-        for page in PDFPage.create_pages(doc):
-            interpreter.process_page(page)
-
-        text=output_string.getvalue().decode('UTF-8')
-        if Verbose_Flag:
-            print("text: {}".format(text))
-
-    # define the maker string
-    quad__euro_marker='€€€€'
+    # only the trailing pages, from the start of the For DIVA information to the end, are converted to text
+    text=text_of_trailing_pages(filename)
+    if Verbose_Flag:
+        print("text: {}".format(text))
 
     # look for the new start of the For DiVA information
     diva_start=text.find("{0} For DIVA {0}".format(quad__euro_marker))
@@ -916,6 +527,9 @@ def main(argv):
                         acronyms_present=check_for_acronyms(abstracts[a])
                         if acronyms_present:
                             any_acronyms_in_abstracts=True
+                    for a in keywords:
+                        if check_for_acronyms(keywords[a]):
+                            any_acronyms_in_abstracts=True
 
                     if any_acronyms_in_abstracts:
                         acronyms_filename=args["acronyms"]
@@ -934,8 +548,11 @@ def main(argv):
                                 if file_status == "File found":
                                     if len(acronym_dict) > 0:
                                         # entries of the form: acronym_dict[label]={'acronym': acronym, 'phrase': phrase}
+                                        expander=acronym_expander.AcronymExpander(acronym_dict)
                                         for a in abstracts:
-                                            abstracts[a]=spellout_acronyms_in_abstract(acronym_dict, abstracts[a])
+                                            abstracts[a]=expander.expand(abstracts[a])
+                                        for a in keywords:
+                                            keywords[a]=expander.expand(keywords[a])
                             else: #  possible_acronyms_tex_info is False
                                 print(f"No file of acronyms found")
                                 acronym_dict=dict()
@@ -943,6 +560,8 @@ def main(argv):
                                 collected_acronyms=set()
                                 for a in abstracts:
                                     collected_acronyms.update(collect_acronyms(abstracts[a]))
+                                for a in keywords:
+                                    collected_acronyms.update(collect_acronyms(keywords[a]))
                                 print(f"collected_acronyms={collected_acronyms}")
                                 # use the filename as a base for the missing-acronyms file - so you can process many files
                                 missing_acronyms_filename=filename+'-missing-acronyms.tex'
@@ -958,8 +577,11 @@ def main(argv):
                                 print("*** no acronyms found in {}".format(acronyms_filename))
                             else:
                                 # entries of the form: acronym_dict[label]={'acronym': acronym, 'phrase': phrase}
+                                expander=acronym_expander.AcronymExpander(acronym_dict)
                                 for a in abstracts:
-                                    abstracts[a]=spellout_acronyms_in_abstract(acronym_dict, abstracts[a])
+                                    abstracts[a]=expander.expand(abstracts[a])
+                                for a in keywords:
+                                    keywords[a]=expander.expand(keywords[a])
                         else:
                             print("*** Unexpected error when looking for acronyms")
 
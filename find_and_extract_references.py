@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 # -*- mode: python; python-indent-offset: 4 -*-
 #
-# ./find_and_extract_references.py [--pdf test.pdf] [--spreadsheet filename.xlsx]
+# ./find_and_extract_references.py [--pdf test.pdf] [--spreadsheet filename.xlsx] [--jobs N] [--fullscan]
 #
 # Purpose: Find and extract refrences pages
 #
@@ -12,11 +12,20 @@
 #
 # For all the PDF files in the spreadsheet
 # ./find_and_extract_references.py -s ../eecs-2022.xlsx
+#
+# The same, but processing 16 PDF files at a time:
+# ./find_and_extract_references.py -s ../eecs-2022.xlsx --jobs 16
 # Note that this can be fund after updating the original spreadsheet with cover information
 #
 # To get the correct pdfminer package do:
 # pip install pdfminer.six
 #
+# The page layouts are cached in a file shared by the checkers, see pdf_layout_cache.py.
+#
+# If PyMuPDF is installed (pip install pymupdf), it is used to find the candidate pages (from the outline or a
+# fast text-only pass) and only these pages are run through pdfminer's layout analysis.
+# Use --fullscan to analyze every page.
+#
 # 2021-09-04 G. Q. Maguire Jr.
 #
 import re
@@ -41,6 +50,8 @@ import pandas as pd
 
 import faulthandler
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 # from pdfminer.converter import TextConverter, HTMLConverter
 # from pdfminer.layout import LAParams
 # from pdfminer.pdfdocument import PDFDocument
@@ -48,7 +59,8 @@ import faulthandler
 # from pdfminer.pdfpage import PDFPage
 # from pdfminer.pdfparser import PDFParser
 
-from pdfminer.high_level import extract_pages
+# pdfminer's extract_pages, but with the layouts cached in a file shared by the checkers (see pdf_layout_cache.py)
+from pdf_layout_cache import extract_pages
 from pdfminer.layout import LTTextContainer, LTChar, LTLine, LAParams, LTFigure, LTImage, LTTextLineHorizontal, LTTextBoxHorizontal, LTCurve
 from typing import Iterable, Any
 from pdfminer.layout import LAParams, LTTextBox, LTText, LTChar, LTAnno
@@ -56,6 +68,11 @@ import pdfminer.psparser
 from pdfminer.pdfdocument import PDFNoValidXRef
 from pdfminer.psparser import PSEOF
 
+try:
+    import pymupdf # import PyMuPDF - used to quickly find the pages to be analyzed
+except ImportError:
+    pymupdf=None
+
 font_families_and_names={
     # font_name style
     # family: Computer Modern Text Fonts - info from http://mirrors.ibiblio.org/CTAN/systems/win32/bakoma/fonts/fonts.html
@@ -1549,28 +1566,27 @@ def rough_comparison(a, b):
     return False
 
 
-global found_references_page
 references_place_y=630.0
 #heading_size_min=19.0      # 24.79
 heading_size_min=13.9      # 24.79
 
-found_references_page=False
-global found_last_references_page
-found_last_references_page=False
-
 # heading rule
 # LTLine                       70.87   785.34  524.41  785.34   
-page_heading_place_y=780.0
+default_page_heading_place_y=780.0
 page_heading_size_min=10.0  #10.91
-global found_heading_rule
-found_heading_rule=False
-
-
-global found_appendix_page
-found_appendix_page=False
 
-global found_TOC_page
-found_TOC_page=False
+# The state of the search for the references in one PDF file.
+# The page numbers are page indexes (starting from 1) or False if not (yet) found.
+# page_heading_place_y is updated if heading rules are found.
+def new_scan_state():
+    return {'found_references_page':      False,
+            'found_last_references_page': False,
+            'found_appendix_page':        False,
+            'found_TOC_page':             False,
+            'found_heading_rule':         False,
+            'page_heading_place_y':       default_page_heading_place_y,
+            'extracted_data':             []
+            }
 
 # Match against targets including an all caps version of target with a vertical bar
 def check_for_one_target_string_alone(txt, targets):
@@ -1590,11 +1606,8 @@ def check_for_one_target_string_alone(txt, targets):
             return True
     return False
 
-# Note that we have to set the globals to the page index (pgnumber)
-def check_for_references(o: Any, pgnumber):
-    global found_references_page
-    global found_last_references_page
-    global found_appendix_page
+# Note that we have to set the page numbers in the state to the page index (pgnumber)
+def check_for_references(o: Any, pgnumber, state):
     global Verbose_Flag
     target_strings=['References', 'Bibliography', 'References and Bibliography']
     appendix_strings=['Appendix', 'Appendices']
@@ -1604,28 +1617,24 @@ def check_for_references(o: Any, pgnumber):
     if check_for_one_target_string_alone(txt, target_strings):
         if Verbose_Flag or True:
             print("Found references starting at page:{}".format(pgnumber))
-        if not found_references_page:
-            found_references_page=pgnumber
+        if not state['found_references_page']:
+            state['found_references_page']=pgnumber
         else:
-            found_last_references_page=pgnumber
+            state['found_last_references_page']=pgnumber
     elif check_for_one_target_string_alone(txt, appendix_strings):
         if Verbose_Flag or True:
             print("Found appendix/appendices at page:{0} - {1}".format(pgnumber, txt))
-        if found_references_page:
-            print("found_appendix_page={0} found_last_references_page={1}".format(found_appendix_page, found_last_references_page))
-            if not found_appendix_page and not found_last_references_page:
-                found_appendix_page=True
-                found_last_references_page=pgnumber-1
+        if state['found_references_page']:
+            print("found_appendix_page={0} found_last_references_page={1}".format(state['found_appendix_page'], state['found_last_references_page']))
+            if not state['found_appendix_page'] and not state['found_last_references_page']:
+                state['found_appendix_page']=True
+                state['found_last_references_page']=pgnumber-1
     else:
         return
     return
 
 # check for section/chapter heading being some variant of References
-def check_for_references_in_section_heading(o: Any, pgnumber):
-    global found_references_page
-    global found_last_references_page
-    global found_TOC_page
-    global found_appendix_page
+def check_for_references_in_section_heading(o: Any, pgnumber, state):
     global Verbose_Flag
     target_strings=['References', 'Bibliography']
     appendix_strings=['Appendix', 'Appendices']
@@ -1643,41 +1652,37 @@ def check_for_references_in_section_heading(o: Any, pgnumber):
         print("checking for heading in {0} - nbc={1}".format(txt, nbc))
         if nbc > len(txt)/2:
             # try to avoid the instance of "References" in the table of contents
-            if not found_TOC_page:
-                found_references_page=pgnumber
+            if not state['found_TOC_page']:
+                state['found_references_page']=pgnumber
                 print("First case in check_for_references_in_section_heading")
-            elif found_TOC_page + max_toc_length < pgnumber:
+            elif state['found_TOC_page'] + max_toc_length < pgnumber:
                 print("Second case in check_for_references_in_section_heading")
-                if not found_references_page:
-                    found_references_page=pgnumber
+                if not state['found_references_page']:
+                    state['found_references_page']=pgnumber
                 else:
-                    found_last_references_page=pgnumber
+                    state['found_last_references_page']=pgnumber
             else:
                 print("Third case in check_for_references_in_section_heading")
                 return
     elif check_for_one_target_string_alone(txt, appendix_strings):
         if Verbose_Flag or True:
             print("Found appendix/appendices at page:{0} - {1}".format(pgnumber, txt))
-        if found_references_page:
-            print("found_appendix_page={0} found_last_references_page={1}".format(found_appendix_page, found_last_references_page))
-            if not found_appendix_page and not found_last_references_page:
-                found_appendix_page=True
-                found_last_references_page=pgnumber #  as this could be on the same page as the refrences
+        if state['found_references_page']:
+            print("found_appendix_page={0} found_last_references_page={1}".format(state['found_appendix_page'], state['found_last_references_page']))
+            if not state['found_appendix_page'] and not state['found_last_references_page']:
+                state['found_appendix_page']=True
+                state['found_last_references_page']=pgnumber #  as this could be on the same page as the refrences
     elif check_for_one_target_string_alone(txt, toc_strings):
         if Verbose_Flag or True:
             print("Found table of contents at page:{0} - {1}".format(pgnumber, txt))
         # found_TOC_page will be the last page with a Contents page heading
-        found_TOC_page=pgnumber
+        state['found_TOC_page']=pgnumber
     else:
         return
     return
 
 
-def check_for_references_page_header(o: Any, pgnumber):
-    global found_references_page
-    global found_last_references_page
-    global found_appendix_page
-    global found_TOC_page
+def check_for_references_page_header(o: Any, pgnumber, state):
     global Verbose_Flag
     target_strings=['References', 'Bibliography', 'References and Bibliography']
     appendix_strings=['Appendix', 'Appendices']
@@ -1687,46 +1692,44 @@ def check_for_references_page_header(o: Any, pgnumber):
     print("check for page header in {0} on page {1}".format(txt, pgnumber))
 
     # in this case there is a new page header, so stop including the pages in the set of reference pages
-    if found_references_page and not check_for_one_target_string_alone(txt, target_strings):
-        if not found_last_references_page:
+    if state['found_references_page'] and not check_for_one_target_string_alone(txt, target_strings):
+        if not state['found_last_references_page']:
             if Verbose_Flag:
                 print("Change in page headers at page:{0} - {1}".format(pgnumber, txt))
-            found_last_references_page=pgnumber-1
+            state['found_last_references_page']=pgnumber-1
     # This check for the target alone is to avoid the instance of the target in the Table of Contents
     elif check_for_one_target_string_alone(txt, target_strings):
         if Verbose_Flag:
             print("Found references starting at page:{}".format(pgnumber))
-        if not found_references_page:
-            found_references_page=pgnumber
+        if not state['found_references_page']:
+            state['found_references_page']=pgnumber
         else:
-            found_last_references_page=pgnumber
+            state['found_last_references_page']=pgnumber
     elif check_for_one_target_string_alone(txt, appendix_strings):
         if Verbose_Flag:
             print("Found appendix/appendices at page:{0} - {1}".format(pgnumber, txt))
-        if found_references_page:
-            print("found_appendix_page={0} found_last_references_page={1}".format(found_appendix_page, found_last_references_page))
-            if not found_appendix_page and not found_last_references_page:
-                found_appendix_page=True
-                found_last_references_page=pgnumber-1
+        if state['found_references_page']:
+            print("found_appendix_page={0} found_last_references_page={1}".format(state['found_appendix_page'], state['found_last_references_page']))
+            if not state['found_appendix_page'] and not state['found_last_references_page']:
+                state['found_appendix_page']=True
+                state['found_last_references_page']=pgnumber-1
     elif check_for_one_target_string_alone(txt, toc_strings):
         if Verbose_Flag:
             print("Found table of contents at page:{0} - {1}".format(pgnumber, txt))
         # found_TOC_page will be the last page with a Contents page heading
-        found_TOC_page=pgnumber
+        state['found_TOC_page']=pgnumber
     else:
         return
     return
 
 # If there are heading rules, update the expected location for page headings
-def check_for_heading_rule(o: Any):
-    global page_heading_place_y
-    global found_heading_rule
-    if found_heading_rule:
+def check_for_heading_rule(o: Any, state):
+    if state['found_heading_rule']:
         return
-    if (o.bbox[1] == o.bbox[3]) and (o.bbox[2] - o.bbox[0]) > 400.0 and (o.bbox[1] > page_heading_place_y):
-        found_heading_rule=True
-        page_heading_place_y=o.bbox[1]
-        print("Found heading rule at {0} - the page heading should be above this".format(page_heading_place_y))
+    if (o.bbox[1] == o.bbox[3]) and (o.bbox[2] - o.bbox[0]) > 400.0 and (o.bbox[1] > state['page_heading_place_y']):
+        state['found_heading_rule']=True
+        state['page_heading_place_y']=o.bbox[1]
+        print("Found heading rule at {0} - the page heading should be above this".format(state['page_heading_place_y']))
 
     return
 
@@ -1753,8 +1756,7 @@ def count_bold_characters(o: Any):
     return count
 
 
-def process_element(o: Any, pgnumber):
-    global extracted_data
+def process_element(o: Any, pgnumber, state):
     last_x_offset=None
     last_x_width=None
     last_y_offset=None            # y_offset of text characters
@@ -1777,16 +1779,16 @@ def process_element(o: Any, pgnumber):
         # Check in page heading
         # LTTextBoxHorizontal          402.96  783.59  496.06  794.50   REFERENCES | 69
         # LTTextLineHorizontal       402.96  783.59  496.06  794.50   REFERENCES | 69
-        if (o.bbox[1]-page_heading_place_y) >= 0.0: # and (o.bbox[3]-o.bbox[1]) >= page_heading_size_min:
-            check_for_references_page_header(o, pgnumber)
+        if (o.bbox[1]-state['page_heading_place_y']) >= 0.0: # and (o.bbox[3]-o.bbox[1]) >= page_heading_size_min:
+            check_for_references_page_header(o, pgnumber, state)
         #
         #LTTextBoxHorizontal          127.56  638.43  261.19  663.22   References
         #LTTextLineHorizontal       127.56  638.43  261.19  663.22   References
         # elif (o.bbox[1]-references_place_y) > 0.0 and (o.bbox[3]-o.bbox[1]) >= heading_size_min:
-        #     check_for_references(o, pgnumber)
+        #     check_for_references(o, pgnumber, state)
         else:
             # check for section/chapter heading
-            check_for_references_in_section_heading(o, pgnumber)
+            check_for_references_in_section_heading(o, pgnumber, state)
             return
 
     elif isinstance(o, LTTextContainer):
@@ -1806,15 +1808,15 @@ def process_element(o: Any, pgnumber):
                 last_x_offset=text_line.bbox[0]
                 last_y_offset=text_line.bbox[1]
                 last_x_width=text_line.bbox[2]-text_line.bbox[0]
-        extracted_data.append([font_size, last_x_offset, last_y_offset, last_x_width, (o.get_text())])
+        state['extracted_data'].append([font_size, last_x_offset, last_y_offset, last_x_width, (o.get_text())])
     elif isinstance(o, LTLine): #  a line
         #  LTLine                       70.87   785.34  524.41  785.34   
-        check_for_heading_rule(o)
+        check_for_heading_rule(o, state)
         return
     elif isinstance(o, LTFigure):
         if isinstance(o, Iterable):
             for i in o:
-                process_element(i, pgnumber)
+                process_element(i, pgnumber, state)
     elif isinstance(o, LTImage):
         return
         
@@ -1826,7 +1828,7 @@ def process_element(o: Any, pgnumber):
             last_y_offset=o.bbox[1]
             last_x_width=o.bbox[2]-o.bbox[0]
             font_size=o.size
-        extracted_data.append([font_size, last_x_offset, last_y_offset, last_x_width, (o.get_text())])
+        state['extracted_data'].append([font_size, last_x_offset, last_y_offset, last_x_width, (o.get_text())])
     elif isinstance(o, LTAnno):
         return
     elif isinstance(o, LTCurve): #  a curve
@@ -1835,41 +1837,110 @@ def process_element(o: Any, pgnumber):
         print(f'unprocessed element: {o}')
         if isinstance(o, Iterable):
             for i in o:
-                process_element(i, pgnumber)
+                process_element(i, pgnumber, state)
+
+references_heading_strings=['references', 'bibliography', 'references and bibliography']
+toc_heading_strings=['contents', 'table of contents']
+
+# a line (in lower case) that is a references heading or a page header such as "references | 69"
+def is_references_heading_line(l):
+    if l in references_heading_strings:
+        return True
+    return l.find('|') > 0 and any(l.find(t) >= 0 for t in references_heading_strings)
 
-def process_file(filename):
+# Use PyMuPDF to cheaply find the pages that need the (expensive) pdfminer layout analysis.
+# Returns a sorted list of zero-based page numbers or None if the candidate pages could not be determined.
+#
+# The candidates are the table of contents page(s) (so that "References" in the TOC can be recognized as such)
+# and the pages from the start of the references onwards. The start of the references is taken from the
+# document outline (bookmarks) if there is one, otherwise from a fast text-only pass over the pages.
+# When the outline is used, the range ends with the page of the next outline entry at the same or a higher level.
+def candidate_pages(filename):
+    global Verbose_Flag
+
+    if pymupdf is None:
+        return None
+
+    try:
+        doc=pymupdf.open(filename)
+    except Exception as e:
+        print(f'Unable to open {filename} with PyMuPDF: {e}')
+        return None
+
+    with doc:
+        page_count=doc.page_count
+        toc_pages=[]
+        references_start=None
+        references_end=page_count-1
+
+        page_lines=[]
+        for page_number in range(0, page_count):
+            lines=[l.strip().lower() for l in doc[page_number].get_text().splitlines()]
+            page_lines.append(lines)
+            if any(l in toc_heading_strings for l in lines[:10]):
+                toc_pages.append(page_number)
+
+        outline=doc.get_toc(simple=True) # entries are [level, title, page number (starting from 1)]
+        for entry_index, (level, title, page) in enumerate(outline):
+            if title.strip().lower() in references_heading_strings and page >= 1:
+                references_start=page-1
+                for next_level, next_title, next_page in outline[entry_index+1:]:
+                    if next_level <= level and next_page-1 > references_start:
+                        references_end=next_page-1
+                        break
+                if Verbose_Flag:
+                    print("outline entry {0} gives references at pages {1}-{2}".format(title, references_start+1, references_end+1))
+                break
+
+        # only trust the outline if the page really has a references heading
+        if references_start is not None and not any(is_references_heading_line(l) for l in page_lines[references_start]):
+            if Verbose_Flag:
+                print("outline entry for the references does not match page {}, ignoring the outline".format(references_start+1))
+            references_start=None
+            references_end=page_count-1
+
+        if references_start is None:
+            for page_number, lines in enumerate(page_lines):
+                if page_number in toc_pages:
+                    continue
+                if any(is_references_heading_line(l) for l in lines):
+                    references_start=page_number
+                    break
+
+    if references_start is None:
+        if Verbose_Flag:
+            print("No candidate references page found in {}".format(filename))
+        return []
+
+    pages=set(toc_pages)
+    pages.update(range(references_start, references_end+1))
+    return sorted(pages)
+
+# returns the scan state for the file (see new_scan_state()) or None if the PDF file could not be processed
+#
+# Unless full_scan is True, only the candidate pages (see candidate_pages()) are run through the layout analysis.
+# In both cases the scan stops once an appendix has been found after the references.
+def process_file(filename, full_scan=False):
     global Verbose_Flag
-    global Use_local_time_for_output_flag
     global testing
-    global set_of_errors
-    global set_of_evidence_for_new_cover
-    global extracted_data
-    global cycle
-    global found_references_page
-    global found_last_references_page
-    global found_appendix_page
-
-
-    extracted_data=[]
-    set_of_errors=set()
-    set_of_evidence_for_new_cover=set()
-    major_subject=None            # the major subject
-    cycle=None                    # the cycle number
-    place=None                    # the place from the cover
-    font_size=None                # the latest font size
-    last_x_offset=None
-    last_x_width=None
-    last_y_offset=None            # y_offset of text characters
 
-    found_references_page=False
-    found_last_references_page=False
-    found_TOC_page=False
-    found_appendix_page=False
+    state=new_scan_state()
+
+    pages_to_scan=None
+    if not full_scan and not testing:
+        pages_to_scan=candidate_pages(filename)
+        if pages_to_scan is not None and len(pages_to_scan) == 0:
+            return state
+        if Verbose_Flag and pages_to_scan:
+            print("pages to scan: {}".format([p+1 for p in pages_to_scan]))
 
     page_index = 0
     try:
-        for page in extract_pages(filename):
-            page_index=page_index+1
+        for page_position, page in enumerate(extract_pages(filename, page_numbers=pages_to_scan)):
+            if pages_to_scan is None:
+                page_index=page_index+1
+            else:
+                page_index=pages_to_scan[page_position]+1
             if Verbose_Flag:
                 print(f'Processing page={page_index}')
 
@@ -1881,32 +1952,81 @@ def process_file(filename):
             for element in page:
                 if Verbose_Flag:
                     print(f'{element}')
-                process_element(element, page_index)
+                process_element(element, page_index, state)
+
+            # nothing after the appendix will change the pages of references
+            if state['found_appendix_page']:
+                break
 
     except (PDFNoValidXRef, PSEOF, pdfminer.pdfdocument.PDFNoValidXRef, pdfminer.psparser.PSEOF) as e:
         print(f'Unexpected error in processing the PDF file: {filename} with error {e}')
-        return False
+        return None
     except Exception as e:
         print(f'Error in PDF extractor: {e}')
-        return False
+        return None
+
+    if state['found_references_page']:
+        if not state['found_appendix_page'] and not state['found_last_references_page']:
+            state['found_last_references_page']=page_index-1
+            print("Assuming references end on page {}".format(state['found_last_references_page']))
+    return state
+
+# use qpdf to copy the page(s) of references into the file output_filename
+def extract_reference_pages(filename, first_page, last_page, output_filename):
+    global Verbose_Flag
+
+    if last_page:
+        cmd="qpdf {0} --pages . {1}-{2} -- {3}".format(filename, first_page, last_page, output_filename)
+    else:
+        cmd="qpdf {0} --pages . {1} -- {2}".format(filename, first_page, output_filename)
+    if Verbose_Flag:
+        print("cmd: {0}".format(cmd))
+
+    with subprocess.Popen(shlex.split(cmd), stdout=subprocess.PIPE) as proc:
+        cmd_ouput=proc.stdout.read()
+        if len(cmd_ouput) > 0:
+            print(cmd_ouput)
+    return output_filename
+
+# Process one thesis: find the references and extract them with qpdf.
+# This is the unit of work in the --jobs N mode, hence it only returns a result record
+# (rather than updating the spreadsheet), the records are merged into the spreadsheet by main().
+def process_thesis(idx, filename, full_scan=False):
+    result={'idx':              idx,
+            'filename':         filename,
+            'references_start': False,
+            'references_end':   False,
+            'error':            None
+            }
+
+    print(f'reading file {filename}')
+    state=process_file(filename, full_scan)
+    if state is None:
+        result['error']='Unexpected error when processing file'
+        return result
+
+    result['references_start']=state['found_references_page']
+    result['references_end']=state['found_last_references_page']
+    if result['references_start']:
+        if filename.endswith('.pdf'):
+            output_filename="{0}-refpages.pdf".format(filename[:-4])
+        else:
+            output_filename="{0}-refpages.pdf".format(filename)
+        extract_reference_pages(filename, result['references_start'], result['references_end'], output_filename)
+    return result
 
-    if found_references_page:
-        if not found_appendix_page and not found_last_references_page:
-            found_last_references_page=page_index-1
-            print("Assuming references end on page {}".format(found_last_references_page))
-    return True
+# each of the worker processes needs its own copy of the flags
+def initialize_worker(verbose, testing_flag):
+    global Verbose_Flag
+    global testing
+    Verbose_Flag=verbose
+    testing=testing_flag
 
 
 def main(argv):
     global Verbose_Flag
     global Use_local_time_for_output_flag
     global testing
-    global set_of_errors
-    global set_of_evidence_for_new_cover
-    global extracted_data
-    global cycle
-    global found_references_page
-    global found_last_references_page
 
     argp = argparse.ArgumentParser(description='find_and_extract_references.py: FInd reference page(s) within the PDF file')
 
@@ -1945,6 +2065,18 @@ def main(argv):
                       help="dump font information"
                       )
 
+    argp.add_argument('-f', '--fullscan',
+                      default=False,
+                      action="store_true",
+                      help="run the layout analysis on every page, rather than only on the candidate pages"
+                      )
+
+    argp.add_argument('-j', '--jobs',
+                      type=int,
+                      default=1,
+                      help="number of PDF files to process in parallel (when processing a spreadsheet)"
+                      )
+
 
     args = vars(argp.parse_args(argv))
 
@@ -1964,8 +2096,11 @@ def main(argv):
         if Verbose_Flag:
             print("filename={}".format(filename))
 
-        if not process_file(filename):
+        state=process_file(filename, args["fullscan"])
+        if state is None:
             return
+        found_references_page=state['found_references_page']
+        found_last_references_page=state['found_last_references_page']
         if found_references_page:
             print("Found references page at {0} in {1}".format(found_references_page, filename))
         if not found_last_references_page:
@@ -1980,14 +2115,7 @@ def main(argv):
             else:
                 output_filename="output.pdf"
 
-            cmd="qpdf {0} --pages . {1}-{2} -- {3}".format(filename, found_references_page, found_last_references_page, output_filename)
-            if Verbose_Flag or True:
-                print("cmd: {0}".format(cmd))
-
-            with subprocess.Popen(shlex.split(cmd), stdout=subprocess.PIPE) as proc:
-                cmd_ouput=proc.stdout.read()
-                if len(cmd_ouput) > 0:
-                    print(cmd_ouput)
+            extract_reference_pages(filename, found_references_page, found_last_references_page, output_filename)
             return found_references_page
         else:
             return -1
@@ -2009,10 +2137,9 @@ def main(argv):
     # this column is used to record the starting page numer of the For DIVA pages that have NOT been removed
     diva_df['For DIVA page(s) present'] = pd.NaT
 
-
+    # collect the files to be processed
+    theses_to_process=[]
     for idx, row in diva_df.iterrows():
-        found_references_page=False
-        found_last_references_page=False
         if skip_to_row and idx < skip_to_row:
             continue
         url=row['FullTextLink']
@@ -2027,39 +2154,44 @@ def main(argv):
                 print("Cannot find file name in URL")
                 continue
             filename="{0}-{1}".format(pid, url[last_slash_in_url+1:])
-            print(f'reading file {filename}')
-
-            if not process_file(filename):
-                diva_df.loc[idx, 'Unexpected error when processing file']=filename
-                continue
-
-            if found_references_page:
-                print("Found references page at {0} in {1} by author(s) {2}".format(found_references_page, filename, row['Name']))
-                if found_last_references_page:
-                    diva_df.loc[idx, 'References page(s) present'] = "{0}-{1}".format(found_references_page, found_last_references_page)
-                else:
-                    diva_df.loc[idx, 'References page(s) present'] = "{0}".format(found_references_page)
-
-                if filename.endswith('.pdf'):
-                    output_filename="{0}-refpages.pdf".format(filename[:-4])
-                else:
-                    output_filename="{0}-refpages.pdf".format(filename)
-
-                if found_last_references_page:
-                    cmd="qpdf {0} --pages . {1}-{2} -- {3}".format(filename, found_references_page, found_last_references_page, output_filename)
-                else:
-                    cmd="qpdf {0} --pages . {1} -- {2}".format(filename, found_references_page, output_filename)
-                if Verbose_Flag:
-                    print("cmd: {0}".format(cmd))
-
-                with subprocess.Popen(shlex.split(cmd), stdout=subprocess.PIPE) as proc:
-                    cmd_ouput=proc.stdout.read()
-                    if len(cmd_ouput) > 0:
-                        print(cmd_ouput)
+            theses_to_process.append((idx, filename))
 
         if args["testing"]:
             break
 
+    results=[]
+    if args["jobs"] > 1:
+        with ProcessPoolExecutor(max_workers=args["jobs"], initializer=initialize_worker, initargs=(Verbose_Flag, testing)) as executor:
+            futures={executor.submit(process_thesis, idx, filename, args["fullscan"]): (idx, filename) for idx, filename in theses_to_process}
+            for future in as_completed(futures):
+                idx, filename = futures[future]
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    print(f'Worker failed when processing {filename} with error {e}')
+                    results.append({'idx': idx, 'filename': filename, 'references_start': False, 'references_end': False,
+                                    'error': 'Unexpected error when processing file'})
+    else:
+        for idx, filename in theses_to_process:
+            results.append(process_thesis(idx, filename, args["fullscan"]))
+
+    # merge the results into the spreadsheet
+    for result in sorted(results, key=lambda r: r['idx']):
+        idx=result['idx']
+        filename=result['filename']
+        if result['error']:
+            diva_df.loc[idx, result['error']]=filename
+            continue
+
+        found_references_page=result['references_start']
+        found_last_references_page=result['references_end']
+        if found_references_page:
+            print("Found references page at {0} in {1} by author(s) {2}".format(found_references_page, filename, diva_df.loc[idx, 'Name']))
+            if found_last_references_page:
+                diva_df.loc[idx, 'References page(s) present'] = "{0}-{1}".format(found_references_page, found_last_references_page)
+            else:
+                diva_df.loc[idx, 'References page(s) present'] = "{0}".format(found_references_page)
+
     # the following was inspired by the section "Using XlsxWriter with Pandas" on http://xlsxwriter.readthedocs.io/working_with_pandas.html
     # set up the output write
     output_spreadsheet_name=spreadsheet_name[:-5]+'with_references_info.xlsx'
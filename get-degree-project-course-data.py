@@ -37,6 +37,8 @@ import json
 # Use Python Pandas to create XLSX files
 import pandas as pd
 
+import kopps_cache
+
 from bs4 import BeautifulSoup
 
 ################################
@@ -44,6 +46,8 @@ from bs4 import BeautifulSoup
 ################################
 KOPPSbaseUrl = 'https://www.kth.se'
 
+global kopps	# cache for the responses from KOPPS (see kopps_cache.py)
+
 English_language_code='en'
 Swedish_language_code='sv'
 
@@ -64,7 +68,7 @@ def v1_get_programmes():
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting v1 programme: {}".format(r.text))
     #
@@ -130,7 +134,7 @@ def get_dept_codes(language_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting department codes: {}".format(r.text))
     #
@@ -158,7 +162,7 @@ def get_dept_courses(dept_code, language_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting courses for a department: {}".format(r.text))
     #
@@ -176,7 +180,7 @@ def get_course_info(course_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting course info: {}".format(r.text))
     #
@@ -211,7 +215,7 @@ def get_course_rounds_info(course_code, r_info):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting course round info: {}".format(r.text))
     #
@@ -230,7 +234,7 @@ def v1_get_course_info(course_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting v1 course info: {}".format(r.text))
     #
@@ -415,7 +419,7 @@ def programme_syllabi(program_code):
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting programme_syllabi: {}".format(r.text))
     #
@@ -439,7 +443,7 @@ def course_codes_from_url(syllabus_url):
     if Verbose_Flag:
         print("course_list_url: " + course_list_url)
     #
-    r = requests.get(course_list_url)
+    r = kopps.get(course_list_url)
     if Verbose_Flag:
         print("result of getting course list: {}".format(r.text))
     #
@@ -484,7 +488,7 @@ def target_group_for_course(course_code):
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting course information: {}".format(r.text))
     #
@@ -620,7 +624,7 @@ def v1_get_academic_year_plan_for_program(program_code, year):
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = kopps.get(url)
     if Verbose_Flag:
         print("result of getting v1 programme academic-year-plan: {}".format(r.text))
     #
@@ -657,6 +661,7 @@ def programs_specializations(programs_and_titles, school_acronym):
 
 def main():
     global Verbose_Flag
+    global kopps
 
     default_picture_size=128
 
@@ -678,11 +683,21 @@ def main():
                       help="execute test code"
     )
 
+    parser.add_option('--offline',
+                      dest="offline",
+                      default=False,
+                      action="store_true",
+                      help="only use the cached KOPPS responses, do not access the network"
+    )
 
+    parser.add_option("--kopps_cache", dest="kopps_cache",
+                      default=kopps_cache.default_cache_filename,
+                      help="read and write cached KOPPS responses in FILE", metavar="FILE")
 
     options, remainder = parser.parse_args()
 
     Verbose_Flag=options.verbose
+    kopps=kopps_cache.KOPPSCache(options.kopps_cache, offline=options.offline, verbose=Verbose_Flag)
     if Verbose_Flag:
         print("ARGV      : {}".format(sys.argv[1:]))
         print("VERBOSE   : {}".format(options.verbose))
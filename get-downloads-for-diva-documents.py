@@ -1,11 +1,15 @@
 #!/usr/bin/python3
 # -*- coding: utf-8 -*-
 #
-# ./get-downloads-for-diva-documents.py urns.xlsx
+# ./get-downloads-for-diva-documents.py [--jobs N] [--delay seconds] [--checkpoint file] [--restart] urns.xlsx
 #
 # Output: diva-downloads.xlsx
 #           a spreadsheet of download data
 #
+# The DiVA pages are fetched by N worker threads, with requests to the same host started at least
+# the given delay apart. The results for each DiVA record are appended to a checkpoint file
+# (default diva-downloads-checkpoint.jsonl), so that an interrupted run continues where it stopped.
+#
 #
 # Input
 # URNs are of the form: urn:nbn:se:kth:diva-230996
@@ -23,17 +27,50 @@ import pprint
 import optparse
 import sys
 import json
+import os
+import re
+import threading
+import urllib.parse
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
 
 # Use Python Pandas to create XLSX files
 import pandas as pd
 
-from bs4 import BeautifulSoup
+# only the spans with the statistics are looked at, so lxml's XPath is used rather than building a BeautifulSoup tree
+import lxml.html
 
 ################################
 ######    DiVA related   ######
 ################################
 DiVAUrlbase = 'http://kth.diva-portal.org/smash/record.jsf?pid=diva2%3A'
 
+default_number_of_workers=4
+default_delay_between_requests=0.5 # seconds between the start of two requests to the same host
+default_checkpoint_filename='diva-downloads-checkpoint.jsonl'
+
+# a single session is shared by the worker threads, so that the connections to DiVA are reused
+session=None
+
+# Polite rate limiting: requests to the same host are started at least min_interval seconds apart,
+# regardless of how many worker threads there are
+class HostRateLimiter:
+    def __init__(self, min_interval):
+        self.min_interval=min_interval
+        self.lock=threading.Lock()
+        self.next_time=dict()
+
+    def wait(self, url):
+        host=urllib.parse.urlsplit(url).netloc
+        with self.lock:
+            now=time.monotonic()
+            start=max(now, self.next_time.get(host, now))
+            self.next_time[host]=start+self.min_interval
+        if start > now:
+            time.sleep(start-now)
+
+rate_limiter=HostRateLimiter(default_delay_between_requests)
 
 def get_diva_page(diva_id):
     global Verbose_Flag
@@ -42,7 +79,8 @@ def get_diva_page(diva_id):
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    rate_limiter.wait(url)
+    r = session.get(url)
     if Verbose_Flag:
         print("result of getting get_diva_page: {}".format(r.text))
     #
@@ -51,33 +89,53 @@ def get_diva_page(diva_id):
     #
     return None
 
+# lxml does not accept a str that starts with an XML declaration giving an encoding, as XHTML pages from DiVA do,
+# the page has already been decoded, so the declaration is removed before parsing
+xml_declaration_re=re.compile(r'^\s*<\?xml[^>]*\?>')
+
+def parse_diva_page(page):
+    return lxml.html.fromstring(xml_declaration_re.sub('', page, count=1))
+
+# the text of an element, if it only contains text (as for BeautifulSoup's .string)
+def string_of(element):
+    if len(element) == 0:
+        return element.text
+    return None
+
+def spans_with_class(xml, class_name, within_div_class=None):
+    span_path="//span[contains(concat(' ', normalize-space(@class), ' '), ' {} ')]".format(class_name)
+    if within_div_class:
+        div_path="//div[contains(concat(' ', normalize-space(@class), ' '), ' {} ')]".format(within_div_class)
+        divs=xml.xpath(div_path)
+        if not divs:
+            return []
+        # only the first div, as for BeautifulSoup's find()
+        return divs[0].xpath('.'+span_path)
+    return xml.xpath(span_path)
+
 def get_download_count(xml):
     #<div class="attachment">
-    p1=xml.find('div', attrs={'class': 'attachment'})
-    if p1:
-        #<span class="singleRow">94 downloads</span>
-        found=p1.find('span', attrs={'class': 'singleRow'})
-        if found:
-            for singlerow in found:
-                h1=singlerow.string
-                if h1:
-                    offset_to_download_string=h1.find('downloads')
-                    count_string=h1[0:(offset_to_download_string)]
-                    if Verbose_Flag:
-                        print("count_string={0}".format(count_string))
-                    return int(count_string.strip())
+    #<span class="singleRow">94 downloads</span>
+    found=spans_with_class(xml, 'singleRow', 'attachment')
+    if found:
+        h1=found[0].text
+        if h1:
+            offset_to_download_string=h1.find('downloads')
+            count_string=h1[0:(offset_to_download_string)]
+            if Verbose_Flag:
+                print("count_string={0}".format(count_string))
+            return int(count_string.strip())
     # no full text
     return -1
 
 def get_hits_count(xml):
-    #<div class="attachment">
-    found=xml.findAll('span', attrs={'class': 'singleRow'})
+    found=spans_with_class(xml, 'singleRow')
     # look for <span class="singleRow">Total: 735                     hits</span>
     if found:
         if Verbose_Flag:
             print("found={0}, length={1}".format(found, len(found)))
         for idx, singlerow in enumerate(found):
-            h1=singlerow.string
+            h1=string_of(singlerow)
             if Verbose_Flag:
                 print("h1{0}={1}".format(idx, h1))
             if h1:
@@ -92,13 +150,13 @@ def get_hits_count(xml):
     return -1
 
 def get_year_and_language(xml):
-    found=xml.findAll('span', attrs={'class': 'displayFields'})
+    found=spans_with_class(xml, 'displayFields')
     # look for <span class="displayFields">1995 (Swedish)</span>
     if found:
         if Verbose_Flag:
             print("found={0}, length={1}".format(found, len(found)))
         for idx, singlerow in enumerate(found):
-            h1=singlerow.string
+            h1=string_of(singlerow)
             if Verbose_Flag:
                 print("h1 {0}={1}".format(idx, h1))
             if h1:
@@ -114,9 +172,43 @@ def get_year_and_language(xml):
     # no year and language information
     return None
 
+# returns a dict with the statistics for the DiVA record or None if the page could not be fetched
+def get_statistics(diva2_id):
+    page=get_diva_page(diva2_id)
+    if not page:
+        return None
+    xml=parse_diva_page(page)
+    statistics={'diva2_id': diva2_id,
+                'Downloads': get_download_count(xml),
+                'Hits': get_hits_count(xml),
+                'Year': None,
+                'Language': None}
+    y_l=get_year_and_language(xml)
+    if y_l:
+        statistics['Year']=y_l['year']
+        statistics['Language']=y_l['lang']
+    return statistics
+
+# The checkpoint file has one JSON object per line for each DiVA record that has been done,
+# so an interrupted run can continue where it stopped
+def read_checkpoint(checkpoint_filename):
+    done=dict()
+    if not os.path.exists(checkpoint_filename):
+        return done
+    with open(checkpoint_filename, 'r') as checkpoint_FH:
+        for line in checkpoint_FH:
+            try:
+                statistics=json.loads(line)
+            except json.JSONDecodeError:
+                continue        # a partially written last line
+            done[statistics['diva2_id']]=statistics
+    return done
+
 
 def main():
     global Verbose_Flag
+    global session
+    global rate_limiter
 
     default_picture_size=128
 
@@ -129,6 +221,33 @@ def main():
                       help="Print lots of output to stdout"
     )
 
+    parser.add_option('-j', '--jobs',
+                      dest="jobs",
+                      type="int",
+                      default=default_number_of_workers,
+                      help="number of DiVA pages to fetch at the same time"
+    )
+
+    parser.add_option('-d', '--delay',
+                      dest="delay",
+                      type="float",
+                      default=default_delay_between_requests,
+                      help="minimum number of seconds between starting requests to the same host"
+    )
+
+    parser.add_option('-c', '--checkpoint',
+                      dest="checkpoint",
+                      default=default_checkpoint_filename,
+                      help="file that records the DiVA records that have been done"
+    )
+
+    parser.add_option('--restart',
+                      dest="restart",
+                      default=False,
+                      action="store_true",
+                      help="ignore (and remove) an existing checkpoint file"
+    )
+
     options, remainder = parser.parse_args()
 
     Verbose_Flag=options.verbose
@@ -151,20 +270,50 @@ def main():
     ids_df['Hits']=None
     ids_df['Year']=None
     ids_df['Language']=None
-    
-    for idx, row in ids_df.iterrows():
-        diva2_id=row['diva2 ids'].split(':')[1]
-        if Verbose_Flag:
-            print("ids_df[{0}]={1}".format(idx, diva2_id))
-        page=get_diva_page(diva2_id)
-        xml=BeautifulSoup(page, features="html.parser")
-        count=get_download_count(xml)
-        ids_df.loc[idx, 'Downloads']=count
-        hits=get_hits_count(xml)
-        ids_df.loc[idx, 'Hits']=hits
-        y_l=get_year_and_language(xml)
-        ids_df.loc[idx, 'Year']=y_l['year']
-        ids_df.loc[idx, 'Language']=y_l['lang']
+
+    session=requests.Session()
+    adapter=HTTPAdapter(pool_connections=options.jobs, pool_maxsize=options.jobs)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    rate_limiter=HostRateLimiter(options.delay)
+
+    if options.restart and os.path.exists(options.checkpoint):
+        os.remove(options.checkpoint)
+    done=read_checkpoint(options.checkpoint)
+    if done:
+        print("continuing from {0} DiVA records in {1}".format(len(done), options.checkpoint))
+
+    diva2_ids=[row['diva2 ids'].split(':')[1] for idx, row in ids_df.iterrows()]
+    # each DiVA record is only fetched once, even if it occurs several times
+    to_do=[diva2_id for diva2_id in dict.fromkeys(diva2_ids) if diva2_id not in done]
+
+    with open(options.checkpoint, 'a') as checkpoint_FH, ThreadPoolExecutor(max_workers=options.jobs) as executor:
+        futures={executor.submit(get_statistics, diva2_id): diva2_id for diva2_id in to_do}
+        for future in as_completed(futures):
+            diva2_id=futures[future]
+            try:
+                statistics=future.result()
+            except Exception as e:
+                print("Error in getting the statistics for diva2:{0}: {1}".format(diva2_id, e))
+                continue
+            if not statistics:
+                print("Unable to get the DiVA page for diva2:{}".format(diva2_id))
+                continue
+            done[diva2_id]=statistics
+            # only the main thread writes to the checkpoint file
+            checkpoint_FH.write(json.dumps(statistics)+'\n')
+            checkpoint_FH.flush()
+            if Verbose_Flag:
+                print("diva2:{0} {1}".format(diva2_id, statistics))
+
+    for idx, diva2_id in zip(ids_df.index, diva2_ids):
+        statistics=done.get(diva2_id, None)
+        if not statistics:
+            continue
+        ids_df.loc[idx, 'Downloads']=statistics['Downloads']
+        ids_df.loc[idx, 'Hits']=statistics['Hits']
+        ids_df.loc[idx, 'Year']=statistics['Year']
+        ids_df.loc[idx, 'Language']=statistics['Language']
 
     writer = pd.ExcelWriter('diva-downloads.xlsx', engine='xlsxwriter')
 
@@ -174,4 +323,3 @@ def main():
     writer.save()
 
 if __name__ == "__main__": main()
-
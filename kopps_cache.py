@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# -*- mode: python; python-indent-offset: 4 -*-
+#
+# kopps_cache.py
+#
+# Purpose: A persistent on-disk cache for responses from KOPPS (and the KTH course web pages).
+#          The programs that collect course, department, and program data all fetch the same
+#          KOPPS URLs again and again, this cache lets repeated runs cost (almost) no network time.
+#
+# The cache is an SQLite database (by default the file KOPPS_cache.sqlite3 in the current directory).
+# Entries are keyed by the URL and the language (the language is taken from the "l" query parameter
+# or the ".en.json"/".sv.json" suffix, unless it is explicitly given).
+#
+# Each kind of KOPPS endpoint has its own time to live (see KOPPS_TTLs). When an entry has expired,
+# the cache revalidates it using the stored ETag (If-None-Match) and Last-Modified (If-Modified-Since)
+# values, so that an unchanged resource only costs a "304 Not Modified".
+#
+# In offline mode only the cache is used (regardless of the age of the entries); a URL that
+# is not in the cache gives a response with status_code 504 (as for an HTTP "only-if-cached" miss).
+#
+# Example of use in a program:
+#
+#   import kopps_cache
+#   kopps=kopps_cache.KOPPSCache(options.kopps_cache, offline=options.offline, verbose=Verbose_Flag)
+#   r = kopps.get(url)
+#   if r.status_code == requests.codes.ok:
+#       page_response=r.json()
+#
+# 2026-10-18
+#
+
+import json
+import re
+import sqlite3
+import threading
+import time
+import urllib.parse
+
+import requests
+
+default_cache_filename='KOPPS_cache.sqlite3'
+
+# time to live in seconds for the different kinds of KOPPS URLs, the first pattern that matches is used
+one_hour=60*60
+one_day=24*one_hour
+KOPPS_TTLs=[
+    (re.compile(r'/api/kopps/v2/departments\.'),         7*one_day),  # the list of departments rarely changes
+    (re.compile(r'/api/kopps/v1/programme$'),            7*one_day),  # the list of programs
+    (re.compile(r'/api/kopps/v2/programmes/'),           7*one_day),
+    (re.compile(r'/api/kopps/v1/programme/.*/academic-year-plan/'), 7*one_day),
+    (re.compile(r'/api/kopps/v2/courses/'),              one_day),    # courses of a department
+    (re.compile(r'/api/kopps/v2/course/'),               one_day),    # includes the examiners
+    (re.compile(r'/api/kopps/v1/course/.*/round/'),      one_day),
+    (re.compile(r'/api/kopps/v1/course/'),               one_day),
+    (re.compile(r'/student/kurser/program/'),            7*one_day),  # program syllabi and course lists
+    (re.compile(r'/student/kurser/kurs/'),               one_day),
+]
+default_ttl=one_day
+
+# status code returned for a cache miss in offline mode
+offline_miss_status_code=504
+
+
+def ttl_for_url(url):
+    path=urllib.parse.urlsplit(url).path
+    for pattern, ttl in KOPPS_TTLs:
+        if pattern.search(path):
+            return ttl
+    return default_ttl
+
+def language_of_url(url):
+    parts=urllib.parse.urlsplit(url)
+    query=urllib.parse.parse_qs(parts.query)
+    language=query.get('l', None)
+    if language:
+        return language[0]
+    m=re.search(r'\.(en|sv)\.json$', parts.path)
+    if m:
+        return m.group(1)
+    return ''
+
+
+class CachedResponse:
+    # a minimal stand-in for a requests.Response, with the fields that the KOPPS functions use
+    def __init__(self, url, status_code, text, from_cache=True):
+        self.url=url
+        self.status_code=status_code
+        self.text=text
+        self.from_cache=from_cache
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class KOPPSCache:
+    def __init__(self, cache_filename=default_cache_filename, offline=False, verbose=False):
+        self.offline=offline
+        self.verbose=verbose
+        self.session=requests.Session()
+        self.lock=threading.Lock()
+        self.db=sqlite3.connect(cache_filename or default_cache_filename, check_same_thread=False)
+        self.db.execute("""CREATE TABLE IF NOT EXISTS responses (
+                               url TEXT NOT NULL,
+                               language TEXT NOT NULL,
+                               status_code INTEGER NOT NULL,
+                               body TEXT NOT NULL,
+                               etag TEXT,
+                               last_modified TEXT,
+                               fetched REAL NOT NULL,
+                               PRIMARY KEY (url, language))""")
+        self.db.commit()
+
+    def lookup(self, url, language):
+        with self.lock:
+            cur=self.db.execute("SELECT status_code, body, etag, last_modified, fetched FROM responses WHERE url=? AND language=?",
+                                (url, language))
+            return cur.fetchone()
+
+    def store(self, url, language, status_code, body, etag, last_modified):
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (url, language, status_code, body, etag, last_modified, time.time()))
+            self.db.commit()
+
+    def touch(self, url, language):
+        with self.lock:
+            self.db.execute("UPDATE responses SET fetched=? WHERE url=? AND language=?", (time.time(), url, language))
+            self.db.commit()
+
+    def get(self, url, language=None):
+        if language is None:
+            language=language_of_url(url)
+
+        entry=self.lookup(url, language)
+        if entry:
+            status_code, body, etag, last_modified, fetched = entry
+            if self.offline or (time.time() - fetched) < ttl_for_url(url):
+                if self.verbose:
+                    print("KOPPS cache hit for {}".format(url))
+                return CachedResponse(url, status_code, body)
+        elif self.offline:
+            print("Offline mode: no cached response for {}".format(url))
+            return CachedResponse(url, offline_miss_status_code, '')
+
+        # either not in the cache or the entry has expired, so ask KOPPS
+        conditional_headers=dict()
+        if entry:
+            if etag:
+                conditional_headers['If-None-Match']=etag
+            if last_modified:
+                conditional_headers['If-Modified-Since']=last_modified
+
+        r=self.session.get(url, headers=conditional_headers)
+        if r.status_code == requests.codes.not_modified and entry:
+            if self.verbose:
+                print("KOPPS cache revalidated {}".format(url))
+            self.touch(url, language)
+            return CachedResponse(url, status_code, body)
+
+        # only successful responses and "not found" are worth remembering
+        if r.status_code in [requests.codes.ok, requests.codes.not_found]:
+            self.store(url, language, r.status_code, r.text, r.headers.get('ETag', None), r.headers.get('Last-Modified', None))
+        return r
+
+    def clear(self):
+        with self.lock:
+            self.db.execute("DELETE FROM responses")
+            self.db.commit()
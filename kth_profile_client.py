@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# -*- mode: python; python-indent-offset: 4 -*-
+#
+# kth_profile_client.py
+#
+# Purpose: A shared client for the KTH profile API ("{host}/profile/v1/kthId/{kthid}") that the programs
+#          can use instead of each having their own get_user_by_kthid() that makes a new HTTP request for every call.
+#          The same examiners and supervisors turn up for hundreds of students, so most lookups are repeats.
+#
+# The client:
+#   - keeps the most recently used profiles in memory (an LRU of up to lru_size entries),
+#   - keeps the profiles in a persistent SQLite cache (by default the file KTH_profile_cache.sqlite3 in the
+#     current directory, or the file named by the environment variable KTH_PROFILE_CACHE), keyed by the kthid,
+#   - lets entries expire (after profile_ttl seconds for a profile),
+#   - remembers unknown kthids ("404 Not Found") for unknown_ttl seconds, so they are not asked for again and again,
+#   - has prefetch(kthids) to fetch all of the profiles that are not already cached using a pool of threads.
+#
+# Responses other than "200 OK" and "404 Not Found" (for example, an overloaded server) are not cached.
+#
+# Example of use in a program:
+#
+#   import kth_profile_client
+#   kth_profiles=kth_profile_client.KTHProfileClient(host, header, verbose=Verbose_Flag)
+#   kth_profiles.prefetch([t['sis_user_id'] for t in teachers])
+#   profile=kth_profiles.get(kthid)
+#
+# As with the earlier get_user_by_kthid() functions, get() returns the profile as a dict or [] if there is no such user.
+#
+# 2026-10-18
+#
+
+import collections
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+default_cache_filename='KTH_profile_cache.sqlite3'
+
+one_hour=60*60
+one_day=24*one_hour
+profile_ttl=7*one_day           # profiles (names, titles, affiliations) change rarely
+unknown_ttl=one_day             # a kthid that is unknown now might be created later
+
+default_lru_size=1024
+default_max_workers=8
+
+
+class KTHProfileClient:
+    def __init__(self, host, header, cache_filename=None, lru_size=default_lru_size, max_workers=default_max_workers, verbose=False):
+        self.host=host
+        self.header=header
+        self.lru_size=lru_size
+        self.max_workers=max_workers
+        self.verbose=verbose
+
+        self.session=requests.Session()
+        self.session.headers.update(header)
+        # make the connection pool large enough for all of the worker threads
+        adapter=HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.lock=threading.Lock()
+        self.lru=collections.OrderedDict() # kthid -> (status_code, profile, fetched)
+
+        if cache_filename is None:
+            cache_filename=os.environ.get('KTH_PROFILE_CACHE', default_cache_filename)
+        self.db=None
+        if cache_filename:      # an empty file name means that there is no persistent cache
+            self.db=sqlite3.connect(cache_filename, check_same_thread=False)
+            self.db.execute("""CREATE TABLE IF NOT EXISTS profiles (
+                                   kthid TEXT PRIMARY KEY,
+                                   status_code INTEGER NOT NULL,
+                                   body TEXT NOT NULL,
+                                   fetched REAL NOT NULL)""")
+            self.db.commit()
+
+    def remember(self, kthid, entry):
+        # the caller holds self.lock
+        self.lru[kthid]=entry
+        self.lru.move_to_end(kthid)
+        while len(self.lru) > self.lru_size:
+            self.lru.popitem(last=False)
+
+    def lookup(self, kthid):
+        # returns (status_code, profile) for an unexpired entry or None
+        with self.lock:
+            entry=self.lru.get(kthid, None)
+            if entry is not None:
+                self.lru.move_to_end(kthid)
+            elif self.db is not None:
+                row=self.db.execute("SELECT status_code, body, fetched FROM profiles WHERE kthid=?", (kthid,)).fetchone()
+                if row:
+                    status_code, body, fetched = row
+                    entry=(status_code, json.loads(body), fetched)
+                    self.remember(kthid, entry)
+        if entry is None:
+            return None
+        status_code, profile, fetched = entry
+        if status_code == requests.codes.ok:
+            ttl=profile_ttl
+        else:
+            ttl=unknown_ttl
+        if (time.time() - fetched) >= ttl:
+            return None
+        return (status_code, profile)
+
+    def store(self, kthid, status_code, profile):
+        fetched=time.time()
+        with self.lock:
+            self.remember(kthid, (status_code, profile, fetched))
+            if self.db is not None:
+                self.db.execute("INSERT OR REPLACE INTO profiles VALUES (?, ?, ?, ?)",
+                                (kthid, status_code, json.dumps(profile), fetched))
+                self.db.commit()
+
+    def fetch(self, kthid):
+        # Use the KTH API to get the user information given a kthid
+        #"#{$kth_api_host}/profile/v1/kthId/#{kthid}"
+        url = "{0}/profile/v1/kthId/{1}".format(self.host, kthid)
+        if self.verbose:
+            print("url: {}".format(url))
+
+        r = self.session.get(url)
+        if self.verbose:
+            print("result of getting profile: {}".format(r.text))
+
+        if r.status_code == requests.codes.ok:
+            profile=r.json()
+            self.store(kthid, r.status_code, profile)
+            return profile
+        if r.status_code == requests.codes.not_found:
+            self.store(kthid, r.status_code, [])
+        return []
+
+    def get(self, kthid):
+        cached=self.lookup(kthid)
+        if cached is not None:
+            if self.verbose:
+                print("KTH profile cache hit for {}".format(kthid))
+            return cached[1]
+        return self.fetch(kthid)
+
+    def prefetch(self, kthids):
+        # fetch the profiles (that are not already cached) for all of the kthids, using the client's worker threads
+        missing=[]
+        seen=set()
+        for kthid in kthids:
+            if not kthid or kthid in seen:
+                continue
+            seen.add(kthid)
+            if self.lookup(kthid) is None:
+                missing.append(kthid)
+        if not missing:
+            return
+        if self.verbose:
+            print("prefetching {} KTH profiles".format(len(missing)))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(self.fetch, missing))
+
+    def clear(self):
+        with self.lock:
+            self.lru.clear()
+            if self.db is not None:
+                self.db.execute("DELETE FROM profiles")
+                self.db.commit()
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# -*- mode: python; python-indent-offset: 4 -*-
+#
+# latex_to_html.py
+#
+# Purpose: A shared transformer for the LaTeX that is found in the abstracts of theses, used by JSON_to_MODS.py (DiVA),
+#          JSON_to_calendar.py (Cortina), extract_pseudo_JSON-from_PDF.py, and cleanup_pseudo_JSON-from_LaTeX.py.
+#
+# Earlier each of these programs had its own copy of transform_urls(), transform_math_for_diva()/transform_math_for_cortina(),
+# replace_latex_command(), replace_latex_symbol(), ... that did a find() followed by slicing and concatenating the string
+# for each replacement and then searched again from the start - which is quadratic in the length of the abstract.
+#
+# Here a single compiled regular expression finds the next token (a math span, a \url{...}, a LaTeX command with an argument,
+# a symbol, a macro from defines.tex, or a siunitx unit), so an abstract is transformed in one pass from left to right.
+# The argument of a command is found by matching the braces (so \textit{a {b} c} works) and is itself transformed.
+# The output of a replacement is never scanned again.
+#
+# The output targets are:
+#   'diva'    - HTML for DiVA, math is put into <span class='math-tex'>...</span>
+#   'cortina' - HTML for Cortina (currently the same as for DiVA)
+#   'text'    - plain text, math is left as LaTeX, the commands are replaced by their argument and the symbols by Unicode characters
+#
+# Example of use in a program:
+#
+#   import latex_to_html
+#   abstract_text=latex_to_html.transform_abstract(abstract_text, 'diva')     # \url{...}, \%, and math
+#   s=latex_to_html.transform_latex(s, 'diva')                               # \textit{...}, \ldots, \eg, {\meter}, ...
+#
+# 2026-10-18
+#
+
+import re
+
+# the commands with one argument, for each target the strings to put before and after the argument
+latex_commands={
+    'textit':          {'html': ('<i>', '</i>'),           'text': ('', '')},
+    'emph':            {'html': ('<strong>', '</strong>'), 'text': ('', '')},
+    'textbf':          {'html': ('<strong>', '</strong>'), 'text': ('', '')},
+    'texttt':          {'html': ('<tt>', '</tt>'),         'text': ('', '')},
+    'textsubscript':   {'html': ('<sub>', '</sub>'),       'text': ('', '')},
+    'textsuperscript': {'html': ('<sup>', '</sup>'),       'text': ('', '')},
+    'mbox':            {'html': ('<span>', '</span>'),     'text': ('', '')},
+    'num':             {'html': ('', ''),                  'text': ('', '')},
+    'SI':              {'html': ('', ''),                  'text': ('', '')},
+}
+
+# symbols, the macros in defines.tex, and units (siunitx) - for each target what to replace them by
+latex_symbols={
+    '\\&':              {'html': '&amp;',  'text': '&'},
+    '\\%':              {'html': '%',      'text': '%'},
+    '\\,':              {'html': '\u202F', 'text': '\u202F'}, # a narrow non-breaking space
+    '\\ldots':          {'html': ' ... ',  'text': ' ... '},
+    '\\textregistered': {'html': '&reg;',  'text': '\u00AE'},
+    '\\texttrademark':  {'html': '&trade;', 'text': '\u2122'},
+    '\\textcopyright':  {'html': '&copy;', 'text': '\u00A9'},
+    '\\textbackslash ': {'html': '\\',     'text': '\\'},
+    # handle defines.tex macros
+    '\\eg':             'e.g.',
+    '\\Eg':             'E.g.',
+    '\\ie':             'i.e.',
+    '\\Ie':             'I.e.',
+    '\\etc':            'etc.',
+    '\\etal':           'et al.',
+    '\\first':          '(i) ',
+    '\\Second':         '(ii) ',
+    '\\third':          '(iii) ',
+    '\\fourth':         '(iv) ',
+    '\\fifth':          '(v) ',
+    '\\sixth':          '(vi) ',
+    '\\seventh':        '(vii) ',
+    '\\eighth':         '(viii) ',
+    # handle some units
+    '{\\meter\\squared}':         {'html': '\u202Fm<sup>2</sup>',         'text': '\u202Fm\u00B2'},
+    '{\\meter\\per\\second}':     {'html': '\u202Fm\u202Fs<sup>-1</sup>', 'text': '\u202Fm\u202Fs\u207B\u00B9'},
+    '{\\second}':                 '\u202Fs',
+    '{\\meter}':                  '\u202Fm',
+    '{\\percent}':                '\u202F%',
+}
+
+# math delimiters: the opening delimiter, the closing delimiter, and the delimiters used in the output
+math_delimiters={
+    '\\(': ('\\)', '\\(', '\\)'),
+    '\\[': ('\\]', '\\[', '\\]'),
+    '$$':  ('$$',  '\\[', '\\]'),
+}
+
+# the kind of output (HTML or text) of each target
+targets={
+    'diva':    'html',
+    'cortina': 'html',
+    'text':    'text',
+}
+
+
+def replacement_for_target(replacement, kind):
+    if isinstance(replacement, dict):
+        return replacement[kind]
+    return replacement
+
+def alternatives(strings):
+    # longest first, so that for example \etal is tried before \eg would match its prefix
+    return '|'.join(re.escape(s) for s in sorted(strings, key=len, reverse=True))
+
+
+class LaTeXTransformer:
+    # urls     - replace \url{...}
+    # math     - True to format the math spans for the target, 'keep' to copy them unchanged (so that nothing inside is replaced),
+    #            or False to not look for math
+    # commands - replace the commands in latex_commands
+    # symbols  - None for all of the symbols in latex_symbols, otherwise a list of the symbols to replace
+    def __init__(self, target, urls=True, math=True, commands=True, symbols=None):
+        self.target=target
+        self.kind=targets[target]
+        self.math=math
+        self.commands={c: v[self.kind] for c, v in latex_commands.items()}
+        if symbols is None:
+            symbols=latex_symbols.keys()
+        self.symbols={s: replacement_for_target(latex_symbols[s], self.kind) for s in symbols}
+        parts=[]
+        if urls:
+            parts.append(r'(?P<url>\\url\{)')
+        if math:
+            parts.append(r'(?P<math>{})'.format(alternatives(math_delimiters)))
+        if commands:
+            parts.append(r'\\(?P<command>{})\{{'.format('|'.join(sorted(self.commands, key=len, reverse=True))))
+        if self.symbols:
+            parts.append(r'(?P<symbol>{})'.format(alternatives(self.symbols)))
+        self.token_re=re.compile('|'.join(parts))
+
+    def format_url(self, url):
+        if self.kind == 'html':
+            # <a href="xxxx">xxx</a>
+            return "<a href='{0}'>{0}</a>".format(url)
+        return url
+
+    def format_math(self, open_delimiter, eqn, close_delimiter):
+        if self.kind == 'html':
+            # <span class=\"math-tex\">\\(x =  {-b \\pm \\sqrt{b^2-4ac} \\over 2a}\\)</span>
+            return "<span class=\'math-tex\'>{0}{1}{2}</span>".format(open_delimiter, eqn, close_delimiter)
+        return open_delimiter+eqn+close_delimiter
+
+    def transform(self, s):
+        if not s:
+            return s
+        output=[]
+        offset=0
+        while True:
+            m=self.token_re.search(s, offset)
+            if m is None:
+                break
+            output.append(s[offset:m.start()])
+            offset=m.end()
+            kind=m.lastgroup
+            if kind == 'url':
+                end_of_url=s.find('}', offset)
+                if end_of_url < 0:  # not terminated, leave it as it is
+                    output.append(m.group(0))
+                    continue
+                output.append(self.format_url(s[offset:end_of_url]))
+                offset=end_of_url+1
+            elif kind == 'math':
+                close_delimiter, open_output, close_output = math_delimiters[m.group('math')]
+                end_of_eqn=s.find(close_delimiter, offset)
+                if end_of_eqn < 0:  # not terminated, leave it as it is
+                    output.append(m.group(0))
+                    continue
+                if self.math == 'keep':
+                    output.append(s[m.start():end_of_eqn+len(close_delimiter)])
+                else:
+                    output.append(self.format_math(open_output, s[offset:end_of_eqn], close_output))
+                offset=end_of_eqn+len(close_delimiter)
+            elif kind == 'command':
+                end_of_argument=matching_brace(s, offset)
+                if end_of_argument < 0: # not terminated, leave it as it is
+                    output.append(m.group(0))
+                    continue
+                insert_at_start, insert_at_end = self.commands[m.group('command')]
+                output.append(insert_at_start)
+                output.append(self.transform(s[offset:end_of_argument]))
+                output.append(insert_at_end)
+                offset=end_of_argument+1
+            else:
+                output.append(self.symbols[m.group('symbol')])
+        output.append(s[offset:])
+        return ''.join(output)
+
+
+brace_re=re.compile(r'\\.|[{}]')
+
+def matching_brace(s, offset):
+    # returns the offset of the '}' that closes the group starting at offset (just after a '{') or -1
+    depth=1
+    for m in brace_re.finditer(s, offset):
+        c=m.group(0)
+        if c == '{':
+            depth=depth+1
+        elif c == '}':
+            depth=depth-1
+            if depth == 0:
+                return m.start()
+    return -1
+
+
+# the transformers are compiled on first use and then reused
+transformers=dict()
+
+def transformer(target, urls=True, math=True, commands=True, symbols=None):
+    key=(target, urls, math, commands, None if symbols is None else tuple(symbols))
+    t=transformers.get(key, None)
+    if t is None:
+        t=LaTeXTransformer(target, urls=urls, math=math, commands=commands, symbols=symbols)
+        transformers[key]=t
+    return t
+
+def mathincluded(html):
+    # look for LaTeX math in the html
+    if html.find('\\(') >= 0 and html.find('\\)') >= 0:
+        return True
+    if html.find('\\[') >= 0 and html.find('\\]') >= 0:
+        return True
+    if html.find('$$') >= 0:
+        return True
+    return False
+
+# For the abstracts that go to DiVA or Cortina: \url{...}, \%, and the math (\( \), \[ \], and $$ $$)
+def transform_abstract(s, target='diva'):
+    return transformer(target, commands=False, symbols=['\\%']).transform(s)
+
+# only \url{...}
+def transform_urls(s, target='diva'):
+    return transformer(target, math=False, commands=False, symbols=[]).transform(s)
+
+# For cleaning up the abstracts extracted from a thesis: the commands (\textit{...}, ...), symbols, macros, and units.
+# Math is copied unchanged and \url{...} is left for transform_abstract().
+def transform_latex(s, target='diva'):
+    return transformer(target, urls=False, math='keep').transform(s)
+
+
+comment_re=re.compile(r'(?<!\\)%[^\n]*\n')
+
+def remove_comment_to_EOL(s):
+    # remove the LaTeX comments (from an unescaped % to the end of the line), a comment at the very start is removed with its newline
+    return comment_re.sub(lambda m: '' if m.start() == 0 else '\n', s)
+
+
+# ligature. LaTeX commonly does it for ff, fi, fl, ffi, ffl, ...
+ligrature_table= {'\ufb00': 'ff', # 'ﬀ'
+                  '\ufb03': 'f‌f‌i', # 'ﬃ'
+                  '\ufb04': 'ffl', # 'ﬄ'
+                  '\ufb01': 'fi', # 'ﬁ'
+                  '\ufb02': 'fl', # 'ﬂ'
+                  '\ua732': 'AA', # 'Ꜳ'
+                  '\ua733': 'aa', # 'ꜳ'
+                  '\ua733': 'aa', # 'ꜳ'
+                  '\u00c6': 'AE', # 'Æ'
+                  '\u00e6': 'ae', # 'æ'
+                  '\uab31': 'aə', # 'ꬱ'
+                  '\ua734': 'AO', # 'Ꜵ'
+                  '\ua735': 'ao', # 'ꜵ'
+                  '\ua736': 'AU', # 'Ꜷ'
+                  '\ua737': 'au', # 'ꜷ'
+                  '\ua738': 'AV', # 'Ꜹ'
+                  '\ua739': 'av', # 'ꜹ'
+                  '\ua73a': 'AV', # 'Ꜻ'  - note the bar
+                  '\ua73b': 'av', # 'ꜻ'  - note the bar
+                  '\ua73c': 'AY', # 'Ꜽ'
+                  '\ua76a': 'ET', # 'Ꝫ'
+                  '\ua76b': 'et', # 'ꝫ'
+                  '\uab41': 'əø', # 'ꭁ'
+                  '\u01F6': 'Hv', # 'Ƕ'
+                  '\u0195': 'hu', # 'ƕ'
+                  '\u2114': 'lb', # '℔'
+                  '\u1efa': 'IL', # 'Ỻ'
+                  '\u0152': 'OE', # 'Œ'
+                  '\u0153': 'oe', # 'œ'
+                  '\ua74e': 'OO', # 'Ꝏ'
+                  '\ua74f': 'oo', # 'ꝏ'
+                  '\uab62': 'ɔe', # 'ꭢ'
+                  '\u1e9e': 'fs', # 'ẞ'
+                  '\u00df': 'fz', # 'ß'
+                  '\ufb06': 'st', # 'ﬆ'
+                  '\ufb05': 'ſt', # 'ﬅ'  -- long ST
+                  '\ua728': 'Tz', # 'Ꜩ'
+                  '\ua729': 'tz', # 'ꜩ'
+                  '\u1d6b': 'ue', # 'ᵫ'
+                  '\uab63': 'uo', # 'ꭣ'
+                  #'\u0057': 'UU', # 'W'
+                  #'\u0077': 'uu', # 'w'
+                  '\ua760': 'VY', # 'Ꝡ'
+                  '\ua761': 'vy', # 'ꝡ'
+                  # 
+                  '\u0238': 'db', # 'ȸ'
+                  '\u02a3': 'dz', # 'ʣ'
+                  '\u1b66': 'dʐ', # 'ꭦ'
+                  '\u02a5': 'dʑ', # 'ʥ'
+                  '\u02a4': 'dʒ', # 'ʤ'
+                  '\u02a9': 'fŋ', # 'ʩ'
+                  '\u02aa': 'ls', # 'ʪ'
+                  '\u02ab': 'lz', # 'ʫ'
+                  '\u026e': 'lʒ', # 'ɮ'
+                  '\u0239': 'qp', # 'ȹ'
+                  '\u02a8': 'tɕ', # 'ʨ'
+                  '\u02a6': 'ts', # 'ʦ'
+                  '\uab67': 'tʂ', # 'ꭧ'
+                  '\u02a7': 'tʃ', # 'ʧ'
+                  '\uab50': 'ui', # 'ꭐ'
+                  '\uab51': 'ui', # 'ꭑ' -- turned ui
+                  '\u026f': 'uu', # 'ɯ'
+                  # digraphs with single code points
+                  '\u01f1': 'DZ', # 'Ǳ'
+                  '\u01f2': 'Dz', # 'ǲ'
+                  '\u01f3': 'dz', # 'ǳ'
+                  '\u01c4': 'DŽ', # 'Ǆ'
+                  '\u01c5': 'Dž', # 'ǅ'
+                  '\u01c6': 'dž', # 'ǆ'
+                  '\u0132': 'IJ', # 'Ĳ'
+                  '\u0133': 'ij', # 'ĳ'
+                  '\u01c7': 'LJ', # 'Ǉ'
+                  '\u01c8': 'Lj', # 'ǈ'
+                  '\u01c9': 'lj', # 'ǉ'
+                  '\u01ca': 'NJ', # 'Ǌ'
+                  '\u01cb': 'Nj', # 'ǋ'
+                  '\u01cc': 'nj', # 'ǌ'
+                  '\u1d7a': 'th', # 'ᵺ'
+                  }
+
+ligature_re=re.compile('|'.join(re.escape(l) for l in ligrature_table))
+
+def replace_ligature(s):
+    # check for ligratures and replace them with separate characters
+    if not s:
+        return s
+
+    found=set()
+    def replace(m):
+        found.add(m.group(0))
+        return ligrature_table[m.group(0)]
+    s=ligature_re.sub(replace, s)
+    for l in ligrature_table:
+        if l in found:
+            print("found ligrature {0} replacing with {1}".format(l, ligrature_table[l]))
+    #
+    return s
@@ -30,16 +30,19 @@ import json
 # Use Python Pandas to create XLSX files
 import pandas as pd
 
+import canvas_client
+
 #############################
 ###### EDIT THIS STUFF ######
 #############################
 global baseUrl	# the base URL used for access to Canvas
 global header	# the header for all HTML requests
 global payload	# place to store additionally payload when needed for options to HTML requests
+global canvas	# shared client (pooled session, concurrent pagination) for the Canvas API
 
 # Based upon the options to the program, initialize the variables used to access Canvas gia HTML requests
 def initialize(options):
-    global baseUrl, header, payload
+    global baseUrl, header, payload, canvas
 
     # styled based upon https://martin-thoma.com/configuration-files-in-python/
     if options.config_filename:
@@ -59,6 +62,7 @@ def initialize(options):
 
             header = {'Authorization' : 'Bearer ' + access_token}
             payload = {}
+            canvas=canvas_client.CanvasClient(baseUrl, header, verbose=Verbose_Flag)
     except:
         print("Unable to open configuration file named {}".format(config_file))
         print("Please create a suitable configuration file, the default name is config.json")
@@ -70,65 +74,18 @@ def initialize(options):
 ##############################################################################
 
 def list_custom_column_entries(course_id, column_number):
-       entries_found_thus_far=[]
-
        # Use the Canvas API to get the list of custom column entries for a specific column for the course
        #GET /api/v1/courses/:course_id/custom_gradebook_columns/:id/data
 
        url = "{0}/courses/{1}/custom_gradebook_columns/{2}/data".format(baseUrl,course_id, column_number)
-       if Verbose_Flag:
-              print("url: " + url)
-
-       r = requests.get(url, headers = header)
-       if Verbose_Flag:
-              print("result of getting custom_gradebook_columns: {}".format(r.text))
-
-       if r.status_code == requests.codes.ok:
-              page_response=r.json()
-
-       for p_response in page_response:  
-              entries_found_thus_far.append(p_response)
-
-       # the following is needed when the reponse has been paginated
-       # i.e., when the response is split into pieces - each returning only some of the list of modules
-       # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-       while r.links['current']['url'] != r.links['last']['url']:  
-              r = requests.get(r.links['next']['url'], headers=header)  
-              page_response = r.json()  
-              for p_response in page_response:  
-                     entries_found_thus_far.append(p_response)
-
-       return entries_found_thus_far
+       return canvas.get_all(url)
 
 def list_custom_columns(course_id):
-       columns_found_thus_far=[]
        # Use the Canvas API to get the list of custom column for this course
        #GET /api/v1/courses/:course_id/custom_gradebook_columns
 
        url = "{0}/courses/{1}/custom_gradebook_columns".format(baseUrl,course_id)
-       if Verbose_Flag:
-              print("url: {}".format(url))
-
-       r = requests.get(url, headers = header)
-       if Verbose_Flag:
-              print("result of getting custom_gradebook_columns: {}".format(r.text))
-
-       if r.status_code == requests.codes.ok:
-              page_response=r.json()
-
-              for p_response in page_response:  
-                     columns_found_thus_far.append(p_response)
-
-              # the following is needed when the reponse has been paginated
-              # i.e., when the response is split into pieces - each returning only some of the list of modules
-              # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-              while r.links['current']['url'] != r.links['last']['url']:  
-                     r = requests.get(r.links['next']['url'], headers=header)  
-                     page_response = r.json()  
-                     for p_response in page_response:  
-                            columns_found_thus_far.append(p_response)
-
-       return columns_found_thus_far
+       return canvas.get_all(url)
 
 
 def insert_column_name(course_id, column_name):
@@ -199,16 +156,18 @@ def main():
        course_id=remainder[0]
        list_of_columns=list_custom_columns(course_id)              
 
+       # get the entries of all of the columns concurrently
+       entries_of_columns=canvas.map(lambda column: list_custom_column_entries(course_id, column['id']), list_of_columns)
+
        custom_columns_present=False
        index=0
-       for column in list_of_columns:
+       for column, output in zip(list_of_columns, entries_of_columns):
               column_name=column['title']
               column_number=column['id']
 
               if Verbose_Flag:
                      print('column_name: ', column_name, '; column_number: ', column_number)
 
-              output=list_custom_column_entries(course_id, column_number)
               if (output):
                      if Verbose_Flag:
                             print(output)
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# -*- mode: python; python-indent-offset: 4 -*-
+#
+# mods_reader.py
+#
+# Purpose: A streaming reader for (large) MODS files, such as a DiVA export of all of the theses at KTH
+#          over several years, for MODS_to_titles_and_subtitles.py and extract_diva2_ids_from_mods.py.
+#
+# Rather than loading the whole file into memory (as eulxml's load_xmlobject_from_file() or BeautifulSoup do),
+# the file is read with lxml.etree.iterparse() and each <mods> element is handed over as soon as it has been parsed.
+# After it has been processed the element (and the ones before it) are removed from the tree, so memory use
+# does not grow with the number of records in the file.
+#
+# Example of use in a program:
+#
+#   import mods_reader
+#   for record in mods_reader.mods_records(mods_filename):
+#       print(record['thesis_title'])
+#
+# or, to look at the <mods> elements yourself:
+#
+#   for node_index, mods_element in mods_reader.iterate_mods(mods_filename):
+#       ...
+#
+# Each record is a dict with the keys that MODS_to_titles_and_subtitles.py used to produce
+# ('node', 'thesis_title', 'thesis_subtitle', 'authors', 'supervisors', 'examiners', 'opponents',
+# 'genre_publicationTypeCode', 'thesis_uri', 'thesis_isbn') and, when they are in the record,
+# 'topics' (the keywords per language), 'hsv_subjects' and 'hsv_codes' (the national subject categories),
+# 'abstract_language' (a list of the languages of the abstracts), and 'record_identifier' (the diva2 id).
+#
+# 2026-10-18
+#
+
+import lxml.etree as etree
+
+MODS_namespace="http://www.loc.gov/mods/v3"
+
+
+# Generator that yields (node_index, mods_element) for each <mods> element in the file (a file name or a binary file object).
+# Do not keep references to the elements, as each one is cleared when the next one is asked for.
+def iterate_mods(mods_file):
+    node_index=0
+    for event, element in etree.iterparse(mods_file, events=('end',), tag="{{{}}}mods".format(MODS_namespace),
+                                          huge_tree=True):
+        yield (node_index, element)
+        node_index=node_index+1
+        # free the processed element and any siblings before it
+        element.clear(keep_tail=True)
+        parent=element.getparent()
+        if parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
+
+
+# Generator that yields a dict for each <mods> element in the file
+def mods_records(mods_file, verbose=False):
+    for node_index, mods_element in iterate_mods(mods_file):
+        yield record_from_mods(mods_element, node_index, verbose)
+
+
+# Returns the recordIdentifier(s) (i.e., the diva2 ids) in a <mods> element
+def record_identifiers(mods_element):
+    return [e.text for e in mods_element.iter("{{{}}}recordIdentifier".format(MODS_namespace)) if e.text]
+
+
+# processing of MODS data: extract information about one publication
+def record_from_mods(current_mod, node_index, verbose=False):
+    # extract information about the publication
+    pub_info=dict()
+
+
+    pub_info['node']=[node_index]
+
+    pub_info['thesis_title']=dict()
+    pub_info['thesis_subtitle']=dict()
+    authors=list()
+    supervisors=list()
+    examiners=list()
+    opponents=list()
+    list_of_topics=dict()
+    list_of_HSV_subjects=dict()
+    list_of_HSV_codes=set()
+    current_subject_language=None
+    thesis_abstract_language=list()
+
+    # note types
+    level=dict()
+    universityCredits=dict()
+    venue=None
+    cooperation=None
+
+    if verbose:
+        print("Length of mod: {0}".format(len(current_mod)))
+    for mod_element in range(0, len(current_mod)):
+        current_element=current_mod[mod_element]
+        if verbose:
+            print("current element {0}".format(current_element))
+        if current_element.tag.count("}genre") == 1:
+            if verbose:
+                print("attribute={}".format(current_element.attrib))
+                print("text={}".format(current_element.text))
+            attribute=current_element.attrib
+            type=attribute.get('type', None)
+            if type and (type == 'publicationTypeCode'):
+                if current_element.text == 'studentThesis':
+                    pub_info['genre_publicationTypeCode']=current_element.text
+                elif current_element.text in ['comprehensiveDoctoralThesis',
+                                              'comprehensiveLicentiateThesis',
+                                              'monographDoctoralThesis',
+                                              'monographLicentiateThesis']:
+                    pub_info['genre_publicationTypeCode']=current_element.text
+                else:
+                    print("Unexpected genre publicationTypeCode = {}".format(current_element.text))
+
+        elif current_element.tag.count("}name") == 1:
+            name_given=None
+            name_family=None
+            corporate_name=''
+            affiliation=''
+            role=None
+            kthid=None
+
+            name_type=current_element.attrib.get('type', 'Unknown')
+            if verbose:
+                print("name_type={}".format(name_type))
+                print("current_element.attrib={}".format(current_element.attrib))
+            # note the line below is based on the manual expansion of the xlink name space
+            kthid=current_element.attrib.get('{http://www.w3.org/1999/xlink}href', None)
+            if verbose:
+                print("kthid={}".format(kthid))
+
+            for j in range(0, len(current_element)):
+                elem=current_element[j]
+                if elem.tag.count("}namePart") == 1:
+                    if name_type == 'personal':
+                        #   name_family, name_given, name_type, affiliation
+                        if verbose:
+                            print("namePart: {}".format(elem.text))
+                        if len(elem.attrib) > 0 and verbose:
+                            print(elem.attrib)
+                        namePart_type = elem.attrib.get('type', None)
+                        if namePart_type and namePart_type == 'family':
+                            name_family=elem.text
+                            if verbose:
+                                print("name_family: {}".format(name_family))
+                        elif namePart_type and namePart_type == 'given':
+                            name_given=elem.text
+                            if verbose:
+                                print("name_given: {}".format(name_given))
+                        elif namePart_type and namePart_type == 'date':
+                            name_date=elem.text
+                            if verbose:
+                                print("name_date: {}".format(name_date))
+                        elif namePart_type and verbose:
+                            print("Cannot parse namePart {0} {1}".format(elem.attrib['type'], elem.text))
+                        else:
+                            print("here is no namePart_type")
+                    elif name_type == 'corporate':
+                        if len(corporate_name) > 0:
+                            corporate_name = corporate_name + "," + elem.text
+                        else:
+                            corporate_name = elem.text
+                    else:
+                        print("dont' know what do do about a namePart")
+
+                elif elem.tag.count("}role") == 1:
+                    if verbose and elem.text is not None:
+                        print("role: elem {0} {1}".format(elem.attrib, elem.text))
+                        print("role length is {}".format(len(elem)))
+                    for j in range(0, len(elem)):
+                        rt=elem[j]
+                        if rt.tag.count("}roleTerm") == 1:
+                            # role, affiliation, author_affiliation, supervisor_affiliation, examiner_affiliation
+                            #  name_family, name_given, author_name_family, author_name_given, supervisor_name_family, supervisor_name_given
+                            #  examiner_name_family, examiner_name_given, corporate_name, publisher_name
+                            #
+                            if len(rt.attrib) > 0 and verbose:
+                                print("roleTerm: {}".format(rt.attrib))
+                            if rt.text is not None:
+                                if verbose:
+                                    print(rt.text)
+                                if rt.text.count('aut') == 1:
+                                    author_name_family = name_family
+                                    author_name_given = name_given
+                                    role = 'aut'
+                                    if verbose:
+                                        print("author_name_family: {}".format(name_family))
+                                        print("author_name_given: {}".format(name_given))
+                                elif rt.text.count('ths') == 1:
+                                    role = 'ths'
+                                    if verbose:
+                                        print("supervisor_name_family: {}".format(name_family))
+                                        print("supervisor_name_given: {}".format(name_given))
+                                elif rt.text.count('mon') == 1:
+                                    role = 'mon'
+                                    if verbose:
+                                        print("examiner_name_family: {}".format(name_family))
+                                        print("examiner_name_given: {}".format(name_given))
+                                elif rt.text.count('opn') == 1:
+                                    role = 'opn'
+                                    if verbose:
+                                        print("examiner_name_family: {}".format(name_family))
+                                        print("examiner_name_given: {}".format(name_given))
+                                elif rt.text.count('pbl') == 1:
+                                    publisher_name = corporate_name
+                                    role = 'pbl'
+                                    if verbose:
+                                        print("publisher_name: {}".format(publisher_name))
+                                elif rt.text.count('oth') == 1:
+                                    # clear the corporate_name if this is a "oth" role
+                                    corporate_name=''
+                                    if verbose:
+                                        print("name_family: {}".format(name_family))
+                                        print("name_given: {}".format(name_given))
+                                else:
+                                    if verbose:
+                                        print("rt[{0}]={1}".format(j, rt))
+                elif elem.tag.count("}affiliation") == 1:
+                    # Extract
+                    # affiliation, author_affiliation, supervisor_affiliation, examiner_affiliation
+                    if verbose:
+                        print("affiliation :")
+                    if len(elem.attrib) > 0:
+                        if verbose:
+                            print(elem.attrib)
+                    if elem.text is not None:
+                        if len(affiliation) > 0:
+                            affiliation = affiliation + ' ,' + elem.text
+                        else:
+                            affiliation=elem.text
+                            if verbose:
+                                print(elem.text)
+
+                elif elem.tag.count("}description") == 1:
+                    if verbose:
+                        if len(elem.attrib) > 0:
+                            if verbose and elem.text is not None:
+                                print("description: {0} {1}".format(elem.attrib, elem.text))
+
+                else:
+                    if verbose:
+                        print("mod_emem[{0}]={1}".format(j, elem))
+
+            if  name_given and name_family:
+                full_name=name_given+' '+name_family
+            elif name_given:
+                full_name=name_given
+            elif name_family:
+                full_name=name_family
+            else:
+                full_name=None
+
+            if full_name:
+                if role == 'aut':
+                    author={'name': full_name}
+                    if kthid:
+                        author['kthid']=kthid
+                    if affiliation:
+                        author['affiliation']=affiliation
+                    authors.append(author)
+                elif role == 'ths':
+                    supervisor={'name': full_name}
+                    if kthid:
+                        supervisor['kthid']=kthid
+                    if affiliation:
+                        supervisor['affiliation']=affiliation
+                    supervisors.append(supervisor)
+                elif role == 'mon':
+                    examiner={'name': full_name}
+                    if kthid:
+                        examiner['kthid']=kthid
+                    if affiliation:
+                        examiner['affiliation']=affiliation
+                    examiners.append(examiner)
+                elif role == 'opn':
+                    opponent={'name': full_name}
+                    if kthid:
+                        opponent['kthid']=kthid
+                    if affiliation:
+                        opponent['affiliation']=affiliation
+                    opponents.append(opponent)
+                elif role == 'pbl':
+                    # publisher_name
+                    print("publisher_name={}".format(publisher_name))
+                elif role == 'oth':
+                    # clear the corporate_name if this is a "oth" role
+                    print("role is oth")
+                else:
+                    if name_given and name_family:
+                        print("Unknown role for {0} {1}".format(name_given, name_family))
+            if authors:
+                pub_info['authors']=authors
+            if supervisors:
+                pub_info['supervisors']=supervisors
+            if examiners:
+                pub_info['examiners']=examiners
+            if opponents:
+                pub_info['opponents']=opponents
+        # end of processing a name
+
+        # <titleInfo lang="eng"><title>A Balance between Precision and Privacy</title><subTitle>Recommendation Model for the Healthcare Sector</subTitle></titleInfo>
+        # <titleInfo lang="eng"><title>A comparative analysis of CNN and LSTM for music genre classification</title></titleInfo><language><languageTerm type="code" authority="iso639-2b">eng</languageTerm></language><titleInfo type="alternative" lang="swe"><title>En jämförande analys av CNN och LSTM för klassificering av musikgenrer</title></titleInfo>
+        # <titleInfo lang="eng"><title>A Comparative Analysis of RNN and SVM</title><subTitle>Electricity Price Forecasting in Energy Management Systems</subTitle></titleInfo><language><languageTerm type="code" authority="iso639-2b">eng</languageTerm></language><titleInfo type="alternative" lang="swe"><title>En jämförande analys av RNN och SVM</title><subTitle>Prognos för elpriser i energiledningssystem</subTitle></titleInfo>
+        elif current_element.tag.count("}titleInfo") == 1:
+            if verbose:
+                print("TitleInfo: ")
+            if len(current_element.attrib) > 0:
+                if verbose:
+                    print("current_element.attrib={}".format(current_element.attrib))
+                titleInfo_type=current_element.attrib.get('type', None)
+                titleInfo_lang=current_element.attrib.get('lang', None)
+                if current_element.text is not None:
+                    if verbose:
+                        print("{}".format(current_element.text))
+                for j in range(0, len(current_element)):
+                    elem=current_element[j]
+                    if elem.tag.count("}title") == 1:
+                        if len(elem.attrib) > 0:
+                            if verbose:
+                                print("{}".format(elem.attrib))
+                        if elem.text is not None:
+                            if titleInfo_type == 'alternative':
+                                if pub_info['thesis_title'].get('alternative', None):
+                                    pub_info['thesis_title']['alternative'][titleInfo_lang]=elem.text
+                                else:
+                                    pub_info['thesis_title']['alternative']=dict()
+                                    pub_info['thesis_title']['alternative'][titleInfo_lang]=elem.text
+                            else:
+                                pub_info['thesis_title'][titleInfo_lang]=elem.text
+                    elif elem.tag.count("}subTitle") == 1:
+                        if len(elem.attrib) > 0:
+                            if verbose:
+                                print("{}".format(elem.attrib))
+                        if elem.text is not None:
+                            if titleInfo_type == 'alternative':
+                                if pub_info['thesis_subtitle'].get('alternative', None):
+                                    pub_info['thesis_subtitle']['alternative'][titleInfo_lang]=elem.text
+                                else:
+                                    pub_info['thesis_subtitle']['alternative']=dict()
+                                    pub_info['thesis_subtitle']['alternative'][titleInfo_lang]=elem.text
+                            else:
+                                pub_info['thesis_subtitle'][titleInfo_lang]=elem.text
+                    else:
+                        if verbose:
+                            print("mod_emem[{0}]={1}".format(j, elem))
+
+
+        elif current_element.tag.count("}identifier") == 1:
+            if current_element.text is not None:
+                identifier_type=current_element.attrib.get('type', None)
+                if identifier_type == 'uri':
+                    pub_info['thesis_uri']=current_element.text
+                elif identifier_type == 'isbn':
+                    pub_info['thesis_isbn']=current_element.text
+                else:
+                    print("Unhandled identifier: {0} of type {1}".format(current_element.text, identifier_type))
+
+        # <subject lang="eng"><topic>Machine learning</topic></subject>
+        # <subject lang="eng" authority="hsv" xlink:href="10201"><topic>Natural Sciences</topic><topic>Computer and Information Sciences</topic>...</subject>
+        elif current_element.tag.count("}subject") == 1:
+            current_subject_language=current_element.attrib.get('lang', None)
+            topics=[elem.text for elem in current_element if elem.tag.count("}topic") == 1 and elem.text is not None]
+            if current_element.attrib.get('authority', None) == 'hsv':
+                hsv_code=current_element.attrib.get('{http://www.w3.org/1999/xlink}href', None)
+                if hsv_code:
+                    list_of_HSV_codes.add(hsv_code)
+                list_of_HSV_subjects.setdefault(current_subject_language, []).append(topics)
+            else:
+                list_of_topics.setdefault(current_subject_language, []).extend(topics)
+
+        elif current_element.tag.count("}abstract") == 1:
+            abstract_language=current_element.attrib.get('lang', None)
+            if abstract_language and abstract_language not in thesis_abstract_language:
+                thesis_abstract_language.append(abstract_language)
+
+        # <recordInfo><recordContentSource>kth</recordContentSource><recordIdentifier>diva2:1589853</recordIdentifier>...</recordInfo>
+        elif current_element.tag.count("}recordInfo") == 1:
+            for elem in current_element:
+                if elem.tag.count("}recordIdentifier") == 1 and elem.text is not None:
+                    pub_info['record_identifier']=elem.text
+
+    if list_of_topics:
+        pub_info['topics']=list_of_topics
+    if list_of_HSV_subjects:
+        pub_info['hsv_subjects']=list_of_HSV_subjects
+        pub_info['hsv_codes']=sorted(list_of_HSV_codes)
+    if thesis_abstract_language:
+        pub_info['abstract_language']=thesis_abstract_language
+
+    if verbose:
+        print("pub_info is {}".format(pub_info))
+    return pub_info
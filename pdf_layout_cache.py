@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# -*- mode: python; python-indent-offset: 4 -*-
+#
+# ./pdf_layout_cache.py [--cache FILE] [--jobs N] file.pdf ...
+#
+# Purpose: A cache of pdfminer's layout analysis of PDF files, shared by the programs that check the
+#          DiVA PDF files (check_for_new_cover.py, find_For_DIVA_page.py, find_back_cover_page.py,
+#          find_and_extract_references.py, and process_degree_project_proposal.py).
+#
+# The layout analysis (pdfminer's extract_pages) is by far the most expensive part of these programs,
+# and they are all run over the same corpus of PDF files. With this cache each PDF file is only parsed once.
+#
+# The function extract_pages() is a drop-in replacement for pdfminer.high_level.extract_pages(), hence
+# each checker's process_element() runs unchanged over the cached layout objects (LTPage, LTTextBoxHorizontal,
+# LTChar with its font name and size, bbox, LTLine, LTRect, ...).
+#
+# The cache is an SQLite database (by default the file PDF_layout_cache.sqlite3 in the current directory).
+# Set the environment variable PDF_LAYOUT_CACHE to the name of another cache file, or to an empty string to disable the cache.
+# Each page's layout is stored as a zlib compressed pickle, keyed by the SHA-256 hash of the PDF file's contents,
+# the layout parameters (LAParams), and the page number. As the pages are stored individually, a program that
+# only looks at some pages (such as the cover) only parses and loads those pages.
+# The number of pages of a PDF file is counted (from its page tree) the first time it is seen, so any later call,
+# including one for the whole document, only parses the pages that are not already in the cache.
+#
+# Note that the cache contains pickles, so only use a cache file that you have created yourself.
+#
+# When run as a program, it fills the cache for the given PDF files (using N worker processes), so that
+# the checkers can then be run over the cached layouts.
+#
+# Example:
+# ./pdf_layout_cache.py --jobs 16 *.pdf
+# ./find_For_DIVA_page.py -s ../eecs-2022with_coverinfo.xlsx
+#
+# 2026-10-18
+#
+import sys
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import zlib
+
+from concurrent.futures import ProcessPoolExecutor
+
+import pdfminer.high_level
+from pdfminer.layout import LAParams
+from pdfminer.pdfpage import PDFPage
+
+default_cache_filename='PDF_layout_cache.sqlite3'
+
+cache_filename=os.environ.get('PDF_LAYOUT_CACHE', default_cache_filename)
+cache_enabled=bool(cache_filename) # setting PDF_LAYOUT_CACHE to an empty string disables the cache
+
+# the database connection is opened on first use (and separately in each process)
+cache_db=None
+cache_db_pid=None
+
+def use_cache(filename):
+    # use the cache in the given file (None or '' disables the cache)
+    global cache_filename, cache_enabled, cache_db
+    cache_filename=filename
+    cache_enabled=bool(filename)
+    cache_db=None
+
+def open_cache():
+    global cache_db, cache_db_pid
+    if cache_db is not None and cache_db_pid == os.getpid():
+        return cache_db
+    cache_db=sqlite3.connect(cache_filename, timeout=60)
+    cache_db_pid=os.getpid()
+    cache_db.execute("PRAGMA journal_mode=WAL")
+    cache_db.execute("""CREATE TABLE IF NOT EXISTS pages (
+                            pdf_hash TEXT NOT NULL,
+                            laparams_key TEXT NOT NULL,
+                            page_number INTEGER NOT NULL,
+                            layout BLOB NOT NULL,
+                            PRIMARY KEY (pdf_hash, laparams_key, page_number))""")
+    cache_db.execute("""CREATE TABLE IF NOT EXISTS documents (
+                            pdf_hash TEXT NOT NULL,
+                            laparams_key TEXT NOT NULL,
+                            page_count INTEGER NOT NULL,
+                            PRIMARY KEY (pdf_hash, laparams_key))""")
+    cache_db.commit()
+    return cache_db
+
+def hash_of_pdf_file(filename):
+    h=hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024*1024), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def key_for_laparams(laparams):
+    # pdfminer's extract_pages uses LAParams() when no laparams are given
+    if laparams is None:
+        laparams=LAParams()
+    parameters={k: v for k, v in vars(laparams).items() if isinstance(v, (bool, int, float, str, type(None)))}
+    return hashlib.sha256(json.dumps(parameters, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+def load_page(db, pdf_hash, laparams_key, page_number):
+    row=db.execute("SELECT layout FROM pages WHERE pdf_hash=? AND laparams_key=? AND page_number=?",
+                   (pdf_hash, laparams_key, page_number)).fetchone()
+    if row is None:
+        return None
+    return pickle.loads(zlib.decompress(row[0]))
+
+def cached_page_numbers(db, pdf_hash, laparams_key):
+    rows=db.execute("SELECT page_number FROM pages WHERE pdf_hash=? AND laparams_key=?", (pdf_hash, laparams_key))
+    return set(r[0] for r in rows)
+
+def known_page_count(db, pdf_hash, laparams_key):
+    row=db.execute("SELECT page_count FROM documents WHERE pdf_hash=? AND laparams_key=?", (pdf_hash, laparams_key)).fetchone()
+    if row is None:
+        return None
+    return row[0]
+
+def store_page(db, pdf_hash, laparams_key, page_number, page):
+    # pdfminer numbers the pages it has processed, rather than the pages in the document, so
+    # make pageid the (one-based) page number in the document, independent of which pages were parsed together
+    page.pageid=page_number+1
+    layout=zlib.compress(pickle.dumps(page, protocol=pickle.HIGHEST_PROTOCOL))
+    db.execute("INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?)", (pdf_hash, laparams_key, page_number, layout))
+    db.commit()
+
+def count_pages(pdf_file, password=''):
+    with open(pdf_file, 'rb') as fp:
+        return sum(1 for page in PDFPage.get_pages(fp, password=password))
+
+def store_page_count(db, pdf_hash, laparams_key, page_count):
+    db.execute("INSERT OR REPLACE INTO documents VALUES (?, ?, ?)", (pdf_hash, laparams_key, page_count))
+    db.commit()
+
+
+# Same arguments and results as pdfminer.high_level.extract_pages(), page_numbers are zero-based
+def extract_pages(pdf_file, password='', page_numbers=None, maxpages=0, caching=True, laparams=None):
+    if not cache_enabled or not isinstance(pdf_file, (str, os.PathLike)):
+        yield from pdfminer.high_level.extract_pages(pdf_file, password=password, page_numbers=page_numbers,
+                                                     maxpages=maxpages, caching=caching, laparams=laparams)
+        return
+
+    db=open_cache()
+    pdf_hash=hash_of_pdf_file(pdf_file)
+    laparams_key=key_for_laparams(laparams)
+    page_count=known_page_count(db, pdf_hash, laparams_key)
+    if page_count is None:
+        # counting the pages only reads the page tree, which is cheap compared to the layout analysis
+        page_count=count_pages(pdf_file, password)
+        store_page_count(db, pdf_hash, laparams_key, page_count)
+
+    if page_numbers is None:
+        wanted=list(range(0, page_count))
+    else:
+        wanted=[p for p in sorted(set(page_numbers)) if p < page_count]
+    if maxpages:                # as in pdfminer, maxpages limits the (zero-based) page numbers to below maxpages
+        wanted=[p for p in wanted if p < maxpages]
+
+    # parse only the pages that are not in the cache, yielding the cached and new pages in page order
+    cached=cached_page_numbers(db, pdf_hash, laparams_key)
+    missing=[p for p in wanted if p not in cached]
+    parsed_pages=None
+    if missing:
+        parsed_pages=pdfminer.high_level.extract_pages(pdf_file, password=password, page_numbers=missing,
+                                                       maxpages=0, caching=caching, laparams=laparams)
+    for p in wanted:
+        if p in cached:
+            yield load_page(db, pdf_hash, laparams_key, p)
+            continue
+        page=next(parsed_pages, None)
+        if page is None:        # the page number is beyond the end of the document
+            return
+        store_page(db, pdf_hash, laparams_key, p, page)
+        yield page
+
+
+def fill_cache_for_file(filename):
+    try:
+        page_count=0
+        for page in extract_pages(filename):
+            page_count=page_count+1
+        return (filename, page_count, None)
+    except Exception as e:
+        return (filename, 0, str(e))
+
+def initialize_worker(filename):
+    use_cache(filename)
+
+def main(argv):
+    argp = argparse.ArgumentParser(description='pdf_layout_cache.py: parse PDF files once and cache their layout for the checkers')
+
+    argp.add_argument('-c', '--cache',
+                      type=str,
+                      default=cache_filename,
+                      help="name of the cache file"
+                      )
+
+    argp.add_argument('-j', '--jobs',
+                      type=int,
+                      default=1,
+                      help="number of PDF files to process in parallel"
+                      )
+
+    argp.add_argument('pdf_files', nargs='+', help="PDF files")
+
+    args = vars(argp.parse_args(argv))
+
+    use_cache(args['cache'])
+    if args['jobs'] > 1:
+        with ProcessPoolExecutor(max_workers=args['jobs'], initializer=initialize_worker, initargs=(args['cache'],)) as executor:
+            results=list(executor.map(fill_cache_for_file, args['pdf_files']))
+    else:
+        results=[fill_cache_for_file(f) for f in args['pdf_files']]
+
+    for filename, page_count, error in results:
+        if error:
+            print("Error in processing {0}: {1}".format(filename, error))
+        else:
+            print("{0}: {1} pages".format(filename, page_count))
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -15,9 +15,12 @@
 # with the option '-C'or '--containers' use HTTP rather than HTTPS for access to Canvas
 # "-m" or "--modules" set up the two basic modules (Gatekeeper module 1 and Gatekeeper protected module 1)
 # "-p" or "--page" set up the two basic pages for the course
-# "-s" or "--survey" set up the survey
+# "-s" or "--survey" set up the survey (if the survey already exists, its questions are updated in place)
+# "--examiner_classes FILE" keep the classes of courses with the same examiners in FILE and on later runs only update
+#   the classes of the courses whose examiners have changed (so the blanks of the survey's examiner question stay the same)
 # "-S" or "--sections" set up the sections for the examiners and programs
 # "-c" or "--columns" set up the custom columns
+# "-e" or "--examiner_column" fill in the Examiner column from the examiner section of each student (needs school_acronym)
 # "-p" or "--pages" set up the pages
 # "-a" or "--assignments" set up the assignments (proposal, alpha and beta drafts, etc.)
 # "-o" or "--objectives" set up the objectives for the course
@@ -67,6 +70,9 @@ import pandas as pd
 
 from bs4 import BeautifulSoup
 
+import canvas_client
+import examiner_classes
+
 ################################
 ######    KOPPS related   ######
 ################################
@@ -212,46 +218,26 @@ def degree_project_course_codes_in(set_of_course_codes):
     return dp_course_set
 
 def compute_equivalence_class_of_teachers_in_courses(ces):
-    courses_with_same_examiners=dict()
-    set_of_examiners=dict()
-    courses_with_no_examiner=list()
-    i=0
-    for c in ces:
-        examiners_for_class=ces[c]
-        examiner_set=set(examiners_for_class)
-        if Verbose_Flag:
-            print("examiners_for_class={0} are {1}".format(c, examiner_set))
-        if not examiner_set:
-            if Verbose_Flag:
-                print("course {0} has no examiners".format(c))
-            courses_with_no_examiner.append(c)
-            continue
-        teacher_set_found = -1
-        for j in range(0, len(set_of_examiners)):
-            if examiner_set == set_of_examiners[j]:
-                if Verbose_Flag:
-                    print("already in set of examiners for j={}".format(j))
-                teacher_set_found=j
-                break
-        #
-        if teacher_set_found >= 0:
-            course_codes=courses_with_same_examiners.get(teacher_set_found, [])
-            if not course_codes:
-                if Verbose_Flag:
-                    print("inserted course code {0} in courses_with_same_examiners[{1}]".format(c, courses_with_same_examiners[teacher_set_found]))
-                courses_with_same_examiners[teacher_set_found]=[c]
-            else:
-                courses_with_same_examiners[teacher_set_found].append(c)
-                if Verbose_Flag:
-                    print("added {0} to courses_with_same_examiners[{1}] is {2}".format(c, teacher_set_found, examiner_set))
-        else:
-            next_set=len(set_of_examiners)
-            if Verbose_Flag:
-                print("new courses_with_same_examiners[{0}] is {1}".format(next_set, examiner_set))
-            set_of_examiners[next_set]=examiner_set
-            courses_with_same_examiners[next_set]=[c]
-    #
-    return {'courses': courses_with_same_examiners, 'examiners': set_of_examiners, 'courses_with_no_examiner': courses_with_no_examiner}
+    # group the courses by their set of examiners (see examiner_classes.py)
+    return examiner_classes.equivalence_classes(ces, verbose=Verbose_Flag)
+
+Examiner_classes_filename=None  # where the examiner classes are kept between runs (see the option --examiner_classes)
+
+def examiner_equivalence_classes(all_course_examiners):
+    # With --examiner_classes the classes from the previous run (for example, the previous term) are updated with only
+    # the courses whose examiners have changed, so the other classes keep their numbers, i.e., their blanks in the survey.
+    if not Examiner_classes_filename:
+        return compute_equivalence_class_of_teachers_in_courses(all_course_examiners)
+    previous=examiner_classes.load_classes(Examiner_classes_filename)
+    if previous is None:
+        equiv_classes=compute_equivalence_class_of_teachers_in_courses(all_course_examiners)
+    else:
+        changes=examiner_classes.course_examiner_changes(previous, all_course_examiners)
+        print("the examiners of {0} courses have changed: {1}".format(len(changes), sorted(changes)))
+        equiv_classes=examiner_classes.update_equivalence_classes(previous, changes, verbose=Verbose_Flag)
+    if not Plan_only:
+        examiner_classes.save_classes(Examiner_classes_filename, equiv_classes)
+    return equiv_classes
 
 
 def examiners_courses(name, courses):
@@ -309,10 +295,11 @@ def potential_examiners_answerv2(course_examiner_dict):
 global baseUrl	# the base URL used for access to Canvas
 global header	# the header for all HTML requests
 global payload	# place to store additionally payload when needed for options to HTML requests
+global canvas	# shared client (pooled session, concurrent pagination) for the Canvas API
 
 # Based upon the options to the program, initialize the variables used to access Canvas gia HTML requests
 def initialize(options):
-       global baseUrl, header, payload
+       global baseUrl, header, payload, canvas
 
        # styled based upon https://martin-thoma.com/configuration-files-in-python/
        if options.config_filename:
@@ -332,40 +319,19 @@ def initialize(options):
 
                      header = {'Authorization' : 'Bearer ' + access_token}
                      payload = {}
+                     canvas=canvas_client.CanvasClient(baseUrl, header, verbose=Verbose_Flag)
        except:
               print("Unable to open configuration file named {}".format(config_file))
               print("Please create a suitable configuration file, the default name is config.json")
               sys.exit()
 
 def users_in_course(course_id):
-       user_found_thus_far=[]
        # Use the Canvas API to get the list of users enrolled in this course
        #GET /api/v1/courses/:course_id/enrollments
+       # returns a generator, so that the enrollments can be processed as they arrive
 
        url = "{0}/courses/{1}/enrollments".format(baseUrl,course_id)
-       if Verbose_Flag:
-              print("url: {}".format(url))
-
-       extra_parameters={'per_page': '100'}
-       r = requests.get(url, params=extra_parameters, headers = header)
-       if Verbose_Flag:
-              print("result of getting enrollments: {}".format(r.text))
-
-       if r.status_code == requests.codes.ok:
-              page_response=r.json()
-
-              for p_response in page_response:  
-                     user_found_thus_far.append(p_response)
-
-              # the following is needed when the reponse has been paginated
-              # i.e., when the response is split into pieces - each returning only some of the list of modules
-              # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-              while r.links['current']['url'] != r.links['last']['url']:  
-                     r = requests.get(r.links['next']['url'], headers=header)  
-                     page_response = r.json()  
-                     for p_response in page_response:  
-                            user_found_thus_far.append(p_response)
-       return user_found_thus_far
+       return canvas.paginated(url)
 
 def user_profile_url(user_id):
        # Use the Canvas API to get the profile of a user
@@ -390,98 +356,96 @@ def section_name_from_section_id(sections_info, section_id):
                    return i['name']
 
 def sections_in_course(course_id):
-       sections_found_thus_far=[]
        # Use the Canvas API to get the list of sections for this course
        #GET /api/v1/courses/:course_id/sections
 
        url = "{0}/courses/{1}/sections".format(baseUrl,course_id)
-       if Verbose_Flag:
-              print("url: {}".format(url))
-
-       r = requests.get(url, headers = header)
-       if Verbose_Flag:
-              print("result of getting sections: {}".format(r.text))
-
-       if r.status_code == requests.codes.ok:
-              page_response=r.json()
-
-              for p_response in page_response:  
-                     sections_found_thus_far.append(p_response)
-
-              # the following is needed when the reponse has been paginated
-              # i.e., when the response is split into pieces - each returning only some of the list of modules
-              # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-              while r.links['current']['url'] != r.links['last']['url']:  
-                     r = requests.get(r.links['next']['url'], headers=header)  
-                     page_response = r.json()  
-                     for p_response in page_response:  
-                            sections_found_thus_far.append(p_response)
-
-       return sections_found_thus_far
+       return canvas.get_all(url)
 
 def list_your_courses():
-       courses_found_thus_far=[]
        # Use the Canvas API to get the list of all of your courses
        # GET /api/v1/courses
 
-       url = baseUrl+'courses'
-       if Verbose_Flag:
-              print("url: {}".format(url))
-
-       r = requests.get(url, headers = header)
-       if Verbose_Flag:
-              print("result of getting courses: {}".format(r.text))
-
-       if r.status_code == requests.codes.ok:
-              page_response=r.json()
-
-              for p_response in page_response:  
-                     courses_found_thus_far.append(p_response)
-
-              # the following is needed when the reponse has been paginated
-              # i.e., when the response is split into pieces - each returning only some of the list of modules
-              # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-              while r.links['current']['url'] != r.links['last']['url']:  
-                     r = requests.get(r.links['next']['url'], headers=header)  
-                     if Verbose_Flag:
-                            print("result of getting courses for a paginated response: {}".format(r.text))
-                     page_response = r.json()  
-                     for p_response in page_response:  
-                            courses_found_thus_far.append(p_response)
-
-       return courses_found_thus_far
+       url = "{0}/courses".format(baseUrl)
+       return canvas.get_all(url)
 
 def list_assignments(course_id):
-    assignments_found_thus_far=[]
     # Use the Canvas API to get the list of assignments for the course
     #GET /api/v1/courses/:course_id/assignments
 
     url = "{0}/courses/{1}/assignments".format(baseUrl, course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
+    return canvas.get_all(url)
 
-    r = requests.get(url, headers = header)
-    if Verbose_Flag:
-        print("result of getting assignments: {}".format(r.text))
+def list_pages(course_id):
+    # Use the Canvas API to get the list of pages for the course
+    #GET /api/v1/courses/:course_id/pages
 
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
+    url = "{0}/courses/{1}/pages".format(baseUrl, course_id)
+    return canvas.get_all(url)
 
-        for p_response in page_response:  
-            assignments_found_thus_far.append(p_response)
+def list_quizzes(course_id):
+    # Use the Canvas API to get the list of quizzes for the course
+    #GET /api/v1/courses/:course_id/quizzes
 
-            # the following is needed when the reponse has been paginated
-            # i.e., when the response is split into pieces - each returning only some of the list of assignments
-            # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-            while r.links['current']['url'] != r.links['last']['url']:  
-                r = requests.get(r.links['next']['url'], headers=header)  
-                if Verbose_Flag:
-                    print("result of getting assignments for a paginated response: {}".format(r.text))
-                page_response = r.json()  
-                for p_response in page_response:  
-                    assignments_found_thus_far.append(p_response)
+    url = "{0}/courses/{1}/quizzes".format(baseUrl, course_id)
+    return canvas.get_all(url)
 
-    return assignments_found_thus_far
+################################
+###### Plan and apply     ######
+################################
+# The existing state of the course is fetched once (the lists are fetched in parallel), each step of the setup
+# compares what it wants to create with this state and only creates what is missing. Hence the program can be run
+# again, for example after a step has failed, without duplicating what was already created.
+# With the option --plan, what would be created is only listed.
+
+global Plan_only
+
+def fetch_course_state(course_id):
+    listers=[('modules', list_modules),
+             ('sections', sections_in_course),
+             ('assignments', list_assignments),
+             ('columns', list_custom_columns),
+             ('pages', list_pages),
+             ('quizzes', list_quizzes),
+             ('assignment_groups', list_assignment_groups)]
+    results=canvas.map(lambda lister: lister[1](course_id), listers)
+    state=dict()
+    for (name, lister), result in zip(listers, results):
+        state[name]=list(result)
+        if Verbose_Flag:
+            print("existing {0}: {1}".format(name, [i.get('name', i.get('title', None)) for i in state[name]]))
+    return state
+
+def names_in(items, key='name'):
+    return set(i.get(key, None) for i in items)
+
+def id_of_named(items, name, key='name'):
+    for i in items:
+        if i.get(key, None) == name:
+            return i['id']
+    return None
+
+def remember_created(items, name, id, key='name'):
+    # add something that has been created to the state, so that the later steps know of it
+    if id:
+        items.append({key: name, 'id': id})
+
+def run_creations(what, creations, concurrent=True):
+    # creations is a list of (name, function, arguments)
+    # Independent creations are run concurrently, use concurrent=False when the order matters (for example,
+    # the position of modules, module items, assignments, or columns). The results are returned in the order of creations.
+    if not creations:
+        if Verbose_Flag:
+            print("no {} to create".format(what))
+        return []
+    if Plan_only:
+        for name, function, arguments in creations:
+            print("would create {0}: {1}".format(what, name))
+        return [None for c in creations]
+    print("creating {0} {1}".format(len(creations), what))
+    if concurrent and len(creations) > 1:
+        return canvas.map(lambda c: c[1](*c[2]), creations)
+    return [function(*arguments) for name, function, arguments in creations]
 
 def create_assignment(course_id, name, max_points, grading_type, description):
     # Use the Canvas API to create an assignment
@@ -677,36 +641,18 @@ def create_module_assignment_item(course_id, module_id, assignment_id, item_name
     return  module_id
 
 def list_modules(course_id):
-    modules_found_thus_far=[]
     # Use the Canvas API to get the list of modules for the course
     #GET /api/v1/courses/:course_id/modules
 
     url = "{0}/courses/{1}/modules".format(baseUrl, course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
+    return canvas.get_all(url)
 
-    r = requests.get(url, headers = header)
-    if Verbose_Flag:
-        print("result of getting modules: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            modules_found_thus_far.append(p_response)
+def list_module_items(course_id, module_id):
+    # Use the Canvas API to get the list of items in a module
+    #GET /api/v1/courses/:course_id/modules/:module_id/items
 
-            # the following is needed when the reponse has been paginated
-            # i.e., when the response is split into pieces - each returning only some of the list of modules
-            # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-            while r.links['current']['url'] != r.links['last']['url']:  
-                r = requests.get(r.links['next']['url'], headers=header)  
-                if Verbose_Flag:
-                    print("result of getting modules for a paginated response: {}".format(r.text))
-                page_response = r.json()  
-                for p_response in page_response:  
-                    modules_found_thus_far.append(p_response)
-
-    return modules_found_thus_far
+    url = "{0}/courses/{1}/modules/{2}/items".format(baseUrl, course_id, module_id)
+    return canvas.get_all(url)
 
 def create_module(course_id, module_name, requires_module_id):
     module_id=None              # will contain the module's ID if it exists
@@ -807,25 +753,36 @@ def check_for_module(course_id,  module_name):
     return module_id
 
 
-def create_basic_modules(course_id):
-    module_id=check_for_module(course_id, "Gatekeeper module 1")
+def create_basic_modules(course_id, state):
+    # the steps depend on each other (module, then the assignment and its module item, then the protected module)
+    module_id=id_of_named(state['modules'], "Gatekeeper module 1")
     if not module_id:
-        module_id=create_gatekeeper_module(course_id, "Gatekeeper module 1")
+        [module_id]=run_creations('module', [("Gatekeeper module 1", create_gatekeeper_module, (course_id, "Gatekeeper module 1"))])
+        remember_created(state['modules'], "Gatekeeper module 1", module_id)
         if Verbose_Flag:
             print("create_basic_modules: Gatekeeper module 1 module_id={}".format(module_id))
 
     name="Gatekeeper 1 access control"
-    description="This assignment is simply for access control. When the teacher sets the assignment for a student to have 1 point then the student will have access to the pages protected by the module where this assignment is."
-    assignment_id=create_assignment(course_id, name, 1, 'points', description)
-    if Verbose_Flag:
-        print("create_basic_modules:assignment_id={}".format(assignment_id))
+    assignment_id=id_of_named(state['assignments'], name)
+    if not assignment_id:
+        description="This assignment is simply for access control. When the teacher sets the assignment for a student to have 1 point then the student will have access to the pages protected by the module where this assignment is."
+        [assignment_id]=run_creations('assignment', [(name, create_assignment, (course_id, name, 1, 'points', description))])
+        remember_created(state['assignments'], name, assignment_id)
+        if Verbose_Flag:
+            print("create_basic_modules:assignment_id={}".format(assignment_id))
 
+    # the module item is checked separately, as an earlier run might have created the assignment but not its module item
     item_name="Gatekeeper 1 access control"
-    create_module_assignment_item(course_id, module_id, assignment_id, item_name, 1)
+    module_items=[]
+    if module_id:
+        module_items=list_module_items(course_id, module_id)
+    if not any(i.get('type') == 'Assignment' and i.get('content_id') == assignment_id for i in module_items):
+        run_creations('module item', [(item_name, create_module_assignment_item, (course_id, module_id, assignment_id, item_name, 1))])
 
-    access_controlled_module=check_for_module(course_id,  "Gatekeeper protected module 1")
+    access_controlled_module=id_of_named(state['modules'], "Gatekeeper protected module 1")
     if not access_controlled_module:
-        access_controlled_module=create_module(course_id, "Gatekeeper protected module 1", module_id)
+        [access_controlled_module]=run_creations('module', [("Gatekeeper protected module 1", create_module, (course_id, "Gatekeeper protected module 1", module_id))])
+        remember_created(state['modules'], "Gatekeeper protected module 1", access_controlled_module)
         if Verbose_Flag:
             print("create_basic_modules: Gatekeeper protected module 1 module_id={}".format(access_controlled_module))
 
@@ -1153,70 +1110,75 @@ def create_module_quiz_item(course_id, module_id, quiz_id, item_name, points):
         return module_id
     return  module_id
 
-def create_survey(course_id, cycle_number, school_acronym, PF_courses, AF_courses, relevant_courses_English, relevant_courses_Swedish, examiners, all_course_examiners):
-    index=1
-    survey=create_survey_quiz(course_id)
-
-    # add the quiz to the appropriate module page
-    module_id=check_for_module(course_id,  'Gatekeeper protected module 1')
-    if Verbose_Flag:
-        print("found module to place the quiz in is module_id: {}".format(module_id))
-    q_module_id=create_module_quiz_item(course_id, module_id, survey, 'Information om exjobbsprojekt/Information for degree project', 0)
-    if Verbose_Flag:
-        print("placed the quiz into module as module item id: {}".format(q_module_id))
+################################
+###### Survey             ######
+################################
+# The survey's questions are described once as a list of question payloads (see survey_questions()).
+# The long answer lists of the course code and examiner questions are computed once for each (school, cycle)
+# and kept in survey_answer_lists_cache. A new survey's questions are created concurrently, each with its
+# position, and then put in order. For an existing survey, the questions are updated in place: questions that
+# are missing are added and the dropdown questions whose answer lists (for example, from KOPPS examiner lists)
+# have changed are updated, rather than rebuilding the quiz.
+
+survey_title='Information om exjobbsprojekt/Information for degree project'
+
+survey_answer_lists_cache=dict()
+
+def survey_answer_lists(school_acronym, cycle_number, PF_courses, AF_courses, relevant_courses_English, relevant_courses_Swedish, examiners, all_course_examiners):
+    key=(school_acronym, cycle_number)
+    lists=survey_answer_lists_cache.get(key, None)
+    if lists is not None:
+        return lists
+
+    equiv_classes=examiner_equivalence_classes(all_course_examiners)
+    lists={'course_code_answers': course_code_alternatives(PF_courses, AF_courses),
+           'course_code_description': course_code_descriptions(PF_courses, AF_courses, relevant_courses_English, relevant_courses_Swedish),
+           'examiner_answers': potential_examiners_answer(examiners),
+           'course_examiner_table': course_examiner_alternatives_table(equiv_classes),
+           'course_examiner_answers': course_examiner_alternatives_answers(equiv_classes)
+           }
+    survey_answer_lists_cache[key]=lists
+    return lists
+
+def survey_question(name, question_type, question_text, answers=None):
+    question={'question_name': name,
+              'question_text': question_text,
+              'question_type': question_type,
+              'question_category': 'Unknown'
+              }
+    if answers is not None:
+        question['answers']=answers
+    return question
+
+def survey_questions(lists):
+    # returns the payloads of the survey's questions, in order and with their positions
+    questions=[]
 
     graded_or_ungraded='<div class="enhanceable_content tabs"><ul><li lang="en"><a href="#fragment-1">English</a></li><li lang="sv"><a href="#fragment-2">På svenska</a></li></ul><div id="fragment-1"><p lang="en">Do you wish an A-F grade, rather than the default P/F (i.e. Pass/Fail) grade for your degree project?</p><p>True: Grade A-F</p><p>False: Pass/Fail (standard)</p></div><div id="fragment-2"><p lang="sv">Vill du ha ett betygsatt exjobb (A-F), i stället för ett vanligt med bara P/F (Pass/Fail)?</p><p>Sant: Betygsatt exjobb (A-F)</p><p>Falskt: Pass/Fail (standard)</p></div>'
-
-    create_question_boolean(course_id, survey, index,
-                            'Graded or ungraded', graded_or_ungraded,
-                            [{'answer_comments': '', 'answer_weight': 100, 'answer_text': 'True/Sant'}, {'answer_comments': '', 'answer_weight': 0, 'answer_text': 'False/Falskt'}])
-    index += 1
+    questions.append(survey_question('Graded or ungraded', 'true_false_question', graded_or_ungraded,
+                                     [{'answer_comments': '', 'answer_weight': 100, 'answer_text': 'True/Sant'}, {'answer_comments': '', 'answer_weight': 0, 'answer_text': 'False/Falskt'}]))
 
     diva='<div class="enhanceable_content tabs"><ul><li lang="en"><a href="#fragment-1">English</a></li><li lang="sv"><a href="#fragment-2">På svenska</a></li></ul><div id="fragment-1"><p lang="en">Do you give KTH permission to make the full text of your final report available via DiVA?</p><p lang="en"><strong>True</strong>: I accept publication via DiVA</p><p lang="en"><strong>False</strong>: I do not accept publication via DiVA</p><p lang="en"><strong>Note that in all cases the report is public and KTH must provide a copy to anyone on request.</strong></p></div><div id="fragment-2"><p lang="sv">Ger du KTH tillstånd att publicera hela din slutliga exjobbsrapport elektroniskt i databasen DiVA?</p><p lang="sv"><strong>Sant:</strong> Jag godkänner publicering via DiVA</p><p lang="sv"><strong>Falskt:</strong> Jag godkänner inte publicering via DiVA</p><p lang="sv"><strong>Observera att din slutliga exjobbsrapport alltid är offentlig, och att KTH alltid måste tillhandahålla en kopia om någon begär det.</strong></p></div>'
-    create_question_boolean(course_id, survey, index, 'Publishing in DiVA', diva, [{'answer_comments': '', 'answer_weight': 100, 'answer_text': 'True/Sant'}, {'answer_comments': '', 'answer_weight': 0, 'answer_text': 'False/Falskt'}])
-    index += 1
-
+    questions.append(survey_question('Publishing in DiVA', 'true_false_question', diva,
+                                     [{'answer_comments': '', 'answer_weight': 100, 'answer_text': 'True/Sant'}, {'answer_comments': '', 'answer_weight': 0, 'answer_text': 'False/Falskt'}]))
 
     course_code='''<p>Kurskod/Course code: Pass/Fail grading (standard): [PF] or Graded A-F/Betygsatt exjobb (A-F): [AF]</p>'''
-    course_code_answers=course_code_alternatives(PF_courses, AF_courses)
-    course_code_description=course_code_descriptions(PF_courses, AF_courses, relevant_courses_English, relevant_courses_Swedish)
-    create_question_multiple_dropdowns(course_id, survey, index, 'Kurskod/Course code', course_code_description+course_code, course_code_answers)
-    index += 1
-        
+    questions.append(survey_question('Kurskod/Course code', 'multiple_dropdowns_question', lists['course_code_description']+course_code, lists['course_code_answers']))
 
     prelim_title='<div class="enhanceable_content tabs"><ul><li lang="en"><a href="#fragment-1">English</a></li><li lang="sv"><a href="#fragment-2">På svenska</a></li></ul><div id="fragment-1"><p lang="en">Tentative title</p></div><div id="fragment-2"><p lang="sv">Preliminär titel</p></div>'
-    create_question_essay(course_id, survey, index, 'Preliminär titel/Tentative title', prelim_title)
-    index += 1
-
+    questions.append(survey_question('Preliminär titel/Tentative title', 'essay_question', prelim_title))
 
     # The following was added to provide some information that could be used to identify an appropriate examiner
     prelim_description='<div class="enhanceable_content tabs"><ul><li lang="en"><a href="#fragment-1">English</a></li><li lang="sv"><a href="#fragment-2">På svenska</a></li></ul><div id="fragment-1"><p lang="en">Brief description of the proposed project</p></div><div id="fragment-2"><p lang="sv">Kort beskrivning av det föreslagna projektet</p></div>'
-    create_question_essay(course_id, survey, index, 'Project Description/Projekt beskrivning', prelim_description)
-    index += 1
+    questions.append(survey_question('Project Description/Projekt beskrivning', 'essay_question', prelim_description))
 
     # examiner
     examiner_question='''<div class="enhanceable_content tabs"><ul><li lang="en"><a href="#fragment-1">English</a></li><li lang="sv"><a href="#fragment-2">P&aring; svenska</a></li></ul><div id="fragment-1"><p lang="en">Potential examiner:</p></div><div id="fragment-2"><p lang="sv">F&ouml;rslag p&aring; examinator:</p></div></div><p> [e1]</p>'''
-
-    course_code_description=course_code_descriptions(PF_courses, AF_courses, relevant_courses_English, relevant_courses_Swedish)
-    examiner_answers=potential_examiners_answer(examiners)
-    create_question_multiple_dropdowns(course_id, survey, index, 'Examinator/Examiner', examiner_question, examiner_answers)
-    index += 1
+    questions.append(survey_question('Examinator/Examiner', 'multiple_dropdowns_question', examiner_question, lists['examiner_answers']))
 
     # examiner version 2
-    #course_examiners_dict=course_examiners(PF_courses + AF_courses)
-    #equiv_classes=compute_equivalence_class_of_teachers_in_courses(course_examiners_dict)
-    equiv_classes=compute_equivalence_class_of_teachers_in_courses(all_course_examiners)
-
-    examiner_question2='''<div class="enhanceable_content tabs"><ul><li lang="en"><a href="#fragment-1">English</a></li><li lang="sv"><a href="#fragment-2">P&aring; svenska</a></li></ul><div id="fragment-1"><p lang="en">Potential examiner:</p></div><div id="fragment-2"><p lang="sv">F&ouml;rslag p&aring; examinator:</p></div></div>'''+course_examiner_alternatives_table(equiv_classes)
-
-    examiner_answers2=course_examiner_alternatives_answers(equiv_classes)
-    course_code_description=course_code_descriptions(PF_courses, AF_courses, relevant_courses_English, relevant_courses_Swedish)
-
-    #examiner_answers=potential_examiners_answer(examiners)
-    create_question_multiple_dropdowns(course_id, survey, index, 'Examinator/Examiner (version 2)', examiner_question2, examiner_answers2)
-    index += 1
-
-
+    examiner_question2='''<div class="enhanceable_content tabs"><ul><li lang="en"><a href="#fragment-1">English</a></li><li lang="sv"><a href="#fragment-2">P&aring; svenska</a></li></ul><div id="fragment-1"><p lang="en">Potential examiner:</p></div><div id="fragment-2"><p lang="sv">F&ouml;rslag p&aring; examinator:</p></div></div>'''+lists['course_examiner_table']
+    questions.append(survey_question('Examinator/Examiner (version 2)', 'multiple_dropdowns_question', examiner_question2, lists['course_examiner_answers']))
 
     start_date='<div class="enhanceable_content tabs"><ul><li lang="en"><a href="#fragment-1">English</a></li><li lang="sv"><a href="#fragment-2">P&aring; svenska</a></li></ul><div id="fragment-1"><p lang="en">Planned start:</p></div><div id="fragment-2"><p lang="sv">Startdatum:</p></div></div><p>[year].[month].[day]</p>' 
     start_date_answers=[{'weight': 100, 'text': '2018', 'blank_id': 'year'},
@@ -1266,24 +1228,166 @@ def create_survey(course_id, cycle_number, school_acronym, PF_courses, AF_course
                         {'weight': 100, 'text': '30', 'blank_id': 'day'},
                         {'weight': 100, 'text': '31', 'blank_id': 'day'}]
 
-    create_question_multiple_dropdowns(course_id, survey, index, 'Startdatum/Planned start', start_date, start_date_answers)
-    index += 1
+    questions.append(survey_question('Startdatum/Planned start', 'multiple_dropdowns_question', start_date, start_date_answers))
 
     company='<div class="enhanceable_content tabs"><ul><li lang="en"><a href="#fragment-1">English</a></li><li lang="sv"><a href="#fragment-2">På svenska</a></li></ul><div id="fragment-1"><p lang="en">At a company, indicate name:</p></div><div id="fragment-2"><p lang="sv">På företag, ange vilket</p></div>'
-    create_question_essay(course_id, survey, index, 'På företag, ange vilket/At a company, indicate name', company)
-    index += 1
+    questions.append(survey_question('På företag, ange vilket/At a company, indicate name', 'essay_question', company))
 
     country='<div class="enhanceable_content tabs"><ul><li lang="en"><a href="#fragment-1">English</a></li><li lang="sv"><a href="#fragment-2">På svenska</a></li></ul><div id="fragment-1"><p lang="en">Outside Sweden, indic. Country (Enter two character country code)</p></div><div id="fragment-2"><p lang="sv">Utomlands, ange land (Ange landskod med två tecken)</p></div>'
-    create_question_short_answer_question(course_id, survey, index, 'Utomlands, ange land/Outside Sweden, indic. Country', country)
-    index += 1
+    questions.append(survey_question('Utomlands, ange land/Outside Sweden, indic. Country', 'short_answer_question', country))
 
     university='<div class="enhanceable_content tabs"><ul><li lang="en"><a href="#fragment-1">English</a></li><li lang="sv"><a href="#fragment-2">P&aring; svenska</a></li></ul><div id="fragment-1"><p lang="en">At another university</p></div><div id="fragment-2"><p lang="sv">P&aring; annan h&ouml;gskola</p></div></div>'
-    create_question_essay(course_id, survey, index, 'På annan högskola/At another university', university)
-    index += 1
+    questions.append(survey_question('På annan högskola/At another university', 'essay_question', university))
 
     contact='<div class="enhanceable_content tabs"><ul><li lang="en"><a href="#fragment-1">English</a></li><li lang="sv"><a href="#fragment-2">P&aring; svenska</a></li></ul><div id="fragment-1"><p lang="en">Enter the name and contact details of your contact at a company, other university, etc.</p></div><div id="fragment-2"><p lang="sv">Ange namn, e-postadress och annan kontaktinformation f&ouml;r din kontaktperson vid f&ouml;retaget, det andra universitetet, eller motsvarande.</p></div></div>'
-    create_question_essay(course_id, survey, index, 'Kontaktperson/Contact person', contact)
-    index += 1
+    questions.append(survey_question('Kontaktperson/Contact person', 'essay_question', contact))
+
+    for index, question in enumerate(questions, start=1):
+        question['position']=index
+    return questions
+
+def list_quiz_questions(course_id, quiz_id):
+    # Use the Canvas API to get the list of questions of a quiz
+    # GET /api/v1/courses/:course_id/quizzes/:quiz_id/questions
+
+    url = "{0}/courses/{1}/quizzes/{2}/questions".format(baseUrl, course_id, quiz_id)
+    return canvas.get_all(url)
+
+def create_quiz_question(course_id, quiz_id, question):
+    # Use the Canvas API to create a question for a quiz
+    # POST /api/v1/courses/:course_id/quizzes/:quiz_id/questions
+
+    url = "{0}/courses/{1}/quizzes/{2}/questions".format(baseUrl, course_id, quiz_id)
+    if Verbose_Flag:
+        print("url: {}".format(url))
+    r = canvas.post(url, json={'question': question})
+    if Verbose_Flag:
+        print("result of post making a question: {}".format(r.text))
+        print("r.status_code={}".format(r.status_code))
+    if r.status_code == requests.codes.created or r.status_code == requests.codes.ok:
+        page_response=r.json()
+        print("inserted question: {}".format(question['question_name']))
+        return page_response['id']
+    return False
+
+def update_quiz_question(course_id, quiz_id, question_id, question):
+    # Use the Canvas API to update a question of a quiz
+    # PUT /api/v1/courses/:course_id/quizzes/:quiz_id/questions/:id
+
+    url = "{0}/courses/{1}/quizzes/{2}/questions/{3}".format(baseUrl, course_id, quiz_id, question_id)
+    if Verbose_Flag:
+        print("url: {}".format(url))
+    r = canvas.put(url, json={'question': question})
+    if Verbose_Flag:
+        print("result of updating a question: {}".format(r.text))
+        print("r.status_code={}".format(r.status_code))
+    if r.status_code == requests.codes.ok:
+        print("updated question: {}".format(question['question_name']))
+        return True
+    return False
+
+def reorder_quiz_questions(course_id, quiz_id, question_ids):
+    # Use the Canvas API to put the questions of a quiz in order
+    # POST /api/v1/courses/:course_id/quizzes/:id/reorder
+
+    url = "{0}/courses/{1}/quizzes/{2}/reorder".format(baseUrl, course_id, quiz_id)
+    payload={'order': [{'id': i, 'type': 'question'} for i in question_ids]}
+    r = canvas.post(url, json=payload)
+    if Verbose_Flag:
+        print("result of reordering the questions: {}".format(r.status_code))
+    return r.status_code == requests.codes.no_content or r.status_code == requests.codes.ok
+
+def republish_quiz(course_id, quiz_id):
+    # the changes to the questions of a published quiz are only seen by the students once it has been saved again,
+    # only call this for a quiz that is already published, so that an unpublished quiz stays unpublished
+    # PUT /api/v1/courses/:course_id/quizzes/:id
+
+    url = "{0}/courses/{1}/quizzes/{2}".format(baseUrl, course_id, quiz_id)
+    r = canvas.put(url, data={'quiz[published]': True})
+    if Verbose_Flag:
+        print("result of republishing the quiz: {}".format(r.text))
+    return r.status_code == requests.codes.ok
+
+def dropdown_answers_of(answers):
+    return sorted((a.get('blank_id', ''), a.get('text', '')) for a in answers)
+
+def visible_text_of(question_text):
+    # Canvas stores the question text as sanitized HTML (with entities and markup that can differ from what was sent),
+    # so compare only the text that is shown, with the entities decoded and the white space collapsed
+    return ' '.join(BeautifulSoup(question_text or '', 'html.parser').get_text(' ').split())
+
+def question_has_changed(existing, question):
+    # only the dropdown questions have answer lists that come from the course data
+    if question['question_type'] != 'multiple_dropdowns_question':
+        return False
+    if visible_text_of(existing.get('question_text', None)) != visible_text_of(question['question_text']):
+        return True
+    return dropdown_answers_of(existing.get('answers', [])) != dropdown_answers_of(question['answers'])
+
+def create_survey_questions(course_id, quiz_id, questions, existing_questions=[]):
+    # create the questions (concurrently, each with its position), then make sure that all of the questions are in order
+    created=run_creations('survey question', [(q['question_name'], create_quiz_question, (course_id, quiz_id, q)) for q in questions])
+    if Plan_only or not questions:
+        return
+    question_ids=dict((q['question_name'], i) for q, i in zip(questions, created) if i)
+    for q in existing_questions:
+        question_ids[q['question_name']]=q['id']
+    positions=dict((q['question_name'], q['position']) for q in questions)
+    order=sorted(question_ids, key=lambda name: positions.get(name, len(positions)+1))
+    reorder_quiz_questions(course_id, quiz_id, [question_ids[name] for name in order])
+
+def update_survey_questions(course_id, quiz_id, questions, published):
+    existing_questions=list_quiz_questions(course_id, quiz_id)
+    existing_by_name=dict((q['question_name'], q) for q in existing_questions)
+
+    missing=[q for q in questions if q['question_name'] not in existing_by_name]
+    changed=[(existing_by_name[q['question_name']]['id'], q) for q in questions
+             if q['question_name'] in existing_by_name and question_has_changed(existing_by_name[q['question_name']], q)]
+    if not missing and not changed:
+        print("The survey {} is up to date".format(survey_title))
+        return
+
+    if Plan_only:
+        for question_id, q in changed:
+            print("would update survey question: {}".format(q['question_name']))
+    elif changed:
+        print("updating {} survey questions".format(len(changed)))
+        canvas.map(lambda c: update_quiz_question(course_id, quiz_id, c[0], c[1]), changed)
+
+    create_survey_questions(course_id, quiz_id, missing, existing_questions)
+    if published and not Plan_only:
+        republish_quiz(course_id, quiz_id)
+
+def create_survey(course_id, cycle_number, school_acronym, PF_courses, AF_courses, relevant_courses_English, relevant_courses_Swedish, examiners, all_course_examiners, state):
+    lists=survey_answer_lists(school_acronym, cycle_number, PF_courses, AF_courses, relevant_courses_English, relevant_courses_Swedish, examiners, all_course_examiners)
+    questions=survey_questions(lists)
+
+    survey=id_of_named(state['quizzes'], survey_title, 'title')
+    if survey:
+        print("The survey {} already exists, updating its questions".format(survey_title))
+        published=any(q.get('published', False) for q in state['quizzes'] if q['id'] == survey)
+        update_survey_questions(course_id, survey, questions, published)
+        return
+    if Plan_only:
+        run_creations('quiz', [(survey_title, None, None)])
+        create_survey_questions(course_id, None, questions)
+        return
+
+    survey=create_survey_quiz(course_id)
+    if not survey:
+        print("Unable to create the survey {}".format(survey_title))
+        return
+    remember_created(state['quizzes'], survey_title, survey, 'title')
+
+    # add the quiz to the appropriate module page
+    module_id=id_of_named(state['modules'], 'Gatekeeper protected module 1')
+    if Verbose_Flag:
+        print("found module to place the quiz in is module_id: {}".format(module_id))
+    q_module_id=create_module_quiz_item(course_id, module_id, survey, survey_title, 0)
+    if Verbose_Flag:
+        print("placed the quiz into module as module item id: {}".format(q_module_id))
+
+    create_survey_questions(course_id, survey, questions)
 
 
 def insert_column_name(course_id, column_name):
@@ -1313,37 +1417,14 @@ def insert_column_name(course_id, column_name):
     return False
 
 def list_custom_columns(course_id):
-    columns_found_thus_far=[]
     # Use the Canvas API to get the list of custom column for this course
     #GET /api/v1/courses/:course_id/custom_gradebook_columns
 
     url = "{0}/courses/{1}/custom_gradebook_columns".format(baseUrl,course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    r = requests.get(url, headers = header)
-    if Verbose_Flag:
-        print("result of getting custom_gradebook_columns: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            columns_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        # i.e., when the response is split into pieces - each returning only some of the list of modules
-        # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-        while r.links['current']['url'] != r.links['last']['url']:  
-            r = requests.get(r.links['next']['url'], headers=header)  
-            page_response = r.json()  
-            for p_response in page_response:  
-                columns_found_thus_far.append(p_response)
+    return canvas.get_all(url)
 
-    return columns_found_thus_far
-
-def create_custom_columns(course_id, cycle_number):
-    existing_columns=list_custom_columns(course_id)
+def create_custom_columns(course_id, cycle_number, state):
+    existing_columns=state['columns']
     print("existing_columns={}".format(existing_columns))
 
     column_names=['Group', 'Course_code', 'Planned_start_date', 'Tentative_title', 'Prelim_description', 'Examiner', 'Supervisor', 'KTH_unit', 'Place', 'Contact', 'Student_approves_fulltext', 'TRITA', 'DiVA_URN', 'GA_Approval', 'Ladok_Final_grade_entered']
@@ -1351,11 +1432,12 @@ def create_custom_columns(course_id, cycle_number):
     if cycle_number == '2':
         column_names.remove('Group') # as 2nd cycle degree projects can only be done by individual students
 
-    for c in existing_columns:  # no need to insert existing columns
-        column_names.remove(c['title'])
+    # no need to insert existing columns
+    existing_column_names=names_in(existing_columns, 'title')
+    column_names=[c for c in column_names if c not in existing_column_names]
 
-    for c in column_names:
-        insert_column_name(course_id, c)
+    # the columns are created one at a time, as their order in the gradebook is the order in which they are created
+    run_creations('column', [(c, insert_column_name, (course_id, c)) for c in column_names], concurrent=False)
 
 def lookup_column_number(column_name, list_of_exiting_columns):
     for column in list_of_exiting_columns:
@@ -1373,95 +1455,115 @@ def add_column_if_necessary(course_id, new_column_name, list_of_exiting_columns)
     insert_column_name(course_id, new_column_name)
     return lookup_column_number(new_column_name, list_custom_columns(course_id))
 
-def put_custom_column_entries(course_id, column_number, user_id, data_to_store):
-    entries_found_thus_far=[]
+def list_custom_column_entries(course_id, column_number):
     # Use the Canvas API to get the list of custom column entries for a specific column for the course
+    #GET /api/v1/courses/:course_id/custom_gradebook_columns/:id/data
+
+    url = "{0}/courses/{1}/custom_gradebook_columns/{2}/data".format(baseUrl,course_id, column_number)
+    return canvas.get_all(url)
+
+def put_custom_column_entries(course_id, column_number, user_id, data_to_store):
+    # Use the Canvas API to set the custom column entry of a specific column for one user
     #PUT /api/v1/courses/:course_id/custom_gradebook_columns/:id/data/:user_id
+    # to set the entries of many users use put_custom_column_entries_in_bulk()
 
     url = "{0}/courses/{1}/custom_gradebook_columns/{2}/data/{3}".format(baseUrl,course_id, column_number,user_id)
     if Verbose_Flag:
         print("url: " + url)
         
     payload={'column_data[content]': data_to_store}
-    r = requests.put(url, headers = header, data=payload)
+    r = canvas.put(url, data=payload)
 
     if Verbose_Flag:
         print("result of putting data into custom_gradebook_column: {}".format(r.text))
 
     if r.status_code == requests.codes.ok:
         page_response=r.json()
+        return page_response
+    return None
+
+def put_custom_column_entries_in_bulk(course_id, entries):
+    # entries is a list of (column_number, user_id, data_to_store)
+    # The existing entries are read first, so that only the entries that change are sent; these are sent
+    # in chunks using the bulk update of the custom gradebook column data (PUT /api/v1/courses/:course_id/custom_gradebook_column_data)
+    number_updated=canvas.bulk_update_custom_columns(course_id, entries)
+    print("updated {0} custom column entries".format(number_updated))
+    return number_updated
+
+def fill_examiner_column(course_id, examiners, state):
+    # set the Examiner column of each student to the examiner(s) whose section the student is in,
+    # the cells are written with a few bulk updates rather than one request per student
+    column_id=lookup_column_number('Examiner', list_custom_columns(course_id))
+    if column_id < 0:
+        print("There is no Examiner column, create it with the option -c")
+        return 0
+
+    examiner_of_section=dict((s['id'], s['name']) for s in state['sections'] if s.get('name') in examiners)
+    examiners_of_student=dict()
+    for e in users_in_course(course_id):
+        if e.get('type') != 'StudentEnrollment':
+            continue
+        examiner=examiner_of_section.get(e.get('course_section_id'), None)
+        if examiner:
+            examiners_of_student.setdefault(e['user_id'], set()).add(examiner)
 
-    for p_response in page_response:  
-        entries_found_thus_far.append(p_response)
-
-    return entries_found_thus_far
+    entries=[(column_id, user_id, ', '.join(sorted(examiners_of_student[user_id]))) for user_id in examiners_of_student]
+    if Plan_only:
+        print("would set the Examiner column of {} students (the unchanged entries are skipped)".format(len(entries)))
+        return 0
+    return put_custom_column_entries_in_bulk(course_id, entries)
 
 def sections_in_course(course_id):
-    sections_found_thus_far=[]
-    # Use the Canvas API to get the list of sections for this course
-    #GET /api/v1/courses/:course_id/section
+       # Use the Canvas API to get the list of sections for this course
+       #GET /api/v1/courses/:course_id/sections
+
+       url = "{0}/courses/{1}/sections".format(baseUrl,course_id)
+       return canvas.get_all(url)
+
+def create_section(course_id, section_name):
+    # Use the Canvas API to create a section for this course
+    #POST /api/v1/courses/:course_id/sections
 
     url = "{0}/courses/{1}/sections".format(baseUrl,course_id)
     if Verbose_Flag:
         print("url: {}".format(url))
 
-    r = requests.get(url, headers = header)
+    #course_section[name]
+    payload={'course_section[name]': section_name}
+    r = canvas.post(url, data=payload)
+
     if Verbose_Flag:
-        print("result of getting sections: {}".format(r.text))
+        print("result of creating section: {}".format(r.text))
 
     if r.status_code == requests.codes.ok:
         page_response=r.json()
+        return page_response
+    return None
 
-        for p_response in page_response:  
-            sections_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        # i.e., when the response is split into pieces - each returning only some of the list of modules
-        # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-        while r.links['current']['url'] != r.links['last']['url']:  
-            r = requests.get(r.links['next']['url'], headers=header)  
-            page_response = r.json()  
-            for p_response in page_response:  
-                sections_found_thus_far.append(p_response)
-
-    return sections_found_thus_far
-
-def create_sections_in_course(course_id, section_names):
-    sections_found_thus_far=[]
-
-    # Use the Canvas API to create sections for this course
-    #POST /api/v1/courses/:course_id/sections
-
-    url = "{0}/courses/{1}/sections".format(baseUrl,course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
+def create_sections_in_course(course_id, section_names, state):
+    # only the sections that do not already exist are created, they are created concurrently
+    existing_sections=names_in(state['sections'])
+    missing_sections=[]
     for section_name in section_names:
-        #course_section[name]
-        payload={'course_section[name]': section_name}
-        r = requests.post(url, headers = header, data=payload)
-
-        if Verbose_Flag:
-            print("result of creating section: {}".format(r.text))
-
-        if r.status_code == requests.codes.ok:
-            page_response=r.json()
+        if section_name not in existing_sections and section_name not in missing_sections:
+            missing_sections.append(section_name)
 
-            for p_response in page_response:  
-                sections_found_thus_far.append(p_response)
+    sections_created=[]
+    for section in run_creations('section', [(section_name, create_section, (course_id, section_name)) for section_name in missing_sections]):
+        if section:
+            state['sections'].append(section)
+            sections_created.append(section)
 
-    return sections_found_thus_far
+    return sections_created
 
-def create_sections_for_examiners_and_programs(course_id, examiners, programs):
+def create_sections_for_examiners_and_programs(course_id, examiners, programs, state):
     if Verbose_Flag:
         print("create_sections_for_examiners_and_programs({0}, {1}, {2}".format(course_id, examiners, programs))
-    create_sections_in_course(course_id, sorted(examiners))
-
     program_names=[]
     for s in programs:
         program_names.append("Program: {0}-{1}".format(s, programs[s]['title_en'] ))
 
-    create_sections_in_course(course_id, program_names)
+    create_sections_in_course(course_id, sorted(examiners)+program_names, state)
 
 def create_course_page(course_id, page_title, page_contents):
     #Create page WikiPagesApiController#create
@@ -1485,8 +1587,8 @@ def create_course_page(course_id, page_title, page_contents):
 
     if r.status_code == requests.codes.ok:
         page_response=r.json()
-
-    return page_response
+        return page_response
+    return None
 
 def create_module_page_item(course_id, module_id, page_id, item_name, page_url):
     # Use the Canvas API to create a module item in the course and module
@@ -1514,7 +1616,7 @@ def create_module_page_item(course_id, module_id, page_id, item_name, page_url):
     return  module_id
 
 
-def create_basic_pages(course_id, cycle_number, existing_modules):
+def create_basic_pages(course_id, cycle_number, state):
     basic_pages={
         'Introduction': ['Welcome to Degree Project Course, second Cycle /Välkommen',
                          'Grants from KTH Opportunities Fund / Bidrag från KTH Opportunities Fund',
@@ -1882,18 +1984,21 @@ Om du har fått Fail på ditt examensarbete av någon orsak, t ex något problem
         '''
     }
 
-    for m in existing_modules:
-        if m['name'] == 'Gatekeeper protected module 1':
-            id_of_protected_module=m['id']
+    id_of_protected_module=id_of_named(state['modules'], 'Gatekeeper protected module 1')
 
+    other_modules=[]
     for bp in basic_pages:
         if bp == 'Introduction':
-            module_id=check_for_module(course_id,  bp)
+            module_id=id_of_named(state['modules'], bp)
             if not module_id:
-                module_id=create_module(course_id, bp, id_of_protected_module)
+                [module_id]=run_creations('module', [(bp, create_module, (course_id, bp, id_of_protected_module))])
+                remember_created(state['modules'], bp, module_id)
             pages_in_module=basic_pages[bp]
             print("pages_in_module={}".format(pages_in_module))
 
+            # the pages are created concurrently, then they are added to the module in order
+            existing_pages=names_in(state['pages'], 'title')
+            new_pages=[]
             for p in pages_in_module:
                 if Verbose_Flag:
                     print("p={}".format(p))
@@ -1901,18 +2006,31 @@ Om du har fått Fail på ditt examensarbete av någon orsak, t ex något problem
                 page_content=pages_content.get(p, [])
                 if Verbose_Flag:
                     print("page_content={}".format(page_content))
-                if page_content:                 
-                    cp=create_course_page(course_id, page_title, page_content)
-                    if Verbose_Flag:
-                        print("cp={}".format(cp))
-                        print("page title={}".format(cp['title']))
-                        print("page url={}".format(cp['url']))
-                        print("page id={}".format(cp['page_id']))
-                    create_module_page_item(course_id, module_id, cp['page_id'], cp['title'], cp['url'])
-        else:
-            create_module(course_id, bp, None)
-
-def create_basic_assignments(course_id):
+                if page_content and page_title not in existing_pages:
+                    new_pages.append((page_title, create_course_page, (course_id, page_title, page_content)))
+
+            module_items=[]
+            for (page_title, function, arguments), cp in zip(new_pages, run_creations('page', new_pages)):
+                if Plan_only:           # each new page would also get a module item
+                    module_items.append((page_title, None, None))
+                    continue
+                if not cp:
+                    continue
+                if Verbose_Flag:
+                    print("cp={}".format(cp))
+                    print("page title={}".format(cp['title']))
+                    print("page url={}".format(cp['url']))
+                    print("page id={}".format(cp['page_id']))
+                state['pages'].append(cp)
+                module_items.append((cp['title'], create_module_page_item, (course_id, module_id, cp['page_id'], cp['title'], cp['url'])))
+            run_creations('module item', module_items, concurrent=False)
+        elif bp not in names_in(state['modules']):
+            other_modules.append((bp, create_module, (course_id, bp, None)))
+
+    for (bp, function, arguments), module_id in zip(other_modules, run_creations('module', other_modules, concurrent=False)):
+        remember_created(state['modules'], bp, module_id)
+
+def create_basic_assignments(course_id, state):
     list_of_assignments={
         'Projekt Plan/Project plan':
         '''<div class="enhanceable_content tabs"><ul><li lang="en"><a href="#fragment-en">English</a></li><li lang="sv"><a href="#fragment-sv">På svenska</a></li></ul>
@@ -2142,44 +2260,30 @@ def create_basic_assignments(course_id):
 
 
 
+    # only the assignments that do not already exist are created, they are created in order, as Canvas lists them by position
+    # (an assignment that needs peer reviews is only created with peer reviews)
+    existing_assignments=names_in(state['assignments'])
+    new_assignments=[]
     for a in list_of_assignments:
+        if a in existing_assignments or a in list_of_assignments_with_peer_reviews:
+            continue
         description=list_of_assignments[a]
-        create_assignment_with_submission(course_id, a, '1.0', 'pass_fail', description)
+        new_assignments.append((a, create_assignment_with_submission, (course_id, a, '1.0', 'pass_fail', description)))
 
     for a in list_of_assignments_with_peer_reviews:
+        if a in existing_assignments:
+            continue
         description=list_of_assignments[a]
-        create_assignment_with_submission_with_peerreview(course_id, a, '1.0', 'pass_fail', description)
+        new_assignments.append((a, create_assignment_with_submission_with_peerreview, (course_id, a, '1.0', 'pass_fail', description)))
+
+    for (a, function, arguments), assignment_id in zip(new_assignments, run_creations('assignment', new_assignments, concurrent=False)):
+        remember_created(state['assignments'], a, assignment_id)
 
 def list_assignment_groups(course_id):
     # GET /api/v1/courses/:course_id/assignment_groups
-    assignment_groups_found_thus_far=[]
 
     url = "{0}/courses/{1}/assignment_groups".format(baseUrl, course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    r = requests.get(url, headers = header)
-    if Verbose_Flag:
-        print("result of getting assignment groups: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            assignment_groups_found_thus_far.append(p_response)
-
-            # the following is needed when the reponse has been paginated
-            # i.e., when the response is split into pieces - each returning only some of the list of assignments
-            # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-            while r.links['current']['url'] != r.links['last']['url']:  
-                r = requests.get(r.links['next']['url'], headers=header)  
-                if Verbose_Flag:
-                    print("result of getting assignment groups for a paginated response: {}".format(r.text))
-                page_response = r.json()  
-                for p_response in page_response:  
-                    assignment_groups_found_thus_far.append(p_response)
-
-    return assignment_groups_found_thus_far
+    return canvas.get_all(url)
 
 def create_assignment_group(course_id, name, position, group_weight, rules):
     # Use the Canvas API to create an assignment
@@ -2205,12 +2309,12 @@ def create_assignment_group(course_id, name, position, group_weight, rules):
 
 
 
-def create_active_listening_assignments(course_id):
+def create_active_listening_assignments(course_id, state):
     target_active_group=False
     target_active_group_name='Active lister group'
 
     # check existing assignment groups
-    existing_assignment_groups=list_assignment_groups(course_id)
+    existing_assignment_groups=state['assignment_groups']
 
     # create an assignment group if necessary
     for ag in existing_assignment_groups:
@@ -2221,7 +2325,8 @@ def create_active_listening_assignments(course_id):
         position=1
         group_weight=0.0
         rules=''
-        target_active_group=create_assignment_group(course_id, target_active_group_name, position, group_weight, rules)
+        [target_active_group]=run_creations('assignment group', [(target_active_group_name, create_assignment_group, (course_id, target_active_group_name, position, group_weight, rules))])
+        remember_created(state['assignment_groups'], target_active_group_name, target_active_group)
     # create the two assignments for recording active listener participation
     assignment_name='aktiva deltagande/active listener'
     assignment_description='''
@@ -2238,9 +2343,13 @@ def create_active_listening_assignments(course_id):
 <p lang="sv">Aktiva lyssnare skall, åtminstone, ställa en fråga var. Ange din fråga eller frågor nedan.</p>
 </div>
 </div>'''
+    new_assignments=[]
     for i in range(2):
         name="{1}:{0}".format(assignment_name, i+1)
-        create_assignment_with_textual_submission(course_id, name, '0.50', 'pass_fail', assignment_description, target_active_group)
+        if name not in names_in(state['assignments']):
+            new_assignments.append((name, create_assignment_with_textual_submission, (course_id, name, '0.50', 'pass_fail', assignment_description, target_active_group)))
+    for (name, function, arguments), assignment_id in zip(new_assignments, run_creations('assignment', new_assignments, concurrent=False)):
+        remember_created(state['assignments'], name, assignment_id)
 
 def create_assessment_quiz(course_id, assignment_group_id):
     # Use the Canvas API to create a quiz
@@ -2343,12 +2452,20 @@ def create_assessment_reference(course_id, assessment_quiz, index, cycle_number,
     create_question_essay(course_id, assessment_quiz, index, assessment_name, base_string+lang_alternatives+div_string) 
 
 
-def create_assessments(course_id, cycle_number):
+def create_assessments(course_id, cycle_number, state):
     target_active_group=False
     target_active_group_name='Assignments'
 
+    assessment_quiz_title='Värdering av måluppfyllnad/Assessment of the achievement of objectives'
+    if assessment_quiz_title in names_in(state['quizzes'], 'title'):
+        print("The quiz {} already exists, so the assessments are not created again".format(assessment_quiz_title))
+        return
+    if Plan_only:
+        run_creations('quiz', [(assessment_quiz_title, None, None)])
+        return
+
     # check existing assignment groups
-    existing_assignment_groups=list_assignment_groups(course_id)
+    existing_assignment_groups=state['assignment_groups']
 
     # create an assignment group if necessary
     for ag in existing_assignment_groups:
@@ -2363,7 +2480,7 @@ def create_assessments(course_id, cycle_number):
     assessment_quiz=create_assessment_quiz(course_id, target_active_group)
 
     # add the quiz to the appropriate module page
-    module_id=check_for_module(course_id,  'Gatekeeper protected module 1')
+    module_id=id_of_named(state['modules'], 'Gatekeeper protected module 1')
     if Verbose_Flag:
         print("found module to place the quiz in is module_id: {}".format(module_id))
     q_module_id=create_module_quiz_item(course_id, module_id, assessment_quiz, 'Värdering av måluppfyllnad/Assessment of the achievement of objectives', 40)
@@ -3299,6 +3416,8 @@ def create_outcomes_and_rubrics(course_id):
     
 def main():
     global Verbose_Flag
+    global Plan_only
+    global Examiner_classes_filename
 
     default_picture_size=128
 
@@ -3355,6 +3474,13 @@ def main():
                       help="create the custom columns"
     )
 
+    parser.add_option('-e', '--examiner_column',
+                      dest="examiner_column",
+                      default=False,
+                      action="store_true",
+                      help="fill in the Examiner column from the students' examiner sections"
+    )
+
     parser.add_option('-a', '--assignments',
                       dest="assignments",
                       default=False,
@@ -3385,6 +3511,20 @@ def main():
                       help="create the whole course"
     )
 
+    parser.add_option('--plan',
+                      dest="plan",
+                      default=False,
+                      action="store_true",
+                      help="only list what would be created"
+    )
+
+    parser.add_option('--examiner_classes',
+                      dest="examiner_classes",
+                      default=None,
+                      help="JSON file with the examiner classes of the previous run, only the classes of the courses whose examiners have changed are updated",
+                      metavar="FILE"
+    )
+
 
     options, remainder = parser.parse_args()
 
@@ -3396,6 +3536,8 @@ def main():
         print("Configuration file : {}".format(options.config_filename))
 
     initialize(options)
+    Plan_only=options.plan
+    Examiner_classes_filename=options.examiner_classes
 
     if options.all_features:    # do it all
         options.modules=True
@@ -3415,7 +3557,7 @@ def main():
         cycle_number=remainder[0] # note that cycle_number is a string with the value '1' or '2'
         course_id=remainder[1]
 
-        if (options.survey or options.sections) and (len(remainder) > 2):
+        if (options.survey or options.sections or options.examiner_column) and (len(remainder) > 2):
             school_acronym=remainder[2]
             inputfile_name="course-data-{0}-cycle-{1}.json".format(school_acronym, cycle_number)
             try:
@@ -3440,15 +3582,13 @@ def main():
             relevant_courses_English=all_data['relevant_courses_English']
             relevant_courses_Swedish=all_data['relevant_courses_Swedish']
 
-    if options.modules:
-        create_basic_modules(course_id)
+    # get what already exists in the course, so that only what is missing is created
+    state=fetch_course_state(course_id)
 
-    existing_modules=list_modules(course_id)
-    if Verbose_Flag:
-        if existing_modules:
-            print("existing_modules={0}".format(existing_modules))
+    if options.modules:
+        create_basic_modules(course_id, state)
 
-    if options.survey or options.sections:
+    if options.survey or options.sections or options.examiner_column:
         if Verbose_Flag:
             print("school_acronym={}".format(school_acronym))
         if Verbose_Flag:
@@ -3467,29 +3607,35 @@ def main():
                 all_examiners.add(e)
 
     if options.survey:
-        create_survey(course_id, cycle_number, school_acronym, PF_courses, AF_courses, relevant_courses_English, relevant_courses_Swedish, all_examiners, all_course_examiners)
+        create_survey(course_id, cycle_number, school_acronym, PF_courses, AF_courses, relevant_courses_English, relevant_courses_Swedish, all_examiners, all_course_examiners, state)
 
     if options.sections:
-        create_sections_for_examiners_and_programs(course_id, all_examiners, programs_in_the_school_with_titles)
+        create_sections_for_examiners_and_programs(course_id, all_examiners, programs_in_the_school_with_titles, state)
         # create a section for student awaiting the assignment of an examiner
-        create_sections_in_course(course_id, ["Awaiting Assignment of Examiner"])
+        create_sections_in_course(course_id, ["Awaiting Assignment of Examiner"], state)
 
     if options.columns:
-        create_custom_columns(course_id, cycle_number)
+        create_custom_columns(course_id, cycle_number, state)
+
+    if options.examiner_column:
+        fill_examiner_column(course_id, all_examiners, state)
         
     if options.pages:
-        create_basic_pages(course_id, cycle_number, existing_modules)
+        create_basic_pages(course_id, cycle_number, state)
         
     if options.assignments:
-        create_basic_assignments(course_id)
-        create_active_listening_assignments(course_id)
+        create_basic_assignments(course_id, state)
+        create_active_listening_assignments(course_id, state)
 
         # the following creates the self-assessment quiz
-        create_assessments(course_id, cycle_number)
+        create_assessments(course_id, cycle_number, state)
 
     if options.objectives:
         print("Objectives to be implemented")
-        create_outcomes_and_rubrics(course_id)
+        if Plan_only:
+            print("would create the outcomes and rubrics")
+        else:
+            create_outcomes_and_rubrics(course_id)
 
     if options.testing:
         print("testing for course_id={}".format(course_id))
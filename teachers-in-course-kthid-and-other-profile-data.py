@@ -41,6 +41,8 @@ except ImportError:
 
 from PIL import Image
 
+import kth_profile_client
+
 #############################
 ###### EDIT THIS STUFF ######
 #############################
@@ -52,11 +54,12 @@ global canvas_payload	# place to store additionally payload when needed for opti
 global host	# the base URL
 global header	# the header for all HTML requests
 global payload	# place to store additionally payload when needed for options to HTML requests
+global kth_profiles	# shared client (with a cache) for the KTH profile API
 
 # Based upon the options to the program, initialize the variables used to access Canvas gia HTML requests
 def initialize(args):
     global canvas_baseUrl, canvas_header, canvas_payload
-    global host, header
+    global host, header, kth_profiles
     # styled based upon https://martin-thoma.com/configuration-files-in-python/
     config_file=args["config"]
 
@@ -77,6 +80,7 @@ def initialize(args):
                     host=configuration["KTH_API"]["host"]
                     header = {'api_key': key, 'Content-Type': 'application/json', 'Accept': 'application/json' }
                     payload = {}
+                    kth_profiles=kth_profile_client.KTHProfileClient(host, header, verbose=Verbose_Flag)
                 else:
                     print("could not get KTH_API info")
             except:
@@ -141,22 +145,11 @@ def user_profile_info(user_id):
 # KTH API call(s)
 
 def get_user_by_kthid(kthid):
-    global host, header
+    global kth_profiles
     # Use the KTH API to get the user information give an orcid
     #"#{$kth_api_host}/profile/v1/kthId/#{kthid}"
-
-    url = "{0}/profile/v1/kthId/{1}".format(host, kthid)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    r = requests.get(url, headers = header)
-    if Verbose_Flag:
-        print("result of getting profile: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-        return page_response
-    return []
+    # the profiles are cached, see kth_profile_client.py
+    return kth_profiles.get(kthid)
 
 
 def main(argv):
@@ -198,6 +191,9 @@ def main(argv):
         if u['type'] == 'TeacherEnrollment':
             teachers.append(u)
 
+    # get the profiles of all of the teachers at once
+    kth_profiles.prefetch([u.get('sis_user_id', None) for u in teachers])
+
     teacher_names_sortable=list()
     for u in teachers:
         kthid=u.get('sis_user_id', None)
@@ -13,8 +13,14 @@
 #
 # Output: spreadsheeet with the data
 #
+# The participants of all the course rounds are collected first and each student is only fetched once, using
+# -j N concurrent workers (default 8), each with its own LADOK session. The theses of each student are cached
+# (by default in Ladok_theses_cache.sqlite3, see --cache), keyed by the student's LADOK Uid and the time when
+# their participation was last changed, so a later harvest only fetches the students whose data has changed.
+#
 # Example:
 #./thesis_titles_by_school.py -s EECS
+#./thesis_titles_by_school.py -j 16 -s EECS
 #
 #
 # 
@@ -33,6 +39,10 @@ import re
 import os                       # to make OS calls, here to get time zone info
 import datetime
 from datetime import datetime
+import sqlite3
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
 
 # Use Python Pandas to create XLSX files
 import pandas as pd
@@ -532,8 +542,163 @@ def get_integration_id_from_email_address(email_address):
     integration_id=user_profile.get('integration_id', None)
     return integration_id
 
+#
+# Harvesting the titles from LADOK
+#
+# The participants of all of the course rounds are collected first (the course rounds and the participants are fetched
+# concurrently), so each student who has completed a degree project course is only fetched once, even if they were
+# registered in several course rounds. Each worker thread has its own LADOK session. The theses of a student are cached,
+# keyed by the student's LADOK Uid and the time when their participation was last changed ('SenastSparad').
+#
+default_jobs=8
+default_theses_cache_filename='Ladok_theses_cache.sqlite3'
+
+global Ladok_testing            # use LADOK's test environment
+global theses_cache             # SQLite cache of the theses of each student (None if there is no cache)
+
+ladok_sessions=threading.local()
+all_ladok_sessions=list()
+ladok_sessions_lock=threading.Lock()
+
+def ladok_session():
+    # returns this thread's LADOK session, logging in the first time
+    ladok=getattr(ladok_sessions, 'ladok', None)
+    if ladok is None:
+        if Ladok_testing:
+            ladok = ladok3.kth.LadokSession(os.environ["KTH_LOGIN"], os.environ["KTH_PASSWD"],
+                                            test_environment=True) # for experiments
+        else:
+            ladok = ladok3.kth.LadokSession(os.environ["KTH_LOGIN"], os.environ["KTH_PASSWD"]) # for the production LADOK
+        ladok_sessions.ladok=ladok
+        with ladok_sessions_lock:
+            all_ladok_sessions.append(ladok)
+    return ladok
+
+def logout_ladok_sessions():
+    with ladok_sessions_lock:
+        for ladok in all_ladok_sessions:
+            ladok.logout()
+        all_ladok_sessions.clear()
+
+def open_theses_cache(cache_filename):
+    if not cache_filename:
+        return None
+    db=sqlite3.connect(cache_filename, check_same_thread=False)
+    db.execute("""CREATE TABLE IF NOT EXISTS theses (
+                      student_uid TEXT NOT NULL,
+                      last_modified TEXT NOT NULL,
+                      body TEXT NOT NULL,
+                      PRIMARY KEY (student_uid, last_modified))""")
+    db.commit()
+    return db
+
+theses_cache_lock=threading.Lock()
+
+def cached_titles_of_all_thesis(student):
+    integration_id=student['integration_id']
+    last_modified=student['last_modified']
+    if theses_cache is not None and last_modified:
+        with theses_cache_lock:
+            row=theses_cache.execute("SELECT body FROM theses WHERE student_uid=? AND last_modified=?",
+                                     (integration_id, last_modified)).fetchone()
+        if row:
+            if Verbose_Flag:
+                print("cached theses for {}".format(integration_id))
+            return json.loads(row[0])
+
+    theses=get_titles_of_all_thesis(ladok_session(), integration_id)
+    if theses_cache is not None and last_modified:
+        with theses_cache_lock:
+            # only the latest version of a student's theses is kept
+            theses_cache.execute("DELETE FROM theses WHERE student_uid=?", (integration_id,))
+            theses_cache.execute("INSERT INTO theses VALUES (?, ?, ?)", (integration_id, last_modified, json.dumps(theses)))
+            theses_cache.commit()
+    return theses
+
+def course_rounds_of(course_code):
+    course_rounds=ladok_session().search_course_rounds(code=course_code)
+    if Verbose_Flag:
+        print("course_code={0} course_rounds={1}".format(course_code, course_rounds))
+    return course_rounds
+
+def participants_of_round(round_id):
+    return ladok_session().participants_JSON(round_id)
+
+def participants_who_completed(executor, course_codes):
+    # returns a list with one entry for each student who completed (at least) one of the courses, in the order they were found
+    course_codes=list(course_codes)
+    rounds=list()                                   # (course_code, round_id)
+    course_rounds_already_processed=set()
+    for course_code, course_rounds in zip(course_codes, executor.map(course_rounds_of, course_codes)):
+        for course_round in course_rounds:
+            print("course_code={0} course_round.round_id={1}".format(course_code, course_round.round_id))
+            if course_round.round_id in course_rounds_already_processed:
+                continue
+            course_rounds_already_processed.add(course_round.round_id)
+            rounds.append((course_code, course_round.round_id))
+
+    students=dict()
+    for (course_code, round_id), participants in zip(rounds, executor.map(participants_of_round, [r[1] for r in rounds])):
+        for participant in participants:
+            if not participant['Avklarad']: # only if the student completed the course, look for the titles
+                continue
+            integration_id=participant['Student']['Uid']
+            student=students.get(integration_id, None)
+            if student is None:
+                student={'integration_id': integration_id,
+                         'first_name': participant['Student'].get('Fornamn'),
+                         'last_name': participant['Student'].get('Efternamn'),
+                         'last_modified': '',
+                         'course_codes': list()}
+                students[integration_id]=student
+            # the most recent change to any of the student's participations
+            last_modified=participant.get('SenastSparad') or ''
+            if last_modified > student['last_modified']:
+                student['last_modified']=last_modified
+            if course_code not in student['course_codes']:
+                student['course_codes'].append(course_code)
+    return list(students.values())
+
+def thesis_rows(student, theses):
+    # returns the rows of the spreadsheet for the student's theses in the degree project courses where they were found
+    rows=list()
+    for course_code in student['course_codes']:
+        for info in theses:
+            thesis_course_code=info.get('course_code')
+            if thesis_course_code != course_code: # if this is not the degree project course code we are looking for, skip it.
+                continue
+            student_info=dict()
+            student_info['integration_id']=student['integration_id']
+            if student['first_name']:
+                student_info['first_name']=student['first_name']
+            if student['last_name']:
+                student_info['last_name']=student['last_name']
+            date=info.get('Examinationsdatum')
+            if date:
+                student_info['date']=date
+            student_info['course_code']=thesis_course_code
+            title=info['titles'].get('Titel')
+            if title:
+                student_info['title']=title
+            alt_title=info['titles'].get('AlternativTitel')
+            if alt_title:
+                student_info['alt_title']=alt_title
+            examiner=info.get('Examiner')
+            if examiner:
+                student_info['Examiner']=examiner
+            moment=info.get('moment')
+            if moment:
+                student_info['moment']=moment
+            grade=info.get('Grade')
+            if grade:
+                student_info['Grade']=grade
+            rows.append(student_info)
+    return rows
+
 def main(argv):
     global Verbose_Flag
+    global Ladok_testing
+    global theses_cache
     global testing
     global course_id
 
@@ -557,6 +722,12 @@ def main(argv):
     argp.add_argument('-s', '--school', type=str, default='EECS',
                       help="acronyms for a school within KTH")
 
+    argp.add_argument('-j', '--jobs', type=int, default=default_jobs,
+                      help="number of concurrent requests to LADOK (each worker has its own LADOK session)")
+
+    argp.add_argument('--cache', type=str, default=default_theses_cache_filename,
+                      help="file in which to cache the theses of each student (an empty name disables the cache)")
+
     args = vars(argp.parse_args(argv))
     Verbose_Flag=args["verbose"]
 
@@ -591,108 +762,43 @@ def main(argv):
     print("degree_project_course_codes={}".format(degree_project_course_codes))
 
     print("KTH_LOGIN: {}".format(os.environ["KTH_LOGIN"]))
-    if args['testing']:
-        # establish as session with LADOK
-        ls = ladok3.kth.LadokSession(os.environ["KTH_LOGIN"], os.environ["KTH_PASSWD"],
-            test_environment=True) # for experiments
-    else:
-
-        # establish as session with LADOK
-        ls = ladok3.kth.LadokSession(os.environ["KTH_LOGIN"], os.environ["KTH_PASSWD"]) # for the production LADOK
+    Ladok_testing=args['testing']
+    theses_cache=open_theses_cache(args['cache'])
 
+    with ThreadPoolExecutor(max_workers=args['jobs']) as executor:
+        students=participants_who_completed(executor, degree_project_course_codes)
+        print("{} different students have completed the degree project courses".format(len(students)))
+        if args['testing']:
+            students=students[:10]
 
-    list_of_student_info=list()
-    students_already_processed=set()
-    course_rounds_already_processed=set()
-    number_found=0
-    for course_code in degree_project_course_codes:
-        print("course_code={}".format(course_code))
-        course_rounds=ls.search_course_rounds(code=course_code)
-        if Verbose_Flag:
-            print("course_rounds={}".format(course_rounds))
-
-        for course_round in course_rounds:
-            course_start = course_round.start
-            course_length = course_round.end - course_start
+        # each student is only fetched once, even if they were registered in several course rounds
+        all_theses=executor.map(cached_titles_of_all_thesis, students)
 
-            print("course_round.round_id={}".format(course_round.round_id))
-            if course_round.round_id in course_rounds_already_processed:
+        list_of_student_info=list()
+        rows_already_seen=set()
+        for student, theses in zip(students, all_theses):
+            if Verbose_Flag:
+                print("student={0} theses={1}".format(student, theses))
+            if not theses:
                 continue
-
-            course_rounds_already_processed.add(course_round.round_id)
-            for student in ladok.participants_JSON(course_round.round_id):
-                if student['Avklarad']: # if the student completed the course, then look for the titles
-                    if Verbose_Flag:
-                        print("student={}".format(student))
-
-                    integration_id=student['Student']['Uid']
-                    # since we later check for only the matching course_code, we need to consider the author again
-                    # if integration_id in students_already_processed: # skip students that have already been processed
-                    #     continue
-                    first_name=student['Student'].get('Fornamn')
-                    last_name=student['Student'].get('Efternamn')
-                
-                    theses=get_titles_of_all_thesis(ladok, integration_id)
-                    if Verbose_Flag:
-                        print("theses={}".format(theses))
-                    if theses:
-                        for info in theses:
-                            student_info=dict()
-                            student_info['integration_id']=integration_id
-                            if first_name:
-                                student_info['first_name']=first_name
-                            if last_name:
-                                student_info['last_name']=last_name
-                            date=info.get('Examinationsdatum')
-                            if date:
-                                student_info['date']=date
-                            thesis_course_code=info.get('course_code')
-                            if thesis_course_code != course_code: # if this is not the degree project course code we are looking for, skip it.
-                                continue
-                            if thesis_course_code:
-                                student_info['course_code']=thesis_course_code
-                                # The following code was put in to test for the case of EECS when students with other degree projects were getting included
-                                # since the get_titles_of_all_thesis() code collected _all_ degree projects of a given student and not just those of the
-                                # specific course-code we are looking for in this school.
-                                # if thesis_course_code[0] in ['M', 'S']:
-                                #     print("should not see such a course code: course_round.round_id={0}, info={1}".format(course_round.round_id, info))
-                            title=info['titles'].get('Titel')
-                            if title:
-                                student_info['title']=title
-                            alt_title=info['titles'].get('AlternativTitel')
-                            if alt_title:
-                                student_info['alt_title']=alt_title
-                            examiner=info.get('Examiner')
-                            if examiner:
-                                student_info['Examiner']=examiner
-                            moment=info.get('moment')
-                            if moment:
-                                student_info['moment']=moment
-                            grade=info.get('Grade')
-                            if grade:
-                                student_info['Grade']=grade
-                            list_of_student_info.append(student_info)
-                            number_found=number_found+1
-                    students_already_processed.add(integration_id)
-                    if args['testing'] and number_found > 10:
-                        print("list_of_student_info={}".format(list_of_student_info))
-                        break
+            for student_info in thesis_rows(student, theses):
+                row=tuple(sorted(student_info.items()))
+                if row in rows_already_seen:
+                    continue
+                rows_already_seen.add(row)
+                list_of_student_info.append(student_info)
 
     print("Total number of items of thesis information={}".format(len(list_of_student_info)))
     users_info_df=pd.json_normalize(list_of_student_info) 
     output_filename="titles-all-{}.xlsx".format(school_acronym)
     writer = pd.ExcelWriter(output_filename, engine='xlsxwriter')
-    # We need to drop duplicate rows since a student can have been registered in more than one course round for their degree project
-    # If so, they will appear in the list as many times as there were course rounds.
-    users_info_df.drop_duplicates(ignore_index=True, inplace=True, keep='last')
-
     users_info_df.to_excel(writer, sheet_name='Titles')
 
     # Close the Pandas Excel writer and output the Excel file.
     writer.close()
 
-    # to logout and close the session
-    status=ladok.logout()
+    # to logout and close the sessions
+    logout_ladok_sessions()
 
 if __name__ == '__main__':
     sys.exit(main(sys.argv[1:]))
@@ -29,22 +29,25 @@
 # 2020.11.01
 #
 
-import requests, time
+import time
 import pprint
 import optparse
 import sys
 import json
 
+import kth_profile_client
+
 # Use Python Pandas to create XLSX files
 import pandas as pd
 
 global host	# the base URL
 global header	# the header for all HTML requests
 global payload	# place to store additionally payload when needed for options to HTML requests
+global kth_profiles	# shared client (with a cache) for the KTH profile API
 
 # 
 def initialize(options):
-    global host, header, payload
+    global host, header, payload, kth_profiles
 
     # styled based upon https://martin-thoma.com/configuration-files-in-python/
     if options.config_filename:
@@ -59,6 +62,7 @@ def initialize(options):
             host=configuration["KTH_API"]["host"]
             header = {'api_key': key, 'Content-Type': 'application/json', 'Accept': 'application/json' }
             payload = {}
+            kth_profiles=kth_profile_client.KTHProfileClient(host, header, verbose=Verbose_Flag)
     except:
         print("Unable to open configuration file named {}".format(config_file))
         print("Please create a suitable configuration file, the default name is config.json")
@@ -68,19 +72,8 @@ def initialize(options):
 def get_user_by_kthid(kthid):
     # Use the KTH API to get the user information give an orcid
     #"#{$kth_api_host}/profile/v1/kthId/#{kthid}"
-
-    url = "{0}/profile/v1/kthId/{1}".format(host, kthid)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    r = requests.get(url, headers = header)
-    if Verbose_Flag:
-        print("result of getting profile: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-        return page_response
-    return []
+    # the profiles are cached, see kth_profile_client.py
+    return kth_profiles.get(kthid)
 
 
 def main():
@@ -148,6 +141,10 @@ def main():
     if Verbose_Flag:
         pprint.pprint(diva_admins)
 
+    # get the profiles of all of the admins (who have made at least 3 entries) at once
+    kth_profiles.prefetch([admin for admin in diva_admins
+                           if isinstance(admin, str) and sum([len(diva_admins[admin][y]) for y in diva_admins[admin]]) >= 3])
+
     stats_df=pd.DataFrame()
     for admin in diva_admins:
         entries_made=0